@@ -0,0 +1,143 @@
+-- ═════════════════════════════════════════════════════════════════════════
+-- MIGRACIÓN: ÍNDICES DE CONSULTA - INSTITUTO HUTCHISON PORTS (SQL SERVER)
+-- ═════════════════════════════════════════════════════════════════════════
+-- Índices de cobertura y filtrados para las rutas calientes:
+--   • Precargas y UPDATE/MERGE del ETL por (IdUsuario, IdModulo)
+--   • Refresco de instituto_ResumenProgreso por IdModulo
+--   • Calificaciones e intentos por IdInscripcion
+--   • Conteos por EstatusModulo y usuarios activos por unidad
+--
+-- instituto_Usuario.UserId ya tiene índice (UK_UserId).
+--
+-- Idempotente: cada índice se crea solo si no existe. Para evaluar el
+-- impacto antes/después usar scripts/asesor_indices.py (planes y benchmark).
+--
+-- Los índices filtrados requieren QUOTED_IDENTIFIER y ANSI_NULLS en ON en
+-- las sesiones que modifican la tabla (valores por defecto de ODBC).
+-- ═════════════════════════════════════════════════════════════════════════
+
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_NULLS ON;
+GO
+
+PRINT '══════════════════════════════════════════════════════════════';
+PRINT 'ÍNDICES: instituto_ProgresoModulo';
+PRINT '══════════════════════════════════════════════════════════════';
+GO
+
+-- Una inscripción por (usuario, módulo): clave de precargas, UPDATE y MERGE
+-- del ETL. Si hay duplicados no se puede crear como UNIQUE: se avisa con
+-- RAISERROR y, para no perder el rendimiento mientras se depuran, se crea
+-- IX_ProgresoModulo_Usuario_Modulo (NO único, mismas columnas). Al volver a
+-- ejecutar sin duplicados se crea el UNIQUE y se elimina el IX_.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'UX_ProgresoModulo_Usuario_Modulo'
+                 AND object_id = OBJECT_ID('instituto_ProgresoModulo'))
+BEGIN
+    IF EXISTS (SELECT IdUsuario, IdModulo FROM instituto_ProgresoModulo
+               GROUP BY IdUsuario, IdModulo HAVING COUNT(*) > 1)
+    BEGIN
+        RAISERROR('❌ Hay inscripciones duplicadas por (IdUsuario, IdModulo): UX_ProgresoModulo_Usuario_Modulo NO se creó. Depurarlas (SELECT IdUsuario, IdModulo, COUNT(*) FROM instituto_ProgresoModulo GROUP BY IdUsuario, IdModulo HAVING COUNT(*) > 1) y volver a ejecutar esta migración.', 16, 1);
+
+        IF NOT EXISTS (SELECT 1 FROM sys.indexes
+                       WHERE name = 'IX_ProgresoModulo_Usuario_Modulo'
+                         AND object_id = OBJECT_ID('instituto_ProgresoModulo'))
+        BEGIN
+            CREATE NONCLUSTERED INDEX IX_ProgresoModulo_Usuario_Modulo
+                ON instituto_ProgresoModulo (IdUsuario, IdModulo)
+                INCLUDE (EstatusModulo, FechaAsignacion, FechaInicio, FechaFinalizacion);
+            PRINT '⚠️  Creado IX_ProgresoModulo_Usuario_Modulo (NO único) hasta depurar los duplicados';
+        END
+    END
+    ELSE
+    BEGIN
+        CREATE UNIQUE NONCLUSTERED INDEX UX_ProgresoModulo_Usuario_Modulo
+            ON instituto_ProgresoModulo (IdUsuario, IdModulo)
+            INCLUDE (EstatusModulo, FechaAsignacion, FechaInicio, FechaFinalizacion);
+        PRINT '✅ UX_ProgresoModulo_Usuario_Modulo creado';
+
+        IF EXISTS (SELECT 1 FROM sys.indexes
+                   WHERE name = 'IX_ProgresoModulo_Usuario_Modulo'
+                     AND object_id = OBJECT_ID('instituto_ProgresoModulo'))
+        BEGIN
+            DROP INDEX IX_ProgresoModulo_Usuario_Modulo ON instituto_ProgresoModulo;
+            PRINT '🗑️  IX_ProgresoModulo_Usuario_Modulo (provisional) eliminado';
+        END
+    END
+END
+GO
+
+-- Refresco del resumen por módulo (IdInscripcion va incluido por ser la
+-- clave del índice clustered)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_ProgresoModulo_Modulo'
+                 AND object_id = OBJECT_ID('instituto_ProgresoModulo'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_ProgresoModulo_Modulo
+        ON instituto_ProgresoModulo (IdModulo)
+        INCLUDE (IdUsuario, EstatusModulo, FechaAsignacion, FechaInicio, FechaFinalizacion);
+    PRINT '✅ IX_ProgresoModulo_Modulo creado';
+END
+GO
+
+-- Conteos por estatus y tendencia de terminados por fecha
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_ProgresoModulo_Estatus'
+                 AND object_id = OBJECT_ID('instituto_ProgresoModulo'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_ProgresoModulo_Estatus
+        ON instituto_ProgresoModulo (EstatusModulo)
+        INCLUDE (FechaFinalizacion);
+    PRINT '✅ IX_ProgresoModulo_Estatus creado';
+END
+GO
+
+PRINT '';
+PRINT '══════════════════════════════════════════════════════════════';
+PRINT 'ÍNDICES: instituto_ResultadoEvaluacion';
+PRINT '══════════════════════════════════════════════════════════════';
+GO
+
+-- Intentos por (inscripción, evaluación), mejor puntaje por inscripción y
+-- borrado en cascada desde instituto_ProgresoModulo
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_ResultadoEvaluacion_Inscripcion'
+                 AND object_id = OBJECT_ID('instituto_ResultadoEvaluacion'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_ResultadoEvaluacion_Inscripcion
+        ON instituto_ResultadoEvaluacion (IdInscripcion, IdEvaluacion)
+        INCLUDE (PuntajeObtenido, Aprobado);
+    PRINT '✅ IX_ResultadoEvaluacion_Inscripcion creado';
+END
+GO
+
+PRINT '';
+PRINT '══════════════════════════════════════════════════════════════';
+PRINT 'ÍNDICES: instituto_Usuario';
+PRINT '══════════════════════════════════════════════════════════════';
+GO
+
+-- Usuarios activos por unidad y departamento (índice filtrado: solo
+-- contiene a los usuarios activos)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_Usuario_Activos_Unidad'
+                 AND object_id = OBJECT_ID('instituto_Usuario'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Usuario_Activos_Unidad
+        ON instituto_Usuario (IdUnidadDeNegocio, IdDepartamento)
+        WHERE UserStatus = 'Active';
+    PRINT '✅ IX_Usuario_Activos_Unidad creado';
+END
+GO
+
+-- Estadísticas al día para que el optimizador use los índices nuevos
+UPDATE STATISTICS instituto_ProgresoModulo;
+UPDATE STATISTICS instituto_ResultadoEvaluacion;
+UPDATE STATISTICS instituto_Usuario;
+GO
+
+PRINT '';
+PRINT '═════════════════════════════════════════════════════════════════════════';
+PRINT 'MIGRACIÓN DE ÍNDICES COMPLETADA';
+PRINT '═════════════════════════════════════════════════════════════════════════';
+GO
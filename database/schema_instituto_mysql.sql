@@ -40,6 +40,8 @@ DROP TABLE IF EXISTS instituto_AuditoriaCambios;
 DROP TABLE IF EXISTS instituto_AuditoriaAcceso;
 DROP TABLE IF EXISTS instituto_Plantilla;
 DROP TABLE IF EXISTS instituto_Configuracion;
+DROP TABLE IF EXISTS instituto_GeneracionDatos;
+DROP TABLE IF EXISTS instituto_ResumenProgreso;
 
 SET FOREIGN_KEY_CHECKS = 1;
 
@@ -399,6 +401,37 @@ CREATE TABLE instituto_Plantilla (
     CONSTRAINT UK_NombrePlantilla UNIQUE (NombrePlantilla)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Tabla: instituto_GeneracionDatos
+-- Contador de generación por tabla: el ETL lo incrementa al confirmar una
+-- importación y la app lo incluye en las claves de su caché
+CREATE TABLE instituto_GeneracionDatos (
+    Tabla VARCHAR(128) NOT NULL,
+    Generacion BIGINT NOT NULL DEFAULT 0,
+    FechaModificacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT PK_instituto_GeneracionDatos PRIMARY KEY (Tabla)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla: instituto_ResumenProgreso
+-- Hechos pre-agregados de progreso por unidad, departamento, módulo y mes
+-- (usuarios activos). Asignados se cuentan en el mes de asignación;
+-- Completados y puntajes en el mes de finalización. El ETL de SQL Server la
+-- refresca al final de cada importación; mientras esté vacía, los dashboards
+-- calculan los mismos hechos sobre las tablas base.
+-- IdUnidadDeNegocio / IdDepartamento = 0: usuario sin unidad / departamento
+CREATE TABLE instituto_ResumenProgreso (
+    IdUnidadDeNegocio INT NOT NULL,
+    IdDepartamento INT NOT NULL,
+    IdModulo INT NOT NULL,
+    Mes DATE NOT NULL, -- Primer día del mes
+    Asignados INT NOT NULL DEFAULT 0,
+    Completados INT NOT NULL DEFAULT 0,
+    EnProgreso INT NOT NULL DEFAULT 0,
+    SumaPuntaje DECIMAL(18,2), -- Mejor puntaje por inscripción completada
+    NumPuntajes INT NOT NULL DEFAULT 0,
+    FechaActualizacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_instituto_ResumenProgreso PRIMARY KEY (IdModulo, IdUnidadDeNegocio, IdDepartamento, Mes)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- ═════════════════════════════════════════════════════════════════════════
 -- SCRIPT COMPLETADO EXITOSAMENTE
 -- ═════════════════════════════════════════════════════════════════════════
@@ -52,6 +52,9 @@ IF OBJECT_ID('instituto_AuditoriaCambios', 'U') IS NOT NULL DROP TABLE instituto
 IF OBJECT_ID('instituto_AuditoriaAcceso', 'U') IS NOT NULL DROP TABLE instituto_AuditoriaAcceso;
 IF OBJECT_ID('instituto_Plantilla', 'U') IS NOT NULL DROP TABLE instituto_Plantilla;
 IF OBJECT_ID('instituto_Configuracion', 'U') IS NOT NULL DROP TABLE instituto_Configuracion;
+IF OBJECT_ID('instituto_HuellaImportacion', 'U') IS NOT NULL DROP TABLE instituto_HuellaImportacion;
+IF OBJECT_ID('instituto_GeneracionDatos', 'U') IS NOT NULL DROP TABLE instituto_GeneracionDatos;
+IF OBJECT_ID('instituto_ResumenProgreso', 'U') IS NOT NULL DROP TABLE instituto_ResumenProgreso;
 
 PRINT '✅ Tablas eliminadas';
 GO
@@ -470,6 +473,78 @@ CREATE TABLE instituto_Plantilla (
 PRINT '✅ Tabla instituto_Plantilla creada';
 GO
 
+-- Tabla: instituto_HuellaImportacion
+-- Huellas (hash) de las filas de la última importación exitosa de cada
+-- archivo; el ETL en modo delta solo carga las filas nuevas o modificadas
+CREATE TABLE instituto_HuellaImportacion (
+    Origen VARCHAR(255) NOT NULL,
+    Huella BIGINT NOT NULL,
+    FechaImportacion DATETIME DEFAULT GETDATE(),
+    CONSTRAINT PK_instituto_HuellaImportacion PRIMARY KEY (Origen, Huella)
+);
+PRINT '✅ Tabla instituto_HuellaImportacion creada';
+GO
+
+-- Tabla: instituto_GeneracionDatos
+-- Contador de generación por tabla: el ETL lo incrementa al confirmar una
+-- importación y la app lo incluye en las claves de su caché
+CREATE TABLE instituto_GeneracionDatos (
+    Tabla VARCHAR(128) NOT NULL,
+    Generacion BIGINT NOT NULL DEFAULT 0,
+    FechaModificacion DATETIME DEFAULT GETDATE(),
+    CONSTRAINT PK_instituto_GeneracionDatos PRIMARY KEY (Tabla)
+);
+PRINT '✅ Tabla instituto_GeneracionDatos creada';
+GO
+
+-- Tabla: instituto_ResumenProgreso
+-- Hechos pre-agregados de progreso por unidad, departamento, módulo y mes
+-- (usuarios activos). Asignados se cuentan en el mes de asignación;
+-- Completados y puntajes en el mes de finalización. El ETL la refresca al
+-- final de cada importación; los dashboards leen de aquí.
+-- IdUnidadDeNegocio / IdDepartamento = 0: usuario sin unidad / departamento
+CREATE TABLE instituto_ResumenProgreso (
+    IdUnidadDeNegocio INT NOT NULL,
+    IdDepartamento INT NOT NULL,
+    IdModulo INT NOT NULL,
+    Mes DATE NOT NULL, -- Primer día del mes
+    Asignados INT NOT NULL DEFAULT 0,
+    Completados INT NOT NULL DEFAULT 0,
+    EnProgreso INT NOT NULL DEFAULT 0,
+    SumaPuntaje DECIMAL(18,2), -- Mejor puntaje por inscripción completada
+    NumPuntajes INT NOT NULL DEFAULT 0,
+    FechaActualizacion DATETIME DEFAULT GETDATE(),
+    CONSTRAINT PK_instituto_ResumenProgreso PRIMARY KEY (IdModulo, IdUnidadDeNegocio, IdDepartamento, Mes)
+);
+PRINT '✅ Tabla instituto_ResumenProgreso creada';
+GO
+
+PRINT '';
+PRINT '══════════════════════════════════════════════════════════════';
+PRINT 'ÍNDICES DE CONSULTA';
+PRINT '══════════════════════════════════════════════════════════════';
+GO
+
+-- Mismos índices que database/migracion_indices_instituto_sqlserver.sql
+-- (para BDs ya creadas)
+CREATE UNIQUE NONCLUSTERED INDEX UX_ProgresoModulo_Usuario_Modulo
+    ON instituto_ProgresoModulo (IdUsuario, IdModulo)
+    INCLUDE (EstatusModulo, FechaAsignacion, FechaInicio, FechaFinalizacion);
+CREATE NONCLUSTERED INDEX IX_ProgresoModulo_Modulo
+    ON instituto_ProgresoModulo (IdModulo)
+    INCLUDE (IdUsuario, EstatusModulo, FechaAsignacion, FechaInicio, FechaFinalizacion);
+CREATE NONCLUSTERED INDEX IX_ProgresoModulo_Estatus
+    ON instituto_ProgresoModulo (EstatusModulo)
+    INCLUDE (FechaFinalizacion);
+CREATE NONCLUSTERED INDEX IX_ResultadoEvaluacion_Inscripcion
+    ON instituto_ResultadoEvaluacion (IdInscripcion, IdEvaluacion)
+    INCLUDE (PuntajeObtenido, Aprobado);
+CREATE NONCLUSTERED INDEX IX_Usuario_Activos_Unidad
+    ON instituto_Usuario (IdUnidadDeNegocio, IdDepartamento)
+    WHERE UserStatus = 'Active';
+PRINT '✅ Índices de consulta creados';
+GO
+
 PRINT '';
 PRINT '═════════════════════════════════════════════════════════════════════════';
 PRINT 'SCRIPT COMPLETADO EXITOSAMENTE';
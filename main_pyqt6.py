@@ -34,6 +34,14 @@ from smart_reports_pyqt6.ui.windows.pyqt6_login_window import LoginWindow
 def main():
     """Función principal de la aplicación PyQt6"""
 
+    # Procesos de renderizado compartidos por todas las gráficas D3
+    # (flags de Chromium: deben fijarse antes de crear QApplication)
+    try:
+        from smart_reports_pyqt6.ui.widgets.pyqt6_d3_renderer_pool import configurar_motor_web
+        configurar_motor_web()
+    except ImportError:
+        pass
+
     # Establecer atributo para OpenGL (requerido por QtWebEngine)
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
 
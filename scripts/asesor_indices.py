@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Asesor de Índices del Esquema instituto_
+Smart Reports - Instituto Hutchison Ports
+
+Recolecta las consultas de los dashboards (queries_hutchison y
+MetricasGerencialesService) y de las precargas del ETL, captura su plan
+estimado en SQL Server (SHOWPLAN_XML: no ejecuta las consultas) y propone
+índices de cobertura a partir de los "missing indexes" del optimizador.
+También mide las consultas de lectura para comparar antes/después de
+aplicar database/migracion_indices_instituto_sqlserver.sql.
+
+USO:
+    python scripts/asesor_indices.py planes [--sql propuestas.sql]
+    python scripts/asesor_indices.py benchmark <salida.json> [--repeticiones N]
+    python scripts/asesor_indices.py aplicar [migracion.sql]
+    python scripts/asesor_indices.py comparar <antes.json> <despues.json> [--salida reporte.md]
+
+FLUJO TÍPICO (contra una instancia local con datos reales):
+    python scripts/asesor_indices.py benchmark antes.json
+    python scripts/asesor_indices.py planes --sql propuestas.sql
+    python scripts/asesor_indices.py aplicar
+    python scripts/asesor_indices.py benchmark despues.json
+    python scripts/asesor_indices.py comparar antes.json despues.json --salida reporte_indices.md
+
+REQUIERE:
+    - SQL Server con base de datos InstitutoHutchison
+    - pyodbc instalado
+"""
+import sys
+import re
+import json
+import time
+import statistics
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from smart_reports_pyqt6.core.services.etl_instituto_completo import (
+    ETLInstitutoCompleto,
+    ETLConfig
+)
+from smart_reports_pyqt6.core.services.metricas_gerenciales_service import (
+    MetricasGerencialesService,
+    TABLA_RESUMEN
+)
+from smart_reports_pyqt6.database.models import queries_hutchison
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import CursoresPreparados
+
+import logging
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Las precargas del ETL se ejecutan contra un cursor que solo registra
+logging.getLogger('smart_reports_pyqt6.core.services.etl_instituto_completo').setLevel(logging.WARNING)
+
+
+# Namespace de los planes XML de SQL Server
+NS_SHOWPLAN = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'
+
+# Migración con los índices recomendados
+MIGRACION_INDICES = Path(__file__).parent.parent / 'database' / 'migracion_indices_instituto_sqlserver.sql'
+
+# UserIds reales usados para las precargas por bloques del ETL
+USUARIOS_MUESTRA = 1000
+
+# Sentencias que modifican datos (no entran al benchmark)
+RE_ESCRITURA = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE|EXEC|CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+# "Table 'x'. Scan count 1, logical reads 42, ..." de SET STATISTICS IO
+RE_LECTURAS_LOGICAS = re.compile(r'logical reads (\d+)', re.IGNORECASE)
+
+# Separador de lotes de los scripts .sql
+RE_GO = re.compile(r'^\s*GO\s*$', re.IGNORECASE | re.MULTILINE)
+
+# Operadores que recorren un índice o tabla completa
+OPERADORES_SCAN = ('Table Scan', 'Clustered Index Scan', 'Index Scan')
+
+
+# ============================================================================
+# RECOLECCIÓN DE CONSULTAS
+# ============================================================================
+
+@dataclass
+class Consulta:
+    """Consulta a analizar"""
+    origen: str  # "queries_hutchison" | "metricas" | "etl"
+    nombre: str
+    sql: str
+    params: Tuple = ()
+
+    @property
+    def clave(self) -> str:
+        return f"{self.origen}.{self.nombre}"
+
+    @property
+    def solo_lectura(self) -> bool:
+        return not RE_ESCRITURA.search(self.sql)
+
+
+class CursorRegistrador:
+    """Cursor DB-API que solo anota las consultas (resultados vacíos)"""
+
+    description = None
+    rowcount = 0
+
+    def __init__(self, destino: List[Tuple[str, tuple]]):
+        self.destino = destino
+
+    def execute(self, sql: str, *params):
+        # Acepta execute(sql, (a, b)) y execute(sql, a, b) como pyodbc
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        self.destino.append((sql, tuple(params)))
+        return self
+
+    def fetchall(self) -> list:
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class ConexionRegistradora:
+    """Conexión DB-API cuyos cursores solo anotan las consultas"""
+
+    def __init__(self):
+        self.consultas: List[Tuple[str, tuple]] = []
+
+    def cursor(self) -> CursorRegistrador:
+        return CursorRegistrador(self.consultas)
+
+
+def muestra_user_ids(cursor, cantidad: int = USUARIOS_MUESTRA) -> List[str]:
+    """UserIds existentes para que las precargas usen valores reales"""
+    cursor.execute("SELECT TOP (?) UserId FROM instituto_Usuario ORDER BY IdUsuario", cantidad)
+    return [row[0] for row in cursor.fetchall()] or ['SIN-USUARIOS']
+
+
+def recolectar_consultas(user_ids: List[str]) -> List[Consulta]:
+    """
+    Reúne las consultas de dashboards y precargas del ETL
+
+    Las de MetricasGerencialesService y del ETL se obtienen ejecutando los
+    métodos reales contra un cursor registrador, así la lista no se
+    desactualiza cuando cambian las consultas.
+
+    Args:
+        user_ids: UserIds para las precargas por bloques
+
+    Returns:
+        Consultas en dialecto SQL Server
+    """
+    consultas = []
+
+    # 1. Constantes QUERY_* de queries_hutchison
+    for nombre in sorted(dir(queries_hutchison)):
+        if nombre.startswith('QUERY_'):
+            consultas.append(Consulta('queries_hutchison', nombre, getattr(queries_hutchison, nombre)))
+
+    # 2. MetricasGerencialesService (ya traducidas a SQL Server; en SQL
+    #    Server el ETL llena instituto_ResumenProgreso)
+    conexion = ConexionRegistradora()
+    servicio = MetricasGerencialesService(conexion, usar_cache=False, dialecto='sqlserver')
+    servicio._origen_resumen = lambda: TABLA_RESUMEN
+    for nombre in sorted(dir(servicio)):
+        if not nombre.startswith('get_'):
+            continue
+        inicio = len(conexion.consultas)
+        getattr(servicio, nombre)()
+        for sql, params in conexion.consultas[inicio:]:
+            consultas.append(Consulta('metricas', nombre, sql, params))
+
+    # 3. Precargas del ETL (sentencias registradas → cursores preparados)
+    conexion_etl = ConexionRegistradora()
+    registro = conexion_etl.consultas
+    etl = ETLInstitutoCompleto(ETLConfig(), conectar=False)
+    etl.cursor = CursorRegistrador(registro)
+    etl.sentencias = CursoresPreparados(conexion_etl, dialecto='sqlserver')
+
+    precargas = [
+        ('_precargar_modulos', ()),
+        ('_precargar_unidades_negocio', ()),
+        ('_precargar_departamentos', ()),
+        ('_precargar_evaluaciones', ()),
+        ('_precargar_usuarios', (user_ids,)),
+        ('_precargar_progresos', (user_ids,)),
+        ('_precargar_intentos', (user_ids,)),
+    ]
+    for metodo, args in precargas:
+        inicio = len(registro)
+        getattr(etl, metodo)(*args)
+        # Las precargas por bloques repiten la misma sentencia: basta la primera
+        if len(registro) > inicio:
+            sql, params = registro[inicio]
+            consultas.append(Consulta('etl', metodo, sql, params))
+
+    return consultas
+
+
+# ============================================================================
+# PLANES DE EJECUCIÓN
+# ============================================================================
+
+@dataclass
+class AnalisisPlan:
+    """Resumen de un plan estimado"""
+    costo: float = 0.0
+    scans: List[Tuple[str, str]] = field(default_factory=list)  # (operador, tabla)
+    faltantes: List[Dict[str, Any]] = field(default_factory=list)  # missing indexes
+
+
+def sql_con_literales(sql: str, params: Tuple) -> str:
+    """Sustituye los marcadores ? por literales (para SHOWPLAN)"""
+    if not params:
+        return sql
+
+    valores = iter(params)
+
+    def literal(_):
+        valor = next(valores)
+        if valor is None:
+            return 'NULL'
+        if isinstance(valor, (int, float)):
+            return repr(valor)
+        return "N'" + str(valor).replace("'", "''") + "'"
+
+    return re.sub(r'\?', literal, sql)
+
+
+def capturar_plan(cursor, consulta: Consulta) -> List[str]:
+    """
+    Plan estimado (XML) de cada sentencia de la consulta
+
+    Con SHOWPLAN_XML activo SQL Server solo compila: ni las lecturas ni las
+    escrituras se ejecutan.
+    """
+    planes = []
+    cursor.execute("SET SHOWPLAN_XML ON")
+    try:
+        cursor.execute(sql_con_literales(consulta.sql, consulta.params))
+        while True:
+            fila = cursor.fetchone()
+            if fila:
+                planes.append(fila[0])
+            if not cursor.nextset():
+                break
+    finally:
+        cursor.execute("SET SHOWPLAN_XML OFF")
+
+    return planes
+
+
+def _nombre(valor: Optional[str]) -> str:
+    return (valor or '').strip('[]')
+
+
+def analizar_plan(planes_xml: List[str]) -> AnalisisPlan:
+    """Costo estimado, scans y missing indexes de los planes"""
+    analisis = AnalisisPlan()
+
+    for plan_xml in planes_xml:
+        raiz = ET.fromstring(plan_xml)
+
+        for sentencia in raiz.iter(f'{NS_SHOWPLAN}StmtSimple'):
+            analisis.costo += float(sentencia.get('StatementSubTreeCost') or 0)
+
+        for operador in raiz.iter(f'{NS_SHOWPLAN}RelOp'):
+            fisico = operador.get('PhysicalOp')
+            if fisico in OPERADORES_SCAN:
+                objeto = operador.find(f'./*/{NS_SHOWPLAN}Object')
+                if objeto is not None:
+                    analisis.scans.append((fisico, _nombre(objeto.get('Table'))))
+
+        for grupo in raiz.iter(f'{NS_SHOWPLAN}MissingIndexGroup'):
+            for indice in grupo.iter(f'{NS_SHOWPLAN}MissingIndex'):
+                columnas = {'EQUALITY': [], 'INEQUALITY': [], 'INCLUDE': []}
+                for grupo_columnas in indice.iter(f'{NS_SHOWPLAN}ColumnGroup'):
+                    columnas[grupo_columnas.get('Usage')] = [
+                        _nombre(c.get('Name')) for c in grupo_columnas.iter(f'{NS_SHOWPLAN}Column')
+                    ]
+                analisis.faltantes.append({
+                    'tabla': _nombre(indice.get('Table')),
+                    'igualdad': columnas['EQUALITY'],
+                    'desigualdad': columnas['INEQUALITY'],
+                    'incluidas': columnas['INCLUDE'],
+                    'impacto': float(grupo.get('Impact') or 0)
+                })
+
+    return analisis
+
+
+def proponer_indices(analisis: Dict[str, AnalisisPlan]) -> List[Dict[str, Any]]:
+    """
+    Consolida los missing indexes de todas las consultas
+
+    Sugerencias con las mismas columnas clave se unen (columnas incluidas
+    de ambas); una sugerencia cuyas claves son prefijo de otra de la misma
+    tabla queda cubierta por ella.
+
+    Returns:
+        Propuestas ordenadas por impacto: tabla, claves, incluidas,
+        impacto, consultas
+    """
+    propuestas: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+    for clave_consulta, plan in analisis.items():
+        for faltante in plan.faltantes:
+            claves = tuple(faltante['igualdad'] + faltante['desigualdad'])
+            propuesta = propuestas.setdefault((faltante['tabla'], claves), {
+                'tabla': faltante['tabla'],
+                'claves': list(claves),
+                'incluidas': set(),
+                'impacto': 0.0,
+                'consultas': []
+            })
+            propuesta['incluidas'].update(faltante['incluidas'])
+            propuesta['impacto'] = max(propuesta['impacto'], faltante['impacto'])
+            if clave_consulta not in propuesta['consultas']:
+                propuesta['consultas'].append(clave_consulta)
+
+    # Claves que son prefijo de otras más largas en la misma tabla
+    for (tabla, claves), propuesta in sorted(propuestas.items(), key=lambda p: len(p[0][1])):
+        for (otra_tabla, otras_claves), otra in propuestas.items():
+            if (otra_tabla == tabla and len(otras_claves) > len(claves)
+                    and otras_claves[:len(claves)] == claves and not propuesta.get('cubierta')):
+                otra['incluidas'].update(propuesta['incluidas'])
+                otra['impacto'] = max(otra['impacto'], propuesta['impacto'])
+                otra['consultas'].extend(c for c in propuesta['consultas'] if c not in otra['consultas'])
+                propuesta['cubierta'] = True
+                break
+
+    resultado = []
+    for propuesta in propuestas.values():
+        if propuesta.get('cubierta'):
+            continue
+        propuesta['incluidas'] = sorted(propuesta['incluidas'] - set(propuesta['claves']))
+        resultado.append(propuesta)
+
+    return sorted(resultado, key=lambda p: -p['impacto'])
+
+
+def sql_propuesta(propuesta: Dict[str, Any]) -> str:
+    """CREATE INDEX idempotente para una propuesta"""
+    tabla = propuesta['tabla']
+    nombre = f"IX_{tabla.replace('instituto_', '')}_{'_'.join(propuesta['claves'])}"[:128]
+    include = f"\n        INCLUDE ({', '.join(propuesta['incluidas'])})" if propuesta['incluidas'] else ""
+
+    return (
+        f"-- Impacto estimado: {propuesta['impacto']:.1f}% ({', '.join(propuesta['consultas'])})\n"
+        f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{nombre}' "
+        f"AND object_id = OBJECT_ID('{tabla}'))\n"
+        f"    CREATE NONCLUSTERED INDEX {nombre}\n"
+        f"        ON {tabla} ({', '.join(propuesta['claves'])}){include};\n"
+        f"GO\n"
+    )
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _lecturas_logicas(cursor) -> Optional[int]:
+    """Suma las lecturas lógicas de los mensajes de STATISTICS IO"""
+    mensajes = getattr(cursor, 'messages', None)
+    if mensajes is None:
+        return None
+    return sum(int(n) for _, texto in mensajes for n in RE_LECTURAS_LOGICAS.findall(str(texto)))
+
+
+def medir_consulta(cursor, consulta: Consulta, repeticiones: int) -> Dict[str, Any]:
+    """
+    Ejecuta la consulta (1 calentamiento + repeticiones) y mide
+
+    Returns:
+        mediana_ms, min_ms, filas y lecturas_logicas (de la última ejecución)
+    """
+    tiempos = []
+    filas = 0
+    lecturas = None
+
+    cursor.execute("SET STATISTICS IO ON")
+    try:
+        for i in range(repeticiones + 1):
+            inicio = time.perf_counter()
+            if consulta.params:
+                cursor.execute(consulta.sql, *consulta.params)
+            else:
+                cursor.execute(consulta.sql)
+
+            filas = 0
+            lecturas = _lecturas_logicas(cursor)
+            while True:
+                if cursor.description:
+                    filas += len(cursor.fetchall())
+                if not cursor.nextset():
+                    break
+                mas = _lecturas_logicas(cursor)
+                if mas is not None:
+                    lecturas = (lecturas or 0) + mas
+
+            if i > 0:
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+    finally:
+        cursor.execute("SET STATISTICS IO OFF")
+
+    return {
+        'mediana_ms': round(statistics.median(tiempos), 2),
+        'min_ms': round(min(tiempos), 2),
+        'filas': filas,
+        'lecturas_logicas': lecturas
+    }
+
+
+# ============================================================================
+# COMANDOS
+# ============================================================================
+
+def crear_config() -> ETLConfig:
+    """Configuración de conexión a SQL Server"""
+    return ETLConfig(
+        server="localhost",                   # ⚠️ CAMBIAR según tu servidor
+        database="InstitutoHutchison",
+        username=None,                        # None = Windows Authentication
+        password=None,
+        driver="ODBC Driver 17 for SQL Server"
+    )
+
+
+def conectar() -> ETLInstitutoCompleto:
+    """Conexión en autocommit (las mediciones no dejan transacciones abiertas)"""
+    etl = ETLInstitutoCompleto(crear_config())
+    etl.connection.autocommit = True
+    return etl
+
+
+def comando_planes(args: List[str]) -> int:
+    """planes [--sql propuestas.sql]"""
+    salida_sql = args[args.index('--sql') + 1] if '--sql' in args else None
+
+    with conectar() as etl:
+        consultas = recolectar_consultas(muestra_user_ids(etl.cursor))
+        logger.info(f"🔍 Consultas recolectadas: {len(consultas)}")
+
+        analisis: Dict[str, AnalisisPlan] = {}
+        for consulta in consultas:
+            try:
+                analisis[consulta.clave] = plan = analizar_plan(capturar_plan(etl.cursor, consulta))
+            except Exception as e:
+                logger.warning(f"⚠️  {consulta.clave}: sin plan ({e})")
+                continue
+
+            scans = ', '.join(f"{op} {tabla}" for op, tabla in plan.scans) or '-'
+            logger.info(f"  • {consulta.clave}: costo {plan.costo:.4f} | scans: {scans}")
+
+    propuestas = proponer_indices(analisis)
+
+    logger.info("\n" + "="*70)
+    logger.info(f"💡 ÍNDICES PROPUESTOS: {len(propuestas)}")
+    logger.info("="*70)
+
+    script = "\n".join(sql_propuesta(p) for p in propuestas)
+    if propuestas:
+        logger.info("\n" + script)
+    else:
+        logger.info("✅ El optimizador no reporta índices faltantes")
+
+    if salida_sql:
+        Path(salida_sql).write_text(script, encoding='utf-8')
+        logger.info(f"💾 Propuestas guardadas en {salida_sql}")
+
+    return 0
+
+
+def comando_benchmark(args: List[str]) -> int:
+    """benchmark <salida.json> [--repeticiones N]"""
+    if not args:
+        mostrar_uso()
+        return 1
+
+    salida = args[0]
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 5
+    config = crear_config()
+
+    resultados: Dict[str, Any] = {}
+    with conectar() as etl:
+        consultas = recolectar_consultas(muestra_user_ids(etl.cursor))
+
+        for consulta in consultas:
+            if not consulta.solo_lectura:
+                continue
+            try:
+                medicion = medir_consulta(etl.cursor, consulta, repeticiones)
+                medicion['costo_estimado'] = round(analizar_plan(capturar_plan(etl.cursor, consulta)).costo, 4)
+            except Exception as e:
+                logger.warning(f"⚠️  {consulta.clave}: {e}")
+                resultados[consulta.clave] = {'error': str(e)}
+                continue
+
+            resultados[consulta.clave] = medicion
+            logger.info(
+                f"  • {consulta.clave}: {medicion['mediana_ms']:.1f} ms "
+                f"({medicion['filas']:,} filas, lecturas: {medicion['lecturas_logicas']})"
+            )
+
+    Path(salida).write_text(json.dumps({
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'servidor': config.server,
+        'base_datos': config.database,
+        'repeticiones': repeticiones,
+        'consultas': resultados
+    }, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    logger.info(f"💾 Resultados guardados en {salida}")
+    return 0
+
+
+def comando_aplicar(args: List[str]) -> int:
+    """aplicar [migracion.sql]"""
+    ruta = Path(args[0]) if args else MIGRACION_INDICES
+    lotes = [lote.strip() for lote in RE_GO.split(ruta.read_text(encoding='utf-8')) if lote.strip()]
+
+    logger.info(f"🛠️  Aplicando {ruta.name} ({len(lotes)} lotes)...")
+
+    with conectar() as etl:
+        for lote in lotes:
+            etl.cursor.execute(lote)
+            while etl.cursor.nextset():
+                pass
+            for _, texto in getattr(etl.cursor, 'messages', None) or []:
+                logger.info(f"  {texto}")
+
+    logger.info("✅ Migración aplicada")
+    return 0
+
+
+def comando_comparar(args: List[str]) -> int:
+    """comparar <antes.json> <despues.json> [--salida reporte.md]"""
+    if len(args) < 2:
+        mostrar_uso()
+        return 1
+
+    antes = json.loads(Path(args[0]).read_text(encoding='utf-8'))
+    despues = json.loads(Path(args[1]).read_text(encoding='utf-8'))
+    salida = args[args.index('--salida') + 1] if '--salida' in args else None
+
+    def celda(valor, formato='{:,.1f}'):
+        return '-' if valor is None else formato.format(valor)
+
+    lineas = [
+        "# Reporte de índices: antes / después",
+        "",
+        f"- Antes: {antes['fecha']} ({antes['servidor']}/{antes['base_datos']})",
+        f"- Después: {despues['fecha']} ({despues['servidor']}/{despues['base_datos']})",
+        f"- Repeticiones por consulta: {despues['repeticiones']} (mediana)",
+        "",
+        "| Consulta | Antes (ms) | Después (ms) | Mejora | Lecturas antes | Lecturas después | Costo antes | Costo después |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+
+    total_antes = total_despues = 0.0
+    for clave in sorted(set(antes['consultas']) | set(despues['consultas'])):
+        a = antes['consultas'].get(clave, {})
+        d = despues['consultas'].get(clave, {})
+        if 'mediana_ms' not in a or 'mediana_ms' not in d:
+            error = (a.get('error') or d.get('error') or 'sin medición').replace('|', '/')
+            lineas.append(f"| {clave} | - | - | {error} | - | - | - | - |")
+            continue
+
+        total_antes += a['mediana_ms']
+        total_despues += d['mediana_ms']
+        mejora = a['mediana_ms'] / d['mediana_ms'] if d['mediana_ms'] else None
+        lineas.append(
+            f"| {clave} | {celda(a['mediana_ms'])} | {celda(d['mediana_ms'])} | {celda(mejora, '{:.1f}x')} "
+            f"| {celda(a.get('lecturas_logicas'), '{:,}')} | {celda(d.get('lecturas_logicas'), '{:,}')} "
+            f"| {celda(a.get('costo_estimado'), '{:.4f}')} | {celda(d.get('costo_estimado'), '{:.4f}')} |"
+        )
+
+    if total_despues:
+        lineas += ["", f"**Total:** {total_antes:,.1f} ms → {total_despues:,.1f} ms "
+                       f"({total_antes / total_despues:.1f}x)"]
+
+    reporte = "\n".join(lineas) + "\n"
+    if salida:
+        Path(salida).write_text(reporte, encoding='utf-8')
+        logger.info(f"💾 Reporte guardado en {salida}")
+    else:
+        print(reporte)
+
+    return 0
+
+
+def mostrar_uso():
+    """Muestra instrucciones de uso"""
+    print("="*70)
+    print("ASESOR DE ÍNDICES - SMART REPORTS")
+    print("="*70)
+    print("\nUSO:")
+    print("  python scripts/asesor_indices.py <comando> [opciones]")
+    print("\nCOMANDOS:")
+    print("  planes [--sql archivo]            Planes estimados e índices propuestos")
+    print("  benchmark <salida.json>           Mide las consultas de lectura")
+    print("            [--repeticiones N]      Ejecuciones por consulta (default: 5)")
+    print("  aplicar [migracion.sql]           Aplica la migración de índices")
+    print("  comparar <antes> <despues>        Reporte antes/después en Markdown")
+    print("           [--salida reporte.md]")
+    print("="*70)
+
+
+COMANDOS = {
+    'planes': comando_planes,
+    'benchmark': comando_benchmark,
+    'aplicar': comando_aplicar,
+    'comparar': comando_comparar,
+}
+
+
+def main():
+    """Función principal"""
+    if len(sys.argv) < 2 or sys.argv[1].lower() not in COMANDOS:
+        mostrar_uso()
+        return 1
+
+    try:
+        return COMANDOS[sys.argv[1].lower()](sys.argv[2:])
+    except Exception as e:
+        logger.error(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
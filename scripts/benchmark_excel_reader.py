@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Lectura de Excel (pd.read_excel vs streaming openpyxl)
+Smart Reports - Instituto Hutchison Ports
+
+Genera un Training Report sintético con filas de metadatos al inicio (como
+los exports de CSOD) y compara:
+
+  • legacy     → _leer_excel_con_deteccion_headers (pd.read_excel por cada
+                 intento de skiprows)
+  • streaming  → _leer_excel_en_bloques (openpyxl read_only, una pasada)
+
+Cada modo corre en un proceso aparte para medir su pico de memoria (RSS).
+No requiere conexión a SQL Server.
+
+USO:
+    python scripts/benchmark_excel_reader.py [filas] [archivo.xlsx]
+
+    # Ejemplo con 500k registros
+    python scripts/benchmark_excel_reader.py 500000
+"""
+import os
+import sys
+import time
+import random
+import resource
+import subprocess
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+HEADERS = [
+    'Identificación de usuario',
+    'Título de la capacitación',
+    'Tipo de capacitación',
+    'Estado del expediente',
+    'Fecha de registro de la transcripción',
+    'Fecha de inicio de la capacitación',
+    'Fecha de finalización de expediente',
+    'Puntuación de la transcripción',
+]
+
+
+def generar_workbook(ruta: str, filas: int):
+    """Escribe un Training Report sintético con openpyxl en modo write_only"""
+    from openpyxl import Workbook
+    from smart_reports_pyqt6.core.services.etl_instituto_completo import MODULOS_MAPPING
+
+    random.seed(42)
+    titulos = list(MODULOS_MAPPING.values())
+    estados = ['Terminado', 'En progreso', 'Registrado', 'No iniciado']
+    base = datetime(2024, 1, 1)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+
+    # Metadatos de CSOD antes de los headers reales
+    ws.append(['Enterprise Training Report'])
+    ws.append([f"Generado: {datetime.now():%Y-%m-%d %H:%M}"])
+    ws.append([])
+    ws.append(HEADERS)
+
+    for _ in range(filas):
+        es_prueba = random.random() < 0.2
+        fecha = base + timedelta(days=random.randint(0, 365))
+        ws.append([
+            f"U{random.randint(1, 20000):06d}",
+            random.choice(titulos),
+            'Prueba' if es_prueba else 'Curriculum',
+            random.choice(estados),
+            fecha,
+            fecha + timedelta(days=1),
+            fecha + timedelta(days=random.randint(2, 30)),
+            random.randint(40, 100) if es_prueba else None,
+        ])
+
+    wb.save(ruta)
+
+
+def medir(modo: str, ruta: str, tam_bloque: int):
+    """Lee el archivo con el modo indicado (se ejecuta en un subproceso)"""
+    import logging
+    from smart_reports_pyqt6.core.services.etl_instituto_completo import (
+        ETLInstitutoCompleto,
+        ETLConfig
+    )
+
+    logging.getLogger('smart_reports_pyqt6.core.services.etl_instituto_completo').setLevel(logging.ERROR)
+
+    class ETLSinConexion(ETLInstitutoCompleto):
+        def _conectar_bd(self):
+            pass
+
+    etl = ETLSinConexion(ETLConfig(excel_chunk_size=tam_bloque))
+
+    inicio = time.perf_counter()
+    filas = 0
+    bloques = 0
+
+    if modo == 'legacy':
+        df = etl._leer_excel_con_deteccion_headers(ruta)
+        filas, bloques = len(df), 1
+    else:
+        for df in etl._leer_excel_en_bloques(ruta):
+            filas += len(df)
+            bloques += 1
+
+    segundos = time.perf_counter() - inicio
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"{segundos:.3f} {pico_mb:.1f} {filas} {bloques}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--medir':
+        medir(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return 0
+
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    ruta = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        tempfile.gettempdir(), f"benchmark_training_report_{filas}.xlsx"
+    )
+    tam_bloque = 50000
+
+    print("=" * 70)
+    print(f"BENCHMARK LECTURA EXCEL - {filas:,} registros")
+    print("=" * 70)
+
+    if not os.path.exists(ruta):
+        print(f"  Generando workbook sintético: {ruta}")
+        inicio = time.perf_counter()
+        generar_workbook(ruta, filas)
+        print(f"  Generado en {time.perf_counter() - inicio:.1f} s "
+              f"({os.path.getsize(ruta) / 1024 / 1024:.1f} MB)")
+
+    resultados = {}
+    for modo in ['legacy', 'streaming']:
+        salida = subprocess.run(
+            [sys.executable, __file__, '--medir', modo, ruta, str(tam_bloque)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        segundos, pico_mb, leidas, bloques = float(salida[0]), float(salida[1]), int(salida[2]), int(salida[3])
+        resultados[modo] = (segundos, pico_mb, leidas)
+        print(f"  • {modo:<10} {segundos:8.2f} s   pico RSS {pico_mb:8.1f} MB   "
+              f"filas={leidas:,} bloques={bloques}")
+
+    seg_a, mem_a, filas_a = resultados['legacy']
+    seg_b, mem_b, filas_b = resultados['streaming']
+
+    print("-" * 70)
+    print(f"  Aceleración:       {seg_a / seg_b:.1f}x")
+    print(f"  Memoria pico:      {mem_b / mem_a:.0%} de legacy")
+    print(f"  Mismas filas:      {'SÍ ✅' if filas_a == filas_b else 'NO ❌'}")
+    print("=" * 70)
+
+    return 0 if filas_a == filas_b else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Memoria de Gráficos D3 (RSS con N tarjetas)
+Smart Reports - Instituto Hutchison Ports
+
+Abre N D3ChartWidget en una rejilla (como las tarjetas del dashboard),
+espera a que todas las páginas terminen de cargar y mide la memoria del
+proceso de la aplicación y de todos sus procesos QtWebEngine:
+
+  • separado    → flags por defecto de Chromium (un proceso de renderizado
+                  por vista)
+  • compartido  → configurar_motor_web() (--process-per-site y
+                  --renderer-process-limit, ver pyqt6_d3_renderer_pool)
+
+Cada tarjeta sigue teniendo su propio QWebEngineView: lo que se comparte son
+los procesos de renderizado, el perfil y la caché. Este script mide cuánto
+ahorra eso en la práctica.
+
+Cada modo corre en un proceso aparte. Se informa RSS (suma simple, cuenta
+varias veces las páginas compartidas) y PSS (reparte las páginas
+compartidas, más fiel al consumo real) cuando el sistema lo expone
+(/proc/<pid>/smaps_rollup en Linux, o psutil si está instalado).
+
+USO:
+    python scripts/benchmark_rss_graficos.py [tarjetas]
+
+    # Ejemplo con las seis tarjetas del dashboard
+    python scripts/benchmark_rss_graficos.py 6
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+# Tiempo máximo esperando las cargas y asentamiento antes de medir
+TIMEOUT_CARGA_S = 60
+ASENTAMIENTO_MS = 2000
+
+MODOS = ('separado', 'compartido')
+
+
+# ============================================================================
+# MEMORIA DEL ÁRBOL DE PROCESOS
+# ============================================================================
+
+def _hijos_proc(pid: int) -> List[int]:
+    """Descendientes de pid leyendo /proc (Linux)"""
+    padres: Dict[int, List[int]] = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat') as f:
+                # El nombre va entre paréntesis y puede tener espacios
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        padres.setdefault(ppid, []).append(int(entrada))
+
+    descendientes, pila = [], [pid]
+    while pila:
+        for hijo in padres.get(pila.pop(), []):
+            descendientes.append(hijo)
+            pila.append(hijo)
+    return descendientes
+
+
+def _memoria_proc(pid: int) -> Tuple[int, int]:
+    """(RSS, PSS) en bytes de un proceso leyendo /proc (Linux)"""
+    rss = pss = 0
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for linea in f:
+                if linea.startswith('Rss:'):
+                    rss = int(linea.split()[1]) * 1024
+                elif linea.startswith('Pss:'):
+                    pss = int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+    return rss, pss
+
+
+def memoria_arbol(pid: int) -> Tuple[int, int, int]:
+    """
+    Memoria del proceso y de todos sus descendientes
+
+    Returns:
+        (procesos, RSS total, PSS total) en bytes; PSS = 0 si no se puede medir
+    """
+    if PSUTIL_AVAILABLE:
+        raiz = psutil.Process(pid)
+        procesos = [raiz] + raiz.children(recursive=True)
+        rss = pss = 0
+        for proceso in procesos:
+            try:
+                info = proceso.memory_full_info()
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                continue
+            rss += info.rss
+            pss += getattr(info, 'pss', 0)
+        return len(procesos), rss, pss
+
+    if not os.path.isdir('/proc'):
+        raise RuntimeError("Sin psutil ni /proc: no se puede medir la memoria")
+
+    pids = [pid] + _hijos_proc(pid)
+    memorias = [_memoria_proc(p) for p in pids]
+    return len(pids), sum(m[0] for m in memorias), sum(m[1] for m in memorias)
+
+
+# ============================================================================
+# MEDICIÓN (SUBPROCESO)
+# ============================================================================
+
+def medir(modo: str, tarjetas: int):
+    """Abre las tarjetas con el modo indicado y mide (se ejecuta en un subproceso)"""
+    if modo == 'compartido':
+        from smart_reports_pyqt6.ui.widgets.pyqt6_d3_renderer_pool import configurar_motor_web
+        configurar_motor_web()
+    else:
+        from smart_reports_pyqt6.ui.widgets.pyqt6_web_assets import registrar_esquema_assets
+        os.environ.pop('QTWEBENGINE_CHROMIUM_FLAGS', None)
+        registrar_esquema_assets()
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication, QGridLayout, QWidget
+    from smart_reports_pyqt6.ui.widgets.pyqt6_d3_chart_widget import D3ChartWidget
+
+    app = QApplication(sys.argv[:1])
+
+    ventana = QWidget()
+    ventana.resize(1400, 900)
+    rejilla = QGridLayout(ventana)
+    tipos = ['bar', 'horizontal_bar', 'donut', 'line', 'area', 'scatter']
+
+    graficos = []
+    inicio = time.perf_counter()
+    for i in range(tarjetas):
+        grafico = D3ChartWidget(ventana)
+        rejilla.addWidget(grafico, i // 3, i % 3)
+        grafico.set_chart(
+            tipos[i % len(tipos)], f"Tarjeta {i + 1}",
+            {'labels': [f"U{j}" for j in range(12)], 'values': [(j * 7 + i) % 23 for j in range(12)]}
+        )
+        graficos.append(grafico)
+    ventana.show()
+
+    resultado = {}
+
+    def comprobar():
+        listas = sum(1 for g in graficos if g._pagina_lista)
+        vencido = time.perf_counter() - inicio > TIMEOUT_CARGA_S
+        if listas < len(graficos) and not vencido:
+            QTimer.singleShot(50, comprobar)
+            return
+        resultado['segundos'] = time.perf_counter() - inicio
+        resultado['listas'] = listas
+        # Deja terminar animaciones y recolección antes de medir
+        QTimer.singleShot(ASENTAMIENTO_MS, terminar)
+
+    def terminar():
+        procesos, rss, pss = memoria_arbol(os.getpid())
+        print(f"{resultado['segundos']:.3f} {resultado['listas']} {procesos} "
+              f"{rss / 1024 / 1024:.1f} {pss / 1024 / 1024:.1f}")
+        app.quit()
+
+    QTimer.singleShot(0, comprobar)
+    app.exec()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--medir':
+        medir(sys.argv[2], int(sys.argv[3]))
+        return 0
+
+    tarjetas = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+
+    print("=" * 70)
+    print(f"BENCHMARK MEMORIA GRÁFICOS D3 - {tarjetas} tarjetas")
+    print("=" * 70)
+
+    resultados = {}
+    for modo in MODOS:
+        salida = subprocess.run(
+            [sys.executable, __file__, '--medir', modo, str(tarjetas)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()[-5:]
+        segundos, listas, procesos = float(salida[0]), int(salida[1]), int(salida[2])
+        rss_mb, pss_mb = float(salida[3]), float(salida[4])
+        resultados[modo] = (rss_mb, pss_mb)
+        print(f"  • {modo:<11} {segundos:6.2f} s   {listas}/{tarjetas} cargadas   "
+              f"{procesos} procesos   RSS {rss_mb:8.1f} MB   PSS {pss_mb:8.1f} MB")
+
+    rss_a, pss_a = resultados['separado']
+    rss_b, pss_b = resultados['compartido']
+
+    print("-" * 70)
+    print(f"  RSS compartido:    {rss_b / rss_a:.0%} de separado")
+    if pss_a and pss_b:
+        print(f"  PSS compartido:    {pss_b / pss_a:.0%} de separado")
+    print("=" * 70)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Generación HTML de Gráficos (templates compilados)
+Smart Reports - Instituto Hutchison Ports
+
+Mide, por tipo de gráfico, el tiempo de generar el HTML completo con los
+generadores D3/NVD3:
+
+    - compilando:  se vacía la caché antes de cada llamada (equivale a
+                   construir el documento entero cada vez, como antes)
+    - caché:       cascarón ya compilado; solo se serializan los datos
+
+También compara la serialización de los datos con json y con orjson.
+No requiere conexión a BD ni ventana Qt.
+
+USO:
+    python scripts/benchmark_templates_graficos.py [puntos] [repeticiones]
+
+    # Ejemplo: series de 5,000 puntos, 200 repeticiones
+    python scripts/benchmark_templates_graficos.py 5000 200
+"""
+import io
+import sys
+import json
+import time
+import random
+import contextlib
+from pathlib import Path
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from smart_reports_pyqt6.utils.visualization.d3_generator import MotorTemplatesD3
+from smart_reports_pyqt6.utils.visualization.nvd3_generator import MotorTemplatesNVD3
+from smart_reports_pyqt6.utils.visualization.nvd3_generator_interactive import MotorTemplatesNVD3Interactive
+from smart_reports_pyqt6.utils.visualization.templates_compilados import (
+    ORJSON_AVAILABLE,
+    a_json,
+    get_cache_templates
+)
+
+GENERADORES = [
+    ('d3.barras', MotorTemplatesD3.generar_grafico_barras),
+    ('d3.donut', MotorTemplatesD3.generar_grafico_donut),
+    ('d3.lineas', MotorTemplatesD3.generar_grafico_lineas),
+    ('d3.area', MotorTemplatesD3.generar_grafico_area),
+    ('nvd3.barras', MotorTemplatesNVD3.generar_grafico_barras),
+    ('nvd3.donut', MotorTemplatesNVD3.generar_grafico_donut),
+    ('nvd3.lineas', MotorTemplatesNVD3.generar_grafico_lineas),
+    ('nvd3.area', MotorTemplatesNVD3.generar_grafico_area),
+    ('nvd3i.barras', MotorTemplatesNVD3Interactive.generar_grafico_barras_interactivo),
+    ('nvd3i.donut', MotorTemplatesNVD3Interactive.generar_grafico_donut_interactivo),
+    ('nvd3i.lineas', MotorTemplatesNVD3Interactive.generar_grafico_lineas_interactivo),
+]
+
+
+def generar_datos(puntos: int) -> dict:
+    """Serie sintética con etiquetas tipo unidad de negocio / fecha"""
+    random.seed(42)
+    return {
+        'labels': [f"Unidad {i:05d}" for i in range(puntos)],
+        'values': [random.randint(0, 5000) for _ in range(puntos)],
+    }
+
+
+def medir(generador, datos: dict, repeticiones: int, compilando: bool) -> float:
+    """Milisegundos promedio por gráfico"""
+    cache = get_cache_templates()
+    total = 0.0
+
+    # Los generadores NVD3 imprimen los datos recibidos (DEBUG)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generador("Benchmark", dict(datos), "Subtítulo", 'dark')
+        for _ in range(repeticiones):
+            if compilando:
+                cache.limpiar()
+            inicio = time.perf_counter()
+            generador("Benchmark", dict(datos), "Subtítulo", 'dark')
+            total += time.perf_counter() - inicio
+
+    return total / repeticiones * 1000
+
+
+def main():
+    puntos = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    print("=" * 70)
+    print(f"BENCHMARK TEMPLATES DE GRÁFICOS - {puntos:,} puntos x {repeticiones:,} repeticiones")
+    print("=" * 70)
+
+    datos = generar_datos(puntos)
+
+    print(f"  {'Tipo':<14} {'compilando':>12} {'caché':>10} {'aceleración':>12}")
+    print("-" * 70)
+    for nombre, generador in GENERADORES:
+        ms_compilando = medir(generador, datos, repeticiones, compilando=True)
+        ms_cache = medir(generador, datos, repeticiones, compilando=False)
+        print(f"  {nombre:<14} {ms_compilando:9.3f} ms {ms_cache:7.3f} ms {ms_compilando / ms_cache:10.1f}x")
+
+    # Serialización de los datos (lo único que queda por gráfico)
+    carga = [{"x": label, "y": value} for label, value in zip(datos['labels'], datos['values'])]
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        json.dumps(carga)
+    ms_json = (time.perf_counter() - inicio) / repeticiones * 1000
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        a_json(carga)
+    ms_rapido = (time.perf_counter() - inicio) / repeticiones * 1000
+
+    print("-" * 70)
+    print(f"  JSON de datos:     json {ms_json:.3f} ms  •  "
+          f"{'orjson' if ORJSON_AVAILABLE else 'json (orjson no instalado)'} {ms_rapido:.3f} ms")
+    print(f"  Caché:             {get_cache_templates().estadisticas()}")
+    print("=" * 70)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
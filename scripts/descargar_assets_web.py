@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Descarga de Assets Web para Gráficos Offline
+Smart Reports - Instituto Hutchison Ports
+
+Descarga D3 v7, D3 v3 + NVD3 1.8.6 y la fuente Montserrat a
+smart_reports_pyqt6/utils/visualization/vendor/ para que los gráficos no
+dependan de CDNs (redes de terminal lentas o sin salida a internet). Los
+archivos se versionan con el paquete; este script solo hace falta al
+actualizar una versión o en un checkout sin ellos.
+
+montserrat.css se escribe solo cuando están los cinco .woff2: una hoja
+local que apunta a fuentes inexistentes rompería Montserrat incluso con
+internet (los templates dejarían de usar Google Fonts).
+
+USO:
+    python scripts/descargar_assets_web.py            # solo los que faltan
+    python scripts/descargar_assets_web.py --forzar   # todos de nuevo
+    python scripts/descargar_assets_web.py --verificar
+
+REQUIERE:
+    - Acceso a internet (solo en la máquina que prepara el paquete)
+"""
+import sys
+import urllib.request
+from pathlib import Path
+
+# Agregar raíz del proyecto al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from smart_reports_pyqt6.utils.visualization.assets_web import (
+    ASSETS,
+    DIRECTORIO_VENDOR,
+    assets_faltantes
+)
+
+import logging
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+PESOS_MONTSERRAT = (300, 400, 600, 700, 800)
+
+# Origen de cada archivo (versiones fijas)
+_FONTSOURCE = 'https://cdn.jsdelivr.net/npm/@fontsource/montserrat@5.0.8/files'
+
+ORIGENES = {
+    'd3.v7.min.js': 'https://cdn.jsdelivr.net/npm/d3@7.9.0/dist/d3.min.js',
+    'd3.v3.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.17/d3.min.js',
+    'nv.d3.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.js',
+    'nv.d3.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.css',
+    **{
+        f'montserrat-{peso}.woff2': f'{_FONTSOURCE}/montserrat-latin-{peso}-normal.woff2'
+        for peso in PESOS_MONTSERRAT
+    },
+}
+
+TIMEOUT_SEGUNDOS = 30
+
+# Hoja local de Montserrat (apunta a los .woff2 de vendor/)
+CSS_MONTSERRAT = "/* Montserrat (SIL Open Font License 1.1) - pesos usados por los templates */\n" + "".join(
+    f"""@font-face {{
+    font-family: 'Montserrat';
+    font-style: normal;
+    font-weight: {peso};
+    font-display: swap;
+    src: url('montserrat-{peso}.woff2') format('woff2');
+}}
+"""
+    for peso in PESOS_MONTSERRAT
+)
+
+
+def descargar(nombre: str, url: str) -> int:
+    """Descarga un asset a vendor/ y devuelve su tamaño en bytes"""
+    destino = DIRECTORIO_VENDOR / ASSETS[nombre].archivo
+    peticion = urllib.request.Request(url, headers={'User-Agent': 'smart-reports-assets'})
+
+    with urllib.request.urlopen(peticion, timeout=TIMEOUT_SEGUNDOS) as respuesta:
+        contenido = respuesta.read()
+
+    if not contenido:
+        raise ValueError(f"Respuesta vacía: {url}")
+
+    # Escritura atómica: un archivo a medias no debe pasar por válido
+    temporal = destino.with_suffix(destino.suffix + '.tmp')
+    temporal.write_bytes(contenido)
+    temporal.replace(destino)
+    return len(contenido)
+
+
+def escribir_css_montserrat() -> bool:
+    """Escribe montserrat.css si están todas sus fuentes (y si no, lo elimina)"""
+    destino = DIRECTORIO_VENDOR / ASSETS['montserrat.css'].archivo
+    fuentes = ASSETS['montserrat.css'].requiere
+    if not all((DIRECTORIO_VENDOR / ASSETS[f].archivo).is_file() for f in fuentes):
+        destino.unlink(missing_ok=True)
+        return False
+    destino.write_text(CSS_MONTSERRAT, encoding='utf-8')
+    return True
+
+
+def mostrar_uso():
+    """Muestra instrucciones de uso"""
+    print("="*70)
+    print("DESCARGA DE ASSETS WEB - SMART REPORTS")
+    print("="*70)
+    print("\nUSO:")
+    print("  python scripts/descargar_assets_web.py [--forzar | --verificar]")
+    print("\nOPCIONES:")
+    print("  --forzar      Descarga todos los archivos aunque ya existan")
+    print("  --verificar   Solo lista los archivos que faltan")
+    print(f"\nDESTINO: {DIRECTORIO_VENDOR}")
+    print("="*70)
+
+
+def main():
+    """Función principal"""
+    argumentos = sys.argv[1:]
+    if any(a not in ('--forzar', '--verificar') for a in argumentos):
+        mostrar_uso()
+        return 1
+
+    faltantes = assets_faltantes()
+
+    if '--verificar' in argumentos:
+        if faltantes:
+            for nombre in faltantes:
+                logger.warning(f"⚠️  Falta: {nombre}")
+            return 1
+        logger.info("✅ Todos los assets web están empaquetados")
+        return 0
+
+    DIRECTORIO_VENDOR.mkdir(parents=True, exist_ok=True)
+    forzar = '--forzar' in argumentos
+    errores = 0
+
+    for nombre, url in ORIGENES.items():
+        if not forzar and (DIRECTORIO_VENDOR / ASSETS[nombre].archivo).is_file():
+            continue
+        try:
+            tamano = descargar(nombre, url)
+            logger.info(f"✅ {nombre}: {tamano / 1024:.1f} KB")
+        except Exception as e:
+            errores += 1
+            logger.error(f"❌ {nombre}: {e}")
+
+    if escribir_css_montserrat():
+        logger.info("✅ montserrat.css")
+
+    faltantes = assets_faltantes()
+    if faltantes:
+        logger.warning(f"⚠️  Siguen faltando: {', '.join(faltantes)} (se usará el CDN)")
+    return 1 if errores or faltantes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,13 @@ USO:
     # Org Planning (Usuarios)
     python scripts/importar_excel_csod.py usuarios data/org_planning.xlsx
 
+    # Lote: todos los Excel de un directorio o glob (cierre mensual)
+    python scripts/importar_excel_csod.py lote data/cierre_2024_10/ --procesos 4 --conexiones 3
+    python scripts/importar_excel_csod.py lote "data/regiones/*.xlsx"
+
+    # Delta: solo filas nuevas o modificadas desde la última importación
+    python scripts/importar_excel_csod.py training data/training_report.xlsx --delta
+
 REQUIERE:
     - SQL Server con base de datos InstitutoHutchison
     - Tablas instituto_* creadas
@@ -20,12 +27,17 @@ REQUIERE:
 """
 import sys
 import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
-# Agregar src al path
+# Agregar raíz del proyecto al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.main.python.domain.services.etl_instituto_completo import (
+from smart_reports_pyqt6.core.services.etl_instituto_completo import (
     ETLInstitutoCompleto,
     ETLConfig
 )
@@ -50,9 +62,18 @@ def mostrar_uso():
     print("\nTIPOS:")
     print("  training   - Enterprise Training Report (Progreso y Calificaciones)")
     print("  usuarios   - CSOD Org Planning (Datos de Usuarios)")
+    print("  lote       - Directorio o glob con varios archivos (tipo autodetectado)")
+    print("\nOPCIONES DE LOTE:")
+    print("  --procesos N     Archivos en paralelo; cada proceso lee, transforma y carga")
+    print("                   un archivo completo (default: CPUs)")
+    print("  --conexiones N   Conexiones simultáneas a SQL Server; acota también los")
+    print("                   procesos (default: 2)")
+    print("\nOPCIONES GENERALES:")
+    print("  --delta          Solo carga filas nuevas o modificadas (Training Report)")
     print("\nEJEMPLOS:")
     print("  python scripts/importar_excel_csod.py training data/training_report.xlsx")
     print("  python scripts/importar_excel_csod.py usuarios data/org_planning.xlsx")
+    print("  python scripts/importar_excel_csod.py lote data/cierre_2024_10/ --conexiones 3")
     print("="*70)
 
 
@@ -134,6 +155,278 @@ def importar_org_planning(archivo_excel: str, config: ETLConfig):
         return None
 
 
+# ============================================================================
+# ORQUESTADOR DE LOTES (varios archivos)
+# ============================================================================
+
+def listar_archivos(origen: str) -> List[str]:
+    """
+    Lista los Excel de un directorio o de un patrón glob
+
+    Args:
+        origen: Directorio o glob ("data/regiones/*.xlsx")
+
+    Returns:
+        Rutas ordenadas (se omiten los temporales ~$ de Excel)
+    """
+    if os.path.isdir(origen):
+        patron = os.path.join(origen, '*')
+    else:
+        patron = origen
+
+    return sorted(
+        ruta for ruta in glob.glob(patron)
+        if ruta.lower().endswith(('.xlsx', '.xls'))
+        and not os.path.basename(ruta).startswith('~$')
+    )
+
+
+def detectar_tipo(archivo_excel: str, config: ETLConfig) -> str:
+    """
+    Tipo de reporte de un archivo a partir de sus columnas
+
+    Solo se lee el primer bloque de filas (sin conexión a BD).
+
+    Args:
+        archivo_excel: Ruta al Excel
+        config: Configuración del ETL
+
+    Returns:
+        'training' o 'usuarios'
+    """
+    etl = ETLInstitutoCompleto(replace(config, excel_chunk_size=1), conectar=False)
+    bloques = etl._leer_excel_en_bloques(archivo_excel)
+    try:
+        primero = next(bloques, None)
+    finally:
+        bloques.close()
+
+    columnas = etl._detectar_columnas(primero) if primero is not None else {}
+    return 'training' if 'training_title' in columnas else 'usuarios'
+
+
+def cargar_archivo(archivo_excel: str, tipo: str, config: ETLConfig) -> Dict[str, Any]:
+    """
+    Lee, transforma y carga un archivo en streaming (un bloque a la vez)
+
+    Se ejecuta en un proceso del pool con su propia conexión; solo devuelve
+    estadísticas, nunca los datos del archivo.
+
+    Args:
+        archivo_excel: Ruta al Excel
+        tipo: 'training' o 'usuarios'
+        config: Configuración del ETL (con los pasos de cierre diferidos)
+
+    Returns:
+        Estadísticas del ETL, tablas y módulos modificados y tiempos
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        'archivo': archivo_excel,
+        'tipo': tipo,
+        'filas': 0,
+        'stats': None,
+        'tablas': [],
+        'modulos': set(),
+        'error': None,
+    }
+
+    try:
+        with ETLInstitutoCompleto(config) as etl:
+            if tipo == 'training':
+                stats = etl.importar_training_report(archivo_excel)
+            else:
+                stats = etl.importar_org_planning(archivo_excel)
+
+            resultado['tablas'] = etl.tablas_modificadas()
+            resultado['modulos'] = set(etl._modulos_modificados)
+
+        resultado['stats'] = stats
+        resultado['filas'] = stats['filas_leidas']
+
+    except Exception as e:
+        logger.error(f"❌ Error cargando {archivo_excel}: {e}")
+        resultado['error'] = str(e)
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def importar_lote(
+    archivos: List[str],
+    config: ETLConfig,
+    procesos: Optional[int] = None,
+    conexiones: int = 2
+) -> List[Dict[str, Any]]:
+    """
+    Importa varios archivos CSOD en paralelo respetando dependencias
+
+    - Cada archivo pasa por lectura → transformación → carga dentro de un
+      mismo proceso, bloque a bloque: la memoria queda acotada a un bloque
+      por archivo en vuelo, y en vuelo hay a lo sumo min(procesos,
+      conexiones) archivos
+    - Los Org Planning se cargan primero y uno tras otro (crean unidades y
+      departamentos, que no deben duplicarse); ningún Training Report se
+      carga antes de que terminen todos
+    - El refresco del resumen de progreso y el incremento de generaciones
+      se hacen una sola vez al final del lote, no por archivo
+
+    Args:
+        archivos: Rutas a los Excel
+        config: Configuración del ETL
+        procesos: Archivos en paralelo (None = número de CPUs)
+        conexiones: Máximo de conexiones simultáneas a SQL Server
+
+    Returns:
+        Lista de resultados por archivo (ver cargar_archivo)
+    """
+    resultados = []
+    config_archivo = replace(config, refrescar_resumen=False, incrementar_generaciones=False)
+
+    # 1. Clasificación (solo los headers de cada archivo)
+    usuarios, trainings = [], []
+    for archivo in archivos:
+        try:
+            tipo = detectar_tipo(archivo, config)
+        except Exception as e:
+            logger.error(f"❌ Error leyendo {archivo}: {e}")
+            resultados.append({'archivo': archivo, 'tipo': '?', 'filas': 0, 'segundos': 0,
+                               'stats': None, 'tablas': [], 'modulos': set(), 'error': str(e)})
+            continue
+        (trainings if tipo == 'training' else usuarios).append(archivo)
+
+    logger.info(f"📋 {len(usuarios)} Org Planning, {len(trainings)} Training Reports")
+
+    # 2. Org Planning, en serie
+    for archivo in usuarios:
+        resultados.append(cargar_archivo(archivo, 'usuarios', config_archivo))
+
+    # 3. Training Reports en paralelo (cada proceso, una conexión)
+    workers = max(1, min(procesos or os.cpu_count() or 1, conexiones))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        cargas = [pool.submit(cargar_archivo, archivo, 'training', config_archivo) for archivo in trainings]
+        for carga in as_completed(cargas):
+            resultado = carga.result()
+            logger.info(f"📦 Cargado {resultado['archivo']}: {resultado['filas']:,} filas "
+                        f"({resultado['segundos']:.1f} s)")
+            resultados.append(resultado)
+
+    # 4. Cierre del lote: resumen y generaciones, una sola vez
+    cargados = [r for r in resultados if r['error'] is None]
+    tablas: Set[str] = set().union(*(r['tablas'] for r in cargados))
+    if tablas:
+        # Los Org Planning aportan los módulos de usuarios reorganizados
+        modulos = set().union(*(r['modulos'] for r in cargados))
+
+        inicio = time.perf_counter()
+        try:
+            with ETLInstitutoCompleto(config) as etl:
+                etl.cerrar_lote(tablas, modulos)
+            error = None
+        except Exception as e:
+            error = str(e)
+
+        resultados.append({'archivo': '(cierre del lote)', 'tipo': 'cierre', 'filas': 0,
+                           'segundos': time.perf_counter() - inicio, 'stats': None,
+                           'tablas': sorted(tablas), 'modulos': set(), 'error': error})
+
+    return resultados
+
+
+def mostrar_resumen_lote(resultados: List[Dict[str, Any]], segundos_total: float):
+    """
+    Muestra el throughput consolidado por archivo a partir de los stats
+
+    Args:
+        resultados: Resultados de importar_lote
+        segundos_total: Tiempo de pared de todo el lote
+    """
+    logger.info("\n" + "="*100)
+    logger.info("📊 RESUMEN DEL LOTE")
+    logger.info("="*100)
+    logger.info(f"  {'Archivo':<40} {'Tipo':<9} {'Filas':>9} {'Tiempo':>9} "
+                f"{'Filas/s':>9} {'Ins/Upd':>15} {'Estado':>7}")
+    logger.info("-"*100)
+
+    filas_total = 0
+    for r in sorted(resultados, key=lambda r: (r['tipo'] != 'usuarios', r['archivo'])):
+        stats = r['stats'] or {}
+        insertados = stats.get('usuarios_nuevos', 0) + stats.get('progresos_insertados', 0)
+        actualizados = stats.get('usuarios_actualizados', 0) + stats.get('progresos_actualizados', 0)
+        segundos = r['segundos']
+        filas_s = r['filas'] / segundos if segundos else 0
+        estado = 'OK ✅' if r['error'] is None else 'ERROR ❌'
+        filas_total += r['filas']
+
+        logger.info(f"  {os.path.basename(r['archivo'])[:40]:<40} {r['tipo']:<9} {r['filas']:>9,} "
+                    f"{segundos:>8.1f}s {filas_s:>9,.0f} "
+                    f"{f'{insertados:,}/{actualizados:,}':>15} {estado:>7}")
+
+        if r['error']:
+            logger.info(f"      ↳ {r['error']}")
+
+    errores = sum(1 for r in resultados if r['error'])
+    logger.info("-"*100)
+    logger.info(f"  • Archivos:          {len(resultados):,} ({errores:,} con error)")
+    logger.info(f"  • Filas totales:     {filas_total:,}")
+    logger.info(f"  • Tiempo de pared:   {segundos_total:.1f} s")
+    if segundos_total:
+        logger.info(f"  • Throughput global: {filas_total / segundos_total:,.0f} filas/s")
+    logger.info("="*100)
+
+
+def crear_config() -> ETLConfig:
+    """Configuración de conexión a SQL Server"""
+    return ETLConfig(
+        server="localhost",                   # ⚠️ CAMBIAR según tu servidor
+        database="InstitutoHutchison",
+        username=None,                        # None = Windows Authentication
+        password=None,                        # O especificar credenciales SQL Server
+        driver="ODBC Driver 17 for SQL Server",
+        batch_size=1000,
+        enable_validation=True,
+        auto_create_modules=True,
+        delta_mode='--delta' in sys.argv      # Solo filas nuevas o modificadas
+    )
+
+
+def main_lote(args: List[str]) -> int:
+    """
+    Modo lote: <directorio|glob> [--procesos N] [--conexiones N]
+
+    Args:
+        args: Argumentos después de 'lote'
+
+    Returns:
+        Código de salida
+    """
+    origen = args[0]
+    procesos = None
+    conexiones = 2
+
+    try:
+        if '--procesos' in args:
+            procesos = int(args[args.index('--procesos') + 1])
+        if '--conexiones' in args:
+            conexiones = int(args[args.index('--conexiones') + 1])
+    except (IndexError, ValueError):
+        mostrar_uso()
+        return 1
+
+    archivos = listar_archivos(origen)
+    if not archivos:
+        logger.error(f"❌ No se encontraron archivos Excel en: {origen}")
+        return 1
+
+    logger.info(f"📂 {len(archivos)} archivos encontrados en {origen}")
+
+    inicio = time.perf_counter()
+    resultados = importar_lote(archivos, crear_config(), procesos, conexiones)
+    mostrar_resumen_lote(resultados, time.perf_counter() - inicio)
+
+    return 0 if all(r['error'] is None for r in resultados) else 1
+
+
 def main():
     """Función principal"""
     # Verificar argumentos
@@ -144,10 +437,13 @@ def main():
     tipo = sys.argv[1].lower()
     archivo_excel = sys.argv[2]
 
+    if tipo == 'lote':
+        return main_lote(sys.argv[2:])
+
     # Validar tipo
     if tipo not in ['training', 'usuarios']:
         logger.error(f"❌ Tipo inválido: {tipo}")
-        logger.error("   Tipos válidos: training, usuarios")
+        logger.error("   Tipos válidos: training, usuarios, lote")
         mostrar_uso()
         return 1
 
@@ -158,16 +454,7 @@ def main():
     # Configurar conexión a SQL Server
     logger.info("\n🔌 Configurando conexión a SQL Server...")
 
-    config = ETLConfig(
-        server="localhost",                   # ⚠️ CAMBIAR según tu servidor
-        database="InstitutoHutchison",
-        username=None,                        # None = Windows Authentication
-        password=None,                        # O especificar credenciales SQL Server
-        driver="ODBC Driver 17 for SQL Server",
-        batch_size=1000,
-        enable_validation=True,
-        auto_create_modules=True
-    )
+    config = crear_config()
 
     try:
         logger.info("✅ Configuración lista")
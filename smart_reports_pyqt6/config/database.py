@@ -57,6 +57,18 @@ MYSQL_CONFIG = {
 }
 
 
+# ============================================================================
+# POOL DE CONEXIONES (ambos motores)
+# ============================================================================
+POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN', '1')),              # Conexiones que se mantienen abiertas
+    'max_size': int(os.getenv('DB_POOL_MAX', '5')),              # Máximo de conexiones simultáneas
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),        # Segundos de espera por una conexión libre
+    'max_lifetime': float(os.getenv('DB_POOL_LIFETIME', '1800')),  # Segundos antes de reciclar una conexión
+    'pre_ping': os.getenv('DB_POOL_PRE_PING', 'yes').lower() == 'yes'  # Verificar conexión antes de entregarla
+}
+
+
 # ============================================================================
 # VALIDACIÓN
 # ============================================================================
@@ -50,3 +50,16 @@ D3_CONFIG = {
     "cache_enabled": True,
     "temp_dir": "smartreports_d3_charts"
 }
+
+# Configuración del caché de resultados en memoria (utils/cache_manager.py)
+CACHE_CONFIG = {
+    "max_entries": 1000,               # Máximo de entradas (LRU)
+    "max_bytes": 64 * 1024 * 1024,     # Presupuesto aproximado de memoria
+    "sweep_interval_seconds": 60,      # Barrido de entradas expiradas (0 = sin barrido)
+    "disk_enabled": True,              # Segundo nivel en disco (sobrevive entre sesiones)
+    "disk_path": DATA_DIR / "cache_resultados.sqlite",
+    "disk_max_stale_seconds": 7 * 24 * 3600,  # Antigüedad máxima de una foto expirada
+    "schema_version": "1",             # Subir al cambiar el esquema de la BD o de los resultados
+    "generation_poll_seconds": 15,     # Sondeo de instituto_GeneracionDatos
+    "versioned_ttl_seconds": 6 * 3600  # TTL de resultados cuya clave incluye generaciones
+}
@@ -2,26 +2,63 @@
 Database Query Controller
 Controlador para consultas a la base de datos (stub temporal)
 """
+from contextlib import contextmanager
+
+from smart_reports_pyqt6.database.repositories.persistence.mysql.connection import (
+    ConnectionPool,
+    DatabaseConnection
+)
 
 
 class DatabaseQueryController:
     """Controlador temporal para consultas de base de datos"""
 
-    def __init__(self, connection=None, cursor=None):
+    def __init__(self, connection=None, cursor=None, pool=None):
+        """
+        Args:
+            connection: Conexión DB-API compartida, o directamente un
+                        ConnectionPool / DatabaseConnection
+            cursor: Cursor de la conexión compartida
+            pool: ConnectionPool; si se indica, cada consulta toma su propia
+                  conexión y cursor del pool
+        """
+        if isinstance(connection, DatabaseConnection):
+            pool, connection = connection.pool, None
+        elif isinstance(connection, ConnectionPool):
+            pool, connection = connection, None
+
+        self.pool = pool
         self.connection = connection
         self.cursor = cursor
 
+    @contextmanager
+    def _cursor(self):
+        """Cursor para una consulta: propio del pool o el compartido"""
+        if self.pool is None:
+            yield self.cursor
+            return
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                # La conexión vuelve al pool: confirmar aquí lo que se escribió
+                conn.commit()
+            finally:
+                cursor.close()
+
     def execute_query(self, query, params=None):
         """Ejecuta una consulta SQL"""
-        if not self.cursor:
+        if not self.pool and not self.cursor:
             return []
 
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            return self.cursor.fetchall()
+            with self._cursor() as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                return cursor.fetchall() if cursor.description else []
         except Exception as e:
             print(f"Error ejecutando query: {e}")
             return []
@@ -32,12 +69,12 @@ class DatabaseQueryController:
         return results[0] if results else None
 
     def commit(self):
-        """Hace commit de la transacción"""
+        """Hace commit de la transacción (con pool cada consulta ya se confirma)"""
         if self.connection:
             self.connection.commit()
 
     def rollback(self):
-        """Hace rollback de la transacción"""
+        """Hace rollback de la transacción (con pool no hay transacción abierta)"""
         if self.connection:
             self.connection.rollback()
 
@@ -48,15 +85,16 @@ class DatabaseQueryController:
         Returns:
             tuple: (success: bool, message: str)
         """
-        if not self.connection or not self.cursor:
+        if not self.pool and (not self.connection or not self.cursor):
             return (False, "No hay conexión a la base de datos")
 
         try:
             # Verificar tablas principales
             required_tables = ['empleados', 'modulos', 'progreso_modulos']
 
-            self.cursor.execute("SHOW TABLES")
-            existing_tables = [table[0].lower() for table in self.cursor.fetchall()]
+            with self._cursor() as cursor:
+                cursor.execute("SHOW TABLES")
+                existing_tables = [table[0].lower() for table in cursor.fetchall()]
 
             missing_tables = [table for table in required_tables if table.lower() not in existing_tables]
 
@@ -0,0 +1,152 @@
+"""
+Consultas Agrupadas: varias métricas con una sola lectura
+
+OPTIMIZACIÓN: Un recorrido de la tabla por lote de métricas
+
+Varias métricas del dashboard leen la misma tabla (con los mismos JOIN) y
+solo difieren en el GROUP BY. Un LoteAgrupado las combina en una consulta:
+
+- SQL Server: GROUP BY GROUPING SETS ((...), (...), ...) → un solo recorrido
+  de la tabla; la columna "conjunto" (calculada con GROUPING()) indica a qué
+  agrupación pertenece cada fila.
+- MySQL (sin GROUPING SETS): UNION ALL de un GROUP BY por conjunto, con las
+  mismas columnas → un solo viaje a la BD.
+
+repartir() separa las filas por conjunto para que cada métrica construya
+su diccionario como si hubiera hecho su propia consulta.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+DIALECTO_SQLSERVER = 'sqlserver'
+
+
+@dataclass(frozen=True)
+class ConjuntoAgrupacion:
+    """Una agrupación del lote: nombre y alias de sus columnas clave"""
+    nombre: str
+    claves: Tuple[str, ...]
+
+
+@dataclass
+class LoteAgrupado:
+    """
+    Métricas compatibles que comparten origen y filtro
+
+    Attributes:
+        origen: Tabla y JOINs (texto que va después de FROM)
+        columnas: Alias → expresión SQL de cada columna clave. La expresión
+                  puede ser un diccionario dialecto → expresión cuando la
+                  función no existe en ambos motores (clave 'default' para el
+                  resto)
+        medidas: Alias → expresión agregada (SUM, COUNT, ...), comunes a
+                 todos los conjuntos
+        conjuntos: Agrupaciones; no pueden compartir columnas clave
+        where: Filtro común (sin la palabra WHERE)
+    """
+    origen: str
+    columnas: Dict[str, Union[str, Dict[str, str]]]
+    medidas: Dict[str, str]
+    conjuntos: Sequence[ConjuntoAgrupacion]
+    where: str = ''
+    _sql: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        vistas = set()
+        for conjunto in self.conjuntos:
+            for clave in conjunto.claves:
+                if clave not in self.columnas:
+                    raise ValueError(f"Columna desconocida en {conjunto.nombre}: {clave}")
+                if clave in vistas:
+                    raise ValueError(f"Columna compartida entre conjuntos: {clave}")
+                vistas.add(clave)
+
+    def sql(self, dialecto: str) -> str:
+        """
+        Consulta del lote en el dialecto indicado (se genera una sola vez)
+
+        Columnas: conjunto, todas las claves (NULL si no son del conjunto de
+        la fila) y las medidas.
+        """
+        if dialecto not in self._sql:
+            if dialecto == DIALECTO_SQLSERVER:
+                self._sql[dialecto] = self._sql_grouping_sets()
+            else:
+                self._sql[dialecto] = self._sql_union_all(dialecto)
+        return self._sql[dialecto]
+
+    def repartir(self, filas: List[tuple]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Separa las filas del lote por conjunto
+
+        Returns:
+            Nombre de conjunto → filas como diccionarios con sus claves y
+            las medidas (todos los conjuntos presentes, aunque estén vacíos)
+        """
+        alias = list(self.columnas)
+        medidas = list(self.medidas)
+        inicio_medidas = 1 + len(alias)
+        claves_por_conjunto = {
+            c.nombre: [(clave, 1 + alias.index(clave)) for clave in c.claves]
+            for c in self.conjuntos
+        }
+
+        grupos: Dict[str, List[Dict[str, Any]]] = {c.nombre: [] for c in self.conjuntos}
+        for fila in filas:
+            claves = claves_por_conjunto.get(fila[0])
+            if claves is None:
+                continue
+            registro = {clave: fila[i] for clave, i in claves}
+            for i, medida in enumerate(medidas):
+                registro[medida] = fila[inicio_medidas + i]
+            grupos[fila[0]].append(registro)
+        return grupos
+
+    # ==================== GENERACIÓN SQL ====================
+
+    def _expresion(self, alias: str, dialecto: str) -> str:
+        expr = self.columnas[alias]
+        if isinstance(expr, dict):
+            return expr.get(dialecto, expr['default'])
+        return expr
+
+    def _sql_grouping_sets(self) -> str:
+        d = DIALECTO_SQLSERVER
+        casos = "\n".join(
+            f"        WHEN GROUPING({self._expresion(c.claves[0], d)}) = 0 THEN '{c.nombre}'"
+            for c in self.conjuntos
+        )
+        columnas = ",\n".join(
+            f"    {self._expresion(a, d)} AS {a}" for a in self.columnas
+        )
+        medidas = ",\n".join(f"    {expr} AS {a}" for a, expr in self.medidas.items())
+        conjuntos = ",\n".join(
+            "    (" + ", ".join(self._expresion(clave, d) for clave in c.claves) + ")"
+            for c in self.conjuntos
+        )
+        where = f"\nWHERE {self.where}" if self.where else ''
+
+        return (
+            f"SELECT\n    CASE\n{casos}\n    END AS conjunto,\n"
+            f"{columnas},\n{medidas}\n"
+            f"FROM {self.origen}{where}\n"
+            f"GROUP BY GROUPING SETS (\n{conjuntos}\n)"
+        )
+
+    def _sql_union_all(self, dialecto: str) -> str:
+        medidas = ",\n".join(f"    {expr} AS {a}" for a, expr in self.medidas.items())
+        where = f"\nWHERE {self.where}" if self.where else ''
+
+        partes = []
+        for c in self.conjuntos:
+            columnas = ",\n".join(
+                f"    {self._expresion(a, dialecto) if a in c.claves else 'NULL'} AS {a}"
+                for a in self.columnas
+            )
+            agrupacion = ", ".join(self._expresion(clave, dialecto) for clave in c.claves)
+            partes.append(
+                f"SELECT\n    '{c.nombre}' AS conjunto,\n{columnas},\n{medidas}\n"
+                f"FROM {self.origen}{where}\n"
+                f"GROUP BY {agrupacion}"
+            )
+        return "\nUNION ALL\n".join(partes)
@@ -0,0 +1,269 @@
+"""
+Carga Concurrente de Métricas Gerenciales
+
+OPTIMIZACIÓN: El dashboard tarda lo que su consulta más lenta
+
+Las métricas de MetricasGerencialesService son consultas independientes.
+Ejecutadas una tras otra, el dashboard ejecutivo tarda la suma de todas y,
+llamadas desde la UI, congelan el hilo principal de Qt mientras tanto.
+
+MetricasAsync las lanza todas a la vez en un ThreadPoolExecutor: cada tarea
+hace checkout de su propia conexión del ConnectionPool (ver
+MetricasGerencialesService._consultar), así que el tiempo total es
+aproximadamente el de la métrica más lenta. Las métricas de un mismo lote
+(LOTES_METRICAS) se calculan en una sola tarea con una consulta combinada.
+Devuelve un Future por métrica.
+
+PuenteMetricasQt entrega los resultados a la UI con señales a medida que
+cada Future termina. Las señales se emiten desde los hilos de trabajo y Qt
+las encola hacia el hilo del receptor, por lo que los slots pueden tocar
+widgets directamente:
+
+    puente = PuenteMetricasQt(MetricasGerencialesService(pool))
+    puente.metrica_lista.connect(self._on_metrica)   # (nombre, datos)
+    puente.todas_listas.connect(self._on_todas)      # {nombre: datos}
+    puente.cargar_todas()
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional
+import logging
+import threading
+import time
+
+from smart_reports_pyqt6.core.services.metricas_gerenciales_service import (
+    LOTES_METRICAS,
+    METRICAS_DASHBOARD,
+    MetricasGerencialesService
+)
+
+try:
+    from PyQt6.QtCore import QObject, pyqtSignal
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class MetricasAsync:
+    """
+    Fachada concurrente sobre MetricasGerencialesService
+
+    Número de hilos por defecto:
+    - Con pool: max_size del pool (más hilos solo esperarían conexión)
+    - Con una conexión DB-API suelta: 1 (no se comparte entre hilos)
+    - Sin BD (datos de ejemplo): una por métrica
+    """
+
+    def __init__(self, servicio: MetricasGerencialesService, max_workers: Optional[int] = None):
+        """
+        Args:
+            servicio: Servicio de métricas (con pool para cargar en paralelo)
+            max_workers: Hilos de consulta (None = según el servicio)
+        """
+        self.servicio = servicio
+
+        if max_workers is None:
+            if servicio.pool is not None:
+                max_workers = servicio.pool.max_size
+            elif servicio.conn is not None:
+                max_workers = 1
+            else:
+                max_workers = len(METRICAS_DASHBOARD)
+        self.max_workers = max(1, max_workers)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='metricas'
+        )
+
+    def cargar(self, nombre: str, **kwargs) -> Future:
+        """
+        Lanza una métrica en segundo plano
+
+        Args:
+            nombre: Clave de METRICAS_DASHBOARD o nombre de un método get_*
+            **kwargs: Argumentos del método (p. ej. meses=12)
+
+        Returns:
+            Future con el diccionario de la métrica
+        """
+        metodo = getattr(self.servicio, METRICAS_DASHBOARD.get(nombre, nombre), None)
+        if metodo is None:
+            raise ValueError(f"Métrica desconocida: {nombre}")
+
+        return self._executor.submit(self._medir, nombre, metodo, kwargs)
+
+    def cargar_todas(self, nombres: Optional[Iterable[str]] = None) -> Dict[str, Future]:
+        """
+        Lanza todas las métricas a la vez
+
+        Las métricas de un mismo lote comparten una tarea (una consulta);
+        el resto lleva una tarea cada una.
+
+        Args:
+            nombres: Métricas a cargar (None = todas las de METRICAS_DASHBOARD)
+
+        Returns:
+            Diccionario nombre → Future, en el orden pedido
+        """
+        nombres = list(nombres) if nombres is not None else list(METRICAS_DASHBOARD)
+
+        futuros: Dict[str, Future] = {}
+        for lote, metricas in LOTES_METRICAS.items():
+            incluidas = [n for n in nombres if n in metricas]
+            # Una sola métrica del lote no compensa la consulta combinada
+            if len(incluidas) < 2:
+                continue
+
+            por_metrica = {n: Future() for n in incluidas}
+            futuros.update(por_metrica)
+            futuro_lote = self._executor.submit(
+                self._medir, lote, self.servicio.cargar_lote, {'lote': lote}
+            )
+            futuro_lote.add_done_callback(
+                lambda f, por_metrica=por_metrica: self._repartir(f, por_metrica)
+            )
+
+        for nombre in nombres:
+            if nombre not in futuros:
+                futuros[nombre] = self.cargar(nombre)
+
+        return {nombre: futuros[nombre] for nombre in nombres}
+
+    def obtener_todas(self, nombres: Optional[Iterable[str]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Carga todas las métricas en paralelo y espera los resultados
+
+        Para uso fuera de la UI (scripts, exportaciones). Una métrica que
+        falla o no termina a tiempo queda como None.
+
+        Returns:
+            Diccionario nombre → datos de la métrica
+        """
+        futuros = self.cargar_todas(nombres)
+        wait(futuros.values(), timeout=timeout)
+
+        resultados = {}
+        for nombre, futuro in futuros.items():
+            if futuro.done() and futuro.exception() is None:
+                resultados[nombre] = futuro.result()
+            else:
+                logger.warning(f"⚠️  Métrica no disponible: {nombre}")
+                resultados[nombre] = None
+        return resultados
+
+    def cerrar(self, esperar: bool = False):
+        """Detiene los hilos (las métricas pendientes se cancelan)"""
+        self._executor.shutdown(wait=esperar, cancel_futures=True)
+
+    @staticmethod
+    def _repartir(futuro_lote: Future, por_metrica: Dict[str, Future]):
+        """Resuelve los Future de cada métrica con el resultado del lote"""
+        if futuro_lote.cancelled():
+            for futuro in por_metrica.values():
+                futuro.cancel()
+            return
+
+        error = futuro_lote.exception()
+        resultados = futuro_lote.result() if error is None else {}
+        for nombre, futuro in por_metrica.items():
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultados.get(nombre))
+
+    @staticmethod
+    def _medir(nombre: str, metodo, kwargs: Dict[str, Any]) -> Any:
+        """Ejecuta la métrica y registra su duración"""
+        inicio = time.perf_counter()
+        try:
+            return metodo(**kwargs)
+        finally:
+            logger.debug(f"Métrica {nombre}: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+# ==================== PUENTE QT ====================
+
+if QT_AVAILABLE:
+
+    class PuenteMetricasQt(QObject):
+        """
+        Entrega a Qt, mediante señales, las métricas que carga MetricasAsync
+
+        Cada cargar_todas() abre un lote nuevo; los resultados de lotes
+        anteriores que lleguen tarde (p. ej. tras pulsar "Actualizar" dos
+        veces) se descartan sin emitir.
+        """
+
+        # (nombre, datos) al terminar cada métrica
+        metrica_lista = pyqtSignal(str, object)
+        # (nombre, mensaje) si una métrica lanza una excepción
+        metrica_error = pyqtSignal(str, str)
+        # {nombre: datos} cuando termina el lote (las fallidas quedan en None)
+        todas_listas = pyqtSignal(object)
+
+        def __init__(self, servicio: MetricasGerencialesService,
+                     max_workers: Optional[int] = None, parent=None):
+            super().__init__(parent)
+            self.metricas = MetricasAsync(servicio, max_workers)
+
+            self._lock = threading.Lock()
+            self._lote = 0
+            self._pendientes = 0
+            self._resultados: Dict[str, Any] = {}
+
+        def cargar_todas(self, nombres: Optional[Iterable[str]] = None) -> Dict[str, Future]:
+            """
+            Lanza todas las métricas; no bloquea el hilo de la UI
+
+            Returns:
+                Diccionario nombre → Future (las señales se emiten igualmente)
+            """
+            nombres = list(nombres) if nombres is not None else list(METRICAS_DASHBOARD)
+
+            with self._lock:
+                self._lote += 1
+                lote = self._lote
+                self._pendientes = len(nombres)
+                self._resultados = {}
+
+            futuros = self.metricas.cargar_todas(nombres)
+            for nombre, futuro in futuros.items():
+                futuro.add_done_callback(
+                    lambda f, nombre=nombre: self._al_terminar(lote, nombre, f)
+                )
+            return futuros
+
+        def cerrar(self):
+            """Descarta el lote en curso y detiene los hilos"""
+            with self._lock:
+                self._lote += 1
+            self.metricas.cerrar()
+
+        def _al_terminar(self, lote: int, nombre: str, futuro: Future):
+            """Callback del Future (se ejecuta en el hilo de trabajo)"""
+            if futuro.cancelled():
+                return
+
+            error = futuro.exception()
+            datos = futuro.result() if error is None else None
+
+            with self._lock:
+                if lote != self._lote:
+                    return
+                self._resultados[nombre] = datos
+                self._pendientes -= 1
+                completo = dict(self._resultados) if self._pendientes == 0 else None
+
+            if error is None:
+                self.metrica_lista.emit(nombre, datos)
+            else:
+                logger.error(f"❌ Error cargando métrica {nombre}: {error}")
+                self.metrica_error.emit(nombre, str(error))
+
+            if completo is not None:
+                self.todas_listas.emit(completo)
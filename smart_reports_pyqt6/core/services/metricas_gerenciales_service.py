@@ -1,45 +1,362 @@
 """
 Servicio de Métricas Gerenciales
 Proporciona datos agregados para dashboards ejecutivos
+
+Rendimiento, departamentos y series mensuales/trimestrales leen
+instituto_ResumenProgreso (hechos pre-agregados que refresca el ETL de SQL
+Server). Mientras el resumen no tenga filas (p. ej. en MySQL) los mismos
+hechos se calculan al vuelo sobre las tablas base.
+
+Las consultas por métrica se escriben en SQL portable (dialecto MySQL) y
+pasan por QueryAdapter antes de ejecutarse.
+
+Las métricas que leen la misma tabla se pueden calcular por lotes
+(cargar_lote / get_metricas_dashboard): una consulta con GROUPING SETS por
+tabla en lugar de una consulta por métrica.
 """
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from smart_reports_pyqt6.database.repositories.persistence.mysql.connection import (
+    ConnectionPool,
+    DatabaseConnection
+)
+from smart_reports_pyqt6.database.repositories.persistence.sqlserver.query_adapter import QueryAdapter
+from smart_reports_pyqt6.config.database import DB_TYPE
+from smart_reports_pyqt6.config.settings import CACHE_CONFIG
+from smart_reports_pyqt6.core.services.consultas_agrupadas import ConjuntoAgrupacion, LoteAgrupado
+from smart_reports_pyqt6.utils.cache_manager import CacheManager, get_cache_manager, token_instancia
+from smart_reports_pyqt6.utils.generaciones_datos import (
+    GeneracionesDatos,
+    tablas_en_consulta,
+    tablas_versionadas
+)
+
+# TTL de resultados sin generaciones que los invaliden
+TTL_SIN_VERSION_SEGUNDOS = 300
+
+
+# Métricas del dashboard ejecutivo: nombre → método del servicio
+METRICAS_DASHBOARD: Dict[str, str] = {
+    'rendimiento_unidad': 'get_rendimiento_por_unidad',
+    'top_departamentos': 'get_top_departamentos',
+    'progreso_mensual': 'get_progreso_mensual',
+    'comparativa_trimestral': 'get_comparativa_trimestral',
+    'distribucion_estatus': 'get_distribucion_estatus',
+    'usuarios_categoria': 'get_usuarios_por_categoria',
+    'distribucion_jerarquia': 'get_distribucion_jerarquia',
+    'serie_temporal': 'get_serie_temporal_12_meses',
+    'relacion_tiempo': 'get_relacion_tiempo_calificacion',
+}
+
+# Lotes: métricas que se calculan con una sola lectura de su tabla
+# (distribucion_jerarquia parte de instituto_usuarios y va aparte)
+LOTES_METRICAS: Dict[str, Tuple[str, ...]] = {
+    'resumen': ('rendimiento_unidad', 'top_departamentos', 'progreso_mensual',
+                'comparativa_trimestral', 'serie_temporal'),
+    'asignaciones': ('distribucion_estatus', 'usuarios_categoria', 'relacion_tiempo'),
+}
+
+TABLA_RESUMEN = 'instituto_ResumenProgreso'
+
+# Comprobación de que el ETL ya llenó el resumen
+QUERY_HAY_RESUMEN = f"SELECT 1 FROM {TABLA_RESUMEN} LIMIT 1"
+
+# Primer día del mes de una fecha (sin DATE_FORMAT: sin '%' en el SQL)
+MES_DE_FECHA = {
+    'sqlserver': "DATEFROMPARTS(YEAR({fecha}), MONTH({fecha}), 1)",
+    'default': "DATE_SUB(DATE({fecha}), INTERVAL DAYOFMONTH({fecha}) - 1 DAY)",
+}
+
+# Categoría de un curso: su primera palabra
+CATEGORIA_CURSO = {
+    'sqlserver': "LEFT(a.curso, CHARINDEX(' ', a.curso + ' ') - 1)",
+    'default': "SUBSTRING_INDEX(a.curso, ' ', 1)",
+}
+
+JOINS_RESUMEN = """LEFT JOIN instituto_UnidadDeNegocio un ON r.IdUnidadDeNegocio = un.IdUnidadDeNegocio
+    LEFT JOIN instituto_Departamento d ON r.IdDepartamento = d.IdDepartamento"""
+
+
+def origen_progreso_directo(dialecto: str) -> str:
+    """
+    Tabla derivada con las columnas de instituto_ResumenProgreso calculada
+    sobre las tablas base (mismas reglas que el refresco del ETL: usuarios
+    activos, asignación en su mes, finalización y mejor puntaje en el mes
+    de finalización)
+
+    Args:
+        dialecto: 'sqlserver' o 'mysql'
+
+    Returns:
+        Subconsulta entre paréntesis (sin alias)
+    """
+    mes = MES_DE_FECHA.get(dialecto, MES_DE_FECHA['default'])
+    mes_asignacion = mes.format(fecha="COALESCE(pm.FechaAsignacion, pm.FechaInicio, '19000101')")
+    mes_finalizacion = mes.format(
+        fecha="COALESCE(pm.FechaFinalizacion, pm.FechaAsignacion, pm.FechaInicio, '19000101')"
+    )
+    return f"""(
+        SELECT
+            COALESCE(u.IdUnidadDeNegocio, 0) AS IdUnidadDeNegocio,
+            COALESCE(u.IdDepartamento, 0) AS IdDepartamento,
+            pm.IdModulo,
+            {mes_asignacion} AS Mes,
+            1 AS Asignados,
+            0 AS Completados,
+            CASE WHEN pm.EstatusModulo = 'En progreso' THEN 1 ELSE 0 END AS EnProgreso,
+            CAST(NULL AS DECIMAL(18,2)) AS SumaPuntaje,
+            0 AS NumPuntajes
+        FROM instituto_ProgresoModulo pm
+        INNER JOIN instituto_Usuario u ON u.IdUsuario = pm.IdUsuario
+        WHERE u.UserStatus = 'Active'
+        UNION ALL
+        SELECT
+            COALESCE(u.IdUnidadDeNegocio, 0),
+            COALESCE(u.IdDepartamento, 0),
+            pm.IdModulo,
+            {mes_finalizacion},
+            0,
+            1,
+            0,
+            mejor.Puntaje,
+            CASE WHEN mejor.Puntaje IS NULL THEN 0 ELSE 1 END
+        FROM instituto_ProgresoModulo pm
+        INNER JOIN instituto_Usuario u ON u.IdUsuario = pm.IdUsuario
+        LEFT JOIN (
+            SELECT IdInscripcion, MAX(PuntajeObtenido) AS Puntaje
+            FROM instituto_ResultadoEvaluacion
+            GROUP BY IdInscripcion
+        ) mejor ON mejor.IdInscripcion = pm.IdInscripcion
+        WHERE u.UserStatus = 'Active' AND pm.EstatusModulo IN ('Terminado', 'Completado')
+    )"""
+
+
+LOTE_RESUMEN = LoteAgrupado(
+    origen=f"""{TABLA_RESUMEN} r
+    {JOINS_RESUMEN}""",
+    columnas={
+        'unidad': 'un.NombreUnidad',
+        'id_departamento': 'd.IdDepartamento',
+        'departamento': 'd.NombreDepartamento',
+        'mes': 'r.Mes',
+    },
+    medidas={
+        'asignados': 'SUM(r.Asignados)',
+        'completados': 'SUM(r.Completados)',
+        'suma_puntaje': 'SUM(r.SumaPuntaje)',
+        'num_puntajes': 'SUM(r.NumPuntajes)',
+    },
+    conjuntos=(
+        ConjuntoAgrupacion('unidad', ('unidad',)),
+        ConjuntoAgrupacion('departamento', ('id_departamento', 'departamento')),
+        ConjuntoAgrupacion('mes', ('mes',)),
+    ),
+)
+
+# Rangos de tiempo dedicado (minutos) de get_relacion_tiempo_calificacion
+RANGOS_TIEMPO = ('0-30min', '30-60min', '1-2h', '2-4h', '4h+')
+
+# Rango de una asignación completada con calificación (NULL si no aplica);
+# lo usan la consulta por métrica y el lote, sobre todas las filas
+RANGO_TIEMPO_SQL = """CASE WHEN a.estatus = 'Completado'
+            AND a.calificacion IS NOT NULL AND a.tiempo_dedicado > 0 THEN
+            CASE WHEN a.tiempo_dedicado <= 30 THEN '0-30min'
+                 WHEN a.tiempo_dedicado <= 60 THEN '30-60min'
+                 WHEN a.tiempo_dedicado <= 120 THEN '1-2h'
+                 WHEN a.tiempo_dedicado <= 240 THEN '2-4h'
+                 ELSE '4h+' END
+        END"""
+
+LOTE_ASIGNACIONES = LoteAgrupado(
+    origen="instituto_asignaciones a",
+    columnas={
+        'estatus': 'a.estatus',
+        'categoria': CATEGORIA_CURSO,
+        'rango_tiempo': RANGO_TIEMPO_SQL,
+    },
+    medidas={
+        'total': 'COUNT(*)',
+        'usuarios': 'COUNT(DISTINCT a.usuario_id)',
+        'suma_calif': 'SUM(a.calificacion)',
+        'num_calif': 'COUNT(a.calificacion)',
+    },
+    conjuntos=(
+        ConjuntoAgrupacion('estatus', ('estatus',)),
+        ConjuntoAgrupacion('categoria', ('categoria',)),
+        ConjuntoAgrupacion('rango_tiempo', ('rango_tiempo',)),
+    ),
+)
+
+# LOTE_RESUMEN sobre las tablas base, por dialecto (resumen aún vacío)
+_LOTES_RESUMEN_DIRECTO: Dict[str, LoteAgrupado] = {}
 
 
 class MetricasGerencialesService:
     """Servicio para obtener métricas gerenciales agregadas"""
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection=None, cache: Optional[CacheManager] = None,
+                 usar_cache: bool = True, ttl_seconds: Optional[int] = None,
+                 dialecto: Optional[str] = None):
         """
         Args:
-            db_connection: Conexión a base de datos MySQL
+            db_connection: ConnectionPool o DatabaseConnection (cada consulta
+                           toma su propia conexión del pool), o una conexión
+                           DB-API suelta. None = datos de ejemplo
+            cache: CacheManager para los resultados (None = el global, que
+                   incluye el nivel en disco)
+            usar_cache: False para consultar siempre la BD
+            ttl_seconds: Tiempo de vida de los resultados cacheados (None =
+                         versioned_ttl_seconds si todas las tablas de la
+                         consulta tienen generación, 5 minutos si no)
+            dialecto: 'sqlserver' o 'mysql' para las consultas por lotes
+                      (None = DB_TYPE de la configuración)
+        """
+        self.pool: Optional[ConnectionPool] = None
+        self.conn = None
+        self.cache = (cache or get_cache_manager()) if usar_cache else None
+        self.dialecto = dialecto or DB_TYPE
+
+        if isinstance(db_connection, ConnectionPool):
+            self.pool = db_connection
+        elif isinstance(db_connection, DatabaseConnection):
+            self.pool = db_connection.pool
+        else:
+            self.conn = db_connection
+
+        # Con pool de SQL Server (el único dialecto que escribe el ETL), las
+        # claves de caché se versionan con las generaciones que el ETL
+        # incrementa al importar (TTL largo sin datos viejos). Un proveedor
+        # por origen de datos: cada BD tiene sus propias generaciones
+        self._origen_generaciones = None
+        if self.cache is not None and self.pool is not None and self.dialecto == 'sqlserver':
+            self._origen_generaciones = self.pool.__cache_key__()
+            if self.cache.generation_provider(self._origen_generaciones) is None:
+                self.cache.set_generation_provider(
+                    GeneracionesDatos(self.pool, CACHE_CONFIG['generation_poll_seconds']),
+                    self._origen_generaciones
+                )
+
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else TTL_SIN_VERSION_SEGUNDOS
+        self.ttl_versionado_seconds = (
+            ttl_seconds if ttl_seconds is not None else CACHE_CONFIG['versioned_ttl_seconds']
+        )
+
+    def __cache_key__(self) -> Tuple[str, str]:
+        """Dialecto y origen de datos: servicios sobre bases distintas no comparten caché"""
+        if self.pool is not None:
+            origen = self.pool.__cache_key__()
+        elif self.conn is not None:
+            # Conexiones que no admiten weakref (p. ej. pyodbc): la del servicio
+            origen = token_instancia(self.conn) or token_instancia(self)
+        else:
+            origen = 'ejemplo'
+        return self.dialecto, origen
+
+    @property
+    def disponible(self) -> bool:
+        """True si hay de dónde consultar (si no, se usan datos de ejemplo)"""
+        return self.pool is not None or self.conn is not None
+
+    def _consultar(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """
+        Ejecuta una consulta con un cursor propio
+
+        Con pool, cada llamada hace checkout de una conexión, de modo que
+        varios paneles pueden cargar métricas en paralelo. Con caché, el
+        resultado se busca antes en memoria y en disco (clave = origen de
+        datos + texto de la consulta + parámetros). El TTL largo solo se usa
+        si todas las tablas de la consulta tienen generación; si lee alguna
+        que el ETL no versiona, nada invalidaría el resultado.
+        """
+        if self.cache is None:
+            return self._consultar_bd(query, params)
+
+        tablas = tablas_en_consulta(query)
+        versionada = self._origen_generaciones is not None and tablas_versionadas(tablas)
+
+        return self.cache.get_or_compute(
+            CacheManager.query_key(query, (self.__cache_key__(), params)),
+            lambda: self._consultar_bd(query, params),
+            self.ttl_versionado_seconds if versionada else self.ttl_seconds,
+            tablas if versionada else (),
+            self._origen_generaciones
+        )
+
+    def _consultar_bd(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """Ejecuta la consulta en la BD (filas como tuplas, serializables)"""
+        if self.pool is not None:
+            with self.pool.cursor() as cursor:
+                return self._ejecutar(cursor, query, params)
+
+        cursor = self.conn.cursor()
+        try:
+            return self._ejecutar(cursor, query, params)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _ejecutar(cursor, query: str, params: Optional[tuple]) -> List[tuple]:
+        """Ejecuta la consulta en el cursor y devuelve todas las filas"""
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def _consultar_metrica(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """Consulta por métrica: SQL portable traducido al dialecto del servicio"""
+        return self._consultar(QueryAdapter.adapt_query(query, self.dialecto), params)
+
+    def _origen_resumen(self) -> str:
         """
-        self.conn = db_connection
-        self.cursor = db_connection.cursor() if db_connection else None
+        Origen de los hechos de progreso: instituto_ResumenProgreso si ya
+        tiene filas, o su equivalente calculado sobre las tablas base
+
+        La comprobación pasa por la caché (se invalida cuando el ETL
+        incrementa la generación del resumen).
+        """
+        try:
+            if self._consultar_metrica(QUERY_HAY_RESUMEN):
+                return TABLA_RESUMEN
+        except Exception as e:
+            print(f"Resumen de progreso no disponible: {e}")
+        return origen_progreso_directo(self.dialecto)
+
+    def _lote_resumen(self) -> LoteAgrupado:
+        """LOTE_RESUMEN sobre el origen de _origen_resumen()"""
+        origen = self._origen_resumen()
+        if origen == TABLA_RESUMEN:
+            return LOTE_RESUMEN
+
+        lote = _LOTES_RESUMEN_DIRECTO.get(self.dialecto)
+        if lote is None:
+            lote = replace(LOTE_RESUMEN, origen=f"{origen} r\n    {JOINS_RESUMEN}")
+            _LOTES_RESUMEN_DIRECTO[self.dialecto] = lote
+        return lote
 
     # ==================== RENDIMIENTO ====================
 
     def get_rendimiento_por_unidad(self) -> Dict[str, Any]:
         """Obtener rendimiento por unidad de negocio"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_rendimiento_unidad()
 
         try:
-            query = """
+            query = f"""
             SELECT
-                u.unidad_negocio,
-                COUNT(DISTINCT a.usuario_id) as total_usuarios,
-                SUM(CASE WHEN a.estatus = 'Completado' THEN 1 ELSE 0 END) as completados,
-                ROUND(AVG(CASE WHEN a.estatus = 'Completado' THEN a.calificacion ELSE NULL END), 1) as promedio_calif
-            FROM instituto_asignaciones a
-            JOIN instituto_usuarios u ON a.usuario_id = u.id
-            WHERE a.estatus IS NOT NULL
-            GROUP BY u.unidad_negocio
+                COALESCE(un.NombreUnidad, 'SIN UNIDAD') as unidad_negocio,
+                SUM(r.Asignados) as total_asignados,
+                SUM(r.Completados) as completados,
+                ROUND(SUM(r.SumaPuntaje) / NULLIF(SUM(r.NumPuntajes), 0), 1) as promedio_calif
+            FROM {self._origen_resumen()} r
+            LEFT JOIN instituto_UnidadDeNegocio un ON r.IdUnidadDeNegocio = un.IdUnidadDeNegocio
+            GROUP BY un.NombreUnidad
             ORDER BY completados DESC
             LIMIT 10
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
             if not results:
                 return self._get_mock_rendimiento_unidad()
@@ -57,25 +374,24 @@ class MetricasGerencialesService:
 
     def get_top_departamentos(self) -> Dict[str, Any]:
         """Top 10 departamentos por rendimiento"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_top_departamentos()
 
         try:
-            query = """
+            query = f"""
             SELECT
-                u.departamento,
-                COUNT(DISTINCT a.id) as total_asignaciones,
-                SUM(CASE WHEN a.estatus = 'Completado' THEN 1 ELSE 0 END) as completados,
-                ROUND(100.0 * SUM(CASE WHEN a.estatus = 'Completado' THEN 1 ELSE 0 END) / COUNT(*), 1) as porcentaje
-            FROM instituto_asignaciones a
-            JOIN instituto_usuarios u ON a.usuario_id = u.id
-            WHERE a.estatus IS NOT NULL AND u.departamento IS NOT NULL
-            GROUP BY u.departamento
+                d.NombreDepartamento as departamento,
+                SUM(r.Asignados) as total_asignaciones,
+                SUM(r.Completados) as completados,
+                ROUND(100.0 * SUM(r.Completados) / SUM(r.Asignados), 1) as porcentaje
+            FROM {self._origen_resumen()} r
+            JOIN instituto_Departamento d ON r.IdDepartamento = d.IdDepartamento
+            GROUP BY d.IdDepartamento, d.NombreDepartamento
+            HAVING SUM(r.Asignados) > 0
             ORDER BY porcentaje DESC
             LIMIT 10
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
             if not results:
                 return self._get_mock_top_departamentos()
@@ -93,26 +409,25 @@ class MetricasGerencialesService:
 
     def get_progreso_mensual(self, meses: int = 6) -> Dict[str, Any]:
         """Progreso mensual acumulado"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_progreso_mensual()
 
         try:
-            query = """
+            query = f"""
             SELECT
-                DATE_FORMAT(c.fecha_finalizacion, '%b %Y') as mes,
-                COUNT(*) as completados
-            FROM instituto_completados c
-            WHERE c.fecha_finalizacion >= DATE_SUB(NOW(), INTERVAL %s MONTH)
-            GROUP BY DATE_FORMAT(c.fecha_finalizacion, '%Y-%m')
-            ORDER BY c.fecha_finalizacion
+                r.Mes as mes,
+                SUM(r.Completados) as completados
+            FROM {self._origen_resumen()} r
+            WHERE r.Mes >= %s AND r.Completados > 0
+            GROUP BY r.Mes
+            ORDER BY r.Mes
             """
-            self.cursor.execute(query, (meses,))
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query, (self._inicio_mes(meses),))
 
             if not results:
                 return self._get_mock_progreso_mensual()
 
-            categorias = [row[0] for row in results]
+            categorias = [self._como_fecha(row[0]).strftime('%b %Y') for row in results]
             valores = [int(row[1]) for row in results]
 
             return {
@@ -125,29 +440,38 @@ class MetricasGerencialesService:
 
     def get_comparativa_trimestral(self) -> Dict[str, Any]:
         """Comparativa trimestral"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_comparativa_trimestral()
 
         try:
-            query = """
+            # Por mes en SQL; el trimestre se arma aquí (QUARTER no es portable)
+            query = f"""
             SELECT
-                CONCAT('Q', QUARTER(c.fecha_finalizacion)) as trimestre,
-                COUNT(*) as total,
-                ROUND(AVG(a.calificacion), 1) as promedio
-            FROM instituto_completados c
-            JOIN instituto_asignaciones a ON c.asignacion_id = a.id
-            WHERE YEAR(c.fecha_finalizacion) = YEAR(NOW())
-            GROUP BY QUARTER(c.fecha_finalizacion)
-            ORDER BY QUARTER(c.fecha_finalizacion)
+                r.Mes as mes,
+                SUM(r.SumaPuntaje) as suma_puntaje,
+                SUM(r.NumPuntajes) as num_puntajes
+            FROM {self._origen_resumen()} r
+            WHERE r.Mes >= %s AND r.Mes < %s AND r.Completados > 0
+            GROUP BY r.Mes
+            ORDER BY r.Mes
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            anio = date.today().year
+            results = self._consultar_metrica(query, (date(anio, 1, 1), date(anio + 1, 1, 1)))
 
             if not results:
                 return self._get_mock_comparativa_trimestral()
 
-            categorias = [row[0] for row in results]
-            valores = [float(row[2]) if row[2] else 0 for row in results]
+            trimestres: Dict[int, List[float]] = {}
+            for mes, suma, num in results:
+                acumulado = trimestres.setdefault((self._como_fecha(mes).month - 1) // 3 + 1, [0.0, 0])
+                acumulado[0] += float(suma or 0)
+                acumulado[1] += int(num or 0)
+
+            categorias = [f'Q{q}' for q in sorted(trimestres)]
+            valores = [
+                round(trimestres[q][0] / trimestres[q][1], 1) if trimestres[q][1] else 0
+                for q in sorted(trimestres)
+            ]
 
             return {
                 'categorias': categorias,
@@ -161,7 +485,7 @@ class MetricasGerencialesService:
 
     def get_distribucion_estatus(self) -> Dict[str, Any]:
         """Distribución de estatus global"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_distribucion_estatus()
 
         try:
@@ -173,8 +497,7 @@ class MetricasGerencialesService:
             GROUP BY a.estatus
             ORDER BY total DESC
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
             if not results:
                 return self._get_mock_distribucion_estatus()
@@ -192,22 +515,22 @@ class MetricasGerencialesService:
 
     def get_usuarios_por_categoria(self) -> Dict[str, Any]:
         """Usuarios por categoría de módulo"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_usuarios_categoria()
 
         try:
-            query = """
+            categoria = CATEGORIA_CURSO.get(self.dialecto, CATEGORIA_CURSO['default'])
+            query = f"""
             SELECT
-                SUBSTRING_INDEX(a.curso, ' ', 1) as categoria,
+                {categoria} as categoria,
                 COUNT(DISTINCT a.usuario_id) as usuarios
             FROM instituto_asignaciones a
             WHERE a.curso IS NOT NULL
-            GROUP BY categoria
+            GROUP BY {categoria}
             ORDER BY usuarios DESC
             LIMIT 8
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
             if not results:
                 return self._get_mock_usuarios_categoria()
@@ -225,7 +548,7 @@ class MetricasGerencialesService:
 
     def get_distribucion_jerarquia(self) -> Dict[str, Any]:
         """Distribución por nivel jerárquico"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_distribucion_jerarquia()
 
         try:
@@ -241,8 +564,7 @@ class MetricasGerencialesService:
             ORDER BY total_usuarios DESC
             LIMIT 8
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
             if not results:
                 return self._get_mock_distribucion_jerarquia()
@@ -262,28 +584,26 @@ class MetricasGerencialesService:
 
     def get_serie_temporal_12_meses(self) -> Dict[str, Any]:
         """Serie temporal últimos 12 meses"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_serie_temporal()
 
         try:
-            query = """
+            query = f"""
             SELECT
-                DATE_FORMAT(c.fecha_finalizacion, '%b %y') as mes,
-                COUNT(*) as total,
-                ROUND(AVG(a.calificacion), 1) as promedio_calif
-            FROM instituto_completados c
-            JOIN instituto_asignaciones a ON c.asignacion_id = a.id
-            WHERE c.fecha_finalizacion >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-            GROUP BY DATE_FORMAT(c.fecha_finalizacion, '%Y-%m')
-            ORDER BY c.fecha_finalizacion
+                r.Mes as mes,
+                SUM(r.Completados) as total,
+                ROUND(SUM(r.SumaPuntaje) / NULLIF(SUM(r.NumPuntajes), 0), 1) as promedio_calif
+            FROM {self._origen_resumen()} r
+            WHERE r.Mes >= %s AND r.Completados > 0
+            GROUP BY r.Mes
+            ORDER BY r.Mes
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query, (self._inicio_mes(12),))
 
             if not results:
                 return self._get_mock_serie_temporal()
 
-            categorias = [row[0] for row in results]
+            categorias = [self._como_fecha(row[0]).strftime('%b %y') for row in results]
             valores = [float(row[2]) if row[2] else 0 for row in results]
 
             return {
@@ -299,57 +619,204 @@ class MetricasGerencialesService:
 
     def get_relacion_tiempo_calificacion(self) -> Dict[str, Any]:
         """Relación entre tiempo dedicado y calificación"""
-        if not self.cursor:
+        if not self.disponible:
             return self._get_mock_relacion_tiempo()
 
         try:
-            query = """
+            # Promedio por rango sobre todas las asignaciones completadas
+            # (mismo cálculo que el lote 'asignaciones'); tiempo_dedicado en minutos
+            query = f"""
             SELECT
-                a.tiempo_dedicado,
-                a.calificacion
+                {RANGO_TIEMPO_SQL} as rango_tiempo,
+                SUM(a.calificacion) as suma_calif,
+                COUNT(a.calificacion) as num_calif
             FROM instituto_asignaciones a
             WHERE a.estatus = 'Completado'
                 AND a.tiempo_dedicado IS NOT NULL
                 AND a.calificacion IS NOT NULL
                 AND a.tiempo_dedicado > 0
-            LIMIT 100
+            GROUP BY {RANGO_TIEMPO_SQL}
             """
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self._consultar_metrica(query)
 
-            if not results:
-                return self._get_mock_relacion_tiempo()
+            rangos = {rango: (suma, num) for rango, suma, num in results if rango is not None and num}
+            orden = [r for r in RANGOS_TIEMPO if r in rangos]
 
-            # Agrupar en rangos para visualización de barras
-            rangos = {'0-30min': [], '30-60min': [], '1-2h': [], '2-4h': [], '4h+': []}
-            for tiempo, calif in results:
-                minutos = tiempo  # Asumiendo que tiempo_dedicado está en minutos
-                if minutos <= 30:
-                    rangos['0-30min'].append(calif)
-                elif minutos <= 60:
-                    rangos['30-60min'].append(calif)
-                elif minutos <= 120:
-                    rangos['1-2h'].append(calif)
-                elif minutos <= 240:
-                    rangos['2-4h'].append(calif)
-                else:
-                    rangos['4h+'].append(calif)
-
-            categorias = []
-            valores = []
-            for rango, califs in rangos.items():
-                if califs:
-                    categorias.append(rango)
-                    valores.append(round(sum(califs) / len(califs), 1))
+            if not orden:
+                return self._get_mock_relacion_tiempo()
 
             return {
-                'categorias': categorias,
-                'valores': valores
+                'categorias': orden,
+                'valores': [round(float(rangos[r][0]) / rangos[r][1], 1) for r in orden]
             }
         except Exception as e:
             print(f"Error en get_relacion_tiempo_calificacion: {e}")
             return self._get_mock_relacion_tiempo()
 
+    # ==================== LOTES (UNA LECTURA, VARIAS MÉTRICAS) ====================
+
+    def get_metricas_dashboard(self, nombres: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Métricas del dashboard, agrupando en lotes las que comparten tabla
+
+        Args:
+            nombres: Claves de METRICAS_DASHBOARD (None = todas)
+
+        Returns:
+            Diccionario nombre → datos de la métrica, en el orden pedido
+        """
+        nombres = list(nombres) if nombres is not None else list(METRICAS_DASHBOARD)
+
+        resultados: Dict[str, Dict[str, Any]] = {}
+        for lote, metricas in LOTES_METRICAS.items():
+            # Una sola métrica del lote no compensa la consulta combinada
+            if sum(1 for n in nombres if n in metricas) >= 2:
+                resultados.update(self.cargar_lote(lote))
+
+        for nombre in nombres:
+            if nombre not in resultados:
+                resultados[nombre] = getattr(self, METRICAS_DASHBOARD[nombre])()
+
+        return {nombre: resultados[nombre] for nombre in nombres}
+
+    def cargar_lote(self, lote: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula todas las métricas de un lote con una sola consulta
+
+        Si la consulta combinada falla, cada métrica se consulta por
+        separado (con sus propios datos de ejemplo como respaldo).
+
+        Args:
+            lote: Clave de LOTES_METRICAS
+
+        Returns:
+            Diccionario nombre de métrica → datos
+        """
+        if lote not in LOTES_METRICAS:
+            raise ValueError(f"Lote desconocido: {lote}")
+
+        metricas = LOTES_METRICAS[lote]
+        if self.disponible:
+            definicion = self._lote_resumen() if lote == 'resumen' else LOTE_ASIGNACIONES
+            try:
+                grupos = definicion.repartir(self._consultar(definicion.sql(self.dialecto)))
+                if lote == 'resumen':
+                    return self._repartir_resumen(grupos)
+                return self._repartir_asignaciones(grupos)
+            except Exception as e:
+                print(f"Error en lote {lote}, se consulta cada métrica: {e}")
+
+        return {nombre: getattr(self, METRICAS_DASHBOARD[nombre])() for nombre in metricas}
+
+    def _repartir_resumen(self, grupos: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Métricas de instituto_ResumenProgreso a partir de sus conjuntos"""
+        def promedio(filas):
+            num = sum(int(f['num_puntajes'] or 0) for f in filas)
+            return round(sum(float(f['suma_puntaje'] or 0) for f in filas) / num, 1) if num else 0
+
+        resultados = {}
+
+        # Rendimiento por unidad: top 10 por completados
+        unidades = sorted(grupos['unidad'], key=lambda f: f['completados'] or 0, reverse=True)[:10]
+        resultados['rendimiento_unidad'] = {
+            'categorias': [f['unidad'] or 'SIN UNIDAD' for f in unidades],
+            'valores': [promedio([f]) for f in unidades]
+        } if unidades else self._get_mock_rendimiento_unidad()
+
+        # Top departamentos: % completado (solo departamentos existentes)
+        departamentos = sorted(
+            (
+                (f['departamento'], round(100.0 * (f['completados'] or 0) / f['asignados'], 1))
+                for f in grupos['departamento']
+                if f['id_departamento'] is not None and (f['asignados'] or 0) > 0
+            ),
+            key=lambda d: d[1], reverse=True
+        )[:10]
+        resultados['top_departamentos'] = {
+            'categorias': [d[0] for d in departamentos],
+            'valores': [d[1] for d in departamentos]
+        } if departamentos else self._get_mock_top_departamentos()
+
+        # Meses con finalizaciones, en orden cronológico
+        meses = sorted(
+            (dict(f, mes=self._como_fecha(f['mes'])) for f in grupos['mes']
+             if f['mes'] is not None and (f['completados'] or 0) > 0),
+            key=lambda f: f['mes']
+        )
+
+        desde = self._inicio_mes(6)
+        mensual = [f for f in meses if f['mes'] >= desde]
+        resultados['progreso_mensual'] = {
+            'categorias': [f['mes'].strftime('%b %Y') for f in mensual],
+            'valores': [int(f['completados']) for f in mensual]
+        } if mensual else self._get_mock_progreso_mensual()
+
+        anio = date.today().year
+        trimestres: Dict[int, List[Dict[str, Any]]] = {}
+        for f in meses:
+            if f['mes'].year == anio:
+                trimestres.setdefault((f['mes'].month - 1) // 3 + 1, []).append(f)
+        resultados['comparativa_trimestral'] = {
+            'categorias': [f'Q{q}' for q in sorted(trimestres)],
+            'valores': [promedio(trimestres[q]) for q in sorted(trimestres)]
+        } if trimestres else self._get_mock_comparativa_trimestral()
+
+        desde = self._inicio_mes(12)
+        serie = [f for f in meses if f['mes'] >= desde]
+        resultados['serie_temporal'] = {
+            'categorias': [f['mes'].strftime('%b %y') for f in serie],
+            'valores': [promedio([f]) for f in serie],
+            'meta': 80
+        } if serie else self._get_mock_serie_temporal()
+
+        return resultados
+
+    def _repartir_asignaciones(self, grupos: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Métricas de instituto_asignaciones a partir de sus conjuntos"""
+        resultados = {}
+
+        estatus = sorted(grupos['estatus'], key=lambda f: f['total'], reverse=True)
+        resultados['distribucion_estatus'] = {
+            'categorias': [f['estatus'] or 'Sin Estatus' for f in estatus],
+            'valores': [int(f['total']) for f in estatus]
+        } if estatus else self._get_mock_distribucion_estatus()
+
+        categorias = sorted(
+            (f for f in grupos['categoria'] if f['categoria'] is not None),
+            key=lambda f: f['usuarios'], reverse=True
+        )[:8]
+        resultados['usuarios_categoria'] = {
+            'categorias': [f['categoria'] for f in categorias],
+            'valores': [int(f['usuarios']) for f in categorias]
+        } if categorias else self._get_mock_usuarios_categoria()
+
+        # Promedio de calificación por rango de tiempo dedicado
+        rangos = {f['rango_tiempo']: f for f in grupos['rango_tiempo']
+                  if f['rango_tiempo'] is not None and f['num_calif']}
+        orden = [r for r in RANGOS_TIEMPO if r in rangos]
+        resultados['relacion_tiempo'] = {
+            'categorias': orden,
+            'valores': [round(float(rangos[r]['suma_calif']) / rangos[r]['num_calif'], 1) for r in orden]
+        } if orden else self._get_mock_relacion_tiempo()
+
+        return resultados
+
+    @staticmethod
+    def _como_fecha(valor) -> date:
+        """Mes como date (algunos drivers ODBC devuelven DATE como texto)"""
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        return date.fromisoformat(str(valor)[:10])
+
+    @staticmethod
+    def _inicio_mes(meses: int) -> date:
+        """Primer día del mes de hace n meses (como DATE_SUB(NOW(), INTERVAL n MONTH))"""
+        hoy = date.today()
+        total = hoy.year * 12 + hoy.month - 1 - meses
+        return date(total // 12, total % 12 + 1, 1)
+
     # ==================== DATOS MOCK (FALLBACK) ====================
 
     def _get_mock_rendimiento_unidad(self):
@@ -0,0 +1,189 @@
+"""
+Consultas Paginadas (keyset / seek)
+
+OPTIMIZACIÓN: Primera fila en milisegundos, sin importar el tamaño del resultado
+
+Las búsquedas de Consultas (p. ej. todos los usuarios de una unidad grande
+con su progreso) traían el resultado completo con fetchall(). Aquí cada
+página es una consulta independiente que continúa donde terminó la
+anterior mediante un predicado sobre la clave de orden (seek):
+
+    WHERE IdUsuario > <última clave vista> ORDER BY IdUsuario
+    OFFSET 0 ROWS FETCH NEXT n ROWS ONLY        (SQL Server)
+    LIMIT n                                      (MySQL)
+
+A diferencia de OFFSET k, el costo de la página 100 es el mismo que el de
+la primera (búsqueda en el índice de la clave, sin recorrer las k filas
+anteriores), y las subconsultas de progreso solo se evalúan para las filas
+de la página.
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from smart_reports_pyqt6.config.database import DB_TYPE
+
+DIALECTO_SQLSERVER = 'sqlserver'
+
+# Filas por página: pocas para que la primera llegue rápido, suficientes
+# para llenar la tabla visible y algo de scroll
+TAMANO_PAGINA = 200
+
+
+@dataclass
+class ConsultaPaginada:
+    """
+    Consulta que se lee por páginas con seek sobre su clave
+
+    Attributes:
+        base: SELECT con alias en todas las columnas (sin ORDER BY). Las
+              primeras len(encabezados) columnas son las visibles; después
+              pueden ir columnas auxiliares como la clave
+        claves: Alias de las columnas de orden (únicas y no nulas en
+                conjunto, p. ej. la PK)
+        encabezados: Títulos de las columnas visibles
+        params: Parámetros de la consulta base
+        formatos: Índice de columna → función que convierte el valor en texto
+        dialecto: 'sqlserver' o 'mysql' (None = DB_TYPE)
+        tamano_pagina: Filas por página
+    """
+    base: str
+    claves: Tuple[str, ...]
+    encabezados: Sequence[str]
+    params: tuple = ()
+    formatos: Dict[int, Callable[[Any], str]] = field(default_factory=dict)
+    dialecto: Optional[str] = None
+    tamano_pagina: int = TAMANO_PAGINA
+
+    def __post_init__(self):
+        self.dialecto = self.dialecto or DB_TYPE
+        self._indices_clave: Optional[List[int]] = None
+
+    @property
+    def placeholder(self) -> str:
+        return '?' if self.dialecto == DIALECTO_SQLSERVER else '%s'
+
+    def sql_pagina(self, despues_de: Optional[tuple] = None) -> Tuple[str, tuple]:
+        """
+        Consulta y parámetros de la página que sigue a una clave
+
+        Args:
+            despues_de: Valores de la clave de la última fila recibida
+                        (None = primera página)
+        """
+        ph = self.placeholder
+        orden = ", ".join(f"q.{c}" for c in self.claves)
+        params = list(self.params)
+
+        where = ''
+        if despues_de is not None:
+            # (k1 > ?) OR (k1 = ? AND k2 > ?) OR ...
+            condiciones = []
+            for i, clave in enumerate(self.claves):
+                partes = [f"q.{c} = {ph}" for c in self.claves[:i]] + [f"q.{clave} > {ph}"]
+                condiciones.append("(" + " AND ".join(partes) + ")")
+                params.extend(despues_de[:i + 1])
+            where = "\nWHERE " + " OR ".join(condiciones)
+
+        if self.dialecto == DIALECTO_SQLSERVER:
+            limite = f"OFFSET 0 ROWS FETCH NEXT {ph} ROWS ONLY"
+        else:
+            limite = f"LIMIT {ph}"
+        params.append(self.tamano_pagina)
+
+        sql = f"SELECT * FROM ({self.base}) q{where}\nORDER BY {orden}\n{limite}"
+        return sql, tuple(params)
+
+    def pagina(self, cursor, despues_de: Optional[tuple] = None) -> List[tuple]:
+        """Ejecuta la consulta de una página en el cursor"""
+        sql, params = self.sql_pagina(despues_de)
+        cursor.execute(sql, params)
+        filas = [tuple(fila) for fila in cursor.fetchall()]
+
+        if self._indices_clave is None and cursor.description:
+            nombres = [d[0].lower() for d in cursor.description]
+            self._indices_clave = [nombres.index(c.lower()) for c in self.claves]
+        return filas
+
+    def clave_de(self, fila: tuple) -> tuple:
+        """Valores de la clave de una fila (para pedir la página siguiente)"""
+        return tuple(fila[i] for i in self._indices_clave)
+
+    def texto(self, fila: tuple, columna: int) -> str:
+        """Texto a mostrar de una celda"""
+        valor = fila[columna]
+        formato = self.formatos.get(columna)
+        if formato is not None and valor is not None:
+            return formato(valor)
+        return formatear_valor(valor)
+
+
+def formatear_valor(valor: Any) -> str:
+    """Texto de un valor de la BD para mostrar en tablas"""
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.strftime('%Y-%m-%d')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, (float, Decimal)) and valor == int(valor):
+        return str(int(valor))
+    return str(valor)
+
+
+# ============================================
+# BÚSQUEDAS DE USUARIOS (PANEL DE CONSULTAS)
+# ============================================
+
+ENCABEZADOS_USUARIOS = ["ID", "Nombre", "Unidad", "Email", "Progreso", "Última Actividad"]
+
+# Progreso y última actividad como subconsultas correlacionadas: con la
+# paginación solo se calculan para las filas de la página
+_BASE_USUARIOS = """
+    SELECT
+        u.UserId AS Id,
+        u.NombreCompleto AS Nombre,
+        COALESCE(un.NombreUnidad, 'SIN UNIDAD') AS Unidad,
+        u.UserEmail AS Email,
+        (SELECT ROUND(100.0 * SUM(CASE WHEN pm.EstatusModulo IN ('Terminado', 'Completado')
+                                       THEN 1 ELSE 0 END) / NULLIF(COUNT(*), 0), 0)
+         FROM instituto_ProgresoModulo pm
+         WHERE pm.IdUsuario = u.IdUsuario) AS Progreso,
+        (SELECT MAX(COALESCE(pm.FechaFinalizacion, pm.FechaInicio, pm.FechaAsignacion))
+         FROM instituto_ProgresoModulo pm
+         WHERE pm.IdUsuario = u.IdUsuario) AS UltimaActividad,
+        u.IdUsuario AS IdUsuario
+    FROM instituto_Usuario u
+    LEFT JOIN instituto_UnidadDeNegocio un ON u.IdUnidadDeNegocio = un.IdUnidadDeNegocio
+"""
+
+_FORMATOS_USUARIOS = {4: lambda v: f"{formatear_valor(v)}%"}
+
+
+def consulta_usuarios_por_unidad(unidad: str, dialecto: Optional[str] = None) -> ConsultaPaginada:
+    """Usuarios de una unidad de negocio con su progreso, por páginas"""
+    dialecto = dialecto or DB_TYPE
+    ph = '?' if dialecto == DIALECTO_SQLSERVER else '%s'
+    return ConsultaPaginada(
+        base=_BASE_USUARIOS + f"    WHERE un.NombreUnidad = {ph}\n",
+        claves=('IdUsuario',),
+        encabezados=ENCABEZADOS_USUARIOS,
+        params=(unidad,),
+        formatos=_FORMATOS_USUARIOS,
+        dialecto=dialecto,
+    )
+
+
+def consulta_usuarios_por_nombre(nombre: str, dialecto: Optional[str] = None) -> ConsultaPaginada:
+    """Usuarios cuyo nombre contiene el texto, con su progreso, por páginas"""
+    dialecto = dialecto or DB_TYPE
+    ph = '?' if dialecto == DIALECTO_SQLSERVER else '%s'
+    return ConsultaPaginada(
+        base=_BASE_USUARIOS + f"    WHERE u.NombreCompleto LIKE {ph}\n",
+        claves=('IdUsuario',),
+        encabezados=ENCABEZADOS_USUARIOS,
+        params=(f"%{nombre}%",),
+        formatos=_FORMATOS_USUARIOS,
+        dialecto=dialecto,
+    )
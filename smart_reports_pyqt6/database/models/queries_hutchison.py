@@ -1,6 +1,12 @@
 """
 Queries SQL adaptadas al esquema REAL de Hutchison Ports
 Usar estas queries en los paneles de dashboards
+
+Las métricas de progreso leen instituto_ResumenProgreso (hechos
+pre-agregados que el ETL refresca al importar), por lo que su costo no
+crece con el historial de instituto_ProgresoModulo. Mientras el resumen no
+tenga filas (p. ej. en MySQL, donde el ETL no lo refresca),
+consultar_sentencia() usa su variante *_DIRECTO sobre las tablas base.
 """
 
 # ============================================
@@ -32,13 +38,30 @@ QUERY_PROGRESO_POR_UNIDAD = """
     SELECT
         un.NombreUnidad as unidad,
         ROUND(
-            CAST(SUM(CASE WHEN pm.EstatusModulo = 'Completado' THEN 1 ELSE 0 END) AS FLOAT) /
+            CAST(SUM(r.Completados) AS FLOAT) /
+            NULLIF(SUM(r.Asignados), 0) * 100,
+            1
+        ) as porcentaje
+    FROM instituto_ResumenProgreso r
+    INNER JOIN instituto_UnidadDeNegocio un ON r.IdUnidadDeNegocio = un.IdUnidadDeNegocio
+    WHERE un.Activo = 1
+    GROUP BY un.NombreUnidad
+    HAVING SUM(r.Asignados) > 0
+    ORDER BY porcentaje DESC
+"""
+
+# Progreso por Unidad de Negocio, sobre las tablas base (respaldo)
+QUERY_PROGRESO_POR_UNIDAD_DIRECTO = """
+    SELECT
+        un.NombreUnidad as unidad,
+        ROUND(
+            CAST(SUM(CASE WHEN pm.EstatusModulo IN ('Terminado', 'Completado') THEN 1 ELSE 0 END) AS FLOAT) /
             NULLIF(COUNT(pm.IdInscripcion), 0) * 100,
             1
         ) as porcentaje
     FROM instituto_UnidadDeNegocio un
-    LEFT JOIN instituto_Usuario u ON un.IdUnidadDeNegocio = u.IdUnidadDeNegocio
-    LEFT JOIN instituto_ProgresoModulo pm ON u.UserId = pm.UserId
+    INNER JOIN instituto_Usuario u ON un.IdUnidadDeNegocio = u.IdUnidadDeNegocio
+    INNER JOIN instituto_ProgresoModulo pm ON u.IdUsuario = pm.IdUsuario
     WHERE un.Activo = 1 AND u.UserStatus = 'Active'
     GROUP BY un.NombreUnidad
     HAVING COUNT(pm.IdInscripcion) > 0
@@ -127,20 +150,115 @@ QUERY_CUMPLIMIENTO_UNIDADES = """
 """
 
 # Tendencia de módulos completados por mes
+# (yyyy-MM con CONCAT/RIGHT: misma sentencia en MySQL y SQL Server)
 QUERY_TENDENCIA_MENSUAL = """
     SELECT
-        FORMAT(FechaFinalizacion, 'yyyy-MM') as Mes,
-        COUNT(*) as Total
-    FROM instituto_ProgresoModulo
-    WHERE EstatusModulo = 'Completado' AND FechaFinalizacion IS NOT NULL
-    GROUP BY FORMAT(FechaFinalizacion, 'yyyy-MM')
+        CONCAT(YEAR(Mes), '-', RIGHT(CONCAT('0', MONTH(Mes)), 2)) as Mes,
+        SUM(Completados) as Total
+    FROM instituto_ResumenProgreso
+    WHERE Completados > 0 AND Mes > '19000101'
+    GROUP BY Mes
     ORDER BY Mes
 """
 
+# Tendencia mensual, sobre las tablas base (respaldo)
+QUERY_TENDENCIA_MENSUAL_DIRECTO = """
+    SELECT
+        CONCAT(YEAR(pm.FechaFinalizacion), '-', RIGHT(CONCAT('0', MONTH(pm.FechaFinalizacion)), 2)) as Mes,
+        COUNT(*) as Total
+    FROM instituto_ProgresoModulo pm
+    INNER JOIN instituto_Usuario u ON u.IdUsuario = pm.IdUsuario
+    WHERE pm.EstatusModulo IN ('Terminado', 'Completado')
+        AND pm.FechaFinalizacion IS NOT NULL
+        AND u.UserStatus = 'Active'
+    GROUP BY YEAR(pm.FechaFinalizacion), MONTH(pm.FechaFinalizacion)
+    ORDER BY YEAR(pm.FechaFinalizacion), MONTH(pm.FechaFinalizacion)
+"""
+
+# ============================================
+# REGISTRO DE SENTENCIAS
+# ============================================
+# Cada QUERY_* queda en el registro central como 'hutchison.<nombre>'
+# (variante MySQL = la constante, variante SQL Server = su traducción), con
+# métricas de llamadas y latencia. Ver consultar_sentencia().
+
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import (
+    get_registro_sentencias
+)
+from smart_reports_pyqt6.database.repositories.persistence.sqlserver.query_adapter import (
+    QueryAdapter
+)
+
+_registro = get_registro_sentencias()
+
+for _nombre, _sql in list(globals().items()):
+    if _nombre.startswith('QUERY_') and isinstance(_sql, str):
+        _registro.registrar(
+            f"hutchison.{_nombre[len('QUERY_'):].lower()}",
+            mysql=_sql,
+            sqlserver=QueryAdapter.adapt_query(_sql),
+            descripcion=f"queries_hutchison.{_nombre}",
+        )
+del _nombre, _sql
+
+# Sentencias sobre instituto_ResumenProgreso → su variante sobre las tablas
+# base, usada mientras el resumen no devuelva filas
+RESPALDO_SIN_RESUMEN = {
+    'hutchison.progreso_por_unidad': 'hutchison.progreso_por_unidad_directo',
+    'hutchison.tendencia_mensual': 'hutchison.tendencia_mensual_directo',
+}
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
+def consultar_sentencia(origen, nombre, params=()):
+    """
+    Ejecutar una sentencia registrada (p. ej. 'hutchison.usuarios_por_unidad')
+
+    Con un ConnectionPool o DatabaseConnection usa el cursor preparado de
+    la sentencia en la conexión; con una conexión DB-API suelta, un cursor
+    normal. En ambos casos la llamada queda en las métricas del registro.
+
+    Si la sentencia lee instituto_ResumenProgreso y no devuelve filas (o
+    la tabla no existe), se ejecuta su respaldo de RESPALDO_SIN_RESUMEN.
+
+    Args:
+        origen: ConnectionPool, DatabaseConnection o conexión DB-API
+        nombre: Nombre de la sentencia
+        params: Parámetros
+
+    Returns:
+        Lista de tuplas con resultados
+    """
+    try:
+        resultados = _ejecutar_sentencia(origen, nombre, params)
+        if resultados or nombre not in RESPALDO_SIN_RESUMEN:
+            return resultados
+    except Exception as e:
+        if nombre not in RESPALDO_SIN_RESUMEN:
+            print(f"Error ejecutando sentencia {nombre}: {e}")
+            return []
+
+    respaldo = RESPALDO_SIN_RESUMEN[nombre]
+    try:
+        return _ejecutar_sentencia(origen, respaldo, params)
+    except Exception as e:
+        print(f"Error ejecutando sentencia {respaldo}: {e}")
+        return []
+
+
+def _ejecutar_sentencia(origen, nombre, params):
+    """Ejecuta una sentencia registrada (ver consultar_sentencia)"""
+    if hasattr(origen, 'sentencia'):
+        return _registro.consultar_pool(origen, nombre, params)
+    cursor = origen.cursor()
+    try:
+        return _registro.consultar(cursor, nombre, params)
+    finally:
+        cursor.close()
+
+
 def ejecutar_query_simple(db_connection, query):
     """
     Ejecutar query que retorna un solo valor
@@ -180,6 +298,34 @@ def ejecutar_query_lista(db_connection, query):
         print(f"Error ejecutando query: {e}")
         return []
 
+def iterar_query_lotes(db_connection, query, params=None, tamano_lote=500):
+    """
+    Recorrer los resultados de una query por lotes (fetchmany)
+
+    A diferencia de ejecutar_query_lista, no carga el resultado completo
+    en memoria. Para tablas en pantalla usar las consultas paginadas de
+    consultas_paginadas.py.
+
+    Args:
+        db_connection: Conexión a BD
+        query: Query SQL
+        params: Parámetros de la query
+        tamano_lote: Filas por fetchmany()
+
+    Yields:
+        Listas de hasta tamano_lote tuplas
+    """
+    cursor = db_connection.cursor()
+    try:
+        cursor.execute(query, params) if params else cursor.execute(query)
+        while True:
+            filas = cursor.fetchmany(tamano_lote)
+            if not filas:
+                break
+            yield filas
+    finally:
+        cursor.close()
+
 def query_to_chart_data(results, label_index=0, value_index=1):
     """
     Convertir resultados de query a formato de datos para gráficos
@@ -1,7 +1,18 @@
 """
 Gestión de conexión a Base de Datos (SQL Server y MySQL)
+
+- ConnectionPool: pool de conexiones con tamaño mínimo/máximo, pre-ping,
+  reciclado por antigüedad y métricas de espera/utilización
+- DatabaseConnection: punto de acceso único (singleton) al pool de la app
+- sentencia(): cursor preparado de una sentencia del registro central
+  (registro_sentencias.py), uno por sentencia y conexión física
 """
-from typing import Optional
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
 
 # SQL Server support
 try:
@@ -21,15 +32,381 @@ except ImportError:
     MySQLError = Exception
     MYSQL_AVAILABLE = False
 
-from smart_reports.config.database import DB_TYPE, SQLSERVER_CONFIG, MYSQL_CONFIG
+from smart_reports_pyqt6.config.database import DB_TYPE, SQLSERVER_CONFIG, MYSQL_CONFIG, POOL_CONFIG
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import CursoresPreparados
+from smart_reports_pyqt6.utils.cache_manager import token_instancia
+
+# Literales, identificadores delimitados y comentarios: se descartan antes
+# de buscar palabras clave en una sentencia
+_PATRON_NO_CODIGO = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\[[^\]]*\]|`[^`]*`|--[^\n]*|/\*.*?\*/",
+    re.DOTALL
+)
+_PATRON_PALABRA = re.compile(r'(?<![@#$\w.])[A-Za-z_]\w*')
+
+# Palabras que vuelven escritura una sentencia que empieza por SELECT o
+# WITH: WITH cte AS (...) UPDATE/DELETE/MERGE, SELECT ... INTO,
+# SELECT ... FOR UPDATE o varias sentencias seguidas
+_PALABRAS_ESCRITURA = frozenset({
+    'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'INTO', 'CREATE', 'ALTER',
+    'DROP', 'TRUNCATE', 'EXEC', 'EXECUTE'
+})
+
+
+def _es_lectura(query: str) -> bool:
+    """True si la sentencia es de solo lectura (SELECT, o WITH cuya sentencia principal es SELECT)"""
+    palabras = [p.upper() for p in _PATRON_PALABRA.findall(_PATRON_NO_CODIGO.sub(' ', query))]
+    return (
+        bool(palabras)
+        and palabras[0] in ('SELECT', 'WITH')
+        and _PALABRAS_ESCRITURA.isdisjoint(palabras)
+    )
+
+
+# ============================================================================
+# POOL DE CONEXIONES
+# ============================================================================
+
+class _ConexionPool:
+    """Conexión física del pool con sus marcas de tiempo y cursores preparados"""
+
+    __slots__ = ('raw', 'creada', 'ultimo_uso', 'preparados')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.creada = time.monotonic()
+        self.ultimo_uso = self.creada
+        self.preparados: Optional[CursoresPreparados] = None
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones DB-API (pyodbc o mysql-connector)
+
+    - Mantiene entre min_size y max_size conexiones abiertas
+    - checkout con context manager: connection() entrega una conexión en
+      exclusiva y cursor() además un cursor propio que se cierra al salir
+    - Pre-ping: antes de entregar una conexión ociosa se verifica con
+      ping_query; si falló se reemplaza por una nueva
+    - Las conexiones con más de max_lifetime segundos se reciclan
+    - Al devolver una conexión se hace rollback, para que la siguiente
+      petición no herede una transacción abierta
+    - Si no hay conexiones libres se espera hasta timeout segundos
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        timeout: float = 30.0,
+        max_lifetime: float = 1800.0,
+        pre_ping: bool = True,
+        ping_query: str = "SELECT 1",
+        nombre: Optional[str] = None
+    ):
+        """
+        Args:
+            factory: Función que abre una conexión nueva
+            min_size: Conexiones que se abren en precalentar()
+            max_size: Máximo de conexiones simultáneas
+            timeout: Segundos máximos de espera por una conexión
+            max_lifetime: Segundos de vida antes de reciclar (0 = sin límite)
+            pre_ping: Verificar la conexión antes de entregarla
+            ping_query: Consulta usada para el pre-ping
+            nombre: Identidad del origen ("sqlserver://servidor/base"); la
+                    usan las claves de caché para no mezclar bases
+        """
+        self._factory = factory
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.pre_ping = pre_ping
+        self.ping_query = ping_query
+        self.nombre = nombre
+
+        self._condicion = threading.Condition()
+        self._libres: deque = deque()
+        self._abiertas = 0
+        self._en_uso = 0
+        self._cerrado = False
+
+        self._metricas = {
+            'checkouts': 0,
+            'espera_total': 0.0,
+            'espera_max': 0.0,
+            'timeouts': 0,
+            'creadas': 0,
+            'recicladas': 0,
+            'descartadas': 0,
+            'ping_fallidos': 0,
+            'pico_en_uso': 0,
+        }
+
+    def __cache_key__(self) -> str:
+        """Identidad para claves de caché (sin nombre, la de esta instancia, solo en memoria)"""
+        return self.nombre or token_instancia(self)
+
+    # ==================== CHECKOUT ====================
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Entrega una conexión en exclusiva durante el bloque with
+
+        Si el bloque lanza una excepción se hace rollback; si la conexión
+        quedó inutilizable se descarta en lugar de volver al pool.
+
+        Args:
+            timeout: Segundos máximos de espera (None = self.timeout)
+        """
+        entrada = self._adquirir(self.timeout if timeout is None else timeout)
+        try:
+            yield entrada.raw
+        finally:
+            self._liberar(entrada)
+
+    @contextmanager
+    def cursor(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Entrega un cursor propio sobre una conexión del pool
+
+        Args:
+            timeout: Segundos máximos de espera (None = self.timeout)
+        """
+        with self.connection(timeout) as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    @contextmanager
+    def sentencia(self, nombre: str, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Entrega el cursor dedicado a una sentencia del registro
+
+        El cursor vive lo mismo que la conexión física (no se cierra al
+        salir del bloque), así que la sentencia se prepara una sola vez por
+        conexión. Usar con RegistroSentencias.consultar_pool().
+
+        Args:
+            nombre: Sentencia registrada
+            timeout: Segundos máximos de espera (None = self.timeout)
+        """
+        entrada = self._adquirir(self.timeout if timeout is None else timeout)
+        try:
+            if entrada.preparados is None:
+                entrada.preparados = CursoresPreparados(entrada.raw)
+            yield entrada.preparados.cursor(nombre)
+        finally:
+            self._liberar(entrada)
+
+    def precalentar(self):
+        """Abre conexiones hasta completar min_size"""
+        while True:
+            with self._condicion:
+                if self._cerrado or self._abiertas >= self.min_size:
+                    return
+                self._abiertas += 1
+
+            try:
+                entrada = self._abrir()
+            except Exception:
+                with self._condicion:
+                    self._abiertas -= 1
+                    self._condicion.notify()
+                raise
+
+            with self._condicion:
+                self._libres.append(entrada)
+                self._condicion.notify()
+
+    def close(self):
+        """Cierra las conexiones libres; las que están en uso se cierran al devolverse"""
+        with self._condicion:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+
+        for entrada in libres:
+            self._cerrar(entrada)
+
+    # ==================== MÉTRICAS ====================
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Métricas del pool
+
+        Returns:
+            Diccionario con checkouts, tiempos de espera (ms), timeouts,
+            conexiones creadas/recicladas/descartadas, pings fallidos,
+            conexiones en uso/libres y utilización (en uso / max_size)
+        """
+        with self._condicion:
+            metricas = dict(self._metricas)
+            en_uso = self._en_uso
+            libres = len(self._libres)
+            abiertas = self._abiertas
+
+        checkouts = metricas.pop('checkouts')
+        espera_total = metricas.pop('espera_total')
+        espera_max = metricas.pop('espera_max')
+
+        return {
+            'checkouts': checkouts,
+            'espera_promedio_ms': round(espera_total / checkouts * 1000, 2) if checkouts else 0.0,
+            'espera_max_ms': round(espera_max * 1000, 2),
+            **metricas,
+            'en_uso': en_uso,
+            'libres': libres,
+            'abiertas': abiertas,
+            'max_size': self.max_size,
+            'utilizacion': round(en_uso / self.max_size, 3),
+        }
+
+    # ==================== INTERNOS ====================
+
+    def _adquirir(self, timeout: float) -> _ConexionPool:
+        """Reserva una conexión (libre, nueva o esperando a que se libere una)"""
+        inicio = time.perf_counter()
+        limite = inicio + timeout
+        entrada = None
+
+        with self._condicion:
+            while True:
+                if self._cerrado:
+                    raise RuntimeError("El pool de conexiones está cerrado")
+
+                if self._libres:
+                    entrada = self._libres.pop()
+                    break
+
+                if self._abiertas < self.max_size:
+                    self._abiertas += 1
+                    break
 
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    self._metricas['timeouts'] += 1
+                    raise TimeoutError(
+                        f"No hay conexiones libres tras {timeout:.1f} s "
+                        f"({self.max_size} en uso)"
+                    )
+                self._condicion.wait(restante)
+
+            espera = time.perf_counter() - inicio
+            self._en_uso += 1
+            self._metricas['checkouts'] += 1
+            self._metricas['espera_total'] += espera
+            self._metricas['espera_max'] = max(self._metricas['espera_max'], espera)
+            self._metricas['pico_en_uso'] = max(self._metricas['pico_en_uso'], self._en_uso)
+
+        try:
+            if entrada is not None and not self._es_valida(entrada):
+                self._cerrar(entrada)
+                entrada = None
+            if entrada is None:
+                entrada = self._abrir()
+        except Exception:
+            with self._condicion:
+                self._abiertas -= 1
+                self._en_uso -= 1
+                self._condicion.notify()
+            raise
+
+        return entrada
+
+    def _liberar(self, entrada: _ConexionPool):
+        """Devuelve la conexión al pool (o la descarta si quedó inutilizable)"""
+        descartar = False
+        try:
+            entrada.raw.rollback()
+        except Exception:
+            descartar = True
+
+        entrada.ultimo_uso = time.monotonic()
+
+        with self._condicion:
+            self._en_uso -= 1
+            if descartar or self._cerrado:
+                self._abiertas -= 1
+                if descartar:
+                    self._metricas['descartadas'] += 1
+            else:
+                self._libres.append(entrada)
+            self._condicion.notify()
+
+        if descartar or self._cerrado:
+            self._cerrar(entrada)
+
+    def _es_valida(self, entrada: _ConexionPool) -> bool:
+        """Comprueba antigüedad y, si pre_ping, que la conexión responda"""
+        if self.max_lifetime and time.monotonic() - entrada.creada > self.max_lifetime:
+            with self._condicion:
+                self._metricas['recicladas'] += 1
+            return False
+
+        if not self.pre_ping:
+            return True
+
+        try:
+            cursor = entrada.raw.cursor()
+            try:
+                cursor.execute(self.ping_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            with self._condicion:
+                self._metricas['ping_fallidos'] += 1
+            return False
+
+    def _abrir(self) -> _ConexionPool:
+        """Abre una conexión física nueva"""
+        entrada = _ConexionPool(self._factory())
+        with self._condicion:
+            self._metricas['creadas'] += 1
+        return entrada
+
+    @staticmethod
+    def _cerrar(entrada: _ConexionPool):
+        """Cierra una conexión física ignorando errores"""
+        if entrada.preparados is not None:
+            entrada.preparados.cerrar()
+        try:
+            entrada.raw.close()
+        except Exception:
+            pass
+
+
+# ============================================================================
+# CONEXIÓN DE LA APLICACIÓN
+# ============================================================================
 
 class DatabaseConnection:
-    """Singleton para gestionar la conexión a la base de datos"""
+    """
+    Singleton para gestionar el acceso a la base de datos
+
+    Las consultas nuevas deben tomar conexiones del pool (checkout() /
+    cursor()); connect() y get_cursor() conservan la conexión compartida
+    para el código existente.
+    """
 
     _instance = None
     _connection = None
     _cursor = None
+    # La conexión compartida puede tener escrituras sin confirmar
+    _pendiente = False
+    _pool: Optional[ConnectionPool] = None
+    _pool_lock = threading.Lock()
     _db_type = DB_TYPE
 
     def __new__(cls):
@@ -37,39 +414,79 @@ class DatabaseConnection:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
 
-    def connect(self):
-        """Establece conexión con la base de datos según el tipo configurado"""
-        if self._connection is not None:
-            return self._connection
+    def _validar_tipo(self):
+        """Valida el tipo de BD con mensaje útil si hay typo"""
+        if self._db_type not in ['sqlserver', 'mysql']:
+            error_msg = f"Tipo de BD no soportado: '{self._db_type}'"
 
+            # Detectar typos comunes
+            if 'sqlsever' in self._db_type.lower():
+                error_msg += "\n\n❌ TYPO DETECTADO: Dice 'sqlsever' pero debe ser 'sqlserver'"
+                error_msg += "\n\n✅ SOLUCIÓN:"
+                error_msg += "\n   1. Abre tu archivo .env (en la raíz del proyecto)"
+                error_msg += "\n   2. Busca la línea: DB_TYPE=sqlsever"
+                error_msg += "\n   3. Cámbiala a: DB_TYPE=sqlserver"
+                error_msg += "\n   4. Guarda y reinicia la aplicación"
+                error_msg += "\n\nOpciones válidas: 'sqlserver' o 'mysql'"
+
+            raise ValueError(error_msg)
+
+    def _identidad(self) -> str:
+        """Servidor y base configurados ("sqlserver://servidor/base")"""
+        if self._db_type == 'sqlserver':
+            return f"sqlserver://{SQLSERVER_CONFIG['server']}/{SQLSERVER_CONFIG['database']}"
+        return f"mysql://{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
+
+    def _nueva_conexion(self):
+        """Abre una conexión física según el tipo configurado"""
         try:
-            # Validar tipo de BD con mensaje útil si hay typo
-            if self._db_type not in ['sqlserver', 'mysql']:
-                error_msg = f"Tipo de BD no soportado: '{self._db_type}'"
-
-                # Detectar typos comunes
-                if 'sqlsever' in self._db_type.lower():
-                    error_msg += "\n\n❌ TYPO DETECTADO: Dice 'sqlsever' pero debe ser 'sqlserver'"
-                    error_msg += "\n\n✅ SOLUCIÓN:"
-                    error_msg += "\n   1. Abre tu archivo .env (en la raíz del proyecto)"
-                    error_msg += "\n   2. Busca la línea: DB_TYPE=sqlsever"
-                    error_msg += "\n   3. Cámbiala a: DB_TYPE=sqlserver"
-                    error_msg += "\n   4. Guarda y reinicia la aplicación"
-                    error_msg += "\n\nOpciones válidas: 'sqlserver' o 'mysql'"
-
-                raise ValueError(error_msg)
+            self._validar_tipo()
 
             if self._db_type == 'sqlserver':
-                self._connection = self._connect_sqlserver()
-            elif self._db_type == 'mysql':
-                self._connection = self._connect_mysql()
-
-            self._cursor = self._connection.cursor()
-            return self._connection
+                return self._connect_sqlserver()
+            return self._connect_mysql()
 
         except Exception as e:
             raise Exception(f"Error de conexión a BD ({self._db_type}): {str(e)}")
 
+    def connect(self):
+        """Establece la conexión compartida según el tipo configurado"""
+        if self._connection is not None:
+            return self._connection
+
+        self._connection = self._nueva_conexion()
+        self._cursor = self._connection.cursor()
+        return self._connection
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Pool de conexiones de la aplicación (se crea en el primer uso)"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    pool = ConnectionPool(self._nueva_conexion, nombre=self._identidad(), **POOL_CONFIG)
+                    pool.precalentar()
+                    DatabaseConnection._pool = pool
+        return self._pool
+
+    def checkout(self, timeout: Optional[float] = None):
+        """Context manager: conexión del pool en exclusiva"""
+        return self.pool.connection(timeout)
+
+    def cursor(self, timeout: Optional[float] = None):
+        """Context manager: cursor propio sobre una conexión del pool"""
+        return self.pool.cursor(timeout)
+
+    def sentencia(self, nombre: str, timeout: Optional[float] = None):
+        """Context manager: cursor preparado de una sentencia del registro"""
+        return self.pool.sentencia(nombre, timeout)
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Métricas de espera y utilización del pool"""
+        if self._pool is None:
+            return {}
+        return self._pool.get_metrics()
+
     def _connect_sqlserver(self):
         """Conexión a SQL Server usando pyodbc"""
         if not SQLSERVER_AVAILABLE:
@@ -116,9 +533,16 @@ class DatabaseConnection:
         )
 
     def get_cursor(self):
-        """Retorna el cursor de la conexión"""
+        """
+        Retorna el cursor de la conexión compartida
+
+        Quien lo usa puede escribir sin confirmar: hasta el próximo
+        commit() o rollback(), execute() deja también las lecturas en la
+        conexión compartida.
+        """
         if self._cursor is None:
             self.connect()
+        self._pendiente = True
         return self._cursor
 
     def get_placeholder(self) -> str:
@@ -129,33 +553,57 @@ class DatabaseConnection:
         """Commit de transacción"""
         if self._connection:
             self._connection.commit()
+        self._pendiente = False
 
     def rollback(self):
         """Rollback de transacción"""
         if self._connection:
             self._connection.rollback()
+        self._pendiente = False
 
     def close(self):
-        """Cierra la conexión"""
+        """Cierra la conexión compartida y el pool"""
         if self._connection:
             self._connection.close()
             self._connection = None
             self._cursor = None
+        self._pendiente = False
+        if self._pool is not None:
+            self._pool.close()
+            DatabaseConnection._pool = None
 
-    def execute(self, query: str, params: Optional[tuple] = None):
-        """Ejecuta una query y retorna resultados"""
-        cursor = self.get_cursor()
-        if params:
-            cursor.execute(query, params)
+    @contextmanager
+    def _cursor_para(self, query: str) -> Iterator[Any]:
+        """
+        Cursor según la sentencia
+
+        Las lecturas usan una conexión del pool (que hace rollback al
+        devolverse). Las escrituras usan el cursor de la conexión
+        compartida, como antes del pool: quien llama confirma con commit().
+        Mientras haya escrituras sin confirmar, las lecturas también van a
+        la conexión compartida: en otra conexión no las verían, o
+        esperarían a sus propios bloqueos.
+        """
+        if not self._pendiente and _es_lectura(query):
+            with self.cursor() as cursor:
+                yield cursor
         else:
-            cursor.execute(query)
-        return cursor.fetchall()
+            yield self.get_cursor()
+
+    def execute(self, query: str, params: Optional[tuple] = None):
+        """Ejecuta una query y retorna resultados (lecturas en el pool)"""
+        with self._cursor_para(query) as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return cursor.fetchall()
 
     def execute_one(self, query: str, params: Optional[tuple] = None):
-        """Ejecuta query y retorna un solo resultado"""
-        cursor = self.get_cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        return cursor.fetchone()
+        """Ejecuta query y retorna un solo resultado (lecturas en el pool)"""
+        with self._cursor_para(query) as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return cursor.fetchone()
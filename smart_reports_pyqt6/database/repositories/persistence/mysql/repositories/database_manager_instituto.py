@@ -11,6 +11,10 @@ import json
 import hashlib
 import logging
 
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import (
+    get_registro_sentencias
+)
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,7 +50,14 @@ class DatabaseConfig:
 
 
 class DatabaseManager:
-    """Gestor principal de base de datos"""
+    """
+    Gestor principal de base de datos
+
+    Las sentencias fijas de los managers están en el registro central
+    (nombres 'instituto.*') y se ejecutan con execute_statement(), que
+    usa siempre el mismo texto y registra llamadas y latencia. Las
+    consultas con filtros dinámicos siguen usando execute_query().
+    """
 
     # Prefijo de tablas
     TABLE_PREFIX = 'instituto_'
@@ -115,6 +126,29 @@ class DatabaseManager:
             if connection:
                 connection.close()
 
+    def execute_statement(self, nombre: str, params: Any = None,
+                          fetch_one=False, fetch_all=False, commit=False) -> Any:
+        """Ejecuta una sentencia registrada (ver execute_query)"""
+        registro = get_registro_sentencias()
+        query = registro.texto(nombre, 'mysql')
+
+        with registro.medir(nombre) as medicion:
+            result = self.execute_query(query, params, fetch_one=fetch_one,
+                                        fetch_all=fetch_all, commit=commit)
+            if isinstance(result, list):
+                medicion['filas'] = len(result)
+        return result
+
+    def execute_statement_many(self, nombre: str, data: List[Tuple]) -> int:
+        """Ejecuta una sentencia registrada en batch (ver execute_many)"""
+        registro = get_registro_sentencias()
+        query = registro.texto(nombre, 'mysql')
+
+        with registro.medir(nombre) as medicion:
+            rowcount = self.execute_many(query, data)
+            medicion['filas'] = rowcount
+        return rowcount
+
     def execute_many(self, query: str, data: List[Tuple]) -> int:
         """Ejecuta múltiples inserciones en batch"""
         connection = None
@@ -145,20 +179,18 @@ class DatabaseManager:
 
 
 # =============================================================================
-# MANAGERS ESPECÍFICOS CON PREFIJO instituto_
+# SENTENCIAS REGISTRADAS
 # =============================================================================
+# pool_reset_session=True descarta las sentencias preparadas al devolver la
+# conexión al pool, así que aquí el registro aporta el texto único por
+# sentencia (el servidor reutiliza su caché de planes/consultas) y las
+# métricas por sentencia.
 
-class UsuarioManager:
-    """Gestor de operaciones de Usuario"""
-
-    def __init__(self, db: DatabaseManager):
-        self.db = db
-        self.table = f"{db.TABLE_PREFIX}Usuario"
+_P = DatabaseManager.TABLE_PREFIX
+_registro = get_registro_sentencias()
 
-    def crear_usuario(self, user_data: Dict) -> int:
-        """Crea un nuevo usuario"""
-        query = f"""
-            INSERT INTO {self.table} (
+_registro.registrar('instituto.crear_usuario', mysql=f"""
+            INSERT INTO {_P}Usuario (
                 UserId, IdUnidadDeNegocio, IdDepartamento, IdRol,
                 NombreCompleto, UserEmail, PasswordHash, TipoDeCorreo,
                 Nivel, Division, Position, UserStatus, Grupo, Ubicacion
@@ -167,26 +199,81 @@ class UsuarioManager:
                 %(NombreCompleto)s, %(UserEmail)s, %(PasswordHash)s, %(TipoDeCorreo)s,
                 %(Nivel)s, %(Division)s, %(Position)s, %(UserStatus)s, %(Grupo)s, %(Ubicacion)s
             )
-        """
+        """, descripcion="Alta de usuario")
+
+_registro.registrar('instituto.obtener_usuario', mysql=f"""
+            SELECT u.*, un.NombreUnidad, d.NombreDepartamento, r.NombreRol
+            FROM {_P}Usuario u
+            LEFT JOIN {_P}UnidadDeNegocio un ON u.IdUnidadDeNegocio = un.IdUnidadDeNegocio
+            LEFT JOIN {_P}Departamento d ON u.IdDepartamento = d.IdDepartamento
+            LEFT JOIN {_P}Rol r ON u.IdRol = r.IdRol
+            WHERE u.UserId = %s AND u.Activo = 1
+        """, tipos=('str:100',), descripcion="Usuario por UserId")
 
+_registro.registrar('instituto.crear_modulo', mysql=f"""
+            INSERT INTO {_P}Modulo (
+                NombreModulo, FechaInicioModulo, FechaCierre, Descripcion,
+                DuracionEstimadaHoras, CategoriaModulo, IdCreador
+            ) VALUES (
+                %(NombreModulo)s, %(FechaInicioModulo)s, %(FechaCierre)s, %(Descripcion)s,
+                %(DuracionEstimadaHoras)s, %(CategoriaModulo)s, %(IdCreador)s
+            )
+        """, descripcion="Alta de módulo")
+
+_registro.registrar('instituto.asignar_modulo_departamento', mysql=f"""
+            INSERT INTO {_P}ModuloDepartamento (
+                IdModulo, IdDepartamento, Obligatorio, FechaAsignacion, FechaVencimiento
+            ) VALUES (%s, %s, %s, NOW(), %s)
+        """, tipos=('int', 'int', 'bit', 'datetime'), descripcion="Asignación de módulo a departamento")
+
+_registro.registrar('instituto.usuarios_departamento', mysql=f"""
+            SELECT UserId FROM {_P}Usuario
+            WHERE IdDepartamento = %s AND Activo = 1
+        """, tipos=('int',), descripcion="Usuarios activos de un departamento")
+
+_registro.registrar('instituto.inscribir_usuario', mysql=f"""
+            INSERT IGNORE INTO {_P}ProgresoModulo
+            (UserId, IdModulo, EstatusModulo, FechaAsignacion, FechaVencimiento)
+            VALUES (%s, %s, 'No iniciado', NOW(), %s)
+        """, tipos=('str:100', 'int', 'datetime'), descripcion="Inscripción de usuario a módulo")
+
+_registro.registrar('instituto.progreso_usuario', mysql=f"""
+            SELECT p.*, m.NombreModulo, m.CategoriaModulo
+            FROM {_P}ProgresoModulo p
+            JOIN {_P}Modulo m ON p.IdModulo = m.IdModulo
+            WHERE p.UserId = %s
+            ORDER BY p.FechaAsignacion DESC
+        """, tipos=('str:100',), descripcion="Progreso de un usuario")
+
+_registro.registrar('instituto.actualizar_progreso',
+                    mysql="CALL sp_instituto_ActualizarProgreso(%s, %s, %s, %s)",
+                    tipos=('int', 'str:50', 'decimal:5,2', 'str:500'),
+                    descripcion="Actualización de progreso (procedimiento almacenado)")
+
+
+# =============================================================================
+# MANAGERS ESPECÍFICOS CON PREFIJO instituto_
+# =============================================================================
+
+class UsuarioManager:
+    """Gestor de operaciones de Usuario"""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.table = f"{db.TABLE_PREFIX}Usuario"
+
+    def crear_usuario(self, user_data: Dict) -> int:
+        """Crea un nuevo usuario"""
         if 'Password' in user_data and 'PasswordHash' not in user_data:
             user_data['PasswordHash'] = self._hash_password(user_data['Password'])
 
-        usuario_id = self.db.execute_query(query, user_data, commit=True)
+        usuario_id = self.db.execute_statement('instituto.crear_usuario', user_data, commit=True)
         logger.info(f"✅ Usuario creado: {user_data.get('UserId')} (ID: {usuario_id})")
         return usuario_id
 
     def obtener_usuario(self, user_id: str) -> Optional[Dict]:
         """Obtiene un usuario por UserId"""
-        query = f"""
-            SELECT u.*, un.NombreUnidad, d.NombreDepartamento, r.NombreRol
-            FROM {self.table} u
-            LEFT JOIN {self.db.TABLE_PREFIX}UnidadDeNegocio un ON u.IdUnidadDeNegocio = un.IdUnidadDeNegocio
-            LEFT JOIN {self.db.TABLE_PREFIX}Departamento d ON u.IdDepartamento = d.IdDepartamento
-            LEFT JOIN {self.db.TABLE_PREFIX}Rol r ON u.IdRol = r.IdRol
-            WHERE u.UserId = %s AND u.Activo = 1
-        """
-        return self.db.execute_query(query, (user_id,), fetch_one=True)
+        return self.db.execute_statement('instituto.obtener_usuario', (user_id,), fetch_one=True)
 
     def listar_usuarios(self, filtros: Dict = None) -> List[Dict]:
         """Lista usuarios con filtros opcionales"""
@@ -225,17 +312,7 @@ class ModuloManager:
 
     def crear_modulo(self, modulo_data: Dict) -> int:
         """Crea un nuevo módulo"""
-        query = f"""
-            INSERT INTO {self.table} (
-                NombreModulo, FechaInicioModulo, FechaCierre, Descripcion,
-                DuracionEstimadaHoras, CategoriaModulo, IdCreador
-            ) VALUES (
-                %(NombreModulo)s, %(FechaInicioModulo)s, %(FechaCierre)s, %(Descripcion)s,
-                %(DuracionEstimadaHoras)s, %(CategoriaModulo)s, %(IdCreador)s
-            )
-        """
-
-        modulo_id = self.db.execute_query(query, modulo_data, commit=True)
+        modulo_id = self.db.execute_statement('instituto.crear_modulo', modulo_data, commit=True)
         logger.info(f"✅ Módulo creado: {modulo_data.get('NombreModulo')} (ID: {modulo_id})")
         return modulo_id
 
@@ -253,14 +330,8 @@ class ModuloManager:
                                obligatorio: bool = False,
                                fecha_vencimiento: datetime = None) -> int:
         """Asigna un módulo a un departamento"""
-        query = f"""
-            INSERT INTO {self.db.TABLE_PREFIX}ModuloDepartamento (
-                IdModulo, IdDepartamento, Obligatorio, FechaAsignacion, FechaVencimiento
-            ) VALUES (%s, %s, %s, NOW(), %s)
-        """
-
-        asignacion_id = self.db.execute_query(
-            query,
+        asignacion_id = self.db.execute_statement(
+            'instituto.asignar_modulo_departamento',
             (id_modulo, id_departamento, obligatorio, fecha_vencimiento),
             commit=True
         )
@@ -275,25 +346,16 @@ class ModuloManager:
     def _asignar_a_usuarios_departamento(self, id_modulo: int, id_departamento: int,
                                           fecha_vencimiento: datetime):
         """Asigna módulo a todos los usuarios de un departamento"""
-        query_usuarios = f"""
-            SELECT UserId FROM {self.db.TABLE_PREFIX}Usuario
-            WHERE IdDepartamento = %s AND Activo = 1
-        """
-
-        usuarios = self.db.execute_query(query_usuarios, (id_departamento,), fetch_all=True)
+        usuarios = self.db.execute_statement(
+            'instituto.usuarios_departamento', (id_departamento,), fetch_all=True
+        )
 
         if not usuarios:
             logger.info(f"⚠️ No hay usuarios en departamento {id_departamento}")
             return
 
-        query_insert = f"""
-            INSERT IGNORE INTO {self.db.TABLE_PREFIX}ProgresoModulo
-            (UserId, IdModulo, EstatusModulo, FechaAsignacion, FechaVencimiento)
-            VALUES (%s, %s, 'No iniciado', NOW(), %s)
-        """
-
         data = [(u['UserId'], id_modulo, fecha_vencimiento) for u in usuarios]
-        rows = self.db.execute_many(query_insert, data)
+        rows = self.db.execute_statement_many('instituto.inscribir_usuario', data)
 
         logger.info(f"✅ Módulo asignado a {rows} usuarios del departamento")
 
@@ -307,23 +369,13 @@ class ProgresoManager:
 
     def obtener_progreso_usuario(self, user_id: str) -> List[Dict]:
         """Obtiene el progreso de un usuario"""
-        query = f"""
-            SELECT p.*, m.NombreModulo, m.CategoriaModulo
-            FROM {self.table} p
-            JOIN {self.db.TABLE_PREFIX}Modulo m ON p.IdModulo = m.IdModulo
-            WHERE p.UserId = %s
-            ORDER BY p.FechaAsignacion DESC
-        """
-
-        return self.db.execute_query(query, (user_id,), fetch_all=True)
+        return self.db.execute_statement('instituto.progreso_usuario', (user_id,), fetch_all=True)
 
     def actualizar_progreso(self, id_inscripcion: int, estatus: str,
                            porcentaje: float, comentario: str = None) -> bool:
         """Actualiza el progreso usando procedimiento almacenado"""
-        query = "CALL sp_instituto_ActualizarProgreso(%s, %s, %s, %s)"
-
-        self.db.execute_query(
-            query,
+        self.db.execute_statement(
+            'instituto.actualizar_progreso',
             (id_inscripcion, estatus, porcentaje, comentario),
             commit=True
         )
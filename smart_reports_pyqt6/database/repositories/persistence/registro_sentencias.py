@@ -0,0 +1,528 @@
+"""
+Registro Central de Sentencias SQL
+
+OPTIMIZACIÓN: Un texto por sentencia, preparada una vez por conexión
+
+Cada sentencia se declara una sola vez con un nombre, sus variantes por
+dialecto y el tipo de sus parámetros:
+
+    registro = get_registro_sentencias()
+    registro.registrar(
+        'etl.usuarios_por_userid',
+        sqlserver="SELECT IdUsuario, UserId FROM instituto_Usuario WHERE UserId IN ({placeholders})",
+        tipos=('varchar:100',),
+        lista_in=True,
+    )
+
+Beneficios:
+- Texto idéntico en cada ejecución → el servidor reutiliza el plan
+- Con SQL Server los parámetros se declaran con tipo y tamaño fijos
+  (setinputsizes); sin eso pyodbc declara nvarchar(len(valor)) y cada
+  longitud distinta genera otro plan en caché. Las columnas VARCHAR se
+  declaran 'varchar:N' (SQL_VARCHAR): un parámetro nvarchar contra una
+  columna varchar obliga a CONVERT_IMPLICIT y el índice deja de usarse
+  con seek
+- Listas IN de tamaño fijo (el último bloque se rellena), nunca un texto
+  distinto por cantidad de valores
+- CursoresPreparados mantiene un cursor por sentencia y conexión: pyodbc y
+  mysql-connector (prepared=True) solo preparan cuando cambia el texto del
+  cursor, así que cada sentencia se prepara una vez por conexión
+- Conteo de llamadas, errores e histograma de latencia por sentencia:
+  un solo lugar para ver y ajustar las consultas calientes
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import bisect
+import logging
+import threading
+import time
+
+try:
+    import pyodbc
+    PYODBC_AVAILABLE = True
+except ImportError:
+    pyodbc = None
+    PYODBC_AVAILABLE = False
+
+from smart_reports_pyqt6.config.database import DB_TYPE
+
+logger = logging.getLogger(__name__)
+
+DIALECTO_SQLSERVER = 'sqlserver'
+DIALECTO_MYSQL = 'mysql'
+
+MARCADOR_LISTA = '{placeholders}'
+
+# Límites superiores (ms) de los intervalos del histograma de latencia
+LIMITES_HISTOGRAMA_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+# ============================================================================
+# DECLARACIÓN
+# ============================================================================
+
+@dataclass(frozen=True)
+class Sentencia:
+    """
+    Sentencia SQL declarada en el registro
+
+    Attributes:
+        nombre: Identificador único ('modulo.accion')
+        variantes: Dialecto → texto SQL ('default' = cualquier dialecto)
+        tipos: Tipo de cada parámetro: 'int', 'bigint', 'bit', 'str:N'
+               (NVARCHAR), 'varchar:N' (VARCHAR), 'decimal:P,S', 'date',
+               'datetime'. En sentencias lista_in es el tipo de cada valor
+               de la lista
+        lista_in: El texto tiene {placeholders} dentro de un IN y se ejecuta
+                  por bloques de tamaño fijo
+        descripcion: Para qué se usa (aparece en el resumen de métricas)
+    """
+    nombre: str
+    variantes: Tuple[Tuple[str, str], ...]
+    tipos: Tuple[str, ...] = ()
+    lista_in: bool = False
+    descripcion: str = ''
+
+    def texto(self, dialecto: str) -> str:
+        """Texto SQL para el dialecto (variante propia o 'default')"""
+        variantes = dict(self.variantes)
+        if dialecto in variantes:
+            return variantes[dialecto]
+        if 'default' in variantes:
+            return variantes['default']
+        raise ValueError(f"La sentencia {self.nombre} no tiene variante para {dialecto}")
+
+
+class EstadisticasSentencia:
+    """Llamadas, errores y latencias de una sentencia"""
+
+    __slots__ = ('llamadas', 'errores', 'filas', 'total_ms', 'max_ms', 'histograma')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.filas = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Un contador por límite + uno para "más de 10 s"
+        self.histograma = [0] * (len(LIMITES_HISTOGRAMA_MS) + 1)
+
+    def registrar(self, ms: float, filas: int, error: bool):
+        self.llamadas += 1
+        self.errores += int(error)
+        self.filas += filas
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.histograma[bisect.bisect_left(LIMITES_HISTOGRAMA_MS, ms)] += 1
+
+    def percentil(self, p: float) -> float:
+        """
+        Percentil aproximado: límite superior del intervalo que lo contiene
+        (nunca mayor que el máximo observado)
+        """
+        if not self.llamadas:
+            return 0.0
+        objetivo = p * self.llamadas
+        acumulado = 0
+        for i, cuenta in enumerate(self.histograma):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                if i < len(LIMITES_HISTOGRAMA_MS):
+                    return round(min(float(LIMITES_HISTOGRAMA_MS[i]), self.max_ms), 2)
+                return round(self.max_ms, 2)
+        return self.max_ms
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'filas': self.filas,
+            'total_ms': round(self.total_ms, 2),
+            'promedio_ms': round(self.total_ms / self.llamadas, 2) if self.llamadas else 0.0,
+            'p50_ms': self.percentil(0.50),
+            'p95_ms': self.percentil(0.95),
+            'max_ms': round(self.max_ms, 2),
+            'histograma': {
+                (f"<={limite}ms" if i < len(LIMITES_HISTOGRAMA_MS) else f">{LIMITES_HISTOGRAMA_MS[-1]}ms"): cuenta
+                for i, (limite, cuenta) in enumerate(zip(LIMITES_HISTOGRAMA_MS + (None,), self.histograma))
+                if cuenta
+            },
+        }
+
+
+# ============================================================================
+# REGISTRO
+# ============================================================================
+
+class RegistroSentencias:
+    """
+    Catálogo de sentencias con ejecución medida
+
+    Thread-safe: las métricas se actualizan bajo un lock y los textos
+    resueltos (dialecto, tamaño de lista) se calculan una sola vez.
+    """
+
+    def __init__(self, dialecto: Optional[str] = None):
+        """
+        Args:
+            dialecto: Dialecto por defecto (None = DB_TYPE de la configuración)
+        """
+        self.dialecto = dialecto or DB_TYPE
+        self._sentencias: Dict[str, Sentencia] = {}
+        self._textos: Dict[Tuple[str, str, int], str] = {}
+        self._tamanos: Dict[Tuple[str, int], Optional[list]] = {}
+        self._estadisticas: Dict[str, EstadisticasSentencia] = {}
+        self._lock = threading.Lock()
+
+    # ==================== DECLARACIÓN ====================
+
+    def registrar(self, nombre: str, sql: Optional[str] = None, *,
+                  sqlserver: Optional[str] = None, mysql: Optional[str] = None,
+                  tipos: Iterable[str] = (), lista_in: bool = False,
+                  descripcion: str = '') -> Sentencia:
+        """
+        Declara una sentencia
+
+        Registrar de nuevo el mismo nombre con el mismo contenido no hace
+        nada (los módulos se pueden recargar); con contenido distinto es un
+        error de programación.
+
+        Args:
+            nombre: Identificador único
+            sql: Texto válido en cualquier dialecto
+            sqlserver / mysql: Variantes por dialecto
+            tipos: Tipos de los parámetros (ver Sentencia)
+            lista_in: El texto lleva {placeholders} dentro de un IN
+            descripcion: Para qué se usa
+        """
+        variantes = []
+        if sql is not None:
+            variantes.append(('default', sql))
+        if sqlserver is not None:
+            variantes.append((DIALECTO_SQLSERVER, sqlserver))
+        if mysql is not None:
+            variantes.append((DIALECTO_MYSQL, mysql))
+        if not variantes:
+            raise ValueError(f"La sentencia {nombre} no tiene texto SQL")
+        if lista_in and any(MARCADOR_LISTA not in texto for _, texto in variantes):
+            raise ValueError(f"La sentencia {nombre} es lista_in pero no tiene {MARCADOR_LISTA}")
+
+        sentencia = Sentencia(nombre, tuple(variantes), tuple(tipos), lista_in, descripcion)
+
+        with self._lock:
+            existente = self._sentencias.get(nombre)
+            if existente is not None and existente != sentencia:
+                raise ValueError(f"Sentencia ya registrada con otro contenido: {nombre}")
+            self._sentencias[nombre] = sentencia
+        return sentencia
+
+    def obtener(self, nombre: str) -> Sentencia:
+        try:
+            return self._sentencias[nombre]
+        except KeyError:
+            raise KeyError(f"Sentencia no registrada: {nombre}") from None
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._sentencias
+
+    def nombres(self) -> List[str]:
+        return sorted(self._sentencias)
+
+    def texto(self, nombre: str, dialecto: Optional[str] = None, tam_lista: int = 0) -> str:
+        """
+        Texto SQL final de una sentencia
+
+        Args:
+            nombre: Sentencia registrada
+            dialecto: None = dialecto del registro
+            tam_lista: Marcadores del IN (solo sentencias lista_in)
+        """
+        dialecto = dialecto or self.dialecto
+        clave = (nombre, dialecto, tam_lista)
+        texto = self._textos.get(clave)
+        if texto is None:
+            sentencia = self.obtener(nombre)
+            texto = sentencia.texto(dialecto)
+            if sentencia.lista_in:
+                if tam_lista < 1:
+                    raise ValueError(f"La sentencia {nombre} necesita tam_lista")
+                marca = '?' if dialecto == DIALECTO_SQLSERVER else '%s'
+                texto = texto.replace(MARCADOR_LISTA, ','.join([marca] * tam_lista))
+            self._textos[clave] = texto
+        return texto
+
+    # ==================== EJECUCIÓN ====================
+
+    def ejecutar(self, cursor, nombre: str, params: Iterable[Any] = (),
+                 dialecto: Optional[str] = None, dedicado: bool = False):
+        """
+        Ejecuta una sentencia en el cursor (sin leer resultados)
+
+        Args:
+            dedicado: El cursor solo ejecuta esta sentencia
+                      (CursoresPreparados): con SQL Server los parámetros se
+                      declaran con los tipos registrados
+
+        Returns:
+            El cursor
+        """
+        with self.medir(nombre) as medicion:
+            self.ejecutar_sin_medir(cursor, nombre, params, dialecto, dedicado=dedicado)
+            medicion['filas'] = max(getattr(cursor, 'rowcount', 0) or 0, 0)
+        return cursor
+
+    def consultar(self, cursor, nombre: str, params: Iterable[Any] = (),
+                  dialecto: Optional[str] = None, dedicado: bool = False) -> List[Any]:
+        """Ejecuta una sentencia y devuelve todas sus filas"""
+        with self.medir(nombre) as medicion:
+            self.ejecutar_sin_medir(cursor, nombre, params, dialecto, dedicado=dedicado)
+            filas = cursor.fetchall()
+            medicion['filas'] = len(filas)
+        return filas
+
+    def consultar_en_bloques(self, cursor, nombre: str, valores: Iterable[Any],
+                             tam_bloque: int, params: Iterable[Any] = (),
+                             dialecto: Optional[str] = None,
+                             dedicado: bool = False) -> Iterator[Any]:
+        """
+        Ejecuta una sentencia lista_in por bloques de tamaño fijo
+
+        Todos los bloques llevan exactamente tam_bloque valores (el último
+        se rellena repitiendo su último valor), también cuando hay menos
+        valores que tam_bloque: un único texto y un único plan, sin importar
+        cuántos valores haya.
+
+        Args:
+            valores: Valores del IN (se eliminan duplicados)
+            tam_bloque: Valores por ejecución
+            params: Parámetros fijos que van después de la lista
+
+        Yields:
+            Filas de cada bloque, a medida que se van consultando
+        """
+        valores = list(dict.fromkeys(valores))
+        if not valores:
+            return
+
+        tam_bloque = max(1, tam_bloque)
+        params = tuple(params)
+
+        for inicio in range(0, len(valores), tam_bloque):
+            bloque = valores[inicio:inicio + tam_bloque]
+            bloque += [bloque[-1]] * (tam_bloque - len(bloque))
+
+            with self.medir(nombre) as medicion:
+                self.ejecutar_sin_medir(cursor, nombre, tuple(bloque) + params, dialecto,
+                                        tam_bloque, dedicado)
+                filas = cursor.fetchall()
+                medicion['filas'] = len(filas)
+            yield from filas
+
+    def ejecutar_sin_medir(self, cursor, nombre: str, params: Iterable[Any] = (),
+                           dialecto: Optional[str] = None, tam_lista: int = 0,
+                           dedicado: bool = False):
+        """Como ejecutar(), para cuando quien llama ya mide (medir())"""
+        dialecto = dialecto or self.dialecto
+        sql = self.texto(nombre, dialecto, tam_lista)
+        params = tuple(params)
+
+        if dedicado:
+            self._declarar_tipos(cursor, nombre, dialecto, tam_lista)
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        return cursor
+
+    def consultar_pool(self, origen, nombre: str, params: Iterable[Any] = (),
+                       timeout: Optional[float] = None) -> List[Any]:
+        """
+        Consulta con el cursor preparado de la sentencia en una conexión
+        del pool (ConnectionPool o DatabaseConnection)
+        """
+        with origen.sentencia(nombre, timeout) as cursor:
+            return self.consultar(cursor, nombre, params, dedicado=True)
+
+    @contextmanager
+    def medir(self, nombre: str):
+        """
+        Mide una ejecución hecha por quien llama (p. ej. con un cursor de
+        diccionarios). El bloque puede guardar las filas en medicion['filas'].
+        """
+        medicion = {'filas': 0}
+        inicio = time.perf_counter()
+        error = False
+        try:
+            yield medicion
+        except Exception:
+            error = True
+            raise
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            with self._lock:
+                estadisticas = self._estadisticas.get(nombre)
+                if estadisticas is None:
+                    estadisticas = self._estadisticas[nombre] = EstadisticasSentencia()
+                estadisticas.registrar(ms, medicion['filas'], error)
+
+    # ==================== MÉTRICAS ====================
+
+    def metricas(self) -> Dict[str, Dict[str, Any]]:
+        """Llamadas, errores, filas y latencias (p50/p95/máx, histograma) por sentencia"""
+        with self._lock:
+            return {nombre: e.como_dict() for nombre, e in sorted(self._estadisticas.items())}
+
+    def reiniciar_metricas(self):
+        with self._lock:
+            self._estadisticas.clear()
+
+    def resumen(self, top: int = 10, prefijo: str = '') -> List[str]:
+        """
+        Líneas de texto con las sentencias de mayor tiempo total
+
+        Args:
+            top: Número máximo de sentencias
+            prefijo: Solo sentencias cuyo nombre empieza así (p. ej. 'etl.')
+        """
+        metricas = sorted(
+            ((n, m) for n, m in self.metricas().items() if n.startswith(prefijo)),
+            key=lambda m: m[1]['total_ms'], reverse=True
+        )
+        lineas = []
+        for nombre, m in metricas[:top]:
+            lineas.append(
+                f"{nombre}: {m['llamadas']} llamadas, {m['total_ms']:.0f} ms total, "
+                f"p50 {m['p50_ms']:.0f} ms, p95 {m['p95_ms']:.0f} ms, máx {m['max_ms']:.0f} ms"
+                + (f", {m['errores']} errores" if m['errores'] else '')
+            )
+        return lineas
+
+    # ==================== TIPOS DE PARÁMETROS ====================
+
+    def _declarar_tipos(self, cursor, nombre: str, dialecto: str, tam_lista: int):
+        """setinputsizes con los tipos registrados (pyodbc / SQL Server)"""
+        if dialecto != DIALECTO_SQLSERVER or not PYODBC_AVAILABLE or not hasattr(cursor, 'setinputsizes'):
+            return
+
+        clave = (nombre, tam_lista)
+        if clave not in self._tamanos:
+            sentencia = self.obtener(nombre)
+            tipos = list(sentencia.tipos)
+            if sentencia.lista_in and tipos:
+                tipos = [tipos[0]] * tam_lista + tipos[1:]
+            try:
+                self._tamanos[clave] = [_tamano_pyodbc(t) for t in tipos] or None
+            except (ValueError, AttributeError) as e:
+                logger.warning(f"⚠️  Tipos inválidos en {nombre}: {e}")
+                self._tamanos[clave] = None
+
+        tamanos = self._tamanos[clave]
+        if tamanos is not None:
+            cursor.setinputsizes(tamanos)
+
+
+def _tamano_pyodbc(tipo: str) -> Tuple[int, int, int]:
+    """'str:100' → (SQL_WVARCHAR, 100, 0), 'varchar:100' → (SQL_VARCHAR, 100, 0), etc."""
+    base, _, detalle = tipo.partition(':')
+    if base == 'int':
+        return (pyodbc.SQL_INTEGER, 0, 0)
+    if base == 'bigint':
+        return (pyodbc.SQL_BIGINT, 0, 0)
+    if base == 'bit':
+        return (pyodbc.SQL_BIT, 0, 0)
+    if base == 'str':
+        return (pyodbc.SQL_WVARCHAR, int(detalle or 255), 0)
+    if base == 'varchar':
+        return (pyodbc.SQL_VARCHAR, int(detalle or 255), 0)
+    if base == 'decimal':
+        precision, _, escala = (detalle or '18,2').partition(',')
+        return (pyodbc.SQL_DECIMAL, int(precision), int(escala or 0))
+    if base == 'date':
+        return (pyodbc.SQL_TYPE_DATE, 0, 0)
+    if base == 'datetime':
+        return (pyodbc.SQL_TYPE_TIMESTAMP, 23, 3)
+    raise ValueError(f"Tipo de parámetro desconocido: {tipo}")
+
+
+# ============================================================================
+# CURSORES PREPARADOS POR CONEXIÓN
+# ============================================================================
+
+class CursoresPreparados:
+    """
+    Un cursor por sentencia sobre una misma conexión
+
+    El cursor de cada sentencia solo ejecuta ese texto, así que el driver
+    lo prepara la primera vez y lo reutiliza en las siguientes (pyodbc
+    re-prepara solo si cambia el texto; mysql-connector con prepared=True
+    mantiene la sentencia preparada en el servidor). Los cursores comparten
+    la conexión y, por tanto, su transacción.
+    """
+
+    def __init__(self, conexion, registro: Optional[RegistroSentencias] = None,
+                 dialecto: Optional[str] = None):
+        """
+        Args:
+            conexion: Conexión DB-API
+            registro: Registro de sentencias (None = el global)
+            dialecto: None = dialecto del registro
+        """
+        self.conexion = conexion
+        self.registro = registro or get_registro_sentencias()
+        self.dialecto = dialecto or self.registro.dialecto
+        self._cursores: Dict[str, Any] = {}
+
+    def cursor(self, nombre: str):
+        """Cursor dedicado a la sentencia (se crea en el primer uso)"""
+        cursor = self._cursores.get(nombre)
+        if cursor is None:
+            self.registro.obtener(nombre)  # falla pronto si no existe
+            if self.dialecto == DIALECTO_MYSQL:
+                try:
+                    cursor = self.conexion.cursor(prepared=True)
+                except TypeError:
+                    cursor = self.conexion.cursor()
+            else:
+                cursor = self.conexion.cursor()
+            self._cursores[nombre] = cursor
+        return cursor
+
+    def ejecutar(self, nombre: str, params: Iterable[Any] = ()):
+        return self.registro.ejecutar(self.cursor(nombre), nombre, params, self.dialecto, dedicado=True)
+
+    def consultar(self, nombre: str, params: Iterable[Any] = ()) -> List[Any]:
+        return self.registro.consultar(self.cursor(nombre), nombre, params, self.dialecto, dedicado=True)
+
+    def consultar_en_bloques(self, nombre: str, valores: Iterable[Any], tam_bloque: int,
+                             params: Iterable[Any] = ()) -> Iterator[Any]:
+        return self.registro.consultar_en_bloques(
+            self.cursor(nombre), nombre, valores, tam_bloque, params, self.dialecto, dedicado=True
+        )
+
+    def cerrar(self):
+        """Cierra los cursores (la conexión sigue abierta)"""
+        for cursor in self._cursores.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._cursores.clear()
+
+
+# ============================================================================
+# INSTANCIA GLOBAL
+# ============================================================================
+
+_registro: Optional[RegistroSentencias] = None
+_registro_lock = threading.Lock()
+
+
+def get_registro_sentencias() -> RegistroSentencias:
+    """Registro de sentencias de la aplicación"""
+    global _registro
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroSentencias()
+    return _registro
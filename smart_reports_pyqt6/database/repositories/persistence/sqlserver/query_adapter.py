@@ -1,9 +1,54 @@
 """
 Query Adapter: MySQL → SQL Server
 Convierte queries MySQL a SQL Server para mantener compatibilidad
+
+OPTIMIZACIÓN: Traducciones compiladas y cacheadas
+- Los patrones se compilan una sola vez al importar el módulo
+- Cada traducción se guarda en un LRU (dialecto, SQL origen) → SQL destino
+  con cadenas internadas: la app repite las mismas pocas decenas de
+  sentencias y solo la primera vez paga las regex
+- Modo pretraducido (opcional, en build): las constantes de
+  queries_hutchison y CommonQueriesSQLServer se traducen de antemano a
+  query_adapter_pretraducidas.py y en runtime son un lookup en un dict:
+
+      python -m smart_reports_pyqt6.database.repositories.persistence.sqlserver.query_adapter --pretraducir
 """
 import re
-from typing import Tuple
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+# Pretraducciones generadas en build (opcional)
+try:
+    from smart_reports_pyqt6.database.repositories.persistence.sqlserver.query_adapter_pretraducidas import (
+        PRETRADUCIDAS
+    )
+except ImportError:
+    PRETRADUCIDAS = {}
+
+
+# Dialectos de destino (el origen siempre es MySQL)
+DIALECTO_SQLSERVER = 'sqlserver'
+DIALECTO_MYSQL = 'mysql'
+
+# Máximo de traducciones en el LRU
+MAX_TRADUCCIONES = 512
+
+# Módulo generado por el modo pretraducido
+ARCHIVO_PRETRADUCIDAS = Path(__file__).with_name('query_adapter_pretraducidas.py')
+
+# ==================== PATRONES PRECOMPILADOS ====================
+
+RE_LIMIT_FINAL = re.compile(r'\bLIMIT\s+(\d+)\s*$', re.IGNORECASE)
+RE_SELECT = re.compile(r'\bSELECT\b', re.IGNORECASE)
+RE_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE)
+RE_ON_DUPLICATE_KEY = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.IGNORECASE)
+RE_NOW = re.compile(r'\bNOW\(\)', re.IGNORECASE)
+RE_CURRENT_TIMESTAMP = re.compile(r'\bCURRENT_TIMESTAMP\b', re.IGNORECASE)
+RE_CURDATE = re.compile(r'\bCURDATE\(\)', re.IGNORECASE)
+RE_BACKTICKS = re.compile(r'`([^`]+)`')
 
 
 class QueryAdapter:
@@ -21,17 +66,62 @@ class QueryAdapter:
     - Backticks → Corchetes
     """
 
+    # LRU (dialecto, SQL origen) → SQL destino
+    _cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+    _lock = threading.Lock()
+
+    # Traducciones hechas de antemano (build o pretraducir_constantes)
+    _pretraducidas: Dict[Tuple[str, str], str] = dict(PRETRADUCIDAS)
+
+    _stats = {'pretraducidas': 0, 'hits': 0, 'misses': 0}
+
     @staticmethod
-    def adapt_query(mysql_query: str) -> str:
+    def adapt_query(mysql_query: str, dialecto: str = DIALECTO_SQLSERVER) -> str:
         """
         Convierte una query MySQL a SQL Server
 
         Args:
             mysql_query: Query en sintaxis MySQL
+            dialecto: Dialecto de destino ('sqlserver' o 'mysql' = sin cambios)
 
         Returns:
             Query en sintaxis SQL Server
         """
+        clave = (dialecto, mysql_query)
+
+        # 1. Pretraducida: un lookup sin lock
+        traducida = QueryAdapter._pretraducidas.get(clave)
+        if traducida is not None:
+            QueryAdapter._stats['pretraducidas'] += 1
+            return traducida
+
+        # 2. LRU
+        with QueryAdapter._lock:
+            traducida = QueryAdapter._cache.get(clave)
+            if traducida is not None:
+                QueryAdapter._cache.move_to_end(clave)
+                QueryAdapter._stats['hits'] += 1
+                return traducida
+
+        # 3. Traducir (fuera del lock) y guardar
+        traducida = sys.intern(QueryAdapter._traducir(mysql_query, dialecto))
+
+        with QueryAdapter._lock:
+            QueryAdapter._cache[(dialecto, sys.intern(mysql_query))] = traducida
+            while len(QueryAdapter._cache) > MAX_TRADUCCIONES:
+                QueryAdapter._cache.popitem(last=False)
+            QueryAdapter._stats['misses'] += 1
+
+        return traducida
+
+    @staticmethod
+    def _traducir(mysql_query: str, dialecto: str) -> str:
+        """Aplica la cadena de conversiones (sin caché)"""
+        if dialecto == DIALECTO_MYSQL:
+            return mysql_query
+        if dialecto != DIALECTO_SQLSERVER:
+            raise ValueError(f"Dialecto no soportado: '{dialecto}'")
+
         query = mysql_query
 
         # 1. Reemplazar placeholders %s por ?
@@ -57,6 +147,101 @@ class QueryAdapter:
 
         return query
 
+    # ==================== CACHÉ Y PRETRADUCCIÓN ====================
+
+    @staticmethod
+    def pretraducir(consultas: Iterable[str], dialecto: str = DIALECTO_SQLSERVER) -> int:
+        """
+        Traduce de antemano un conjunto de consultas
+
+        Args:
+            consultas: Textos SQL (tal como se pasarán a adapt_query)
+            dialecto: Dialecto de destino
+
+        Returns:
+            Número de consultas pretraducidas
+        """
+        total = 0
+        for sql in consultas:
+            QueryAdapter._pretraducidas[(dialecto, sys.intern(sql))] = sys.intern(
+                QueryAdapter._traducir(sql, dialecto)
+            )
+            total += 1
+        return total
+
+    @staticmethod
+    def constantes_sql() -> Dict[str, str]:
+        """Constantes SQL de queries_hutchison y CommonQueriesSQLServer (nombre → SQL)"""
+        from smart_reports_pyqt6.database.models import queries_hutchison
+
+        constantes = {
+            f"queries_hutchison.{nombre}": valor
+            for nombre, valor in vars(queries_hutchison).items()
+            if nombre.startswith('QUERY_') and isinstance(valor, str)
+        }
+        constantes.update({
+            f"CommonQueriesSQLServer.{nombre}": valor
+            for nombre, valor in vars(CommonQueriesSQLServer).items()
+            if nombre.isupper() and isinstance(valor, str)
+        })
+        return constantes
+
+    @staticmethod
+    def pretraducir_constantes(dialecto: str = DIALECTO_SQLSERVER) -> int:
+        """Pretraduce en memoria todas las constantes SQL del proyecto"""
+        return QueryAdapter.pretraducir(QueryAdapter.constantes_sql().values(), dialecto)
+
+    @staticmethod
+    def generar_modulo_pretraducido(ruta: Path = ARCHIVO_PRETRADUCIDAS,
+                                    dialecto: str = DIALECTO_SQLSERVER) -> int:
+        """
+        Modo build: escribe las constantes ya traducidas en un módulo Python
+
+        Al importar query_adapter se cargan en el diccionario de
+        pretraducidas. Una constante que cambie después simplemente no se
+        encuentra y pasa por el LRU, por lo que un módulo desactualizado
+        nunca devuelve una traducción incorrecta.
+
+        Returns:
+            Número de consultas escritas
+        """
+        constantes = QueryAdapter.constantes_sql()
+        lineas = [
+            '"""',
+            'Traducciones pregeneradas de QueryAdapter (NO EDITAR)',
+            '',
+            'Generado con:',
+            '    python -m smart_reports_pyqt6.database.repositories.persistence.sqlserver.query_adapter --pretraducir',
+            '"""',
+            '',
+            'PRETRADUCIDAS = {',
+        ]
+        for nombre, sql in sorted(constantes.items()):
+            lineas.append(f"    # {nombre}")
+            lineas.append(f"    ({dialecto!r}, {sql!r}): {QueryAdapter._traducir(sql, dialecto)!r},")
+        lineas.append('}')
+
+        Path(ruta).write_text("\n".join(lineas) + "\n", encoding='utf-8')
+        return len(constantes)
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, int]:
+        """Estadísticas de la caché de traducciones"""
+        with QueryAdapter._lock:
+            return {
+                **QueryAdapter._stats,
+                'entries': len(QueryAdapter._cache),
+                'pretranslated_entries': len(QueryAdapter._pretraducidas)
+            }
+
+    @staticmethod
+    def clear_cache():
+        """Vacía el LRU (las pretraducidas se conservan)"""
+        with QueryAdapter._lock:
+            QueryAdapter._cache.clear()
+
+    # ==================== CONVERSIONES ====================
+
     @staticmethod
     def _convert_placeholders(query: str) -> str:
         """
@@ -85,19 +270,13 @@ class QueryAdapter:
             Query con TOP
         """
         # Buscar LIMIT al final
-        match = re.search(r'\bLIMIT\s+(\d+)\s*$', query, re.IGNORECASE)
+        match = RE_LIMIT_FINAL.search(query)
         if match:
             limit_value = match.group(1)
-            query = re.sub(r'\bLIMIT\s+\d+\s*$', '', query, flags=re.IGNORECASE)
+            query = query[:match.start()]
 
             # Insertar TOP después de SELECT
-            query = re.sub(
-                r'\bSELECT\b',
-                f'SELECT TOP {limit_value}',
-                query,
-                count=1,
-                flags=re.IGNORECASE
-            )
+            query = RE_SELECT.sub(f'SELECT TOP {limit_value}', query, count=1)
 
         return query
 
@@ -117,14 +296,10 @@ class QueryAdapter:
         Returns:
             Query con IF NOT EXISTS (simplificado, puede requerir ajuste manual)
         """
-        if re.search(r'\bINSERT\s+IGNORE\b', query, re.IGNORECASE):
-            # Simplificación: Remover IGNORE y confiar en constraints
-            query = re.sub(r'\bINSERT\s+IGNORE\b', 'INSERT', query, flags=re.IGNORECASE)
-
-            # ⚠️ NOTA: Esto puede causar errores si hay duplicados
-            # Para manejar correctamente, usar MERGE o TRY...CATCH
-
-        return query
+        # Simplificación: Remover IGNORE y confiar en constraints
+        # ⚠️ NOTA: Esto puede causar errores si hay duplicados
+        # Para manejar correctamente, usar MERGE o TRY...CATCH
+        return RE_INSERT_IGNORE.sub('INSERT', query)
 
     @staticmethod
     def _convert_on_duplicate_key(query: str) -> str:
@@ -150,7 +325,7 @@ class QueryAdapter:
         Returns:
             Query comentada con instrucciones (requiere conversión manual)
         """
-        if re.search(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', query, re.IGNORECASE):
+        if RE_ON_DUPLICATE_KEY.search(query):
             # Esta conversión es muy compleja, retornar comentario
             query = f"""
 -- ⚠️ CONVERSIÓN MANUAL REQUERIDA
@@ -187,13 +362,13 @@ class QueryAdapter:
             Query con funciones SQL Server
         """
         # NOW() → GETDATE()
-        query = re.sub(r'\bNOW\(\)', 'GETDATE()', query, flags=re.IGNORECASE)
+        query = RE_NOW.sub('GETDATE()', query)
 
         # CURRENT_TIMESTAMP → GETDATE()
-        query = re.sub(r'\bCURRENT_TIMESTAMP\b', 'GETDATE()', query, flags=re.IGNORECASE)
+        query = RE_CURRENT_TIMESTAMP.sub('GETDATE()', query)
 
         # CURDATE() → CAST(GETDATE() AS DATE)
-        query = re.sub(r'\bCURDATE\(\)', 'CAST(GETDATE() AS DATE)', query, flags=re.IGNORECASE)
+        query = RE_CURDATE.sub('CAST(GETDATE() AS DATE)', query)
 
         return query
 
@@ -211,16 +386,9 @@ class QueryAdapter:
         Returns:
             Query con corchetes
         """
-        # Reemplazar backticks por corchetes
-        query = query.replace('`', '[')
-        # Pero solo si hay pares
-        if '[' in query:
-            query = query.replace('[', '[', 1).replace('[', ']', query.count('[') // 2)
-
-        # Mejor: usar regex para pares
-        query = re.sub(r'`([^`]+)`', r'[\1]', query)
-
-        return query
+        if '`' not in query:
+            return query
+        return RE_BACKTICKS.sub(r'[\1]', query)
 
 
 # =============================================================================
@@ -389,6 +557,12 @@ class CommonQueriesSQLServer:
 # =============================================================================
 
 if __name__ == "__main__":
+    # Modo build: generar query_adapter_pretraducidas.py
+    if '--pretraducir' in sys.argv:
+        total = QueryAdapter.generar_modulo_pretraducido()
+        print(f"✅ {total} consultas pretraducidas en {ARCHIVO_PRETRADUCIDAS}")
+        sys.exit(0)
+
     print("="*70)
     print("QUERY ADAPTER: MySQL → SQL Server")
     print("="*70)
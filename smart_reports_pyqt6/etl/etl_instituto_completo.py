@@ -24,17 +24,25 @@ Fecha: 2025-01-18
 Versión: 1.0.0
 """
 
+import os
+import hashlib
 import pandas as pd
 import pyodbc
 import re
 import unicodedata
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, Optional, Tuple, Any, Set, Iterator, Iterable
 from dataclasses import dataclass
 from enum import Enum
 import logging
+import time
 from difflib import SequenceMatcher
 
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import (
+    CursoresPreparados,
+    get_registro_sentencias
+)
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -127,6 +135,16 @@ class ETLConfig:
 
     # ETL Settings
     batch_size: int = 1000
+    transform_mode: str = "vectorized"  # "vectorized" (columnar) | "iterrows" (fila por fila)
+    fast_executemany: bool = True  # Array binding de pyodbc (un round-trip por lote)
+    commit_mode: str = "transaction"  # "transaction" | "chunk" (commit por lote) | "savepoint"
+    load_strategy: str = "client"  # "client" (cachés + INSERT/UPDATE) | "merge" (#staging + MERGE)
+    preload_chunk_size: int = 1000  # Parámetros por consulta IN (SQL Server admite máx. 2100)
+    excel_chunk_size: int = 50000  # Filas por bloque al leer el Excel (0 = archivo completo)
+    delta_mode: bool = False  # Solo cargar filas nuevas o modificadas desde la última importación
+    delta_origen: Optional[str] = None  # Clave de las huellas (None = ruta completa del archivo)
+    refrescar_resumen: bool = True  # Refrescar instituto_ResumenProgreso al final de cada importación
+    incrementar_generaciones: bool = True  # False = las incrementa quien cierra el lote (orquestador)
     enable_validation: bool = True
     auto_create_modules: bool = True
 
@@ -318,6 +336,12 @@ COLUMN_VARIATIONS = {
     ]
 }
 
+# Palabras clave que identifican la fila de headers real en exports de CSOD
+KEYWORDS_HEADERS = ['usuario', 'user', 'módulo', 'module', 'training', 'capacitación']
+
+# Filas iniciales donde se buscan los headers (CSOD pone metadatos arriba)
+MAX_FILAS_BUSQUEDA_HEADERS = 10
+
 # Mapeo de estados del Excel a estados de BD
 ESTADO_MAPPING = {
     'terminado': EstatusModulo.TERMINADO,
@@ -335,6 +359,160 @@ ESTADO_MAPPING = {
     'pending': EstatusModulo.NO_INICIADO
 }
 
+# Patrón para extraer el número de módulo del título ("MÓDULO 8", "Modulo 8")
+PATRON_NUMERO_MODULO = r'M[OÓ]DULO\s+(\d+)'
+RE_NUMERO_MODULO = re.compile(PATRON_NUMERO_MODULO, re.IGNORECASE)
+RE_ESPACIOS = re.compile(r'\s+')
+
+# Umbral mínimo de similitud para el fuzzy matching de títulos
+UMBRAL_FUZZY_MODULO = 0.8
+
+# Formatos de fecha soportados (en orden de prioridad)
+FORMATOS_FECHA = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y'
+]
+
+# Límite de parámetros por sentencia en SQL Server (2100) con margen
+MAX_PARAMETROS_SQLSERVER = 2000
+
+# ============================================================================
+# SENTENCIAS REGISTRADAS (precargas y búsquedas)
+# ============================================================================
+# Texto único y tipos de parámetros fijos por sentencia; se ejecutan con un
+# cursor preparado por sentencia (CursoresPreparados) y sus latencias quedan
+# en el registro central.
+
+_registro_sentencias = get_registro_sentencias()
+
+_registro_sentencias.registrar(
+    'etl.modulos_activos',
+    sqlserver="SELECT IdModulo, NombreModulo FROM instituto_Modulo WHERE Activo = 1",
+    descripcion="Precarga de módulos",
+)
+_registro_sentencias.registrar(
+    'etl.unidades_activas',
+    sqlserver="SELECT IdUnidadDeNegocio, NombreUnidad FROM instituto_UnidadDeNegocio WHERE Activo = 1",
+    descripcion="Precarga de unidades de negocio",
+)
+_registro_sentencias.registrar(
+    'etl.departamentos_activos',
+    sqlserver="""
+            SELECT IdDepartamento, IdUnidadDeNegocio, NombreDepartamento
+            FROM instituto_Departamento
+            WHERE Activo = 1
+        """,
+    descripcion="Precarga de departamentos",
+)
+_registro_sentencias.registrar(
+    'etl.evaluaciones_activas',
+    sqlserver="""
+            SELECT IdEvaluacion, IdModulo, PuntajeMinimo
+            FROM instituto_Evaluacion
+            WHERE Activo = 1
+        """,
+    descripcion="Precarga de evaluaciones",
+)
+_registro_sentencias.registrar(
+    'etl.usuarios_por_userid',
+    sqlserver="""
+            SELECT IdUsuario, UserId
+            FROM instituto_Usuario
+            WHERE UserId IN ({placeholders})
+        """,
+    tipos=('varchar:100',),
+    lista_in=True,
+    descripcion="Precarga de usuarios existentes (por bloques)",
+)
+_registro_sentencias.registrar(
+    'etl.progresos_por_userid',
+    sqlserver="""
+            SELECT p.IdUsuario, p.IdModulo, p.IdInscripcion
+            FROM instituto_ProgresoModulo p
+            INNER JOIN instituto_Usuario u ON p.IdUsuario = u.IdUsuario
+            WHERE u.UserId IN ({placeholders})
+        """,
+    tipos=('varchar:100',),
+    lista_in=True,
+    descripcion="Precarga de inscripciones existentes (por bloques)",
+)
+_registro_sentencias.registrar(
+    'etl.intentos_por_userid',
+    sqlserver="""
+            SELECT r.IdInscripcion, r.IdEvaluacion, COUNT(*) AS total
+            FROM instituto_ResultadoEvaluacion r
+            INNER JOIN instituto_ProgresoModulo p ON r.IdInscripcion = p.IdInscripcion
+            INNER JOIN instituto_Usuario u ON p.IdUsuario = u.IdUsuario
+            WHERE u.UserId IN ({placeholders})
+            GROUP BY r.IdInscripcion, r.IdEvaluacion
+        """,
+    tipos=('varchar:100',),
+    lista_in=True,
+    descripcion="Precarga de intentos de evaluación (por bloques)",
+)
+_registro_sentencias.registrar(
+    'etl.modulo_por_nombre',
+    sqlserver="SELECT IdModulo FROM instituto_Modulo WHERE NombreModulo = ?",
+    tipos=('varchar:255',),
+    descripcion="Búsqueda de módulo fuera de la precarga",
+)
+_registro_sentencias.registrar(
+    'etl.evaluacion_por_modulo',
+    sqlserver="""
+            SELECT IdEvaluacion
+            FROM instituto_Evaluacion
+            WHERE IdModulo = ? AND Activo = 1
+        """,
+    tipos=('int',),
+    descripcion="Evaluación activa de un módulo recién creado",
+)
+_registro_sentencias.registrar(
+    'etl.unidad_por_nombre',
+    sqlserver="SELECT IdUnidadDeNegocio FROM instituto_UnidadDeNegocio WHERE NombreUnidad = ?",
+    tipos=('varchar:255',),
+    descripcion="Búsqueda de unidad fuera de la precarga",
+)
+_registro_sentencias.registrar(
+    'etl.departamento_por_nombre',
+    sqlserver="""
+            SELECT IdDepartamento
+            FROM instituto_Departamento
+            WHERE IdUnidadDeNegocio = ? AND NombreDepartamento = ?
+        """,
+    tipos=('int', 'varchar:255'),
+    descripcion="Búsqueda de departamento fuera de la precarga",
+)
+_registro_sentencias.registrar(
+    'etl.huellas_por_origen',
+    sqlserver="SELECT Huella FROM instituto_HuellaImportacion WHERE Origen = ?",
+    tipos=('varchar:255',),
+    descripcion="Huellas de la importación anterior (modo delta)",
+)
+
+# Largo de instituto_HuellaImportacion.Origen (VARCHAR(255))
+LARGO_MAX_ORIGEN_DELTA = 255
+
+# Tablas que modifica cada contador de estadísticas (para las generaciones
+# de datos que invalidan la caché de la app)
+TABLAS_POR_ESTADISTICA = {
+    'usuarios_nuevos': ('instituto_Usuario',),
+    'usuarios_actualizados': ('instituto_Usuario',),
+    'progresos_insertados': ('instituto_ProgresoModulo',),
+    'progresos_actualizados': ('instituto_ProgresoModulo',),
+    'calificaciones_registradas': ('instituto_ResultadoEvaluacion', 'instituto_ProgresoModulo'),
+    'modulos_creados': ('instituto_Modulo',),
+    'evaluaciones_creadas': ('instituto_Evaluacion',),
+    'unidades_creadas': ('instituto_UnidadDeNegocio',),
+    'departamentos_creados': ('instituto_Departamento',),
+    'resumen_filas': ('instituto_ResumenProgreso',),
+}
+
 # Porcentaje por estado
 PORCENTAJE_POR_ESTADO = {
     EstatusModulo.TERMINADO: 100,
@@ -344,6 +522,281 @@ PORCENTAJE_POR_ESTADO = {
 }
 
 
+# ============================================================================
+# RESOLUCIÓN DE TÍTULOS A MÓDULOS
+# ============================================================================
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza texto para matching case-insensitive
+
+    - Convierte a minúsculas
+    - Quita acentos
+    - Quita espacios extras
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        Texto normalizado
+    """
+    if not texto or pd.isna(texto):
+        return ""
+
+    # Convertir a string y minúsculas
+    texto = str(texto).lower().strip()
+
+    # Quitar acentos
+    texto = ''.join(
+        c for c in unicodedata.normalize('NFD', texto)
+        if unicodedata.category(c) != 'Mn'
+    )
+
+    # Normalizar espacios
+    return RE_ESPACIOS.sub(' ', texto)
+
+
+def extraer_numero_modulo(titulo: str) -> Optional[int]:
+    """
+    Extrae el número de módulo del título usando el regex precompilado
+
+    Soporta variaciones como:
+    - "MÓDULO 8 - PROCESOS DE RRHH"
+    - "Modulo 8: Procesos"
+    - "MODULE 8 Procesos"
+
+    Args:
+        titulo: Título del módulo/capacitación
+
+    Returns:
+        Número del módulo (1-14) o None si no se encuentra
+    """
+    if not titulo or pd.isna(titulo):
+        return None
+
+    match = RE_NUMERO_MODULO.search(str(titulo))
+    if match:
+        num = int(match.group(1))
+        if 1 <= num <= 14:
+            return num
+
+    return None
+
+
+class IndiceTitulosModulo:
+    """
+    Índice memoizado de títulos de capacitación → número de módulo
+
+    Un Training Report trae cientos de miles de filas pero solo unos cientos
+    de títulos distintos. El índice:
+    - Precalcula una sola vez los nombres normalizados de MODULOS_MAPPING y
+      las claves normalizadas de EVALUACIONES_A_MODULOS
+    - Resuelve cada título distinto exactamente una vez (regex → clave de
+      evaluación → fuzzy) y guarda el resultado, incluso cuando es None
+    - Lleva estadísticas de aciertos/fallos de la memoización y de qué
+      método resolvió cada título
+    """
+
+    def __init__(self):
+        self._nombres_normalizados = [
+            (num, normalizar_texto(nombre)) for num, nombre in MODULOS_MAPPING.items()
+        ]
+        # Las claves se normalizan igual que el título; sin esto las claves
+        # con acento ("filosofía", "informática") nunca coincidían
+        self._claves_evaluaciones = [
+            (normalizar_texto(clave), num) for clave, num in EVALUACIONES_A_MODULOS.items()
+        ]
+        self._resueltos: Dict[Any, Optional[int]] = {}
+        self.stats = {
+            'aciertos': 0,
+            'fallos': 0,
+            'regex': 0,
+            'evaluaciones': 0,
+            'fuzzy': 0,
+            'no_identificados': 0,
+        }
+
+    def resolver(self, titulo: str) -> Optional[int]:
+        """
+        Número de módulo de un título (memoizado)
+
+        Args:
+            titulo: Título de la capacitación
+
+        Returns:
+            Número del módulo o None si no se identifica
+        """
+        try:
+            num_modulo = self._resueltos[titulo]
+            self.stats['aciertos'] += 1
+            return num_modulo
+        except KeyError:
+            self.stats['fallos'] += 1
+
+        num_modulo = extraer_numero_modulo(titulo)
+        if num_modulo:
+            self.stats['regex'] += 1
+        else:
+            num_modulo = self.identificar_por_tema(titulo)
+
+        self._resueltos[titulo] = num_modulo
+        return num_modulo
+
+    def identificar_por_tema(self, titulo: str) -> Optional[int]:
+        """
+        Identifica el módulo por claves de evaluación o fuzzy matching
+
+        Útil para títulos que no tienen "MÓDULO X" pero mencionan el tema
+        Ejemplo: "Ciberseguridad - Prueba Final" → Módulo 6
+
+        Args:
+            titulo: Título de la capacitación
+
+        Returns:
+            Número del módulo o None
+        """
+        titulo_norm = normalizar_texto(titulo)
+
+        # Buscar en mapeo de evaluaciones
+        for clave, num_modulo in self._claves_evaluaciones:
+            if clave in titulo_norm:
+                self.stats['evaluaciones'] += 1
+                return num_modulo
+
+        # Fuzzy matching con nombres de módulos
+        best_match_score = 0
+        best_match_num = None
+
+        for num, nombre_norm in self._nombres_normalizados:
+            score = SequenceMatcher(None, titulo_norm, nombre_norm).ratio()
+
+            if score > best_match_score and score >= UMBRAL_FUZZY_MODULO:
+                best_match_score = score
+                best_match_num = num
+
+        if best_match_num:
+            self.stats['fuzzy'] += 1
+            logger.info(f"🔍 Fuzzy match: '{titulo}' → Módulo {best_match_num} (score: {best_match_score:.2f})")
+        else:
+            self.stats['no_identificados'] += 1
+
+        return best_match_num
+
+    def resolver_columna(self, titulos: pd.Series) -> pd.Series:
+        """
+        Resuelve una columna completa de títulos
+
+        Solo se resuelven los títulos distintos (titulos.unique()); el
+        resultado se expande a la columna con un map.
+
+        Args:
+            titulos: Columna de títulos de capacitación
+
+        Returns:
+            Serie float con el número de módulo (NaN si no se identifica)
+        """
+        unicos = titulos.dropna().unique()
+        resueltos = {titulo: self.resolver(titulo) for titulo in unicos}
+        return pd.to_numeric(titulos.map(resueltos), errors='coerce').astype(float)
+
+
+# ============================================================================
+# ESCRITURA EN LOTES
+# ============================================================================
+
+class BatchWriter:
+    """
+    Escritor en lotes para executemany sobre pyodbc
+
+    - Activa fast_executemany (array binding) en el cursor
+    - Envía las filas en lotes de batch_size
+    - Según commit_mode:
+        * "transaction": todo el archivo en una sola transacción (default)
+        * "chunk": COMMIT después de cada lote
+        * "savepoint": SAVE TRANSACTION antes de cada lote; si un lote falla
+          se revierte solo ese lote y se continúa con el siguiente
+    - Registra filas/segundo por lote en stats['escrituras']
+    """
+
+    def __init__(self, connection, cursor, config: ETLConfig, stats: Dict[str, Any]):
+        """
+        Args:
+            connection: Conexión pyodbc
+            cursor: Cursor pyodbc
+            config: Configuración del ETL (batch_size, commit_mode, fast_executemany)
+            stats: Diccionario de estadísticas del ETL
+        """
+        self.connection = connection
+        self.cursor = cursor
+        self.batch_size = max(1, config.batch_size)
+        self.commit_mode = config.commit_mode
+        self.stats = stats
+
+        if config.fast_executemany:
+            self.cursor.fast_executemany = True
+
+    def escribir(self, operacion: str, sql: str, filas: List[tuple]) -> int:
+        """
+        Ejecuta sql para todas las filas, lote por lote
+
+        Args:
+            operacion: Nombre de la operación (para logs y métricas)
+            sql: Sentencia parametrizada
+            filas: Parámetros de cada fila
+
+        Returns:
+            Número de filas escritas
+        """
+        total_lotes = (len(filas) + self.batch_size - 1) // self.batch_size
+        escritas = 0
+        segundos_total = 0.0
+
+        for num_lote, inicio in enumerate(range(0, len(filas), self.batch_size), 1):
+            lote = filas[inicio:inicio + self.batch_size]
+            t0 = time.perf_counter()
+
+            if self.commit_mode == "savepoint":
+                self.cursor.execute(f"SAVE TRANSACTION lote_{num_lote}")
+
+            try:
+                self.cursor.executemany(sql, lote)
+            except pyodbc.Error as e:
+                if self.commit_mode != "savepoint":
+                    raise
+
+                self.cursor.execute(f"ROLLBACK TRANSACTION lote_{num_lote}")
+                error_msg = f"{operacion}: lote {num_lote}/{total_lotes} revertido ({len(lote):,} filas): {e}"
+                self.stats['errores'].append(error_msg)
+                logger.warning(f"⚠️  {error_msg}")
+                continue
+
+            if self.commit_mode == "chunk":
+                self.connection.commit()
+
+            segundos = time.perf_counter() - t0
+            escritas += len(lote)
+            segundos_total += segundos
+
+            self.stats['escrituras'].append({
+                'operacion': operacion,
+                'lote': num_lote,
+                'filas': len(lote),
+                'segundos': segundos
+            })
+            logger.debug(
+                f"   💾 {operacion}: lote {num_lote}/{total_lotes} · {len(lote):,} filas · "
+                f"{len(lote) / segundos if segundos else 0:,.0f} filas/s"
+            )
+
+        if escritas and segundos_total:
+            logger.info(
+                f"   💾 {operacion}: {escritas:,} filas en {total_lotes} lotes "
+                f"({escritas / segundos_total:,.0f} filas/s)"
+            )
+
+        return escritas
+
+
 # ============================================================================
 # CLASE PRINCIPAL ETL
 # ============================================================================
@@ -360,16 +813,20 @@ class ETLInstitutoCompleto:
     5. Reporte: Generar estadísticas de la importación
     """
 
-    def __init__(self, config: ETLConfig):
+    def __init__(self, config: ETLConfig, conectar: bool = True):
         """
         Inicializa el sistema ETL
 
         Args:
             config: Configuración del ETL
+            conectar: Si es False no se abre conexión (solo lectura, p. ej.
+                      para que el orquestador detecte el tipo de reporte)
         """
         self.config = config
         self.connection: Optional[pyodbc.Connection] = None
         self.cursor: Optional[pyodbc.Cursor] = None
+        # Cursores preparados de las sentencias registradas (misma conexión)
+        self.sentencias: Optional[CursoresPreparados] = None
 
         # Columnas detectadas en el Excel
         self.detected_columns: Dict[str, str] = {}
@@ -381,6 +838,14 @@ class ETLInstitutoCompleto:
         self._cache_departamentos: Dict[Tuple[int, str], int] = {}
         self._cache_usuarios: Dict[str, int] = {}
         self._cache_progresos: Dict[Tuple[int, int], int] = {}  # (IdUsuario, IdModulo) → IdInscripcion
+        self._cache_puntajes_minimos: Dict[int, float] = {}  # IdEvaluacion → PuntajeMinimo
+        self._cache_intentos: Dict[Tuple[int, int], int] = {}  # (IdInscripcion, IdEvaluacion) → intentos
+
+        # Índice memoizado de títulos → número de módulo
+        self._indice_titulos = IndiceTitulosModulo()
+
+        # Módulos cuyo progreso cambió (para refrescar solo su parte del resumen)
+        self._modulos_modificados: Set[int] = set()
 
         # Estadísticas
         self.stats = {
@@ -394,12 +859,21 @@ class ETLInstitutoCompleto:
             'unidades_creadas': 0,
             'departamentos_creados': 0,
             'errores': [],
+            'escrituras': [],  # Métricas por lote: operacion, lote, filas, segundos
+            'filas_leidas': 0,  # Filas del Excel (todas, también las omitidas por delta)
+            'filas_sin_cambios': 0,  # Modo delta: filas omitidas por huella conocida
+            'resumen_filas': 0,  # Filas de instituto_ResumenProgreso recalculadas
+            'titulos': self._indice_titulos.stats,  # Aciertos/fallos del índice de títulos
             'tiempo_inicio': None,
             'tiempo_fin': None
         }
 
+        # Escritor en lotes (se crea al conectar)
+        self.writer: Optional[BatchWriter] = None
+
         # Conectar a BD
-        self._conectar_bd()
+        if conectar:
+            self._conectar_bd()
 
     # ========================================================================
     # CONEXIÓN A BASE DE DATOS
@@ -429,6 +903,8 @@ class ETLInstitutoCompleto:
 
             self.connection = pyodbc.connect(conn_str, autocommit=False)
             self.cursor = self.connection.cursor()
+            self.sentencias = CursoresPreparados(self.connection, dialecto='sqlserver')
+            self.writer = BatchWriter(self.connection, self.cursor, self.config, self.stats)
 
             logger.info(f"✅ Conectado a SQL Server: {self.config.server}/{self.config.database}")
 
@@ -438,6 +914,8 @@ class ETLInstitutoCompleto:
 
     def cerrar_conexion(self):
         """Cierra la conexión a la BD"""
+        if self.sentencias:
+            self.sentencias.cerrar()
         if self.cursor:
             self.cursor.close()
         if self.connection:
@@ -478,15 +956,14 @@ class ETLInstitutoCompleto:
                 logger.warning("⚠️  Headers no detectados en fila 0, buscando headers reales...")
 
                 # Buscar headers reales en las primeras 10 filas
-                for skip_rows in range(1, 11):
+                for skip_rows in range(1, MAX_FILAS_BUSQUEDA_HEADERS + 1):
                     try:
                         df_test = pd.read_excel(archivo_excel, skiprows=skip_rows, engine='openpyxl')
 
                         # Verificar si encontramos columnas conocidas
                         cols_str = ' '.join(str(c).lower() for c in df_test.columns)
-                        keywords = ['usuario', 'user', 'módulo', 'module', 'training', 'capacitación']
 
-                        if any(kw in cols_str for kw in keywords):
+                        if any(kw in cols_str for kw in KEYWORDS_HEADERS):
                             logger.info(f"✅ Headers encontrados en fila {skip_rows}")
                             return df_test
                     except:
@@ -501,6 +978,141 @@ class ETLInstitutoCompleto:
             logger.error(f"❌ Error leyendo Excel {archivo_excel}: {e}")
             raise
 
+    def _leer_excel_en_bloques(self, archivo_excel: str) -> Iterator[pd.DataFrame]:
+        """
+        Lee el Excel en una sola pasada y entrega DataFrames por bloques
+
+        Usa openpyxl en modo read_only: las primeras filas se escanean una
+        única vez para encontrar los headers (mismo criterio que
+        _leer_excel_con_deteccion_headers) y el resto se va entregando en
+        bloques de config.excel_chunk_size filas, de modo que la memoria
+        queda acotada al tamaño del bloque.
+
+        Los .xls (no soportados por openpyxl) se leen completos con el
+        lector anterior y se entregan como un único bloque.
+
+        Args:
+            archivo_excel: Ruta al archivo Excel
+
+        Yields:
+            DataFrames con los datos, con los mismos nombres de columna
+        """
+        if not str(archivo_excel).lower().endswith(('.xlsx', '.xlsm')):
+            yield self._leer_excel_con_deteccion_headers(archivo_excel)
+            return
+
+        from openpyxl import load_workbook
+
+        tam_bloque = self.config.excel_chunk_size or None
+
+        try:
+            wb = load_workbook(archivo_excel, read_only=True, data_only=True)
+        except Exception as e:
+            logger.error(f"❌ Error leyendo Excel {archivo_excel}: {e}")
+            raise
+
+        try:
+            filas = wb.worksheets[0].iter_rows(values_only=True)
+
+            # Escanear las primeras filas una sola vez
+            iniciales = []
+            for fila in filas:
+                iniciales.append(fila)
+                if len(iniciales) > MAX_FILAS_BUSQUEDA_HEADERS:
+                    break
+
+            if not iniciales:
+                return
+
+            # Como pandas, el ancho de la tabla lo define la fila más larga
+            num_columnas = max(len(self._sin_celdas_vacias_al_final(f)) for f in iniciales)
+
+            fila_header = self._detectar_fila_headers(iniciales, num_columnas)
+            columnas = self._nombres_columnas(iniciales[fila_header], num_columnas)
+
+            def datos():
+                yield from iniciales[fila_header + 1:]
+                yield from filas
+
+            bloque = []
+            for fila in datos():
+                if all(v is None or v == '' for v in fila):
+                    continue
+
+                fila = tuple(fila[:num_columnas]) + (None,) * (num_columnas - len(fila))
+                bloque.append(fila)
+
+                if tam_bloque and len(bloque) >= tam_bloque:
+                    yield pd.DataFrame(bloque, columns=columnas)
+                    bloque = []
+
+            if bloque:
+                yield pd.DataFrame(bloque, columns=columnas)
+
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _sin_celdas_vacias_al_final(fila: tuple) -> List[Any]:
+        """Valores de la fila sin las celdas vacías del final"""
+        valores = list(fila)
+        while valores and valores[-1] in (None, ''):
+            valores.pop()
+        return valores
+
+    @staticmethod
+    def _detectar_fila_headers(filas: List[tuple], num_columnas: int) -> int:
+        """
+        Determina cuál de las primeras filas contiene los headers
+
+        Mismo criterio que _leer_excel_con_deteccion_headers: la fila 0 es
+        válida si no deja columnas sin nombre ('Unnamed'); si no, se busca
+        la primera fila con palabras clave conocidas.
+
+        Args:
+            filas: Primeras filas del Excel (valores)
+            num_columnas: Ancho de la tabla
+
+        Returns:
+            Índice de la fila de headers
+        """
+        primera = list(filas[0][:num_columnas]) + [None] * (num_columnas - len(filas[0]))
+        if all(v not in (None, '') for v in primera):
+            return 0
+
+        logger.warning("⚠️  Headers no detectados en fila 0, buscando headers reales...")
+
+        for num_fila, fila in enumerate(filas[1:], 1):
+            cols_str = ' '.join(str(v).lower() for v in fila if v is not None)
+
+            if any(kw in cols_str for kw in KEYWORDS_HEADERS):
+                logger.info(f"✅ Headers encontrados en fila {num_fila}")
+                return num_fila
+
+        logger.warning("⚠️  No se pudieron detectar headers automáticamente. Usando fila 0.")
+        return 0
+
+    @staticmethod
+    def _nombres_columnas(fila_header: tuple, num_columnas: int) -> List[str]:
+        """Nombres de columna al estilo pandas ('Unnamed: N', duplicados con '.1')"""
+        valores = list(fila_header[:num_columnas]) + [None] * (num_columnas - len(fila_header))
+
+        columnas = []
+        vistos: Dict[str, int] = {}
+
+        for i, valor in enumerate(valores):
+            nombre = f"Unnamed: {i}" if valor in (None, '') else str(valor)
+
+            if nombre in vistos:
+                vistos[nombre] += 1
+                nombre = f"{nombre}.{vistos[nombre]}"
+            else:
+                vistos[nombre] = 0
+
+            columnas.append(nombre)
+
+        return columnas
+
     def _detectar_columnas(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         Detecta automáticamente las columnas del Excel (Español/Inglés)
@@ -539,70 +1151,17 @@ class ETLInstitutoCompleto:
 
     @staticmethod
     def _normalizar_texto(texto: str) -> str:
-        """
-        Normaliza texto para matching case-insensitive
-
-        - Convierte a minúsculas
-        - Quita acentos
-        - Quita espacios extras
-
-        Args:
-            texto: Texto a normalizar
-
-        Returns:
-            Texto normalizado
-        """
-        if not texto or pd.isna(texto):
-            return ""
-
-        # Convertir a string y minúsculas
-        texto = str(texto).lower().strip()
-
-        # Quitar acentos
-        texto = ''.join(
-            c for c in unicodedata.normalize('NFD', texto)
-            if unicodedata.category(c) != 'Mn'
-        )
-
-        # Normalizar espacios
-        texto = re.sub(r'\s+', ' ', texto)
-
-        return texto
+        """Normaliza texto para matching (ver normalizar_texto)"""
+        return normalizar_texto(texto)
 
     @staticmethod
     def _extraer_numero_modulo(titulo: str) -> Optional[int]:
-        """
-        Extrae el número de módulo del título usando regex
-
-        Soporta variaciones como:
-        - "MÓDULO 8 - PROCESOS DE RRHH"
-        - "Modulo 8: Procesos"
-        - "MODULE 8 Procesos"
-
-        Args:
-            titulo: Título del módulo/capacitación
-
-        Returns:
-            Número del módulo (1-14) o None si no se encuentra
-        """
-        if not titulo or pd.isna(titulo):
-            return None
-
-        # Buscar "MÓDULO X" o "MODULE X" (case-insensitive)
-        match = re.search(r'M[OÓ]DULO\s+(\d+)', str(titulo), re.IGNORECASE)
-        if match:
-            num = int(match.group(1))
-            if 1 <= num <= 14:
-                return num
-
-        return None
+        """Extrae el número de módulo del título (ver extraer_numero_modulo)"""
+        return extraer_numero_modulo(titulo)
 
     def _identificar_modulo_fuzzy(self, titulo: str) -> Optional[int]:
         """
-        Identifica módulo usando fuzzy matching si regex falla
-
-        Útil para títulos que no tienen "MÓDULO X" pero mencionan el tema
-        Ejemplo: "Ciberseguridad - Prueba Final" → Módulo 6
+        Identifica módulo usando claves de evaluación o fuzzy matching
 
         Args:
             titulo: Título de la capacitación
@@ -610,29 +1169,22 @@ class ETLInstitutoCompleto:
         Returns:
             Número del módulo o None
         """
-        titulo_norm = self._normalizar_texto(titulo)
-
-        # Buscar en mapeo de evaluaciones
-        for key, num_modulo in EVALUACIONES_A_MODULOS.items():
-            if key in titulo_norm:
-                return num_modulo
-
-        # Fuzzy matching con nombres de módulos (umbral 80%)
-        best_match_score = 0
-        best_match_num = None
+        return self._indice_titulos.identificar_por_tema(titulo)
 
-        for num, nombre in MODULOS_MAPPING.items():
-            nombre_norm = self._normalizar_texto(nombre)
-            score = SequenceMatcher(None, titulo_norm, nombre_norm).ratio()
+    def _numeros_modulo_columna(self, titulos: pd.Series) -> pd.Series:
+        """
+        Versión columnar de la identificación de módulos
 
-            if score > best_match_score and score >= 0.8:
-                best_match_score = score
-                best_match_num = num
+        Cada título distinto se resuelve una sola vez por importación a
+        través de IndiceTitulosModulo.
 
-        if best_match_num:
-            logger.info(f"🔍 Fuzzy match: '{titulo}' → Módulo {best_match_num} (score: {best_match_score:.2f})")
+        Args:
+            titulos: Columna de títulos de capacitación
 
-        return best_match_num
+        Returns:
+            Serie float con el número de módulo (NaN si no se identifica)
+        """
+        return self._indice_titulos.resolver_columna(titulos)
 
     def _normalizar_estatus(self, estatus_excel: str) -> str:
         """
@@ -689,20 +1241,9 @@ class ETLInstitutoCompleto:
             return fecha_valor if isinstance(fecha_valor, datetime) else fecha_valor.to_pydatetime()
 
         # Intentar múltiples formatos
-        formatos = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            '%d/%m/%Y %H:%M:%S',
-            '%d/%m/%Y',
-            '%m/%d/%Y %H:%M:%S',
-            '%m/%d/%Y',
-            '%Y/%m/%d',
-            '%d-%m-%Y'
-        ]
-
         fecha_str = str(fecha_valor).strip()
 
-        for formato in formatos:
+        for formato in FORMATOS_FECHA:
             try:
                 return datetime.strptime(fecha_str, formato)
             except:
@@ -711,19 +1252,59 @@ class ETLInstitutoCompleto:
         logger.warning(f"⚠️  No se pudo parsear fecha: {fecha_valor}")
         return None
 
-    # ========================================================================
-    # PRECARGA DE DATOS (Optimización - Evita N+1 queries)
-    # ========================================================================
+    def _parse_fechas_columna(self, serie: pd.Series) -> pd.Series:
+        """
+        Versión columnar de _parse_fecha
+
+        Los valores que ya son fecha se convierten directamente; el resto se
+        parsea con pd.to_datetime probando cada formato de FORMATOS_FECHA
+        solo sobre los valores que aún no se han podido interpretar.
+
+        Args:
+            serie: Columna de fechas del Excel
+
+        Returns:
+            Serie datetime64 (NaT donde no hay fecha válida)
+        """
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return serie
+
+        valores = serie.astype(object)
+        resultado = pd.Series(pd.NaT, index=valores.index, dtype='datetime64[ns]')
+
+        es_fecha = valores.map(lambda v: isinstance(v, datetime))
+        if es_fecha.any():
+            resultado[es_fecha] = pd.to_datetime(valores[es_fecha])
+
+        textos = valores[~es_fecha & valores.notna()].astype(str).str.strip()
+        textos = textos[textos != '']
+
+        for formato in FORMATOS_FECHA:
+            if textos.empty:
+                break
+            parseadas = pd.to_datetime(textos, format=formato, errors='coerce')
+            validas = parseadas.notna()
+            resultado.loc[parseadas.index[validas]] = parseadas[validas]
+            textos = textos[~validas]
+
+        if not textos.empty:
+            logger.warning(
+                f"⚠️  No se pudieron parsear {len(textos):,} fechas "
+                f"(ej: {textos.iloc[0]})"
+            )
+
+        return resultado
+
+    # ========================================================================
+    # PRECARGA DE DATOS (Optimización - Evita N+1 queries)
+    # ========================================================================
 
     def _precargar_modulos(self):
         """Precarga módulos en caché"""
         if self._cache_modulos:
             return  # Ya está cargado
 
-        query = "SELECT IdModulo, NombreModulo FROM instituto_Modulo WHERE Activo = 1"
-        self.cursor.execute(query)
-
-        for row in self.cursor.fetchall():
+        for row in self.sentencias.consultar('etl.modulos_activos'):
             self._cache_modulos[row.NombreModulo] = row.IdModulo
 
         logger.info(f"✅ Módulos precargados: {len(self._cache_modulos)}")
@@ -733,10 +1314,7 @@ class ETLInstitutoCompleto:
         if self._cache_unidades:
             return
 
-        query = "SELECT IdUnidadDeNegocio, NombreUnidad FROM instituto_UnidadDeNegocio WHERE Activo = 1"
-        self.cursor.execute(query)
-
-        for row in self.cursor.fetchall():
+        for row in self.sentencias.consultar('etl.unidades_activas'):
             self._cache_unidades[row.NombreUnidad] = row.IdUnidadDeNegocio
 
         logger.info(f"✅ Unidades de negocio precargadas: {len(self._cache_unidades)}")
@@ -746,22 +1324,34 @@ class ETLInstitutoCompleto:
         if self._cache_departamentos:
             return
 
-        query = """
-            SELECT IdDepartamento, IdUnidadDeNegocio, NombreDepartamento
-            FROM instituto_Departamento
-            WHERE Activo = 1
-        """
-        self.cursor.execute(query)
-
-        for row in self.cursor.fetchall():
+        for row in self.sentencias.consultar('etl.departamentos_activos'):
             key = (row.IdUnidadDeNegocio, row.NombreDepartamento)
             self._cache_departamentos[key] = row.IdDepartamento
 
         logger.info(f"✅ Departamentos precargados: {len(self._cache_departamentos)}")
 
+    def _consultar_en_bloques(self, sentencia: str, valores: List[Any]):
+        """
+        Ejecuta una sentencia registrada con lista IN por bloques de tamaño fijo
+
+        Todos los bloques llevan exactamente preload_chunk_size parámetros
+        (el último se rellena repitiendo su último valor), de modo que SQL
+        Server reutiliza un único plan y nunca se supera el límite de 2100
+        parámetros por sentencia.
+
+        Args:
+            sentencia: Nombre de una sentencia lista_in del registro
+            valores: Valores a buscar
+
+        Yields:
+            Filas de cada bloque, a medida que se van consultando
+        """
+        tam_bloque = max(1, min(self.config.preload_chunk_size, MAX_PARAMETROS_SQLSERVER))
+        yield from self.sentencias.consultar_en_bloques(sentencia, valores, tam_bloque)
+
     def _precargar_usuarios(self, user_ids: List[str]):
         """
-        Precarga usuarios existentes
+        Precarga usuarios existentes (por bloques)
 
         Args:
             user_ids: Lista de UserIds a precargar
@@ -769,24 +1359,14 @@ class ETLInstitutoCompleto:
         if not user_ids:
             return
 
-        # SQL Server usa ? como placeholder
-        placeholders = ','.join(['?'] * len(user_ids))
-        query = f"""
-            SELECT IdUsuario, UserId
-            FROM instituto_Usuario
-            WHERE UserId IN ({placeholders})
-        """
-
-        self.cursor.execute(query, user_ids)
-
-        for row in self.cursor.fetchall():
+        for row in self._consultar_en_bloques('etl.usuarios_por_userid', user_ids):
             self._cache_usuarios[row.UserId] = row.IdUsuario
 
         logger.info(f"✅ Usuarios precargados: {len(self._cache_usuarios)}")
 
     def _precargar_progresos(self, user_ids: List[str]):
         """
-        Precarga progresos existentes
+        Precarga progresos existentes (por bloques)
 
         Args:
             user_ids: Lista de UserIds
@@ -794,17 +1374,7 @@ class ETLInstitutoCompleto:
         if not user_ids:
             return
 
-        placeholders = ','.join(['?'] * len(user_ids))
-        query = f"""
-            SELECT p.IdUsuario, p.IdModulo, p.IdInscripcion
-            FROM instituto_ProgresoModulo p
-            INNER JOIN instituto_Usuario u ON p.IdUsuario = u.IdUsuario
-            WHERE u.UserId IN ({placeholders})
-        """
-
-        self.cursor.execute(query, user_ids)
-
-        for row in self.cursor.fetchall():
+        for row in self._consultar_en_bloques('etl.progresos_por_userid', user_ids):
             key = (row[0], row[1])  # (IdUsuario, IdModulo)
             self._cache_progresos[key] = row[2]  # IdInscripcion
 
@@ -815,20 +1385,30 @@ class ETLInstitutoCompleto:
         if self._cache_evaluaciones:
             return
 
-        query = """
-            SELECT IdEvaluacion, IdModulo
-            FROM instituto_Evaluacion
-            WHERE Activo = 1
-        """
-        self.cursor.execute(query)
-
-        for row in self.cursor.fetchall():
+        for row in self.sentencias.consultar('etl.evaluaciones_activas'):
             # Solo guarda la primera evaluación por módulo
             if row.IdModulo not in self._cache_evaluaciones:
                 self._cache_evaluaciones[row.IdModulo] = row.IdEvaluacion
+            if row.PuntajeMinimo is not None:
+                self._cache_puntajes_minimos[row.IdEvaluacion] = float(row.PuntajeMinimo)
 
         logger.info(f"✅ Evaluaciones precargadas: {len(self._cache_evaluaciones)}")
 
+    def _precargar_intentos(self, user_ids: List[str]):
+        """
+        Precarga el número de intentos existentes por (IdInscripcion, IdEvaluacion)
+
+        Args:
+            user_ids: Lista de UserIds
+        """
+        if not user_ids:
+            return
+
+        for row in self._consultar_en_bloques('etl.intentos_por_userid', user_ids):
+            self._cache_intentos[(row[0], row[1])] = row[2]
+
+        logger.info(f"✅ Intentos de evaluación precargados: {len(self._cache_intentos)}")
+
     # ========================================================================
     # CARGA: AUTO-CREACIÓN DE ENTIDADES
     # ========================================================================
@@ -853,12 +1433,11 @@ class ETLInstitutoCompleto:
         if nombre_modulo in self._cache_modulos:
             return self._cache_modulos[nombre_modulo]
 
-        # Verificar si existe en BD
-        self.cursor.execute(
-            "SELECT IdModulo FROM instituto_Modulo WHERE NombreModulo = ?",
-            (nombre_modulo,)
-        )
-        row = self.cursor.fetchone()
+        # Verificar si existe en BD (con el catálogo bloqueado: otra
+        # importación en paralelo podría estar creando el mismo módulo)
+        self._bloquear_catalogo()
+        filas = self.sentencias.consultar('etl.modulo_por_nombre', (nombre_modulo,))
+        row = filas[0] if filas else None
 
         if row:
             id_modulo = row.IdModulo
@@ -912,6 +1491,49 @@ class ETLInstitutoCompleto:
         self.stats['evaluaciones_creadas'] += 1
         logger.info(f"✅ Evaluación creada para módulo {id_modulo}")
 
+    def _obtener_o_crear_evaluacion(self, id_modulo: int, num_modulo: int) -> Optional[int]:
+        """
+        Obtiene la evaluación activa de un módulo, creándola si no existe
+
+        Args:
+            id_modulo: ID del módulo
+            num_modulo: Número del módulo (1-14)
+
+        Returns:
+            IdEvaluacion
+        """
+        if id_modulo in self._cache_evaluaciones:
+            return self._cache_evaluaciones[id_modulo]
+
+        self._bloquear_catalogo()
+        filas = self.sentencias.consultar('etl.evaluacion_por_modulo', (id_modulo,))
+        if not filas:
+            self._crear_evaluacion_para_modulo(id_modulo, MODULOS_MAPPING.get(num_modulo))
+
+            # Actualizar caché
+            filas = self.sentencias.consultar('etl.evaluacion_por_modulo', (id_modulo,))
+        row = filas[0] if filas else None
+
+        if not row:
+            return None
+
+        self._cache_evaluaciones[id_modulo] = row.IdEvaluacion
+        self._cache_puntajes_minimos[row.IdEvaluacion] = self.config.default_puntaje_minimo
+        return row.IdEvaluacion
+
+    def _bloquear_catalogo(self):
+        """
+        Bloquea la creación de módulos/evaluaciones hasta el COMMIT
+
+        Varios Training Reports pueden cargarse en paralelo (orquestador por
+        lotes); sin el bloqueo dos conexiones podrían crear el mismo módulo.
+        Solo se pide cuando falta algo en el catálogo, es decir, casi nunca.
+        """
+        self.cursor.execute(
+            "EXEC sp_getapplock @Resource = 'instituto_Modulo', "
+            "@LockMode = 'Exclusive', @LockOwner = 'Transaction'"
+        )
+
     def _obtener_o_crear_unidad_negocio(self, nombre_unidad: str) -> Optional[int]:
         """
         Obtiene o crea una unidad de negocio
@@ -932,11 +1554,8 @@ class ETLInstitutoCompleto:
             return self._cache_unidades[nombre_unidad]
 
         # Verificar BD
-        self.cursor.execute(
-            "SELECT IdUnidadDeNegocio FROM instituto_UnidadDeNegocio WHERE NombreUnidad = ?",
-            (nombre_unidad,)
-        )
-        row = self.cursor.fetchone()
+        filas = self.sentencias.consultar('etl.unidad_por_nombre', (nombre_unidad,))
+        row = filas[0] if filas else None
 
         if row:
             id_unidad = row.IdUnidadDeNegocio
@@ -984,12 +1603,8 @@ class ETLInstitutoCompleto:
             return self._cache_departamentos[key]
 
         # Verificar BD
-        self.cursor.execute("""
-            SELECT IdDepartamento
-            FROM instituto_Departamento
-            WHERE IdUnidadDeNegocio = ? AND NombreDepartamento = ?
-        """, (id_unidad, nombre_depto))
-        row = self.cursor.fetchone()
+        filas = self.sentencias.consultar('etl.departamento_por_nombre', (id_unidad, nombre_depto))
+        row = filas[0] if filas else None
 
         if row:
             id_depto = row.IdDepartamento
@@ -1013,6 +1628,554 @@ class ETLInstitutoCompleto:
 
         return id_depto
 
+    # ========================================================================
+    # IMPORTACIÓN INCREMENTAL: HUELLAS DE FILAS (delta_mode)
+    # ========================================================================
+
+    def _origen_delta(self, archivo_excel: str) -> str:
+        """
+        Clave con la que se guardan las huellas del archivo
+
+        Por defecto es la ruta absoluta normalizada, no el nombre: exports
+        con el mismo nombre en carpetas distintas (una por región, modo
+        lote) no deben pisarse las huellas.
+        """
+        if self.config.delta_origen:
+            return self.config.delta_origen
+
+        ruta = os.path.normcase(os.path.abspath(str(archivo_excel)))
+        if len(ruta) > LARGO_MAX_ORIGEN_DELTA:
+            # Rutas más largas que la columna: prefijo con el hash de la ruta
+            # completa + el final de la ruta (lo legible: carpeta y nombre)
+            prefijo = hashlib.sha1(ruta.encode('utf-8')).hexdigest()[:16] + ':'
+            ruta = prefijo + ruta[-(LARGO_MAX_ORIGEN_DELTA - len(prefijo)):]
+        return ruta
+
+    def _huellas_filas(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula una huella (hash de 64 bits) por fila del Training Report
+
+        La huella se calcula sobre la fila normalizada (usuario, título,
+        tipo, módulo, estado, fechas y puntuación), de modo que cambios de
+        formato en el export (acentos, espacios, formato de fecha) no
+        cuentan como cambios.
+
+        Args:
+            df: Bloque del Training Report
+
+        Returns:
+            Serie int64 con la huella de cada fila (mismo índice que df)
+        """
+        cols = self.detected_columns
+
+        def texto(key: str) -> pd.Series:
+            if key not in cols:
+                return pd.Series('', index=df.index)
+            valores = df[cols[key]]
+            lookup = {v: normalizar_texto(v) for v in valores.dropna().unique()}
+            return valores.map(lookup).fillna('')
+
+        def fecha(key: str) -> pd.Series:
+            if key not in cols:
+                return pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+            return self._parse_fechas_columna(df[cols[key]])
+
+        if 'record_status' in cols:
+            estados = df[cols['record_status']]
+            lookup_estados = {v: self._normalizar_estatus(v) for v in estados.dropna().unique()}
+            estado = estados.map(lookup_estados).fillna('')
+        else:
+            estado = pd.Series('', index=df.index)
+
+        normalizado = pd.DataFrame({
+            'usuario': df[cols['user_id']].astype(str).str.strip(),
+            'titulo': texto('training_title'),
+            'tipo': texto('training_type'),
+            'modulo': self._numeros_modulo_columna(df[cols['training_title']]),
+            'estado': estado,
+            'registro': fecha('transcript_date'),
+            'inicio': fecha('start_date'),
+            'fin': fecha('completion_date'),
+            'puntaje': pd.to_numeric(df[cols['score']], errors='coerce') if 'score' in cols else float('nan'),
+        }, index=df.index)
+
+        return pd.util.hash_pandas_object(normalizado, index=False).astype('int64')
+
+    def _asegurar_tabla_huellas(self):
+        """Crea instituto_HuellaImportacion si la BD es anterior al modo delta"""
+        self.cursor.execute("""
+            IF OBJECT_ID('instituto_HuellaImportacion', 'U') IS NULL
+            CREATE TABLE instituto_HuellaImportacion (
+                Origen VARCHAR(255) NOT NULL,
+                Huella BIGINT NOT NULL,
+                FechaImportacion DATETIME DEFAULT GETDATE(),
+                CONSTRAINT PK_instituto_HuellaImportacion PRIMARY KEY (Origen, Huella)
+            )
+        """)
+
+    def _cargar_huellas(self, origen: str) -> pd.Index:
+        """
+        Carga las huellas de la última importación exitosa del origen
+
+        Args:
+            origen: Clave del archivo (ver _origen_delta)
+
+        Returns:
+            Índice int64 con las huellas (vacío si es la primera importación)
+        """
+        self._asegurar_tabla_huellas()
+        filas = self.sentencias.consultar('etl.huellas_por_origen', (origen,))
+        huellas = pd.Index([row[0] for row in filas], dtype='int64')
+
+        logger.info(f"✅ Huellas precargadas ({origen}): {len(huellas):,}")
+        return huellas
+
+    def _guardar_huellas(self, origen: str, anteriores: pd.Index, actuales: pd.Series):
+        """
+        Reemplaza las huellas del origen por las del archivo actual
+
+        Solo se escribe la diferencia: se borran las huellas que ya no
+        aparecen y se insertan las nuevas.
+
+        Args:
+            origen: Clave del archivo
+            anteriores: Huellas de la importación anterior
+            actuales: Huellas de todas las filas del archivo actual
+        """
+        actuales = pd.Index(actuales.unique(), dtype='int64')
+        obsoletas = anteriores.difference(actuales)
+        nuevas = actuales.difference(anteriores)
+
+        self.writer.escribir("huellas_delete", """
+            DELETE FROM instituto_HuellaImportacion
+            WHERE Origen = ? AND Huella = ?
+        """, [(origen, int(h)) for h in obsoletas])
+
+        self.writer.escribir("huellas_insert", """
+            INSERT INTO instituto_HuellaImportacion (Origen, Huella, FechaImportacion)
+            VALUES (?, ?, GETDATE())
+        """, [(origen, int(h)) for h in nuevas])
+
+        logger.info(f"✅ Huellas actualizadas ({origen}): {len(nuevas):,} nuevas, {len(obsoletas):,} obsoletas")
+
+    # ========================================================================
+    # GENERACIONES DE DATOS (invalidación de caché de la app)
+    # ========================================================================
+
+    def tablas_modificadas(self) -> List[str]:
+        """Tablas que modificó la importación (según los contadores de stats)"""
+        return sorted({
+            tabla
+            for contador, tablas_contador in TABLAS_POR_ESTADISTICA.items()
+            if self.stats.get(contador)
+            for tabla in tablas_contador
+        })
+
+    def _incrementar_generaciones(self, tablas: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Incrementa la generación de cada tabla modificada por la importación
+
+        Se ejecuta dentro de la transacción, justo antes del COMMIT: la app
+        ve la nueva generación exactamente cuando ve los datos nuevos.
+
+        Args:
+            tablas: Tablas a incrementar; None = las de esta importación
+                    (si config.incrementar_generaciones lo permite)
+
+        Returns:
+            Tablas cuya generación se incrementó
+        """
+        if tablas is None:
+            if not self.config.incrementar_generaciones:
+                return []
+            tablas = self.tablas_modificadas()
+        tablas = sorted(set(tablas))
+
+        if not tablas:
+            return []
+
+        self.cursor.execute("""
+            IF OBJECT_ID('instituto_GeneracionDatos', 'U') IS NULL
+            CREATE TABLE instituto_GeneracionDatos (
+                Tabla VARCHAR(128) NOT NULL,
+                Generacion BIGINT NOT NULL DEFAULT 0,
+                FechaModificacion DATETIME DEFAULT GETDATE(),
+                CONSTRAINT PK_instituto_GeneracionDatos PRIMARY KEY (Tabla)
+            )
+        """)
+
+        self.writer.escribir("generaciones", """
+            MERGE instituto_GeneracionDatos AS destino
+            USING (SELECT ? AS Tabla) AS origen
+            ON destino.Tabla = origen.Tabla
+            WHEN MATCHED THEN UPDATE SET
+                Generacion = destino.Generacion + 1,
+                FechaModificacion = GETDATE()
+            WHEN NOT MATCHED THEN INSERT (Tabla, Generacion, FechaModificacion)
+                VALUES (origen.Tabla, 1, GETDATE());
+        """, [(tabla,) for tabla in tablas])
+
+        logger.info(f"🔄 Generaciones incrementadas: {', '.join(tablas)}")
+        return tablas
+
+    # ========================================================================
+    # RESUMEN DE PROGRESO (hechos pre-agregados para dashboards)
+    # ========================================================================
+
+    def _asegurar_tabla_resumen(self):
+        """Crea instituto_ResumenProgreso si la BD es anterior a esta tabla"""
+        self.cursor.execute("""
+            IF OBJECT_ID('instituto_ResumenProgreso', 'U') IS NULL
+            CREATE TABLE instituto_ResumenProgreso (
+                IdUnidadDeNegocio INT NOT NULL,
+                IdDepartamento INT NOT NULL,
+                IdModulo INT NOT NULL,
+                Mes DATE NOT NULL,
+                Asignados INT NOT NULL DEFAULT 0,
+                Completados INT NOT NULL DEFAULT 0,
+                EnProgreso INT NOT NULL DEFAULT 0,
+                SumaPuntaje DECIMAL(18,2),
+                NumPuntajes INT NOT NULL DEFAULT 0,
+                FechaActualizacion DATETIME DEFAULT GETDATE(),
+                CONSTRAINT PK_instituto_ResumenProgreso PRIMARY KEY (IdModulo, IdUnidadDeNegocio, IdDepartamento, Mes)
+            )
+        """)
+
+    def _refrescar_resumen_progreso(self, modulos: Optional[Iterable[int]]) -> int:
+        """
+        Recalcula los hechos de instituto_ResumenProgreso
+
+        Por cada (unidad, departamento, módulo, mes) de usuarios activos:
+        asignados (mes de asignación), completados, en progreso y suma/número
+        de puntajes (mejor intento, mes de finalización). Se borran y
+        reinsertan solo las filas de los módulos indicados, dentro de la
+        transacción de la importación.
+
+        Args:
+            modulos: IdModulo a recalcular; None recalcula todo el resumen
+
+        Returns:
+            Filas de resumen insertadas
+        """
+        if not self.config.refrescar_resumen:
+            return 0
+
+        logger.info("\n📈 Refrescando resumen de progreso...")
+        self._asegurar_tabla_resumen()
+
+        # Importaciones concurrentes (orquestador por lotes) se serializan
+        # aquí para no cruzar DELETE/INSERT sobre los mismos módulos
+        self.cursor.execute(
+            "EXEC sp_getapplock @Resource = 'instituto_ResumenProgreso', "
+            "@LockMode = 'Exclusive', @LockOwner = 'Transaction'"
+        )
+
+        if modulos is None:
+            bloques = [None]
+        else:
+            ids = sorted({int(m) for m in modulos})
+            tam = self.config.preload_chunk_size
+            bloques = [ids[i:i + tam] for i in range(0, len(ids), tam)]
+
+        insertadas = 0
+        for ids in bloques:
+            params = ids or []
+            marcas = ', '.join(['?'] * len(params))
+            filtro = f"AND pm.IdModulo IN ({marcas})" if ids else ""
+
+            self.cursor.execute(
+                "DELETE FROM instituto_ResumenProgreso" + (f" WHERE IdModulo IN ({marcas})" if ids else ""),
+                *params
+            )
+
+            self.cursor.execute(f"""
+                INSERT INTO instituto_ResumenProgreso
+                    (IdUnidadDeNegocio, IdDepartamento, IdModulo, Mes,
+                     Asignados, Completados, EnProgreso, SumaPuntaje, NumPuntajes, FechaActualizacion)
+                SELECT
+                    h.IdUnidadDeNegocio,
+                    h.IdDepartamento,
+                    h.IdModulo,
+                    DATEFROMPARTS(YEAR(h.Fecha), MONTH(h.Fecha), 1),
+                    SUM(h.Asignado),
+                    SUM(h.Completado),
+                    SUM(h.EnProgreso),
+                    SUM(h.Puntaje),
+                    COUNT(h.Puntaje),
+                    GETDATE()
+                FROM (
+                    SELECT
+                        ISNULL(u.IdUnidadDeNegocio, 0) AS IdUnidadDeNegocio,
+                        ISNULL(u.IdDepartamento, 0) AS IdDepartamento,
+                        pm.IdModulo,
+                        hecho.Fecha, hecho.Asignado, hecho.Completado, hecho.EnProgreso, hecho.Puntaje
+                    FROM instituto_ProgresoModulo pm
+                    INNER JOIN instituto_Usuario u ON u.IdUsuario = pm.IdUsuario
+                    OUTER APPLY (
+                        SELECT MAX(re.PuntajeObtenido) AS Puntaje
+                        FROM instituto_ResultadoEvaluacion re
+                        WHERE re.IdInscripcion = pm.IdInscripcion
+                    ) r
+                    CROSS APPLY (VALUES
+                        -- Asignación: cuenta en el mes en que se asignó
+                        (COALESCE(pm.FechaAsignacion, pm.FechaInicio, '19000101'), 1, 0,
+                         CASE WHEN pm.EstatusModulo = 'En progreso' THEN 1 ELSE 0 END,
+                         CAST(NULL AS DECIMAL(5,2))),
+                        -- Finalización: cuenta en el mes en que se terminó
+                        (COALESCE(pm.FechaFinalizacion, pm.FechaAsignacion, pm.FechaInicio, '19000101'), 0, 1, 0,
+                         r.Puntaje)
+                    ) AS hecho (Fecha, Asignado, Completado, EnProgreso, Puntaje)
+                    WHERE u.UserStatus = 'Active'
+                        AND (hecho.Completado = 0 OR pm.EstatusModulo IN ('Terminado', 'Completado'))
+                        {filtro}
+                ) h
+                GROUP BY h.IdUnidadDeNegocio, h.IdDepartamento, h.IdModulo,
+                         DATEFROMPARTS(YEAR(h.Fecha), MONTH(h.Fecha), 1)
+            """, *params)
+            insertadas += max(self.cursor.rowcount, 0)
+
+        self.stats['resumen_filas'] += insertadas
+        alcance = "completo" if modulos is None else f"{len(set(modulos)):,} módulos"
+        logger.info(f"✅ Resumen de progreso ({alcance}): {insertadas:,} filas")
+        return insertadas
+
+    def _capturar_organizacion_usuarios(self):
+        """
+        Copia unidad, departamento y estatus de cada usuario a una tabla
+        temporal antes de que el Org Planning los modifique
+        """
+        self.cursor.execute(
+            "IF OBJECT_ID('tempdb..#organizacion_previa') IS NOT NULL DROP TABLE #organizacion_previa"
+        )
+        self.cursor.execute("""
+            SELECT
+                IdUsuario,
+                ISNULL(IdUnidadDeNegocio, 0) AS IdUnidadDeNegocio,
+                ISNULL(IdDepartamento, 0) AS IdDepartamento,
+                ISNULL(UserStatus, '') AS UserStatus
+            INTO #organizacion_previa
+            FROM instituto_Usuario
+        """)
+
+    def _modulos_con_cambio_de_organizacion(self) -> Set[int]:
+        """
+        Módulos con progreso de usuarios nuevos o cuya unidad,
+        departamento o estatus cambió respecto a _capturar_organizacion_usuarios()
+
+        Un UPDATE cuenta todas las filas que toca aunque no cambien: con esto
+        el resumen se recalcula solo donde el Org Planning movió a alguien.
+        """
+        self.cursor.execute("""
+            SELECT DISTINCT pm.IdModulo
+            FROM instituto_ProgresoModulo pm
+            INNER JOIN instituto_Usuario u ON u.IdUsuario = pm.IdUsuario
+            LEFT JOIN #organizacion_previa o ON o.IdUsuario = u.IdUsuario
+            WHERE o.IdUsuario IS NULL
+                OR o.IdUnidadDeNegocio <> ISNULL(u.IdUnidadDeNegocio, 0)
+                OR o.IdDepartamento <> ISNULL(u.IdDepartamento, 0)
+                OR o.UserStatus <> ISNULL(u.UserStatus, '')
+        """)
+        modulos = {int(row[0]) for row in self.cursor.fetchall()}
+        self.cursor.execute("DROP TABLE #organizacion_previa")
+
+        logger.info(f"🔎 Módulos con usuarios reorganizados: {len(modulos):,}")
+        return modulos
+
+    def cerrar_lote(self, tablas: Iterable[str], modulos: Optional[Iterable[int]]):
+        """
+        Pasos diferidos de un lote de importaciones, una sola vez y en una
+        sola transacción
+
+        Las importaciones del lote corren con refrescar_resumen e
+        incrementar_generaciones desactivados: así no compiten por el
+        applock del resumen ni por las filas de instituto_GeneracionDatos.
+
+        Args:
+            tablas: Tablas modificadas por las importaciones del lote
+            modulos: IdModulo con progreso modificado; None recalcula todo
+                     el resumen (p. ej. si cambiaron usuarios)
+        """
+        try:
+            if modulos is None or modulos:
+                self._refrescar_resumen_progreso(modulos)
+
+            self._incrementar_generaciones(set(tablas) | set(self.tablas_modificadas()))
+            self.connection.commit()
+            logger.info("✅ Lote cerrado")
+
+        except Exception as e:
+            logger.error(f"❌ Error cerrando el lote: {e}")
+            self.connection.rollback()
+            raise
+
+    # ========================================================================
+    # CARGA: STAGING + MERGE (load_strategy = "merge")
+    # ========================================================================
+
+    def _cargar_staging(self, tabla: str, columnas: str, filas: List[tuple]):
+        """
+        Crea una tabla temporal #staging y la llena con bulk insert
+
+        La columna Fila conserva el orden del Excel para que, si un registro
+        viene repetido, el MERGE aplique el último (igual que el modo client).
+
+        Args:
+            tabla: Nombre de la tabla temporal (con #)
+            columnas: Definición de columnas "Nombre TIPO NULL, ..."
+            filas: Filas a insertar
+        """
+        nombres = [c.strip().split()[0] for c in columnas.split(',')]
+
+        self.cursor.execute(f"IF OBJECT_ID('tempdb..{tabla}') IS NOT NULL DROP TABLE {tabla}")
+        self.cursor.execute(f"CREATE TABLE {tabla} (Fila INT IDENTITY(1,1) PRIMARY KEY, {columnas})")
+
+        self.writer.escribir(f"staging {tabla}", f"""
+            INSERT INTO {tabla} ({', '.join(nombres)})
+            VALUES ({', '.join(['?'] * len(nombres))})
+        """, filas)
+
+    def _ejecutar_merge(self, sql_merge: str) -> Tuple[int, int]:
+        """
+        Ejecuta un MERGE capturando OUTPUT $action
+
+        Args:
+            sql_merge: Sentencia MERGE sin cláusula OUTPUT ni ';' final
+
+        Returns:
+            Tupla (insertados, actualizados)
+        """
+        self.cursor.execute(f"""
+            SET NOCOUNT ON;
+            DECLARE @acciones TABLE (Accion NVARCHAR(10));
+
+            {sql_merge}
+            OUTPUT $action INTO @acciones;
+
+            SELECT
+                SUM(CASE WHEN Accion = 'INSERT' THEN 1 ELSE 0 END) AS insertados,
+                SUM(CASE WHEN Accion = 'UPDATE' THEN 1 ELSE 0 END) AS actualizados
+            FROM @acciones;
+        """)
+        row = self.cursor.fetchone()
+
+        return (row.insertados or 0, row.actualizados or 0) if row else (0, 0)
+
+    def _merge_usuarios(self, filas: List[tuple]) -> Tuple[int, int]:
+        """
+        Upsert de usuarios vía #staging_usuarios + MERGE
+
+        Args:
+            filas: (UserId, IdUnidadDeNegocio, IdDepartamento, NombreCompleto,
+                    UserEmail, Position, Nivel, Ubicacion)
+
+        Returns:
+            Tupla (insertados, actualizados)
+        """
+        self._cargar_staging("#staging_usuarios", """
+            UserId VARCHAR(100) NOT NULL,
+            IdUnidadDeNegocio INT NULL,
+            IdDepartamento INT NULL,
+            NombreCompleto VARCHAR(255) NULL,
+            UserEmail VARCHAR(255) NULL,
+            Position VARCHAR(255) NULL,
+            Nivel VARCHAR(255) NULL,
+            Ubicacion VARCHAR(255) NULL
+        """, filas)
+
+        return self._ejecutar_merge(f"""
+            MERGE instituto_Usuario AS destino
+            USING (
+                SELECT *
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY UserId ORDER BY Fila DESC) AS rn
+                    FROM #staging_usuarios
+                ) s
+                WHERE rn = 1
+            ) AS origen
+            ON destino.UserId = origen.UserId
+            WHEN MATCHED THEN UPDATE SET
+                NombreCompleto = origen.NombreCompleto,
+                UserEmail = origen.UserEmail,
+                Position = origen.Position,
+                IdUnidadDeNegocio = origen.IdUnidadDeNegocio,
+                IdDepartamento = origen.IdDepartamento,
+                Nivel = origen.Nivel,
+                Ubicacion = origen.Ubicacion
+            WHEN NOT MATCHED BY TARGET THEN INSERT
+                (UserId, IdUnidadDeNegocio, IdDepartamento, IdRol,
+                 NombreCompleto, UserEmail, Position, Nivel, Ubicacion, UserStatus, FechaCreacion)
+            VALUES
+                (origen.UserId, origen.IdUnidadDeNegocio, origen.IdDepartamento, {int(self.config.default_rol_id)},
+                 origen.NombreCompleto, origen.UserEmail, origen.Position, origen.Nivel, origen.Ubicacion,
+                 'Active', GETDATE())
+        """)
+
+    def _merge_progresos(self, datos: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Upsert de progreso de módulos vía #staging_progresos + MERGE
+
+        El UserId se resuelve a IdUsuario en el servidor, por lo que no hace
+        falta precargar usuarios ni progresos existentes.
+
+        Args:
+            datos: Resultado de _normalizar_modulos_columnar
+
+        Returns:
+            Tupla (insertados, actualizados)
+        """
+        if datos.empty:
+            return 0, 0
+
+        filas = list(zip(
+            datos['UserId'].tolist(),
+            datos['IdModulo'].tolist(),
+            datos['EstatusModulo'].tolist(),
+            self._valores_sql(datos['FechaInicio']),
+            self._valores_sql(datos['FechaFinalizacion'])
+        ))
+
+        self._cargar_staging("#staging_progresos", """
+            UserId VARCHAR(100) NOT NULL,
+            IdModulo INT NOT NULL,
+            EstatusModulo VARCHAR(50) NULL,
+            FechaInicio DATETIME NULL,
+            FechaFinalizacion DATETIME NULL
+        """, filas)
+
+        insertados, actualizados = self._ejecutar_merge("""
+            MERGE instituto_ProgresoModulo AS destino
+            USING (
+                SELECT u.IdUsuario, s.IdModulo, s.EstatusModulo, s.FechaInicio, s.FechaFinalizacion
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY UserId, IdModulo ORDER BY Fila DESC) AS rn
+                    FROM #staging_progresos
+                ) s
+                INNER JOIN instituto_Usuario u ON u.UserId = s.UserId
+                WHERE s.rn = 1
+            ) AS origen
+            ON destino.IdUsuario = origen.IdUsuario AND destino.IdModulo = origen.IdModulo
+            WHEN MATCHED THEN UPDATE SET
+                EstatusModulo = origen.EstatusModulo,
+                FechaInicio = COALESCE(origen.FechaInicio, destino.FechaInicio),
+                FechaFinalizacion = origen.FechaFinalizacion
+            WHEN NOT MATCHED BY TARGET THEN INSERT
+                (IdUsuario, IdModulo, EstatusModulo, FechaInicio, FechaFinalizacion, FechaAsignacion)
+            VALUES
+                (origen.IdUsuario, origen.IdModulo, origen.EstatusModulo,
+                 COALESCE(origen.FechaInicio, GETDATE()), origen.FechaFinalizacion, GETDATE())
+        """)
+
+        self.cursor.execute("""
+            SELECT COUNT(DISTINCT s.UserId) AS total
+            FROM #staging_progresos s
+            WHERE NOT EXISTS (SELECT 1 FROM instituto_Usuario u WHERE u.UserId = s.UserId)
+        """)
+        sin_usuario = self.cursor.fetchone().total
+        if sin_usuario:
+            logger.warning(f"⚠️  Usuarios no encontrados en instituto_Usuario: {sin_usuario:,}")
+
+        return insertados, actualizados
+
     # ========================================================================
     # PROCESAMIENTO: ORG PLANNING (USUARIOS)
     # ========================================================================
@@ -1034,32 +2197,53 @@ class ETLInstitutoCompleto:
         self.stats['tiempo_inicio'] = datetime.now()
 
         try:
-            # 1. EXTRACCIÓN
+            # 1. EXTRACCIÓN (una sola pasada, por bloques)
             logger.info("\n📖 Paso 1/4: Leyendo archivo Excel...")
-            df = self._leer_excel_con_deteccion_headers(archivo_excel)
-            logger.info(f"✅ Registros leídos: {len(df):,}")
+            total_registros = 0
+
+            for num_bloque, df in enumerate(self._leer_excel_en_bloques(archivo_excel), 1):
+                total_registros += len(df)
+                logger.info(f"✅ Bloque {num_bloque}: {len(df):,} registros ({total_registros:,} acumulados)")
+
+                if num_bloque == 1:
+                    # Organización previa de los usuarios, para saber qué
+                    # módulos del resumen cambian con esta importación
+                    self._capturar_organizacion_usuarios()
 
-            # 2. DETECCIÓN DE COLUMNAS
-            logger.info("\n🔍 Paso 2/4: Detectando columnas...")
-            self._detectar_columnas(df)
+                    # 2. DETECCIÓN DE COLUMNAS
+                    logger.info("\n🔍 Paso 2/4: Detectando columnas...")
+                    self._detectar_columnas(df)
 
-            # Verificar columna crítica
-            if 'user_id' not in self.detected_columns:
-                raise ValueError("❌ Columna 'user_id' no encontrada. No se puede continuar.")
+                    # Verificar columna crítica
+                    if 'user_id' not in self.detected_columns:
+                        raise ValueError("❌ Columna 'user_id' no encontrada. No se puede continuar.")
 
-            # 3. PRECARGA DE DATOS
-            logger.info("\n⚡ Paso 3/4: Precargando datos para optimización...")
-            self._precargar_unidades_negocio()
-            self._precargar_departamentos()
+                    # 3. PRECARGA DE DATOS
+                    logger.info("\n⚡ Paso 3/4: Precargando datos para optimización...")
+                    self._precargar_unidades_negocio()
+                    self._precargar_departamentos()
 
-            user_ids = df[self.detected_columns['user_id']].astype(str).str.strip().unique().tolist()
-            self._precargar_usuarios(user_ids)
+                if self.config.load_strategy != "merge":
+                    user_ids = df[self.detected_columns['user_id']].astype(str).str.strip().unique().tolist()
+                    self._precargar_usuarios(user_ids)
 
-            # 4. PROCESAMIENTO
-            logger.info(f"\n📊 Paso 4/4: Procesando {len(df):,} usuarios...")
-            self._procesar_usuarios_batch(df)
+                # 4. PROCESAMIENTO
+                logger.info(f"\n📊 Paso 4/4: Procesando {len(df):,} usuarios...")
+                self._procesar_usuarios_batch(df)
+
+            if not total_registros:
+                raise ValueError("❌ El archivo no contiene registros")
+            self.stats['filas_leidas'] = total_registros
+
+            # Solo los módulos de usuarios que cambiaron de unidad,
+            # departamento o estatus
+            if self.stats['usuarios_nuevos'] or self.stats['usuarios_actualizados']:
+                self._modulos_modificados.update(self._modulos_con_cambio_de_organizacion())
+            if self._modulos_modificados:
+                self._refrescar_resumen_progreso(self._modulos_modificados)
 
             # COMMIT
+            self._incrementar_generaciones()
             self.connection.commit()
             logger.info("✅ Transacción confirmada")
 
@@ -1093,6 +2277,7 @@ class ETLInstitutoCompleto:
 
         batch_updates = []
         batch_inserts = []
+        filas_staging = []
 
         for idx, row in df.iterrows():
             try:
@@ -1115,8 +2300,19 @@ class ETLInstitutoCompleto:
                 id_unidad = self._obtener_o_crear_unidad_negocio(nombre_unidad) if nombre_unidad else None
                 id_depto = self._obtener_o_crear_departamento(id_unidad, nombre_depto) if nombre_depto and id_unidad else None
 
-                # Verificar si existe
-                if user_id in self._cache_usuarios:
+                if self.config.load_strategy == "merge":
+                    # El INSERT/UPDATE lo decide el MERGE en el servidor
+                    filas_staging.append((
+                        user_id,
+                        id_unidad,
+                        id_depto,
+                        nombre_completo,
+                        email,
+                        cargo,
+                        nivel,
+                        ubicacion
+                    ))
+                elif user_id in self._cache_usuarios:
                     # UPDATE
                     batch_updates.append((
                         nombre_completo,
@@ -1147,9 +2343,16 @@ class ETLInstitutoCompleto:
                 self.stats['errores'].append(error_msg)
                 logger.warning(f"⚠️  {error_msg}")
 
+        if filas_staging:
+            nuevos, actualizados = self._merge_usuarios(filas_staging)
+
+            self.stats['usuarios_nuevos'] += nuevos
+            self.stats['usuarios_actualizados'] += actualizados
+            logger.info(f"✅ Usuarios (MERGE): {nuevos:,} nuevos, {actualizados:,} actualizados")
+
         # Ejecutar BATCH UPDATES
         if batch_updates:
-            self.cursor.executemany("""
+            actualizados = self.writer.escribir("usuarios_update", """
                 UPDATE instituto_Usuario
                 SET NombreCompleto = ?,
                     UserEmail = ?,
@@ -1161,20 +2364,20 @@ class ETLInstitutoCompleto:
                 WHERE UserId = ?
             """, batch_updates)
 
-            self.stats['usuarios_actualizados'] = len(batch_updates)
-            logger.info(f"✅ Usuarios actualizados: {len(batch_updates):,}")
+            self.stats['usuarios_actualizados'] += actualizados
+            logger.info(f"✅ Usuarios actualizados: {actualizados:,}")
 
         # Ejecutar BATCH INSERTS
         if batch_inserts:
-            self.cursor.executemany("""
+            nuevos = self.writer.escribir("usuarios_insert", """
                 INSERT INTO instituto_Usuario
                 (UserId, IdUnidadDeNegocio, IdDepartamento, IdRol,
                  NombreCompleto, UserEmail, Position, Nivel, Ubicacion, UserStatus, FechaCreacion)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Active', GETDATE())
             """, batch_inserts)
 
-            self.stats['usuarios_nuevos'] = len(batch_inserts)
-            logger.info(f"✅ Usuarios nuevos: {len(batch_inserts):,}")
+            self.stats['usuarios_nuevos'] += nuevos
+            logger.info(f"✅ Usuarios nuevos: {nuevos:,}")
 
     # ========================================================================
     # PROCESAMIENTO: TRAINING REPORT (PROGRESO Y CALIFICACIONES)
@@ -1197,37 +2400,93 @@ class ETLInstitutoCompleto:
         self.stats['tiempo_inicio'] = datetime.now()
 
         try:
-            # 1. EXTRACCIÓN
+            # 1. EXTRACCIÓN (una sola pasada, por bloques)
             logger.info("\n📖 Paso 1/5: Leyendo archivo Excel...")
-            df = self._leer_excel_con_deteccion_headers(archivo_excel)
-            logger.info(f"✅ Registros leídos: {len(df):,}")
-
-            # 2. DETECCIÓN DE COLUMNAS
-            logger.info("\n🔍 Paso 2/5: Detectando columnas...")
-            self._detectar_columnas(df)
+            total_registros = 0
+            bloques_pruebas = []
+            huellas_archivo = []
+
+            for num_bloque, df in enumerate(self._leer_excel_en_bloques(archivo_excel), 1):
+                total_registros += len(df)
+                logger.info(f"✅ Bloque {num_bloque}: {len(df):,} registros ({total_registros:,} acumulados)")
+
+                if num_bloque == 1:
+                    # 2. DETECCIÓN DE COLUMNAS
+                    logger.info("\n🔍 Paso 2/5: Detectando columnas...")
+                    self._detectar_columnas(df)
+
+                    # Verificar columnas críticas
+                    if 'user_id' not in self.detected_columns or 'training_title' not in self.detected_columns:
+                        raise ValueError("❌ Columnas críticas no encontradas (user_id, training_title)")
+
+                    # 3. PRECARGA DE DATOS
+                    logger.info("\n⚡ Paso 3/5: Precargando datos para optimización...")
+                    self._precargar_modulos()
+                    self._precargar_evaluaciones()
+
+                    if self.config.delta_mode:
+                        origen_delta = self._origen_delta(archivo_excel)
+                        huellas_anteriores = self._cargar_huellas(origen_delta)
+
+                if self.config.delta_mode:
+                    # Solo siguen las filas cuya huella no estaba en la importación anterior
+                    huellas = self._huellas_filas(df)
+                    huellas_archivo.append(huellas)
+                    nuevas = ~huellas.isin(huellas_anteriores)
+                    self.stats['filas_sin_cambios'] += int((~nuevas).sum())
+                    df = df[nuevas]
+                    logger.info(f"🔁 Delta: {len(df):,} filas nuevas o modificadas en el bloque")
+                    if df.empty:
+                        continue
 
-            # Verificar columnas críticas
-            if 'user_id' not in self.detected_columns or 'training_title' not in self.detected_columns:
-                raise ValueError("❌ Columnas críticas no encontradas (user_id, training_title)")
+                if self.config.load_strategy != "merge":
+                    user_ids = df[self.detected_columns['user_id']].astype(str).str.strip().unique().tolist()
+                    self._precargar_usuarios(user_ids)
+                    self._precargar_progresos(user_ids)
 
-            # 3. PRECARGA DE DATOS
-            logger.info("\n⚡ Paso 3/5: Precargando datos para optimización...")
-            self._precargar_modulos()
-            self._precargar_evaluaciones()
+                # 4. PROCESAMIENTO DE MÓDULOS
+                logger.info("\n📋 Paso 4/5: Procesando progreso de módulos...")
+                self._procesar_modulos_batch(df)
 
-            user_ids = df[self.detected_columns['user_id']].astype(str).str.strip().unique().tolist()
-            self._precargar_usuarios(user_ids)
-            self._precargar_progresos(user_ids)
+                # Las calificaciones se procesan al final, cuando ya existen
+                # todas las inscripciones del archivo
+                bloques_pruebas.append(self._filtrar_pruebas(df))
 
-            # 4. PROCESAMIENTO DE MÓDULOS
-            logger.info("\n📋 Paso 4/5: Procesando progreso de módulos...")
-            self._procesar_modulos_batch(df)
+            if not total_registros:
+                raise ValueError("❌ El archivo no contiene registros")
+            self.stats['filas_leidas'] = total_registros
 
             # 5. PROCESAMIENTO DE CALIFICACIONES
             logger.info("\n📝 Paso 5/5: Procesando calificaciones de evaluaciones...")
-            self._procesar_calificaciones_batch(df)
+            if bloques_pruebas:
+                df_pruebas = pd.concat(bloques_pruebas, ignore_index=True)
+                user_ids = df_pruebas[self.detected_columns['user_id']].astype(str).str.strip().unique().tolist()
+
+                if self.config.load_strategy == "merge":
+                    # Con MERGE solo se traen a memoria los usuarios con calificaciones
+                    self._precargar_usuarios(user_ids)
+                    self._precargar_progresos(user_ids)
+                elif self.stats['progresos_insertados']:
+                    # Las inscripciones recién insertadas también pueden tener calificaciones
+                    self._precargar_progresos(user_ids)
+                self._precargar_intentos(user_ids)
+                self._procesar_calificaciones_batch(df_pruebas)
+
+            # Las huellas se guardan en la misma transacción que los datos; si
+            # algún lote falló (modo savepoint) no se guardan, para que la
+            # siguiente importación vuelva a intentar esas filas
+            if self.config.delta_mode:
+                if self.stats['errores']:
+                    logger.warning("⚠️  Hubo errores por lote: no se actualizan las huellas del modo delta")
+                else:
+                    self._guardar_huellas(origen_delta, huellas_anteriores, pd.concat(huellas_archivo))
+
+            # Solo se recalculan los módulos que tuvieron cambios
+            if self._modulos_modificados:
+                self._refrescar_resumen_progreso(self._modulos_modificados)
 
             # COMMIT
+            self._incrementar_generaciones()
             self.connection.commit()
             logger.info("✅ Transacción confirmada")
 
@@ -1247,16 +2506,13 @@ class ETLInstitutoCompleto:
         """
         Procesa progreso de módulos en batch
 
+        La transformación se hace por columnas (config.transform_mode =
+        "vectorized", por defecto) o fila por fila ("iterrows").
+
         Args:
             df: DataFrame con datos de training
         """
-        col_user_id = self.detected_columns['user_id']
         col_titulo = self.detected_columns['training_title']
-        col_tipo = self.detected_columns.get('training_type')
-        col_estado = self.detected_columns.get('record_status')
-        col_fecha_inicio = self.detected_columns.get('start_date')
-        col_fecha_fin = self.detected_columns.get('completion_date')
-        col_fecha_registro = self.detected_columns.get('transcript_date')
 
         # Filtrar solo módulos (no pruebas)
         df_modulos = df[df[col_titulo].str.contains('MÓDULO|MODULE', case=False, na=False, regex=True)].copy()
@@ -1267,8 +2523,72 @@ class ETLInstitutoCompleto:
 
         logger.info(f"📊 Registros de módulos a procesar: {len(df_modulos):,}")
 
-        batch_updates = []
-        batch_inserts = []
+        if self.config.load_strategy == "merge":
+            datos = self._normalizar_modulos_columnar(df_modulos)
+            self._modulos_modificados.update(int(m) for m in datos['IdModulo'].unique())
+            insertados, actualizados = self._merge_progresos(datos)
+
+            self.stats['progresos_insertados'] += insertados
+            self.stats['progresos_actualizados'] += actualizados
+            logger.info(f"✅ Progresos (MERGE): {insertados:,} insertados, {actualizados:,} actualizados")
+            return
+
+        if self.config.transform_mode == "iterrows":
+            batch_updates, batch_inserts = self._transformar_modulos_iterrows(df_modulos)
+        else:
+            batch_updates, batch_inserts = self._transformar_modulos_vectorizado(df_modulos)
+
+        self._modulos_modificados.update(int(fila[4]) for fila in batch_updates)
+        self._modulos_modificados.update(int(fila[1]) for fila in batch_inserts)
+
+        # Ejecutar BATCH UPDATES
+        if batch_updates:
+            actualizados = self.writer.escribir("progresos_update", """
+                UPDATE instituto_ProgresoModulo
+                SET EstatusModulo = ?,
+                    FechaInicio = COALESCE(?, FechaInicio),
+                    FechaFinalizacion = ?
+                WHERE IdUsuario = ? AND IdModulo = ?
+            """, batch_updates)
+
+            self.stats['progresos_actualizados'] += actualizados
+            logger.info(f"✅ Progresos actualizados: {actualizados:,}")
+
+        # Ejecutar BATCH INSERTS
+        if batch_inserts:
+            insertados = self.writer.escribir("progresos_insert", """
+                INSERT INTO instituto_ProgresoModulo
+                (IdUsuario, IdModulo, EstatusModulo, FechaInicio, FechaFinalizacion, FechaAsignacion)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, batch_inserts)
+
+            self.stats['progresos_insertados'] += insertados
+            logger.info(f"✅ Progresos insertados: {insertados:,}")
+
+    def _transformar_modulos_iterrows(self, df_modulos: pd.DataFrame) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Transforma los registros de módulos fila por fila (modo "iterrows")
+
+        Si un (usuario, módulo) viene repetido en el bloque se conserva el
+        último registro, como el ROW_NUMBER del modo merge: el índice único
+        UX_ProgresoModulo_Usuario_Modulo no admite dos INSERT de la misma clave.
+
+        Args:
+            df_modulos: DataFrame ya filtrado a registros de módulos
+
+        Returns:
+            Tupla (batch_updates, batch_inserts)
+        """
+        col_user_id = self.detected_columns['user_id']
+        col_titulo = self.detected_columns['training_title']
+        col_estado = self.detected_columns.get('record_status')
+        col_fecha_inicio = self.detected_columns.get('start_date')
+        col_fecha_fin = self.detected_columns.get('completion_date')
+        col_fecha_registro = self.detected_columns.get('transcript_date')
+
+        # (IdUsuario, IdModulo) → tupla de UPDATE / INSERT (el último gana)
+        batch_updates: Dict[Tuple[int, int], tuple] = {}
+        batch_inserts: Dict[Tuple[int, int], tuple] = {}
 
         modulos_no_identificados = set()
 
@@ -1284,11 +2604,7 @@ class ETLInstitutoCompleto:
                     continue
 
                 # Identificar módulo
-                num_modulo = self._extraer_numero_modulo(titulo)
-
-                if not num_modulo:
-                    # Intentar fuzzy matching
-                    num_modulo = self._identificar_modulo_fuzzy(titulo)
+                num_modulo = self._indice_titulos.resolver(titulo)
 
                 if not num_modulo:
                     if titulo not in modulos_no_identificados:
@@ -1315,57 +2631,179 @@ class ETLInstitutoCompleto:
                 key = (id_usuario, id_modulo)
 
                 if key in self._cache_progresos:
-                    # UPDATE
-                    batch_updates.append((
+                    # UPDATE (pop + asignación: queda en la posición del último)
+                    batch_updates.pop(key, None)
+                    batch_updates[key] = (
                         estado,
                         fecha_inicio or fecha_registro,
                         fecha_fin,
                         id_usuario,
                         id_modulo
-                    ))
+                    )
                 else:
                     # INSERT
-                    batch_inserts.append((
+                    batch_inserts.pop(key, None)
+                    batch_inserts[key] = (
                         id_usuario,
                         id_modulo,
                         estado,
                         fecha_inicio or fecha_registro or datetime.now(),
                         fecha_fin,
                         datetime.now()
-                    ))
+                    )
 
             except Exception as e:
                 error_msg = f"Error en fila {idx}: {e}"
                 self.stats['errores'].append(error_msg)
                 logger.warning(f"⚠️  {error_msg}")
 
-        # Ejecutar BATCH UPDATES
-        if batch_updates:
-            self.cursor.executemany("""
-                UPDATE instituto_ProgresoModulo
-                SET EstatusModulo = ?,
-                    FechaInicio = COALESCE(?, FechaInicio),
-                    FechaFinalizacion = ?
-                WHERE IdUsuario = ? AND IdModulo = ?
-            """, batch_updates)
+        return list(batch_updates.values()), list(batch_inserts.values())
 
-            self.stats['progresos_actualizados'] = len(batch_updates)
-            logger.info(f"✅ Progresos actualizados: {len(batch_updates):,}")
+    def _transformar_modulos_vectorizado(self, df_modulos: pd.DataFrame) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Transforma los registros de módulos por columnas (modo "vectorized")
 
-        # Ejecutar BATCH INSERTS
-        if batch_inserts:
-            self.cursor.executemany("""
-                INSERT INTO instituto_ProgresoModulo
-                (IdUsuario, IdModulo, EstatusModulo, FechaInicio, FechaFinalizacion, FechaAsignacion)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, batch_inserts)
+        Produce exactamente las mismas tuplas que _transformar_modulos_iterrows,
+        pero resolviendo usuarios, módulos, estados y fechas sobre columnas
+        completas y separando INSERT/UPDATE con un merge contra _cache_progresos.
+        Igual que allí, de cada (usuario, módulo) repetido queda el último.
 
-            self.stats['progresos_insertados'] = len(batch_inserts)
-            logger.info(f"✅ Progresos insertados: {len(batch_inserts):,}")
+        Args:
+            df_modulos: DataFrame ya filtrado a registros de módulos
+
+        Returns:
+            Tupla (batch_updates, batch_inserts)
+        """
+        col_user_id = self.detected_columns['user_id']
+
+        # 1. UserId → IdUsuario
+        user_ids = df_modulos[col_user_id].astype(str).str.strip()
+        id_usuario = user_ids.map(self._cache_usuarios)
+
+        sin_usuario = user_ids[id_usuario.isna()]
+        if not sin_usuario.empty:
+            logger.warning(
+                f"⚠️  Usuarios no encontrados en cache: {sin_usuario.nunique():,} "
+                f"({len(sin_usuario):,} registros, ej: {sin_usuario.iloc[0]})"
+            )
+
+        # 2-5. Módulo, estado y fechas (solo para usuarios existentes)
+        datos = self._normalizar_modulos_columnar(df_modulos[id_usuario.notna()])
+        if datos.empty:
+            return [], []
+
+        datos.insert(0, 'IdUsuario', id_usuario[datos.index].astype('int64'))
+        datos = datos[~datos.duplicated(['IdUsuario', 'IdModulo'], keep='last')]
+
+        # 6. Separar INSERT/UPDATE con merge contra progresos existentes
+        existentes = pd.DataFrame(
+            list(self._cache_progresos.keys()), columns=['IdUsuario', 'IdModulo']
+        ).astype('int64').drop_duplicates()
+
+        datos = datos.merge(existentes, on=['IdUsuario', 'IdModulo'], how='left', indicator='_origen')
+        existe = datos['_origen'] == 'both'
+
+        ahora = datetime.now()
+        upd = datos[existe]
+        ins = datos[~existe]
+
+        batch_updates = list(zip(
+            upd['EstatusModulo'].tolist(),
+            self._valores_sql(upd['FechaInicio']),
+            self._valores_sql(upd['FechaFinalizacion']),
+            upd['IdUsuario'].tolist(),
+            upd['IdModulo'].tolist()
+        ))
+
+        batch_inserts = list(zip(
+            ins['IdUsuario'].tolist(),
+            ins['IdModulo'].tolist(),
+            ins['EstatusModulo'].tolist(),
+            self._valores_sql(ins['FechaInicio'].fillna(ahora)),
+            self._valores_sql(ins['FechaFinalizacion']),
+            [ahora] * len(ins)
+        ))
+
+        return batch_updates, batch_inserts
+
+    def _normalizar_modulos_columnar(self, df_modulos: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resuelve módulo, estado y fechas de los registros de módulos por columnas
+
+        Args:
+            df_modulos: DataFrame con registros de módulos
+
+        Returns:
+            DataFrame (mismo índice, solo filas con módulo identificado) con
+            UserId, IdModulo, EstatusModulo, FechaInicio (inicio o registro)
+            y FechaFinalizacion
+        """
+        col_user_id = self.detected_columns['user_id']
+        col_titulo = self.detected_columns['training_title']
+        col_estado = self.detected_columns.get('record_status')
+        col_fecha_inicio = self.detected_columns.get('start_date')
+        col_fecha_fin = self.detected_columns.get('completion_date')
+        col_fecha_registro = self.detected_columns.get('transcript_date')
+
+        # Título → número de módulo (regex y, si falla, fuzzy por título único)
+        titulos = df_modulos[col_titulo]
+        num_modulo = self._numeros_modulo_columna(titulos)
+
+        for titulo in titulos[num_modulo.isna()].unique():
+            logger.warning(f"⚠️  No se pudo identificar módulo: '{titulo}'")
+
+        # Número de módulo → IdModulo (crea los módulos faltantes una sola vez)
+        ids_modulo = {num: self._crear_modulo_si_no_existe(int(num)) for num in num_modulo.dropna().unique()}
+        id_modulo = num_modulo.map(ids_modulo)
+
+        validos = id_modulo.notna()
+        indice = df_modulos.index[validos]
+
+        # Estados: lookup precomputado sobre valores únicos
+        if col_estado:
+            estados_excel = df_modulos.loc[validos, col_estado]
+            lookup_estados = {valor: self._normalizar_estatus(valor) for valor in estados_excel.dropna().unique()}
+            estados = estados_excel.map(lookup_estados).fillna(EstatusModulo.NO_INICIADO.value)
+        else:
+            estados = pd.Series(EstatusModulo.NO_INICIADO.value, index=indice)
+
+        # Fechas
+        def fechas(col: Optional[str]) -> pd.Series:
+            if not col:
+                return pd.Series(pd.NaT, index=indice, dtype='datetime64[ns]')
+            return self._parse_fechas_columna(df_modulos.loc[validos, col])
+
+        return pd.DataFrame({
+            'UserId': df_modulos.loc[validos, col_user_id].astype(str).str.strip(),
+            'IdModulo': id_modulo[validos].astype('int64'),
+            'EstatusModulo': estados,
+            'FechaInicio': fechas(col_fecha_inicio).fillna(fechas(col_fecha_registro)),
+            'FechaFinalizacion': fechas(col_fecha_fin),
+        }, index=indice)
+
+    @staticmethod
+    def _valores_sql(serie: pd.Series) -> List[Any]:
+        """Convierte una columna a valores Python para pyodbc (NaN/NaT → None)"""
+        return serie.astype(object).where(serie.notna(), None).tolist()
+
+    def _filtrar_pruebas(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Filtra solo pruebas/evaluaciones del Training Report"""
+        col_tipo = self.detected_columns.get('training_type')
+
+        if not col_tipo:
+            return df.iloc[0:0]
+
+        return df[
+            df[col_tipo].str.contains('Prueba|Test|Assessment|Exam', case=False, na=False, regex=True)
+        ]
 
     def _procesar_calificaciones_batch(self, df: pd.DataFrame):
         """
-        Procesa calificaciones de evaluaciones en batch
+        Procesa calificaciones de evaluaciones en batch (set-based)
+
+        Puntajes mínimos e intentos previos se toman de las cachés precargadas;
+        número de intento y aprobado se calculan en pandas, y los resultados se
+        escriben con un único INSERT masivo más un único UPDATE masivo de estatus.
 
         Args:
             df: DataFrame con datos de training
@@ -1379,10 +2817,7 @@ class ETLInstitutoCompleto:
             logger.info("ℹ️  Columnas de tipo o puntaje no encontradas. Saltando calificaciones.")
             return
 
-        # Filtrar solo pruebas/evaluaciones
-        df_pruebas = df[
-            df[col_tipo].str.contains('Prueba|Test|Assessment|Exam', case=False, na=False, regex=True)
-        ].copy()
+        df_pruebas = self._filtrar_pruebas(df)
 
         if len(df_pruebas) == 0:
             logger.info("ℹ️  No se encontraron evaluaciones en el archivo")
@@ -1390,112 +2825,105 @@ class ETLInstitutoCompleto:
 
         logger.info(f"📊 Calificaciones a procesar: {len(df_pruebas):,}")
 
-        calificaciones_registradas = 0
+        # 1. Puntaje numérico (descarta vacíos y no numéricos)
+        puntajes = pd.to_numeric(df_pruebas[col_puntaje], errors='coerce')
+        df_pruebas = df_pruebas[puntajes.notna()]
+        puntajes = puntajes[puntajes.notna()]
+
+        # 2. Título → número de módulo → IdModulo
+        num_modulo = self._numeros_modulo_columna(df_pruebas[col_titulo])
+        nums_unicos = num_modulo.dropna().unique()
+        ids_modulo = {num: self._crear_modulo_si_no_existe(int(num)) for num in nums_unicos}
+        id_modulo = num_modulo.map(ids_modulo)
+
+        # 3. (IdUsuario, IdModulo) → IdInscripcion
+        datos = pd.DataFrame({
+            'UserId': df_pruebas[col_user_id].astype(str).str.strip(),
+            'NumModulo': num_modulo,
+            'IdModulo': id_modulo,
+            'Puntaje': puntajes.astype(float),
+        })
+        datos['IdUsuario'] = datos['UserId'].map(self._cache_usuarios)
+        datos = datos.dropna(subset=['IdModulo'])
+
+        # Clave (IdUsuario, IdModulo): la misma con la que se llena _cache_progresos
+        datos['IdInscripcion'] = [
+            self._cache_progresos.get(clave)
+            for clave in zip(datos['IdUsuario'], datos['IdModulo'])
+        ]
 
-        for idx, row in df_pruebas.iterrows():
-            try:
-                user_id = str(row[col_user_id]).strip()
-                titulo = row[col_titulo]
-                puntaje = row.get(col_puntaje)
+        sin_inscripcion = datos[datos['IdInscripcion'].isna()]
+        if not sin_inscripcion.empty:
+            logger.warning(
+                f"⚠️  No se encontró inscripción para {len(sin_inscripcion):,} calificaciones "
+                f"(ej: {sin_inscripcion['UserId'].iloc[0]} - Módulo {sin_inscripcion['IdModulo'].iloc[0]})"
+            )
+            datos = datos[datos['IdInscripcion'].notna()].copy()
 
-                if pd.isna(puntaje):
-                    continue
+        if datos.empty:
+            logger.info("✅ Calificaciones registradas: 0")
+            return
 
-                try:
-                    puntaje_decimal = float(puntaje)
-                except:
-                    continue
+        # 4. IdModulo → IdEvaluacion (crea las evaluaciones faltantes una sola vez)
+        modulos_unicos = datos[['IdModulo', 'NumModulo']].drop_duplicates('IdModulo')
+        ids_evaluacion = {
+            id_mod: self._obtener_o_crear_evaluacion(int(id_mod), int(num))
+            for id_mod, num in modulos_unicos.itertuples(index=False)
+        }
+        datos['IdEvaluacion'] = datos['IdModulo'].map(ids_evaluacion)
+        datos = datos.dropna(subset=['IdEvaluacion'])
 
-                # Identificar módulo
-                num_modulo = self._extraer_numero_modulo(titulo)
+        datos['IdInscripcion'] = datos['IdInscripcion'].astype('int64')
+        datos['IdEvaluacion'] = datos['IdEvaluacion'].astype('int64')
+        self._modulos_modificados.update(int(m) for m in datos['IdModulo'].unique())
 
-                if not num_modulo:
-                    num_modulo = self._identificar_modulo_fuzzy(titulo)
+        # 5. Aprobado y número de intento
+        puntaje_minimo = datos['IdEvaluacion'].map(self._cache_puntajes_minimos).fillna(
+            self.config.default_puntaje_minimo
+        )
+        datos['Aprobado'] = (datos['Puntaje'] >= puntaje_minimo).astype(int)
 
-                if not num_modulo:
-                    continue
+        claves = list(zip(datos['IdInscripcion'], datos['IdEvaluacion']))
+        intentos_previos = pd.Series([self._cache_intentos.get(k, 0) for k in claves], index=datos.index)
+        datos['IntentoNumero'] = (
+            intentos_previos + datos.groupby(['IdInscripcion', 'IdEvaluacion']).cumcount() + 1
+        )
 
-                # Obtener/crear módulo
-                id_modulo = self._crear_modulo_si_no_existe(num_modulo)
+        # 6. INSERT masivo de resultados
+        batch_inserts = list(zip(
+            datos['IdInscripcion'].tolist(),
+            datos['IdEvaluacion'].tolist(),
+            datos['Puntaje'].tolist(),
+            datos['Aprobado'].tolist(),
+            datos['IntentoNumero'].tolist()
+        ))
 
-                if not id_modulo:
-                    continue
+        registradas = self.writer.escribir("calificaciones_insert", """
+            INSERT INTO instituto_ResultadoEvaluacion
+            (IdInscripcion, IdEvaluacion, PuntajeObtenido, Aprobado,
+             IntentoNumero, FechaRealizacion)
+            VALUES (?, ?, ?, ?, ?, GETDATE())
+        """, batch_inserts)
 
-                # Obtener IdInscripcion
-                key = (user_id, id_modulo)
-                id_inscripcion = self._cache_progresos.get(key)
+        ultimos_intentos = datos.groupby(['IdInscripcion', 'IdEvaluacion'])['IntentoNumero'].max()
+        for (id_inscripcion, id_evaluacion), total in ultimos_intentos.items():
+            self._cache_intentos[(int(id_inscripcion), int(id_evaluacion))] = int(total)
 
-                if not id_inscripcion:
-                    logger.warning(f"⚠️  No se encontró inscripción para {user_id} - Módulo {id_modulo}")
-                    continue
+        # 7. UPDATE masivo: inscripciones con al menos un intento aprobado → Terminado
+        aprobadas = datos.loc[datos['Aprobado'] == 1, 'IdInscripcion'].unique().tolist()
 
-                # Obtener/crear evaluación
-                id_evaluacion = self._cache_evaluaciones.get(id_modulo)
-
-                if not id_evaluacion:
-                    # Crear evaluación
-                    nombre_modulo = MODULOS_MAPPING.get(num_modulo)
-                    self._crear_evaluacion_para_modulo(id_modulo, nombre_modulo)
-
-                    # Actualizar caché
-                    self.cursor.execute("""
-                        SELECT IdEvaluacion
-                        FROM instituto_Evaluacion
-                        WHERE IdModulo = ? AND Activo = 1
-                    """, (id_modulo,))
-                    row_eval = self.cursor.fetchone()
-
-                    if row_eval:
-                        id_evaluacion = row_eval.IdEvaluacion
-                        self._cache_evaluaciones[id_modulo] = id_evaluacion
-
-                # Obtener puntaje mínimo
-                self.cursor.execute("""
-                    SELECT PuntajeMinimo
-                    FROM instituto_Evaluacion
-                    WHERE IdEvaluacion = ?
-                """, (id_evaluacion,))
-                row_eval = self.cursor.fetchone()
-                puntaje_minimo = row_eval.PuntajeMinimo if row_eval else self.config.default_puntaje_minimo
-
-                # Determinar si aprobó
-                aprobado = 1 if puntaje_decimal >= puntaje_minimo else 0
-
-                # Contar intentos previos
-                self.cursor.execute("""
-                    SELECT COUNT(*) as total
-                    FROM instituto_ResultadoEvaluacion
-                    WHERE IdInscripcion = ? AND IdEvaluacion = ?
-                """, (id_inscripcion, id_evaluacion))
-
-                intento_numero = self.cursor.fetchone().total + 1
-
-                # Insertar resultado
-                self.cursor.execute("""
-                    INSERT INTO instituto_ResultadoEvaluacion
-                    (IdInscripcion, IdEvaluacion, PuntajeObtenido, Aprobado,
-                     IntentoNumero, FechaRealizacion)
-                    VALUES (?, ?, ?, ?, ?, GETDATE())
-                """, (id_inscripcion, id_evaluacion, puntaje_decimal, aprobado, intento_numero))
-
-                calificaciones_registradas += 1
-
-                # Si aprobó, actualizar progreso a Terminado
-                if aprobado:
-                    self.cursor.execute("""
-                        UPDATE instituto_ProgresoModulo
-                        SET EstatusModulo = 'Terminado',
-                            FechaFinalizacion = GETDATE()
-                        WHERE IdInscripcion = ?
-                    """, (id_inscripcion,))
+        if aprobadas:
+            self.writer.escribir("calificaciones_estatus", """
+                UPDATE instituto_ProgresoModulo
+                SET EstatusModulo = 'Terminado',
+                    FechaFinalizacion = GETDATE()
+                WHERE IdInscripcion = ?
+            """, [(id_inscripcion,) for id_inscripcion in aprobadas])
 
-            except Exception as e:
-                error_msg = f"Error en calificación {idx}: {e}"
-                self.stats['errores'].append(error_msg)
-                logger.warning(f"⚠️  {error_msg}")
+            logger.info(f"✅ Módulos marcados como terminados: {len(aprobadas):,}")
 
-        self.stats['calificaciones_registradas'] = calificaciones_registradas
-        logger.info(f"✅ Calificaciones registradas: {calificaciones_registradas:,}")
+        self.stats['calificaciones_registradas'] += registradas
+        logger.info(f"✅ Calificaciones registradas: {registradas:,}")
 
     # ========================================================================
     # REPORTES Y ESTADÍSTICAS
@@ -1520,6 +2948,11 @@ class ETLInstitutoCompleto:
         logger.info(f"  • Módulos creados:      {self.stats['modulos_creados']:,}")
         logger.info(f"  • Progresos insertados: {self.stats['progresos_insertados']:,}")
         logger.info(f"  • Progresos actualizados: {self.stats['progresos_actualizados']:,}")
+        logger.info(f"  • Filas de resumen:     {self.stats['resumen_filas']:,}")
+
+        if self.config.delta_mode:
+            logger.info("\n🔁 MODO DELTA:")
+            logger.info(f"  • Filas sin cambios:    {self.stats['filas_sin_cambios']:,}")
 
         logger.info("\n📝 EVALUACIONES:")
         logger.info(f"  • Evaluaciones creadas: {self.stats['evaluaciones_creadas']:,}")
@@ -1529,6 +2962,31 @@ class ETLInstitutoCompleto:
         logger.info(f"  • Unidades creadas:     {self.stats['unidades_creadas']:,}")
         logger.info(f"  • Departamentos creados: {self.stats['departamentos_creados']:,}")
 
+        if self.stats['escrituras']:
+            filas_escritas = sum(m['filas'] for m in self.stats['escrituras'])
+            segundos_escritura = sum(m['segundos'] for m in self.stats['escrituras'])
+            logger.info("\n💾 ESCRITURA EN LOTES:")
+            logger.info(f"  • Lotes:                {len(self.stats['escrituras']):,}")
+            logger.info(f"  • Filas escritas:       {filas_escritas:,}")
+            if segundos_escritura:
+                logger.info(f"  • Rendimiento:          {filas_escritas / segundos_escritura:,.0f} filas/s")
+
+        titulos = self.stats['titulos']
+        if titulos['aciertos'] or titulos['fallos']:
+            logger.info("\n🔍 RESOLUCIÓN DE TÍTULOS:")
+            logger.info(f"  • Títulos distintos:    {titulos['fallos']:,}")
+            logger.info(f"  • Aciertos de caché:    {titulos['aciertos']:,}")
+            logger.info(f"  • Por regex:            {titulos['regex']:,}")
+            logger.info(f"  • Por evaluación:       {titulos['evaluaciones']:,}")
+            logger.info(f"  • Por fuzzy:            {titulos['fuzzy']:,}")
+            logger.info(f"  • No identificados:     {titulos['no_identificados']:,}")
+
+        sentencias = _registro_sentencias.resumen(top=5, prefijo='etl.')
+        if sentencias:
+            logger.info("\n🗂️  SENTENCIAS MÁS COSTOSAS:")
+            for linea in sentencias:
+                logger.info(f"  • {linea}")
+
         logger.info(f"\n❌ ERRORES:")
         logger.info(f"  • Total:                {len(self.stats['errores']):,}")
 
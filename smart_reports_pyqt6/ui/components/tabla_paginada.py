@@ -0,0 +1,200 @@
+"""
+Modelo de Tabla Paginada - PyQt6
+
+QAbstractTableModel que lee una ConsultaPaginada por páginas a medida que
+el usuario hace scroll (canFetchMore / fetchMore), sin bloquear la UI:
+
+- Cada página se consulta en un hilo de trabajo con una conexión del pool
+  y llega al hilo principal con una señal (conexión encolada)
+- Memoria y tiempo hasta la primera fila dependen de lo visto, no del
+  tamaño del resultado
+- Al cambiar de consulta, la página en curso se cancela (cursor.cancel()
+  si el driver lo soporta) y su resultado se descarta al llegar
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence
+import threading
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from smart_reports_pyqt6.database.models.consultas_paginadas import (
+    ConsultaPaginada,
+    formatear_valor
+)
+
+
+class ModeloTablaPaginada(QAbstractTableModel):
+    """Modelo de tabla con carga de páginas bajo demanda"""
+
+    # Se emiten en el hilo principal
+    carga_iniciada = pyqtSignal()
+    pagina_cargada = pyqtSignal(int)      # filas cargadas en total
+    carga_terminada = pyqtSignal(int)     # no hay más páginas: total de filas
+    error = pyqtSignal(str)
+
+    # Interna: hilo de trabajo → hilo principal (generación, filas, error)
+    _pagina_lista = pyqtSignal(int, object, object)
+
+    def __init__(self, origen=None, parent=None):
+        """
+        Args:
+            origen: ConnectionPool o DatabaseConnection (con cursor() como
+                    context manager). None = solo datos estáticos
+        """
+        super().__init__(parent)
+        self.origen = origen
+
+        self._consulta: Optional[ConsultaPaginada] = None
+        self._encabezados: List[str] = []
+        self._filas: List[tuple] = []
+        self._ultima_clave: Optional[tuple] = None
+        self._agotado = True
+        self._cargando = False
+
+        # Cada consulta nueva incrementa la generación; las páginas de
+        # generaciones anteriores se descartan al llegar
+        self._generacion = 0
+        self._lock = threading.Lock()
+        self._cursor_activo = None
+        self._futuro = None
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tabla_paginada')
+        self._pagina_lista.connect(self._agregar_pagina, Qt.ConnectionType.QueuedConnection)
+
+    # ==================== API ====================
+
+    def set_consulta(self, consulta: ConsultaPaginada):
+        """Reemplaza el contenido por una consulta paginada y pide la primera página"""
+        self._reiniciar(list(consulta.encabezados))
+        self._consulta = consulta
+        self._agotado = False
+        self.carga_iniciada.emit()
+        self.fetchMore(QModelIndex())
+
+    def set_datos(self, encabezados: Sequence[str], filas: Sequence[Sequence[Any]]):
+        """Reemplaza el contenido por datos estáticos (sin paginar)"""
+        self._reiniciar(list(encabezados), [tuple(f) for f in filas])
+        self.carga_terminada.emit(len(self._filas))
+
+    def cancelar(self):
+        """Cancela la página en curso (su resultado se descartará)"""
+        with self._lock:
+            self._generacion += 1
+            cursor = self._cursor_activo
+
+        if self._futuro is not None:
+            self._futuro.cancel()
+        if cursor is not None and hasattr(cursor, 'cancel'):
+            try:
+                cursor.cancel()
+            except Exception:
+                pass
+        self._cargando = False
+
+    def cerrar(self):
+        """Cancela la carga y detiene el hilo de trabajo"""
+        self.cancelar()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def cargando(self) -> bool:
+        return self._cargando
+
+    # ==================== QAbstractTableModel ====================
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._encabezados)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        fila = self._filas[index.row()]
+        if self._consulta is not None:
+            return self._consulta.texto(fila, index.column())
+        return formatear_valor(fila[index.column()])
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal and section < len(self._encabezados):
+            return self._encabezados[section]
+        if orientation == Qt.Orientation.Vertical:
+            return str(section + 1)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._consulta is not None and not self._agotado and self.origen is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent) or self._cargando:
+            return
+
+        self._cargando = True
+        self._futuro = self._executor.submit(
+            self._leer_pagina, self._generacion, self._consulta, self._ultima_clave
+        )
+
+    # ==================== CARGA EN SEGUNDO PLANO ====================
+
+    def _leer_pagina(self, generacion: int, consulta: ConsultaPaginada, despues_de: Optional[tuple]):
+        """Hilo de trabajo: consulta una página y la envía al hilo principal"""
+        if generacion != self._generacion:
+            return
+
+        try:
+            with self.origen.cursor() as cursor:
+                with self._lock:
+                    if generacion != self._generacion:
+                        return
+                    self._cursor_activo = cursor
+                try:
+                    filas = consulta.pagina(cursor, despues_de)
+                finally:
+                    with self._lock:
+                        self._cursor_activo = None
+            self._pagina_lista.emit(generacion, filas, None)
+        except Exception as e:
+            self._pagina_lista.emit(generacion, None, str(e))
+
+    def _agregar_pagina(self, generacion: int, filas: Optional[List[tuple]], mensaje: Optional[str]):
+        """Hilo principal: agrega la página al modelo"""
+        if generacion != self._generacion:
+            return
+
+        self._cargando = False
+
+        if mensaje is not None:
+            self._agotado = True
+            print(f"❌ Error cargando página: {mensaje}")
+            self.error.emit(mensaje)
+            return
+
+        if filas:
+            inicio = len(self._filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(filas) - 1)
+            self._filas.extend(filas)
+            self.endInsertRows()
+            self._ultima_clave = self._consulta.clave_de(filas[-1])
+
+        if len(filas) < self._consulta.tamano_pagina:
+            self._agotado = True
+            self.carga_terminada.emit(len(self._filas))
+        else:
+            self.pagina_cargada.emit(len(self._filas))
+
+    def _reiniciar(self, encabezados: List[str], filas: Optional[List[tuple]] = None):
+        """Cancela lo pendiente y reemplaza el contenido del modelo"""
+        self.cancelar()
+        self.beginResetModel()
+        self._consulta = None
+        self._encabezados = encabezados
+        self._filas = filas or []
+        self._ultima_clave = None
+        self._agotado = True
+        self.endResetModel()
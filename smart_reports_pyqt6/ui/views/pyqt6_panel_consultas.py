@@ -1,16 +1,35 @@
 """
 Panel de Consultas - PyQt6
 Migrado desde CustomTkinter con diseño grid 2x2
+
+Las búsquedas por unidad y por nombre se leen por páginas (keyset) en
+segundo plano: la tabla muestra las primeras filas de inmediato y pide más
+al hacer scroll. El pool también se abre en segundo plano; si falla, el
+error se recuerda durante REINTENTO_ORIGEN_SEGUNDOS en lugar de volver a
+esperar al servidor en cada búsqueda.
 """
 
+import threading
+import time
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QFrame,
-    QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+    QScrollArea, QTableView, QHeaderView, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from smart_reports_pyqt6.ui.components.tabla_paginada import ModeloTablaPaginada
+from smart_reports_pyqt6.database.models.consultas_paginadas import (
+    consulta_usuarios_por_unidad,
+    consulta_usuarios_por_nombre
+)
+
+
+# Segundos durante los que se recuerda que la BD no respondió
+REINTENTO_ORIGEN_SEGUNDOS = 30
+
 
 class SearchSectionCard(QFrame):
     """Tarjeta de sección de búsqueda"""
@@ -114,11 +133,24 @@ class SearchSectionCard(QFrame):
 class ConsultasPanel(QWidget):
     """Panel de Consultas con diseño grid 2x2"""
 
+    # Resultado de abrir el pool en segundo plano (hilo de trabajo → UI)
+    _origen_listo = pyqtSignal(object)
+    _origen_error = pyqtSignal(str)
+
     def __init__(self, parent=None, theme_manager=None, db_connection=None):
         super().__init__(parent)
 
         self.theme_manager = theme_manager
         self.db_connection = db_connection
+        self._origen_bd = None
+        self._abriendo_origen = False
+        self._error_origen = None
+        self._hora_error_origen = 0.0
+        # Búsqueda pedida mientras se abre el pool: (consulta, descripción)
+        self._consulta_pendiente = None
+
+        self._origen_listo.connect(self._on_origen_listo)
+        self._origen_error.connect(self._on_origen_error)
         
         # Lista de tarjetas para actualizar tema
         self.cards = []
@@ -468,8 +500,18 @@ class ConsultasPanel(QWidget):
         results_title.setStyleSheet(f"color: {text_color}; background: transparent;")
         results_layout.addWidget(results_title)
 
-        # Tabla de resultados
-        self.results_table = QTableWidget(0, 0)
+        # Tabla de resultados (modelo paginado)
+        self.results_model = ModeloTablaPaginada(parent=self)
+        self.results_model.pagina_cargada.connect(self._on_pagina_cargada)
+        self.results_model.carga_terminada.connect(self._on_carga_terminada)
+        self.results_model.error.connect(self._on_error_consulta)
+
+        # El hilo de páginas no debe sobrevivir al panel
+        modelo = self.results_model
+        self.destroyed.connect(lambda *_: modelo.cerrar())
+
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setMinimumHeight(250)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -479,17 +521,17 @@ class ConsultasPanel(QWidget):
         table_alt = "#2d2d2d" if is_dark else "#f0f0f0"
         table_header = "#002E6D"
         self.results_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {table_bg};
                 color: {table_text};
                 gridline-color: #444444;
                 border: 1px solid #002E6D;
                 border-radius: 8px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 8px;
             }}
-            QTableWidget::item:alternate {{
+            QTableView::item:alternate {{
                 background-color: {table_alt};
             }}
             QHeaderView::section {{
@@ -536,9 +578,7 @@ class ConsultasPanel(QWidget):
             return
 
         print(f"🔍 Buscando usuarios de unidad: {unit}")
-
-        # TODO: Consulta real a BD
-        self._load_dummy_results(f"Unidad: {unit}")
+        self._consultar_paginado(consulta_usuarios_por_unidad(unit), f"Unidad: {unit}")
 
     def _search_by_name(self):
         """Buscar usuarios por nombre"""
@@ -549,7 +589,7 @@ class ConsultasPanel(QWidget):
             return
 
         print(f"🔍 Buscando usuarios con nombre: {name}")
-        self._load_dummy_results(f"Nombre: {name}")
+        self._consultar_paginado(consulta_usuarios_por_nombre(name), f"Nombre: {name}")
 
     def _show_stats(self):
         """Mostrar estadísticas"""
@@ -558,6 +598,94 @@ class ConsultasPanel(QWidget):
         # TODO: Consulta real a BD
         self._load_dummy_results("Estadísticas Globales")
 
+    def _consultar_paginado(self, consulta, query_type: str):
+        """Muestra una consulta paginada (cancela la búsqueda anterior)"""
+        self._query_type = query_type
+
+        if self._origen_bd is not None:
+            self.results_model.origen = self._origen_bd
+            self.results_model.set_consulta(consulta)
+            return
+
+        # Fallo reciente: no se vuelve a esperar al servidor
+        if self._error_origen and time.monotonic() - self._hora_error_origen < REINTENTO_ORIGEN_SEGUNDOS:
+            self._mostrar_error(f"Sin conexión a BD: {self._error_origen}")
+            return
+
+        # El pool se abre en segundo plano; la búsqueda sale al terminar
+        self._consulta_pendiente = (consulta, query_type)
+        self.results_model.set_datos([], [])
+        self.results_title.setText("📋 Resultados (conectando...)")
+        self._abrir_origen_bd()
+
+    def _abrir_origen_bd(self):
+        """Lanza la apertura del pool en un hilo de trabajo (una a la vez)"""
+        if self._abriendo_origen:
+            return
+        self._abriendo_origen = True
+        threading.Thread(target=self._resolver_origen_bd, name="ConsultasOrigen", daemon=True).start()
+
+    def _resolver_origen_bd(self):
+        """Hilo de trabajo: pool de conexiones para las consultas paginadas"""
+        try:
+            from smart_reports_pyqt6.database.repositories.persistence.mysql.connection import (
+                ConnectionPool, DatabaseConnection
+            )
+            if isinstance(self.db_connection, (ConnectionPool, DatabaseConnection)):
+                origen = self.db_connection
+            else:
+                origen = DatabaseConnection().pool
+        except Exception as e:
+            senal, valor = self._origen_error, str(e)
+        else:
+            senal, valor = self._origen_listo, origen
+
+        try:
+            senal.emit(valor)
+        except RuntimeError:
+            pass  # El panel se destruyó mientras se conectaba
+
+    def _on_origen_listo(self, origen):
+        """Hilo principal: pool abierto, se lanza la búsqueda pendiente"""
+        self._abriendo_origen = False
+        self._origen_bd = origen
+        self._error_origen = None
+
+        pendiente, self._consulta_pendiente = self._consulta_pendiente, None
+        if pendiente is not None:
+            self._consultar_paginado(*pendiente)
+
+    def _on_origen_error(self, mensaje: str):
+        """Hilo principal: no se pudo abrir el pool (se recuerda el fallo)"""
+        self._abriendo_origen = False
+        self._error_origen = mensaje
+        self._hora_error_origen = time.monotonic()
+        self._consulta_pendiente = None
+        print(f"⚠️  Sin conexión a BD: {mensaje}")
+        self._mostrar_error(f"Sin conexión a BD: {mensaje}")
+
+    def _mostrar_error(self, mensaje: str):
+        """Estado de error: tabla vacía y el motivo en el título"""
+        self.results_model.set_datos([], [])
+        resumen = mensaje if len(mensaje) <= 120 else mensaje[:117] + "..."
+        self.results_title.setText(f"📋 Resultados — ❌ {resumen}")
+        self.results_title.setToolTip(mensaje)
+
+    def _on_pagina_cargada(self, total: int):
+        """Hay más páginas: total parcial"""
+        self.results_title.setText(f"📋 Resultados ({total}+)")
+        self.results_title.setToolTip("")
+
+    def _on_carga_terminada(self, total: int):
+        """Resultado completo"""
+        self.results_title.setText(f"📋 Resultados ({total})")
+        self.results_title.setToolTip("")
+
+    def _on_error_consulta(self, mensaje: str):
+        """La consulta falló: estado de error (nunca datos de ejemplo)"""
+        print(f"⚠️  Consulta fallida ({getattr(self, '_query_type', '')}): {mensaje}")
+        self._mostrar_error(f"Error en la consulta: {mensaje}")
+
     def _load_dummy_results(self, query_type: str):
         """Cargar resultados dummy"""
 
@@ -571,16 +699,8 @@ class ConsultasPanel(QWidget):
             ["1005", "Luis Rodríguez", "Container", "luis.rodriguez@hp.com", "85%", "2025-01-19"],
         ]
 
-        # Configurar tabla
-        self.results_table.setRowCount(len(data))
-        self.results_table.setColumnCount(len(headers))
-        self.results_table.setHorizontalHeaderLabels(headers)
-
-        # Llenar datos
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                item = QTableWidgetItem(value)
-                self.results_table.setItem(row, col, item)
+        # Llenar tabla
+        self.results_model.set_datos(headers, data)
 
         # Info - ELIMINADO
         # self.results_info.setText(f"✅ {len(data)} registros encontrados - Consulta: {query_type}")
@@ -627,17 +747,17 @@ class ConsultasPanel(QWidget):
         table_header = "#002E6D"
         
         self.results_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {table_bg};
                 color: {table_text};
                 gridline-color: #444444;
                 border: 1px solid #002E6D;
                 border-radius: 8px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 8px;
             }}
-            QTableWidget::item:alternate {{
+            QTableView::item:alternate {{
                 background-color: {table_alt};
             }}
             QHeaderView::section {{
@@ -1,8 +1,15 @@
 """
 Panel de Dashboard - Control Ejecutivo
 PyQt6 Version - Replicando diseño de CustomTkinter
+
+Las gráficas de METRICAS_GRAFICAS se llenan con MetricasGerencialesService
+a través de PuenteMetricasQt: todas las métricas se consultan a la vez en
+hilos de trabajo y cada tarjeta se actualiza al llegar su señal. Mientras
+tanto (o sin BD) se muestran los datos de ejemplo.
 """
 
+import threading
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QFrame, QScrollArea
@@ -11,6 +18,8 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from smart_reports_pyqt6.ui.widgets.pyqt6_d3_chart_widget import D3ChartWidget
+from smart_reports_pyqt6.core.services.metricas_async import PuenteMetricasQt
+from smart_reports_pyqt6.core.services.metricas_gerenciales_service import MetricasGerencialesService
 
 
 # Datos del dashboard
@@ -44,6 +53,14 @@ MODULOS_MENOR_AVANCE_DATA = {
     'values': [45, 52, 58, 65, 72]
 }
 
+# Gráficas con datos reales: posición en chart_cards → (métrica de
+# METRICAS_DASHBOARD, título, máximo de categorías)
+METRICAS_GRAFICAS = {
+    1: ('rendimiento_unidad', 'Calificación Promedio por Unidad', 5),
+    2: ('progreso_mensual', 'Tendencia Mensual', None),
+    3: ('top_departamentos', 'Top 5 Departamentos de Mayor Progreso', 5),
+}
+
 
 class ExpandedChartView(QWidget):
     """Vista expandida de gráfico (flujo tipo app móvil)"""
@@ -722,10 +739,18 @@ class ChartCard(QFrame):
         """Exportar gráfico"""
         print(f"📊 Exportando gráfico '{self.title}' como {format.upper()}...")
 
+    def actualizar_datos(self, title: str, data: dict):
+        """Reemplaza título y datos (p. ej. al llegar la métrica real)"""
+        self.title = title
+        self.data = data
+        self.chart_widget.set_chart(self.chart_type, title, data, tema=self.theme, mode='summary')
+
     def _refresh_chart(self):
         """Actualizar gráfico"""
         print(f"🔄 Actualizando gráfico '{self.title}'...")
-        self.chart_widget.set_chart(self.chart_type, self.title, self.data, tema=self.theme)
+        self.chart_widget.set_chart(self.chart_type, self.title, self.data, tema=self.theme, mode='summary')
+        # Mismos datos: no hay nada que enviar, se repite la animación
+        self.chart_widget.redibujar()
 
     def _show_data_table(self):
         """Mostrar datos del gráfico en tabla"""
@@ -927,12 +952,18 @@ class ChartCard(QFrame):
 class DashboardPanel(QWidget):
     """Panel de Dashboard - Control Ejecutivo (Sin Tabs, replicando CustomTkinter)"""
 
-    def __init__(self, parent=None, theme_manager=None):
+    # Origen de datos resuelto en segundo plano (pool) o error al abrirlo
+    _origen_listo = pyqtSignal(object)
+    _origen_error = pyqtSignal(str)
+
+    def __init__(self, parent=None, theme_manager=None, db_connection=None):
         super().__init__(parent)
 
         self.theme_manager = theme_manager
+        self.db_connection = db_connection
         self.chart_cards = []
         self.metric_cards = []
+        self._puente = None
 
         self.setStyleSheet("background: transparent; border: none;")
 
@@ -943,6 +974,13 @@ class DashboardPanel(QWidget):
         if self.theme_manager:
             self.theme_manager.theme_changed.connect(self._on_theme_changed)
 
+        # Métricas reales: el pool se abre fuera del hilo de la UI
+        self._origen_listo.connect(self._iniciar_metricas)
+        self._origen_error.connect(
+            lambda error: print(f"⚠️ Dashboard sin BD, se muestran datos de ejemplo: {error}")
+        )
+        threading.Thread(target=self._resolver_origen, name="DashboardOrigen", daemon=True).start()
+
     def _create_ui(self):
         """Crear interfaz"""
 
@@ -1064,21 +1102,81 @@ class DashboardPanel(QWidget):
         # Spacer al final
         main_layout.addStretch()
 
-        # Iniciar carga escalonada de gráficas
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(500, self.load_charts_staggered)
+        # Las gráficas ya quedaron en cola al crear cada ChartCard: el
+        # PlanificadorCargas las carga en orden según van terminando
 
     def load_charts_staggered(self):
-        """Cargar gráficas una por una para evitar congelamiento"""
-        from PyQt6.QtCore import QTimer
-        
-        delay = 0
-        for i, chart_card in enumerate(self.chart_cards):
-            # Recargar cada gráfica con un delay incremental
-            QTimer.singleShot(delay, lambda c=chart_card: c.chart_widget.set_chart(
-                c.chart_type, c.title, c.data, tema=c.theme, mode='summary'
-            ))
-            delay += 500  # 500ms entre cada gráfica para asegurar carga
+        """
+        Recargar todas las gráficas
+
+        Se encolan todas a la vez; el PlanificadorCargas inicia cada carga
+        cuando termina una anterior (loadFinished), sin retardos fijos. Con
+        BD, además se vuelven a pedir las métricas reales.
+        """
+        for chart_card in self.chart_cards:
+            chart_card.chart_widget.set_chart(
+                chart_card.chart_type, chart_card.title, chart_card.data,
+                tema=chart_card.theme, mode='summary'
+            )
+        self._cargar_metricas()
+
+    # ==================== MÉTRICAS REALES ====================
+
+    def _resolver_origen(self):
+        """Hilo de fondo: obtiene el pool (conectar puede tardar o fallar)"""
+        try:
+            origen = self.db_connection
+            if origen is None:
+                from smart_reports_pyqt6.database.repositories.persistence.mysql.connection import (
+                    DatabaseConnection
+                )
+                origen = DatabaseConnection().pool
+        except Exception as e:
+            senal, valor = self._origen_error, str(e)
+        else:
+            senal, valor = self._origen_listo, origen
+
+        try:
+            senal.emit(valor)
+        except RuntimeError:
+            pass  # El panel se destruyó mientras se conectaba
+
+    def _iniciar_metricas(self, origen):
+        """Crea el puente de métricas sobre el origen ya abierto (hilo de la UI)"""
+        servicio = MetricasGerencialesService(origen)
+        if not servicio.disponible:
+            return
+
+        self._puente = PuenteMetricasQt(servicio, parent=self)
+        self._puente.metrica_lista.connect(self._on_metrica_lista)
+        self._puente.metrica_error.connect(
+            lambda nombre, error: print(f"⚠️ Métrica {nombre} no disponible: {error}")
+        )
+        # Los hilos de consulta no deben sobrevivir al panel
+        metricas = self._puente.metricas
+        self.destroyed.connect(lambda *_: metricas.cerrar())
+
+        self._cargar_metricas()
+
+    def _cargar_metricas(self):
+        """Pide en paralelo las métricas de METRICAS_GRAFICAS (no bloquea)"""
+        if self._puente is not None:
+            self._puente.cargar_todas([metrica for metrica, _, _ in METRICAS_GRAFICAS.values()])
+
+    def _on_metrica_lista(self, nombre: str, datos):
+        """Slot (hilo de la UI): lleva la métrica a su tarjeta"""
+        if not datos:
+            return
+
+        for posicion, (metrica, titulo, maximo) in METRICAS_GRAFICAS.items():
+            if metrica != nombre or posicion >= len(self.chart_cards):
+                continue
+            categorias = list(datos.get('categorias', []))[:maximo]
+            valores = list(datos.get('valores', []))[:maximo]
+            if categorias:
+                self.chart_cards[posicion].actualizar_datos(
+                    titulo, {'labels': categorias, 'values': valores}
+                )
 
     def _on_theme_changed(self, new_theme: str):
         """Callback cuando cambia el tema - SIN REINICIALIZAR GRÁFICAS"""
@@ -1103,12 +1201,9 @@ class DashboardPanel(QWidget):
             if hasattr(chart_card, 'update_theme_colors'):
                 chart_card.update_theme_colors()
 
-            # NO reinicializar las gráficas - solo dejar que el tema cambie automáticamente
-            # Las gráficas D3 se adaptan al tema mediante CSS
-            
-        # RECARGAR GRÁFICAS para aplicar nuevo tema (background D3)
-        # Usamos carga escalonada para evitar congelamiento
-        self.load_charts_staggered()
+            # NO reinicializar las gráficas: el tema se aplica en la página
+            # ya cargada mediante variables CSS (SmartChart.setTheme)
+            chart_card.chart_widget.set_theme(new_theme)
 
         # Actualizar métricas
         for metric_card in self.metric_cards:
@@ -1,202 +1,207 @@
 """
 D3 Chart Widget - PyQt6 con QWebEngineView
 Widget para renderizar gráficos D3.js v7 interactivos (sin NVD3)
-"""
 
-import os
-import tempfile
-from pathlib import Path
+OPTIMIZACIÓN: Una página anfitriona por widget, actualizada solo con datos
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
-from PyQt6.QtCore import QUrl
+Antes cada set_chart (incluidos cambios de tema y "Actualizar") generaba
+un documento HTML completo, lo escribía en un archivo temporal y recargaba
+la página (cientos de ms). Ahora cada widget carga una sola vez una página
+anfitriona fija que expone:
 
+    SmartChart.update(cambios)   # tipo, título, modo, tema y/o datos
+    SmartChart.setTheme(tema)    # solo cambia variables CSS
+    SmartChart.resize(cambios)   # redibuja al tamaño actual, sin animación
 
-class D3ChartWidget(QWidget):
-    """
-    Widget para renderizar gráficos D3.js v7 usando QWebEngineView
+y Python le envía con runJavaScript únicamente las claves que cambiaron
+respecto al último envío. D3 anima la transición entre conjuntos de datos
+(data join con claves por etiqueta). Sin archivos temporales.
 
-    Características:
-    - Renderizado profesional con Chromium
-    - D3.js v7 (última versión)
-    - Tooltips interactivos
-    - Hover effects y animaciones suaves
-    - Responsive design
-    - Colores corporativos Hutchison Ports
-    """
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-
-        self.temp_file = None
-        self.chart_type = None
-        self.chart_data = None
-
-        # Crear UI
-        self._create_ui()
-
-    def _create_ui(self):
-        """Crear interfaz"""
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-
-        # Crear QWebEngineView
-        self.webview = QWebEngineView(self)
-
-        # Configurar settings
-        settings = self.webview.settings()
-        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.ErrorPageEnabled, False)
-
-        layout.addWidget(self.webview)
-
-    def set_chart(self, chart_type: str, title: str, datos: dict, subtitle: str = "", tema: str = 'dark', mode: str = 'summary'):
-        """
-        Establecer gráfico D3.js v7
-
-        Args:
-            chart_type: 'bar', 'horizontal_bar', 'donut', 'line', 'area', 'scatter'
-            title: Título del gráfico
-            datos: {'labels': [...], 'values': [...]}
-            subtitle: Subtítulo opcional
-            tema: 'dark' o 'light'
-            mode: 'summary' (vista dashboard) o 'detail' (vista expandida)
-        """
-
-        print(f"📊 Cargando gráfico D3.js v7 - {chart_type}: {title}")
-
-        # Guardar datos
-        self.chart_type = chart_type
-        self.chart_data = datos
-
-        # CRÍTICO: Limpiar webview antes de cargar nuevo contenido
-        self.webview.setHtml("")
-
-        # Generar HTML
-        html = self._generate_html(chart_type, title, datos, subtitle, tema, mode)
-
-        # Cargar en webview con delay para asegurar renderizado
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(200, lambda: self._load_html(html))
-
-    def _generate_html(self, chart_type: str, title: str, datos: dict, subtitle: str, tema: str, mode: str) -> str:
-        """Generar HTML del gráfico usando D3.js v7"""
-
-        labels = datos.get('labels', [])
-        values = datos.get('values', [])
+Las series de líneas/área y las nubes de dispersión se reducen al ancho del
+gráfico (LTTB / hexbin, ver reduccion_series) antes de enviarse, y otra vez
+cuando el widget cambia de ancho. El widget
+conserva los datos completos: al seleccionar una zona, la página pide el
+rango por QWebChannel y recibe esa ventana a más resolución.
+"""
 
-        # Preparar datos para D3.js v7
-        chart_data = [
-            {"label": str(labels[i]), "value": float(values[i])}
-            for i in range(len(labels))
-        ]
+import json
+from typing import Any, Dict, Optional
 
-        import json
-        chart_data_json = json.dumps(chart_data)
+import numpy as np
 
-        # Colores Hutchison Ports
-        hutchison_colors = [
-            '#002E6D', '#003D82', '#004C97', '#0066CC', '#0080FF',
-            '#009BDE', '#00B5E2', '#33C7F0', '#66D4F5', '#99E1FA'
-        ]
-        colors_json = json.dumps(hutchison_colors)
-
-        # Colores de fondo según tema
-        bg_color = '#1a1a1a' if tema == 'dark' else '#f5f5f5'
-        card_bg = '#2d2d2d' if tema == 'dark' else '#ffffff'
-        text_color = '#ffffff' if tema == 'dark' else '#003087'
-        axis_color = '#b0b0b0' if tema == 'dark' else '#4a5c8a'
-        # Color de las etiquetas de valores (números en las gráficas)
-        label_color = '#ffffff' if tema == 'dark' else '#002E6D'
-
-        # HTML completo con D3.js v7
-        html = f"""
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal, pyqtSlot
+
+from smart_reports_pyqt6.ui.widgets.pyqt6_d3_renderer_pool import (
+    get_planificador_cargas,
+    perfil_graficos
+)
+from smart_reports_pyqt6.utils.visualization.assets_web import (
+    DIRECTORIO_VENDOR,
+    ESQUEMA,
+    HOST_ASSETS,
+    esquema_activo,
+    etiquetas_head
+)
+from smart_reports_pyqt6.utils.visualization.reduccion_series import (
+    ANCHO_PREDETERMINADO_PX,
+    hexbin,
+    lttb_indices,
+    presupuesto_puntos,
+    valores_float
+)
+
+
+# Colores Hutchison Ports
+HUTCHISON_COLORS = [
+    '#002E6D', '#003D82', '#004C97', '#0066CC', '#0080FF',
+    '#009BDE', '#00B5E2', '#33C7F0', '#66D4F5', '#99E1FA'
+]
+
+# Tipos cuyos datos se reducen al ancho del gráfico
+TIPOS_SERIE = ('line', 'area')
+TIPOS_REDUCIBLES = TIPOS_SERIE + ('scatter',)
+
+# Alto de #chart en la página anfitriona (para el hexbin)
+ALTO_GRAFICO_PX = 450
+
+# Reintentos si la página anfitriona no carga (loadFinished(False))
+REINTENTOS_CARGA = 3
+
+# Espera tras el último resizeEvent antes de reducir de nuevo los datos
+ESPERA_REDIMENSION_MS = 150
+
+# Página anfitriona: estática, se genera una vez por proceso (__ASSETS__ y
+# __COLORS__ se sustituyen al generarla)
+_HTML_HOST = """
 <!DOCTYPE html>
-<html>
+<html data-theme="dark">
 <head>
     <meta charset="UTF-8">
-    <title>{title}</title>
+    <title></title>
 
-    <!-- D3.js v7 (última versión) -->
-    <script src="https://d3js.org/d3.v7.min.js"></script>
+    <!-- D3.js v7 y Montserrat (empaquetados, ver assets_web) -->
+    __ASSETS__
+    <!-- Canal con Python para pedir el rango ampliado (zoom) -->
+    <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
 
     <style>
-        * {{
+        :root {
+            --bg: #1a1a1a;
+            --card-bg: #2d2d2d;
+            --text: #ffffff;
+            --axis: #b0b0b0;
+            --label: #ffffff;
+        }
+
+        [data-theme="light"] {
+            --bg: #f5f5f5;
+            --card-bg: #ffffff;
+            --text: #003087;
+            --axis: #4a5c8a;
+            --label: #002E6D;
+        }
+
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: 'Montserrat', 'Segoe UI', sans-serif;
-            background: {bg_color};
-            color: {text_color};
+            background: var(--bg);
+            color: var(--text);
             padding: 20px;
             overflow: hidden;
-        }}
+            transition: background 0.3s, color 0.3s;
+        }
 
-        .chart-container {{
+        .chart-container {
             width: 100%;
             height: 100vh;
             display: flex;
             flex-direction: column;
             justify-content: center;
             align-items: center;
-        }}
+        }
 
-        .chart-card {{
-            background: {card_bg};
+        .chart-card {
+            background: var(--card-bg);
             border-radius: 15px;
             padding: 30px;
             box-shadow: 0 4px 12px rgba(0,0,0,0.2);
             width: 95%;
             max-width: 1200px;
-        }}
+            transition: background 0.3s;
+        }
 
-        .chart-title {{
+        .chart-title {
             font-size: 22px;
             font-weight: 700;
             margin-bottom: 15px;
             text-align: center;
-            color: {text_color};
-        }}
+            color: var(--text);
+        }
 
-        .chart-subtitle {{
+        .chart-subtitle {
             text-align: center;
             color: #888;
             margin-bottom: 20px;
             font-size: 14px;
-        }}
+        }
 
-        #chart {{
+        #chart {
             width: 100%;
             height: 450px;
-        }}
+        }
+
+        .chart-note {
+            text-align: center;
+            color: #888;
+            margin-top: 10px;
+            font-size: 12px;
+        }
+
+        /* Decorativos: no deben tapar la selección de zoom */
+        .grid,
+        .axis,
+        .area {
+            pointer-events: none;
+        }
+
+        .zoom .selection {
+            fill: var(--axis);
+            fill-opacity: 0.15;
+            stroke: var(--axis);
+        }
 
         /* Estilos de ejes */
-        .axis text {{
-            fill: {text_color};
+        .axis text {
+            fill: var(--text);
             font-family: 'Montserrat', sans-serif;
-            font-size: 11px;
-        }}
+        }
 
         .axis line,
-        .axis path {{
-            stroke: {axis_color};
+        .axis path {
+            stroke: var(--axis);
             stroke-opacity: 0.3;
-        }}
+        }
 
-        .grid line {{
-            stroke: {axis_color};
+        .grid line {
+            stroke: var(--axis);
             stroke-opacity: 0.1;
-        }}
+        }
+
+        .grid path {
+            stroke: none;
+        }
 
         /* Estilos de tooltip */
-        .tooltip {{
+        .tooltip {
             position: absolute;
             padding: 12px 16px;
             background: rgba(0, 46, 109, 0.98);
@@ -209,587 +214,998 @@ class D3ChartWidget(QWidget):
             transition: opacity 0.2s;
             z-index: 1000;
             box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-        }}
+        }
 
-        .tooltip.show {{
+        .tooltip.show {
             opacity: 1;
-        }}
+        }
 
-        .tooltip-label {{
+        .tooltip-label {
             font-weight: 700;
             margin-bottom: 6px;
             font-size: 14px;
-        }}
+        }
 
-        .tooltip-value {{
+        .tooltip-value {
             font-size: 16px;
             color: #00D4AA;
-        }}
+        }
 
         /* Estilos específicos por tipo de gráfico */
-        .bar {{
+        .bar {
             cursor: pointer;
-            transition: all 0.3s ease;
-        }}
+        }
 
-        .bar:hover {{
+        .bar:hover {
             opacity: 0.8;
             filter: brightness(1.2);
-        }}
+        }
 
-        .line {{
+        .label {
+            fill: var(--label);
+        }
+
+        .line {
             fill: none;
             stroke-width: 3;
-        }}
+        }
 
-        .dot {{
+        .dot {
             cursor: pointer;
-            transition: all 0.3s ease;
-        }}
+        }
 
-        .dot:hover {{
+        .dot:hover {
             r: 8;
-        }}
+        }
 
-        .arc {{
+        .arc {
             cursor: pointer;
-            transition: all 0.3s ease;
-        }}
+            stroke: var(--card-bg);
+            stroke-width: 3;
+        }
 
-        .arc:hover {{
+        .arc:hover {
             opacity: 0.8;
             filter: brightness(1.1);
-        }}
+        }
 
-        .legend {{
-            font-size: 12px;
-            fill: {text_color};
-        }}
+        .arc-label {
+            fill: white;
+            pointer-events: none;
+        }
+
+        .legend text {
+            fill: var(--text);
+        }
 
-        .legend-item {{
+        .legend-item {
             cursor: pointer;
-        }}
+        }
 
-        .legend-item:hover {{
+        .legend-item:hover {
             opacity: 0.7;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="chart-container">
         <div class="chart-card">
-            <h1 class="chart-title">{title}</h1>
-            {f'<p class="chart-subtitle">{subtitle}</p>' if subtitle else ''}
+            <h1 class="chart-title" id="title"></h1>
+            <p class="chart-subtitle" id="subtitle"></p>
             <div id="chart"></div>
+            <p class="chart-note" id="nota"></p>
         </div>
     </div>
 
     <script>
-        // Datos del gráfico
-        const data = {chart_data_json};
-        const colors = {colors_json};
-
-        // Tipo de gráfico y modo
-        const chartType = '{chart_type}';
-        const mode = '{mode}'; // 'summary' o 'detail'
+    const SmartChart = (function() {
+        const colors = __COLORS__;
+        const DURACION = 750;
+
+        // Estado acumulado: cada update() trae solo lo que cambió
+        // zoom/nota: los datos vienen reducidos (ver reduccion_series) y
+        // Python puede enviar una ventana a más resolución
+        const estado = {type: null, title: '', subtitle: '', mode: 'summary', theme: 'dark', data: [],
+                        zoom: false, nota: ''};
+
+        const contenedor = d3.select('#chart');
+        const tooltip = d3.select('body').append('div').attr('class', 'tooltip');
+        let svg = null;
+        let raiz = null;
+        let tipoDibujado = null;
+
+        // Objeto "puente" de Python (QWebChannel); null fuera de Qt
+        let puente = null;
+        if (typeof QWebChannel !== 'undefined' && window.qt && qt.webChannelTransport) {
+            new QWebChannel(qt.webChannelTransport, canal => {
+                puente = canal.objects.puente;
+                if (estado.zoom) render(0);
+            });
+        }
 
-        // Tooltip
-        const tooltip = d3.select('body')
-            .append('div')
-            .attr('class', 'tooltip');
+        // ===== Utilidades =====
 
-        // Funciones de tooltip
-        function showTooltip(event, d) {{
+        function showTooltip(event, d) {
             tooltip
                 .html(`
-                    <div class="tooltip-label">${{d.label}}</div>
-                    <div class="tooltip-value">${{d.value.toLocaleString()}}</div>
+                    <div class="tooltip-label">${d.label}</div>
+                    <div class="tooltip-value">${formato(d.value)}</div>
                 `)
                 .style('left', (event.pageX + 15) + 'px')
                 .style('top', (event.pageY - 15) + 'px')
                 .classed('show', true);
-        }}
+        }
 
-        function hideTooltip() {{
+        function hideTooltip() {
             tooltip.classed('show', false);
-        }}
+        }
 
-        // Renderizar según tipo
-        {self._get_d3v7_chart_script(chart_type)}
-    </script>
-</body>
-</html>
-"""
-        return html
-
-    def _get_d3v7_chart_script(self, chart_type: str) -> str:
-        """Obtener script D3.js v7 específico del tipo de gráfico"""
-
-        if chart_type == 'bar':
-            return """
-        // ===== GRÁFICO DE BARRAS D3.js v7 =====
-        const container = d3.select('#chart');
-        const containerNode = container.node();
-        const width = containerNode.clientWidth;
-        const height = containerNode.clientHeight;
-        const margin = {top: 40, right: 30, bottom: 80, left: 60};
-        const chartWidth = width - margin.left - margin.right;
-        const chartHeight = height - margin.top - margin.bottom;
-
-        const svg = container.append('svg')
-            .attr('width', width)
-            .attr('height', height);
-
-        const g = svg.append('g')
-            .attr('transform', `translate(${margin.left},${margin.top})`);
-
-        // Escalas
-        const x = d3.scaleBand()
-            .domain(data.map(d => d.label))
-            .range([0, chartWidth])
-            .padding(0.3);
-
-        const y = d3.scaleLinear()
-            .domain([0, d3.max(data, d => d.value) * 1.1])
-            .range([chartHeight, 0]);
-
-        // Escala de colores
-        const colorScale = d3.scaleOrdinal()
-            .domain(data.map(d => d.label))
-            .range(colors);
-
-        // Grid
-        g.append('g')
-            .attr('class', 'grid')
-            .call(d3.axisLeft(y)
-                .tickSize(-chartWidth)
-                .tickFormat('')
-            );
-
-        // Barras
-        g.selectAll('.bar')
-            .data(data)
-            .join('rect')
-            .attr('class', 'bar')
-            .attr('x', d => x(d.label))
-            .attr('y', chartHeight)
-            .attr('width', x.bandwidth())
-            .attr('height', 0)
-            .attr('fill', d => colorScale(d.label))
-            .on('mouseover', showTooltip)
-            .on('mousemove', showTooltip)
-            .on('mouseout', hideTooltip)
-            .transition()
-            .duration(800)
-            .ease(d3.easeCubicOut)
-            .attr('y', d => y(d.value))
-            .attr('height', d => chartHeight - y(d.value));
-
-        // Etiquetas de valores
-        g.selectAll('.label')
-            .data(data)
-            .join('text')
-            .attr('class', 'label')
-            .attr('x', d => x(d.label) + x.bandwidth() / 2)
-            .attr('y', d => y(d.value) - 5)
-            .attr('text-anchor', 'middle')
-            .attr('fill', '{label_color}')
-            .attr('font-size', '12px')
-            .attr('font-weight', '600')
-            .attr('opacity', 0)
-            .text(d => d.value.toLocaleString())
-            .transition()
-            .delay(800)
-            .duration(300)
-            .attr('opacity', 1);
-
-        // Ejes
-        g.append('g')
-            .attr('class', 'axis')
-            .attr('transform', `translate(0,${chartHeight})`)
-            .call(d3.axisBottom(x))
-            .selectAll('text')
-            .attr('transform', 'rotate(-45)')
-            .style('text-anchor', 'end')
-            .attr('dx', '-0.5em')
-            .attr('dy', '0.5em');
-
-        g.append('g')
-            .attr('class', 'axis')
-            .call(d3.axisLeft(y).tickFormat(d => d.toLocaleString()));
-
-        // Responsive
-        window.addEventListener('resize', () => {
-            location.reload();
-        });
-            """
-
-        elif chart_type == 'donut':
-            return """
-        // ===== GRÁFICO DONUT D3.js v7 =====
-        const container = d3.select('#chart');
-        const containerNode = container.node();
-        const width = containerNode.clientWidth;
-        const height = containerNode.clientHeight;
-        const radius = Math.min(width, height) / 2 - 40;
-
-        const svg = container.append('svg')
-            .attr('width', width)
-            .attr('height', height);
-
-        const g = svg.append('g')
-            .attr('transform', `translate(${width/2},${height/2})`);
-
-        // Escala de colores
-        const colorScale = d3.scaleOrdinal()
-            .domain(data.map(d => d.label))
-            .range(colors);
-
-        // Generador de arcos
-        const arc = d3.arc()
-            .innerRadius(radius * 0.6)
-            .outerRadius(radius);
-
-        const pie = d3.pie()
-            .value(d => d.value)
-            .sort(null);
-
-        // Dibujar arcos
-        const arcs = g.selectAll('.arc')
-            .data(pie(data))
-            .join('g')
-            .attr('class', 'arc');
-
-        arcs.append('path')
-            .attr('d', arc)
-            .attr('fill', d => colorScale(d.data.label))
-            .attr('stroke', '{card_bg}')
-            .attr('stroke-width', 3)
-            .style('opacity', 0)
-            .on('mouseover', function(event, d) {
-                d3.select(this).transition().duration(200)
-                    .attr('d', d3.arc()
-                        .innerRadius(radius * 0.6)
-                        .outerRadius(radius + 10)
-                    );
-                showTooltip(event, d.data);
-            })
-            .on('mousemove', (event, d) => showTooltip(event, d.data))
-            .on('mouseout', function() {
-                d3.select(this).transition().duration(200)
-                    .attr('d', arc);
-                hideTooltip();
-            })
-            .transition()
-            .duration(800)
-            .style('opacity', 1)
-            .attrTween('d', function(d) {
-                const i = d3.interpolate(d.startAngle, d.endAngle);
-                return function(t) {
-                    d.endAngle = i(t);
-                    return arc(d);
-                };
-            });
+        function conTooltip(seleccion) {
+            seleccion
+                .on('mouseover', showTooltip)
+                .on('mousemove', showTooltip)
+                .on('mouseout', hideTooltip);
+        }
 
-        // Etiquetas
-        arcs.append('text')
-            .attr('transform', d => `translate(${arc.centroid(d)})`)
-            .attr('text-anchor', 'middle')
-            .attr('font-size', '13px')
-            .attr('font-weight', '600')
-            .attr('fill', 'white')
-            .attr('opacity', 0)
-            .text(d => {
-                const percent = (d.data.value / d3.sum(data, d => d.value) * 100).toFixed(1);
-                return percent > 5 ? percent + '%' : '';
-            })
-            .transition()
-            .delay(800)
-            .duration(300)
-            .attr('opacity', 1);
-
-        // Leyenda
-        const legend = svg.append('g')
-            .attr('class', 'legend')
-            .attr('transform', `translate(20, 20)`);
-
-        const legendItems = legend.selectAll('.legend-item')
-            .data(data)
-            .join('g')
-            .attr('class', 'legend-item')
-            .attr('transform', (d, i) => `translate(0, ${i * 25})`);
-
-        legendItems.append('rect')
-            .attr('width', 18)
-            .attr('height', 18)
-            .attr('fill', d => colorScale(d.label))
-            .attr('rx', 3);
-
-        legendItems.append('text')
-            .attr('x', 25)
-            .attr('y', 13)
-            .attr('fill', '{text_color}')
-            .attr('font-size', '12px')
-            .text(d => d.label);
-
-        // Responsive
-        window.addEventListener('resize', () => {
-            location.reload();
-        });
-            """
-
-        elif chart_type == 'line':
-            return """
-        // ===== GRÁFICO DE LÍNEAS D3.js v7 =====
-        const container = d3.select('#chart');
-        const containerNode = container.node();
-        const width = containerNode.clientWidth;
-        const height = containerNode.clientHeight;
-        const margin = {top: 40, right: 30, bottom: 80, left: 60};
-        const chartWidth = width - margin.left - margin.right;
-        const chartHeight = height - margin.top - margin.bottom;
-
-        const svg = container.append('svg')
-            .attr('width', width)
-            .attr('height', height);
-
-        const g = svg.append('g')
-            .attr('transform', `translate(${margin.left},${margin.top})`);
-
-        // Escalas
-        const x = d3.scalePoint()
-            .domain(data.map(d => d.label))
-            .range([0, chartWidth])
-            .padding(0.5);
-
-        const y = d3.scaleLinear()
-            .domain([0, d3.max(data, d => d.value) * 1.1])
-            .range([chartHeight, 0]);
-
-        // Grid
-        g.append('g')
-            .attr('class', 'grid')
-            .call(d3.axisLeft(y)
-                .tickSize(-chartWidth)
-                .tickFormat('')
-            );
-
-        // Generador de línea
-        const line = d3.line()
-            .x(d => x(d.label))
-            .y(d => y(d.value))
-            .curve(d3.curveMonotoneX);
-
-        // Área bajo la línea
-        const area = d3.area()
-            .x(d => x(d.label))
-            .y0(chartHeight)
-            .y1(d => y(d.value))
-            .curve(d3.curveMonotoneX);
-
-        // Dibujar área
-        g.append('path')
-            .datum(data)
-            .attr('fill', colors[0])
-            .attr('fill-opacity', 0.2)
-            .attr('d', area);
-
-        // Dibujar línea
-        const path = g.append('path')
-            .datum(data)
-            .attr('class', 'line')
-            .attr('stroke', colors[0])
-            .attr('d', line);
-
-        // Animación de la línea
-        const pathLength = path.node().getTotalLength();
-        path
-            .attr('stroke-dasharray', pathLength)
-            .attr('stroke-dashoffset', pathLength)
-            .transition()
-            .duration(1500)
-            .ease(d3.easeCubicOut)
-            .attr('stroke-dashoffset', 0);
-
-        // Puntos
-        g.selectAll('.dot')
-            .data(data)
-            .join('circle')
-            .attr('class', 'dot')
-            .attr('cx', d => x(d.label))
-            .attr('cy', d => y(d.value))
-            .attr('r', 0)
-            .attr('fill', colors[0])
-            .attr('stroke', 'white')
-            .attr('stroke-width', 2)
-            .on('mouseover', showTooltip)
-            .on('mousemove', showTooltip)
-            .on('mouseout', hideTooltip)
-            .transition()
-            .delay((d, i) => i * 100 + 1500)
-            .duration(300)
-            .attr('r', 5);
-
-        // Ejes
-        g.append('g')
-            .attr('class', 'axis')
-            .attr('transform', `translate(0,${chartHeight})`)
-            .call(d3.axisBottom(x))
-            .selectAll('text')
-            .attr('transform', 'rotate(-45)')
-            .style('text-anchor', 'end')
-            .attr('dx', '-0.5em')
-            .attr('dy', '0.5em');
-
-        g.append('g')
-            .attr('class', 'axis')
-            .call(d3.axisLeft(y).tickFormat(d => d.toLocaleString()));
-
-        // Responsive
-        window.addEventListener('resize', () => {
-            location.reload();
-        });
-            """
-
-        elif chart_type == 'horizontal_bar':
-            return """
-        // ===== GRÁFICO DE BARRAS HORIZONTALES D3.js v7 =====
-        const container = d3.select('#chart');
-        const containerNode = container.node();
-        const width = containerNode.clientWidth;
-        const height = containerNode.clientHeight;
-        // Márgenes ajustados según modo
-        const margin = mode === 'summary' 
-            ? {top: 20, right: 30, bottom: 20, left: 100} 
-            : {top: 40, right: 50, bottom: 50, left: 150};
-            
-        const chartWidth = width - margin.left - margin.right;
-        const chartHeight = height - margin.top - margin.bottom;
-
-        const svg = container.append('svg')
-            .attr('width', width)
-            .attr('height', height);
-
-        const g = svg.append('g')
-            .attr('transform', `translate(${margin.left},${margin.top})`);
-
-        // Escalas
-        const y = d3.scaleBand()
-            .domain(data.map(d => d.label))
-            .range([0, chartHeight])
-            .padding(0.3);
-
-        const x = d3.scaleLinear()
-            .domain([0, d3.max(data, d => d.value) * 1.1])
-            .range([0, chartWidth]);
-
-        // Escala de colores
-        const colorScale = d3.scaleOrdinal()
-            .domain(data.map(d => d.label))
-            .range(colors);
-
-        // Grid vertical
-        g.append('g')
-            .attr('class', 'grid')
-            .call(d3.axisBottom(x)
-                .tickSize(chartHeight)
-                .tickFormat('')
-            );
-
-        // Barras
-        g.selectAll('.bar')
-            .data(data)
-            .join('rect')
-            .attr('class', 'bar')
-            .attr('y', d => y(d.label))
-            .attr('x', 0)
-            .attr('height', y.bandwidth())
-            .attr('width', 0)
-            .attr('fill', d => colorScale(d.label))
-            .on('mouseover', showTooltip)
-            .on('mousemove', showTooltip)
-            .on('mouseout', hideTooltip)
-            .transition()
-            .duration(800)
-            .ease(d3.easeCubicOut)
-            .attr('width', d => x(d.value));
-
-        // Etiquetas de valores (solo en detail o si hay espacio)
-        if (mode === 'detail' || data.length < 10) {
-            g.selectAll('.label')
-                .data(data)
-                .join('text')
-                .attr('class', 'label')
-                .attr('y', d => y(d.label) + y.bandwidth() / 2 + 4)
-                .attr('x', d => x(d.value) + 5)
-                .attr('text-anchor', 'start')
-                .attr('fill', '{label_color}')
+        function formato(valor) {
+            return Number(valor).toLocaleString();
+        }
+
+        // Grupo persistente: se crea en el primer dibujo y se reutiliza
+        function capa(padre, clase, etiqueta = 'g') {
+            return padre.selectAll(etiqueta + '.' + clase.split(' ').join('.'))
+                .data([null])
+                .join(etiqueta)
+                .attr('class', clase);
+        }
+
+        function maximo(data) {
+            return (d3.max(data, d => d.value) || 1) * 1.1;
+        }
+
+        function escalaColor(data) {
+            return d3.scaleOrdinal().domain(data.map(d => d.label)).range(colors);
+        }
+
+        function margenes(margin, width, height) {
+            raiz.attr('transform', `translate(${margin.left},${margin.top})`);
+            return [width - margin.left - margin.right, height - margin.top - margin.bottom];
+        }
+
+        function ejeInferiorRotado(eje, t, escala, alto) {
+            eje.attr('transform', `translate(0,${alto})`);
+            eje.transition(t).call(d3.axisBottom(escala));
+            eje.selectAll('text')
                 .attr('font-size', '11px')
-                .attr('font-weight', '600')
-                .attr('opacity', 0)
-                .text(d => d.value.toLocaleString())
-                .transition()
-                .delay(800)
-                .duration(300)
+                .attr('transform', 'rotate(-45)')
+                .style('text-anchor', 'end')
+                .attr('dx', '-0.5em')
+                .attr('dy', '0.5em');
+        }
+
+        // Zoom por selección: Python responde con la ventana a resolución
+        // completa (o reducida al ancho si sigue siendo grande)
+        function zoomSeleccion(w, h, dosEjes, alSeleccionar) {
+            if (!estado.zoom || !puente) {
+                raiz.selectAll('g.zoom').remove();
+                return;
+            }
+
+            const grupo = capa(raiz, 'zoom');
+            const brush = (dosEjes ? d3.brush() : d3.brushX())
+                .extent([[0, 0], [w, h]])
+                .on('end', event => {
+                    if (!event.selection) return;
+                    alSeleccionar(event.selection);
+                    grupo.call(brush.move, null);
+                });
+
+            // Debajo de las marcas para no tapar sus tooltips
+            grupo.call(brush).lower();
+            grupo.on('dblclick', () => puente.restablecer());
+        }
+
+        // ===== GRÁFICO DE BARRAS =====
+
+        function barras(data, width, height, t) {
+            const [w, h] = margenes({top: 40, right: 30, bottom: 80, left: 60}, width, height);
+
+            const x = d3.scaleBand().domain(data.map(d => d.label)).range([0, w]).padding(0.3);
+            const y = d3.scaleLinear().domain([0, maximo(data)]).range([h, 0]);
+            const color = escalaColor(data);
+
+            capa(raiz, 'grid').transition(t).call(d3.axisLeft(y).tickSize(-w).tickFormat(''));
+
+            capa(raiz, 'bars').selectAll('rect.bar')
+                .data(data, d => d.label)
+                .join(
+                    enter => enter.append('rect')
+                        .attr('class', 'bar')
+                        .attr('x', d => x(d.label))
+                        .attr('y', h)
+                        .attr('width', x.bandwidth())
+                        .attr('height', 0)
+                        .call(conTooltip),
+                    update => update,
+                    exit => exit.transition(t).attr('y', h).attr('height', 0).remove()
+                )
+                .attr('fill', d => color(d.label))
+                .transition(t)
+                .attr('x', d => x(d.label))
+                .attr('width', x.bandwidth())
+                .attr('y', d => y(d.value))
+                .attr('height', d => h - y(d.value));
+
+            capa(raiz, 'labels').selectAll('text.label')
+                .data(data, d => d.label)
+                .join(
+                    enter => enter.append('text')
+                        .attr('class', 'label')
+                        .attr('text-anchor', 'middle')
+                        .attr('font-size', '12px')
+                        .attr('font-weight', '600')
+                        .attr('x', d => x(d.label) + x.bandwidth() / 2)
+                        .attr('y', h)
+                        .attr('opacity', 0),
+                    update => update,
+                    exit => exit.remove()
+                )
+                .text(d => formato(d.value))
+                .transition(t)
+                .attr('x', d => x(d.label) + x.bandwidth() / 2)
+                .attr('y', d => y(d.value) - 5)
                 .attr('opacity', 1);
+
+            ejeInferiorRotado(capa(raiz, 'axis x-axis'), t, x, h);
+            capa(raiz, 'axis y-axis').transition(t)
+                .call(d3.axisLeft(y).tickFormat(d => d.toLocaleString()));
         }
 
-        // Ejes
-        g.append('g')
-            .attr('class', 'axis')
-            .call(d3.axisLeft(y))
-            .selectAll('text')
-            .style('text-anchor', 'end')
-            .style('font-size', mode === 'summary' ? '10px' : '12px');
+        // ===== GRÁFICO DE BARRAS HORIZONTALES =====
+
+        function barrasHorizontales(data, width, height, t) {
+            const resumen = estado.mode === 'summary';
+            // Márgenes ajustados según modo
+            const margin = resumen
+                ? {top: 20, right: 30, bottom: 20, left: 100}
+                : {top: 40, right: 50, bottom: 50, left: 150};
+            const [w, h] = margenes(margin, width, height);
+
+            const y = d3.scaleBand().domain(data.map(d => d.label)).range([0, h]).padding(0.3);
+            const x = d3.scaleLinear().domain([0, maximo(data)]).range([0, w]);
+            const color = escalaColor(data);
+
+            capa(raiz, 'grid').transition(t).call(d3.axisBottom(x).tickSize(h).tickFormat(''));
+
+            capa(raiz, 'bars').selectAll('rect.bar')
+                .data(data, d => d.label)
+                .join(
+                    enter => enter.append('rect')
+                        .attr('class', 'bar')
+                        .attr('x', 0)
+                        .attr('y', d => y(d.label))
+                        .attr('height', y.bandwidth())
+                        .attr('width', 0)
+                        .call(conTooltip),
+                    update => update,
+                    exit => exit.transition(t).attr('width', 0).remove()
+                )
+                .attr('fill', d => color(d.label))
+                .transition(t)
+                .attr('y', d => y(d.label))
+                .attr('height', y.bandwidth())
+                .attr('width', d => x(d.value));
+
+            // Etiquetas de valores (solo en detail o si hay espacio)
+            const conEtiquetas = !resumen || data.length < 10;
+            capa(raiz, 'labels').selectAll('text.label')
+                .data(conEtiquetas ? data : [], d => d.label)
+                .join(
+                    enter => enter.append('text')
+                        .attr('class', 'label')
+                        .attr('text-anchor', 'start')
+                        .attr('font-size', '11px')
+                        .attr('font-weight', '600')
+                        .attr('x', 5)
+                        .attr('y', d => y(d.label) + y.bandwidth() / 2 + 4)
+                        .attr('opacity', 0),
+                    update => update,
+                    exit => exit.remove()
+                )
+                .text(d => formato(d.value))
+                .transition(t)
+                .attr('x', d => x(d.value) + 5)
+                .attr('y', d => y(d.label) + y.bandwidth() / 2 + 4)
+                .attr('opacity', 1);
 
-        // Ocultar eje X en summary para limpieza
-        if (mode === 'detail') {
-            g.append('g')
-                .attr('class', 'axis')
-                .attr('transform', `translate(0,${chartHeight})`)
+            const ejeY = capa(raiz, 'axis y-axis');
+            ejeY.transition(t).call(d3.axisLeft(y));
+            ejeY.selectAll('text')
+                .style('text-anchor', 'end')
+                .attr('font-size', resumen ? '10px' : '12px');
+
+            // Eje X solo en detail (limpieza en summary)
+            capa(raiz, 'axis x-axis')
+                .attr('transform', `translate(0,${h})`)
+                .style('display', resumen ? 'none' : null)
+                .transition(t)
                 .call(d3.axisBottom(x).ticks(5));
         }
 
-        // Responsive
+        // ===== GRÁFICO DE LÍNEAS / ÁREA =====
+
+        function lineas(data, width, height, t, conArea) {
+            const [w, h] = margenes({top: 40, right: 30, bottom: 80, left: 60}, width, height);
+            const primera = raiz.select('path.line').empty();
+
+            const x = d3.scalePoint().domain(data.map(d => d.label)).range([0, w]).padding(0.5);
+            const y = d3.scaleLinear().domain([0, maximo(data)]).range([h, 0]);
+
+            capa(raiz, 'grid').transition(t).call(d3.axisLeft(y).tickSize(-w).tickFormat(''));
+
+            const linea = d3.line()
+                .x(d => x(d.label))
+                .y(d => y(d.value))
+                .curve(d3.curveMonotoneX);
+
+            const area = d3.area()
+                .x(d => x(d.label))
+                .y0(h)
+                .y1(d => y(d.value))
+                .curve(d3.curveMonotoneX);
+
+            const areaPath = capa(raiz, 'area', 'path')
+                .datum(data)
+                .attr('fill', colors[0])
+                .attr('fill-opacity', conArea ? 0.35 : 0.2);
+
+            const path = capa(raiz, 'line', 'path')
+                .datum(data)
+                .attr('stroke', colors[0]);
+
+            if (primera) {
+                areaPath.attr('d', area);
+                path.attr('d', linea);
+                // Animación de entrada de la línea
+                const largo = path.node().getTotalLength();
+                path
+                    .attr('stroke-dasharray', largo)
+                    .attr('stroke-dashoffset', largo)
+                    .transition()
+                    .duration(1500)
+                    .ease(d3.easeCubicOut)
+                    .attr('stroke-dashoffset', 0)
+                    .on('end', function() { d3.select(this).attr('stroke-dasharray', null); });
+            } else {
+                areaPath.transition(t).attr('d', area);
+                path.attr('stroke-dasharray', null).transition(t).attr('d', linea);
+            }
+
+            // Puntos (solo si la serie es corta)
+            const conPuntos = data.length <= 60;
+            capa(raiz, 'dots').selectAll('circle.dot')
+                .data(conPuntos ? data : [], d => d.label)
+                .join(
+                    enter => enter.append('circle')
+                        .attr('class', 'dot')
+                        .attr('cx', d => x(d.label))
+                        .attr('cy', d => y(d.value))
+                        .attr('r', 0)
+                        .attr('fill', colors[0])
+                        .attr('stroke', 'white')
+                        .attr('stroke-width', 2)
+                        .call(conTooltip),
+                    update => update,
+                    exit => exit.transition(t).attr('r', 0).remove()
+                )
+                .transition(t)
+                .delay((d, i) => primera ? i * 100 + 1500 : 0)
+                .attr('cx', d => x(d.label))
+                .attr('cy', d => y(d.value))
+                .attr('r', 5);
+
+            ejeInferiorRotado(capa(raiz, 'axis x-axis'), t, x, h);
+            capa(raiz, 'axis y-axis').transition(t)
+                .call(d3.axisLeft(y).tickFormat(d => d.toLocaleString()));
+
+            // Zoom: rango de índices originales (d.i) bajo la selección
+            zoomSeleccion(w, h, false, ([x0, x1]) => {
+                const dentro = data.filter(d => x(d.label) >= x0 && x(d.label) <= x1);
+                if (dentro.length < 2) return;
+                puente.solicitarRango(dentro[0].i, dentro[dentro.length - 1].i, 0, 0);
+            });
+        }
+
+        // ===== GRÁFICO DE DISPERSIÓN =====
+
+        function dispersion(data, width, height, t) {
+            const [w, h] = margenes({top: 40, right: 30, bottom: 50, left: 60}, width, height);
+
+            const [minX, maxX] = d3.extent(data, d => d.x);
+            const holgura = ((maxX - minX) || 1) * 0.05;
+            const x = d3.scaleLinear().domain([(minX || 0) - holgura, (maxX || 1) + holgura]).range([0, w]);
+            const y = d3.scaleLinear().domain([0, maximo(data)]).range([h, 0]);
+
+            // Celdas hexbin (d.count): el área del punto es proporcional a sus registros
+            const radio = d3.scaleSqrt().domain([1, d3.max(data, d => d.count) || 1]).range([3, 14]);
+
+            capa(raiz, 'grid').transition(t).call(d3.axisLeft(y).tickSize(-w).tickFormat(''));
+
+            capa(raiz, 'dots').selectAll('circle.dot')
+                .data(data)
+                .join(
+                    enter => enter.append('circle')
+                        .attr('class', 'dot')
+                        .attr('cx', d => x(d.x))
+                        .attr('cy', h)
+                        .attr('r', 0)
+                        .attr('fill', colors[3])
+                        .attr('fill-opacity', 0.75)
+                        .call(conTooltip),
+                    update => update,
+                    exit => exit.transition(t).attr('r', 0).remove()
+                )
+                .transition(t)
+                .attr('cx', d => x(d.x))
+                .attr('cy', d => y(d.value))
+                .attr('r', d => d.count ? radio(d.count) : 4);
+
+            capa(raiz, 'axis x-axis')
+                .attr('transform', `translate(0,${h})`)
+                .transition(t)
+                .call(d3.axisBottom(x).ticks(8));
+            capa(raiz, 'axis y-axis').transition(t)
+                .call(d3.axisLeft(y).tickFormat(d => d.toLocaleString()));
+
+            // Zoom: caja en unidades de datos
+            zoomSeleccion(w, h, true, ([[x0, y0], [x1, y1]]) => {
+                puente.solicitarRango(x.invert(x0), x.invert(x1), y.invert(y1), y.invert(y0));
+            });
+        }
+
+        // ===== GRÁFICO DONUT =====
+
+        function dona(data, width, height, t) {
+            const radius = Math.max(Math.min(width, height) / 2 - 40, 10);
+            raiz.attr('transform', `translate(${width / 2},${height / 2})`);
+
+            const color = escalaColor(data);
+            const arc = d3.arc().innerRadius(radius * 0.6).outerRadius(radius);
+            const arcHover = d3.arc().innerRadius(radius * 0.6).outerRadius(radius + 10);
+            const pie = d3.pie().value(d => d.value).sort(null);
+            const arcos = pie(data);
+            const total = d3.sum(data, d => d.value) || 1;
+
+            capa(raiz, 'arcs').selectAll('path.arc')
+                .data(arcos, d => d.data.label)
+                .join(
+                    enter => enter.append('path')
+                        .attr('class', 'arc')
+                        // Los arcos nuevos crecen desde su ángulo inicial
+                        .each(function(d) { this._actual = {startAngle: d.startAngle, endAngle: d.startAngle}; })
+                        .on('mouseover', function(event, d) {
+                            d3.select(this).transition('hover').duration(200).attr('d', arcHover);
+                            showTooltip(event, d.data);
+                        })
+                        .on('mousemove', (event, d) => showTooltip(event, d.data))
+                        .on('mouseout', function(event, d) {
+                            d3.select(this).transition('hover').duration(200).attr('d', arc);
+                            hideTooltip();
+                        }),
+                    update => update,
+                    exit => exit.remove()
+                )
+                .attr('fill', d => color(d.data.label))
+                .transition(t)
+                .attrTween('d', function(d) {
+                    const i = d3.interpolate(this._actual, d);
+                    this._actual = {startAngle: d.startAngle, endAngle: d.endAngle};
+                    return u => arc(i(u));
+                });
+
+            capa(raiz, 'arc-labels').selectAll('text.arc-label')
+                .data(arcos, d => d.data.label)
+                .join(
+                    enter => enter.append('text')
+                        .attr('class', 'arc-label')
+                        .attr('text-anchor', 'middle')
+                        .attr('font-size', '13px')
+                        .attr('font-weight', '600')
+                        .attr('transform', d => `translate(${arc.centroid(d)})`)
+                        .attr('opacity', 0),
+                    update => update,
+                    exit => exit.remove()
+                )
+                .text(d => {
+                    const percent = d.data.value / total * 100;
+                    return percent > 5 ? percent.toFixed(1) + '%' : '';
+                })
+                .transition(t)
+                .attr('transform', d => `translate(${arc.centroid(d)})`)
+                .attr('opacity', 1);
+
+            // Leyenda (fuera del grupo centrado)
+            const items = capa(svg, 'legend')
+                .attr('transform', 'translate(20, 20)')
+                .selectAll('g.legend-item')
+                .data(data, d => d.label)
+                .join(
+                    enter => {
+                        const item = enter.append('g').attr('class', 'legend-item');
+                        item.append('rect').attr('width', 18).attr('height', 18).attr('rx', 3);
+                        item.append('text').attr('x', 25).attr('y', 13).attr('font-size', '12px');
+                        return item;
+                    },
+                    update => update,
+                    exit => exit.remove()
+                )
+                .attr('transform', (d, i) => `translate(0, ${i * 25})`);
+
+            items.select('rect').attr('fill', d => color(d.label));
+            items.select('text').text(d => d.label);
+        }
+
+        const RENDERERS = {
+            bar: barras,
+            horizontal_bar: barrasHorizontales,
+            line: (data, width, height, t) => lineas(data, width, height, t, false),
+            area: (data, width, height, t) => lineas(data, width, height, t, true),
+            scatter: dispersion,
+            donut: dona
+        };
+
+        // ===== Dibujo =====
+
+        function reiniciar(tipo) {
+            contenedor.selectAll('*').remove();
+            svg = contenedor.append('svg');
+            raiz = svg.append('g');
+            tipoDibujado = tipo;
+        }
+
+        function render(duracion) {
+            document.title = estado.title;
+            d3.select('#title').text(estado.title).style('display', estado.title ? null : 'none');
+            d3.select('#subtitle').text(estado.subtitle).style('display', estado.subtitle ? null : 'none');
+            d3.select('#nota').text(estado.nota).style('display', estado.nota ? null : 'none');
+
+            const dibujar = RENDERERS[estado.type];
+            if (!dibujar) {
+                contenedor.selectAll('*').remove();
+                tipoDibujado = null;
+                return;
+            }
+
+            // Otro tipo de gráfico: se parte de un SVG vacío
+            if (tipoDibujado !== estado.type) {
+                reiniciar(estado.type);
+            }
+
+            const nodo = contenedor.node();
+            const width = nodo.clientWidth;
+            const height = nodo.clientHeight;
+            svg.attr('width', width).attr('height', height);
+
+            const t = svg.transition().duration(duracion).ease(d3.easeCubicOut);
+            dibujar(estado.data, width, height, t);
+        }
+
+        function aplicarTema() {
+            document.documentElement.setAttribute('data-theme', estado.theme);
+        }
+
+        // Responsive: redibujo sin animación, como mucho una vez por frame
+        let resizePendiente = false;
         window.addEventListener('resize', () => {
-            location.reload();
+            if (resizePendiente) return;
+            resizePendiente = true;
+            requestAnimationFrame(() => {
+                resizePendiente = false;
+                render(0);
+            });
         });
-            """
 
-        return ""
+        return {
+            update(cambios) {
+                Object.assign(estado, cambios);
+                if ('theme' in cambios) aplicarTema();
+                render(DURACION);
+            },
+            setTheme(tema) {
+                estado.theme = tema;
+                aplicarTema();
+            },
+            resize(cambios) {
+                // Python manda los datos reducidos al nuevo ancho (si cambiaron)
+                if (cambios) Object.assign(estado, cambios);
+                render(0);
+            },
+            redraw() {
+                tipoDibujado = null;
+                render(DURACION);
+            },
+            clear() {
+                Object.assign(estado, {type: null, title: '', subtitle: '', data: [], zoom: false, nota: ''});
+                render(0);
+            }
+        };
+    })();
+    </script>
+</body>
+</html>
+"""
+
+_html_host_cache: Dict[bool, str] = {}
+
+
+def _pagina_host():
+    """HTML y URL base de la página anfitriona (según el esquema de assets)"""
+    con_esquema = esquema_activo()
+    html = _html_host_cache.get(con_esquema)
+    if html is None:
+        html = _html_host_cache[con_esquema] = (
+            _HTML_HOST
+            .replace('__ASSETS__', etiquetas_head('d3.v7.min.js', 'montserrat.css'))
+            .replace('__COLORS__', json.dumps(HUTCHISON_COLORS))
+        )
+
+    # Origen de la página: el esquema de assets o la carpeta vendor/
+    if con_esquema:
+        base = QUrl(f"{ESQUEMA}://{HOST_ASSETS}/")
+    else:
+        base = QUrl.fromLocalFile(str(DIRECTORIO_VENDOR) + '/')
+    return html, base
+
+
+class PuenteGrafico(QObject):
+    """Objeto que la página ve como 'puente' (QWebChannel) para pedir zoom"""
+
+    rango_solicitado = pyqtSignal(float, float, float, float)
+    restablecimiento_solicitado = pyqtSignal()
+
+    @pyqtSlot(float, float, float, float)
+    def solicitarRango(self, x0: float, x1: float, y0: float, y1: float):
+        """Líneas: índices originales x0..x1. Dispersión: caja en datos"""
+        self.rango_solicitado.emit(x0, x1, y0, y1)
+
+    @pyqtSlot()
+    def restablecer(self):
+        self.restablecimiento_solicitado.emit()
+
+
+class D3ChartWidget(QWidget):
+    """
+    Widget para renderizar gráficos D3.js v7 usando QWebEngineView
+
+    Características:
+    - Renderizado profesional con Chromium
+    - D3.js v7 (última versión)
+    - Tooltips interactivos
+    - Hover effects y animaciones suaves
+    - Responsive design
+    - Colores corporativos Hutchison Ports
+    - Perfil y procesos de renderizado compartidos con el resto de
+      gráficas; las cargas las ordena el PlanificadorCargas
+    - La página se carga una vez; después solo se envían cambios
+      (SmartChart.update / setTheme) y D3 anima entre conjuntos de datos
+    - Series grandes reducidas al ancho en píxeles, con zoom a resolución
+      completa por selección (doble clic restablece)
+    """
 
-    def _load_html(self, html: str):
-        """Cargar HTML en el webview"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-        try:
-            # Limpiar archivo temporal anterior
-            if self.temp_file and os.path.exists(self.temp_file):
-                os.unlink(self.temp_file)
+        self.chart_type = None
+        self.chart_data = None
+        self.tema = 'dark'
+
+        # Estado de la página anfitriona
+        self._pagina_lista = False
+        self._carga_pedida = False
+        self._reintentos = 0
+        # Lo que la página tiene (o tendrá al recibir _pendiente)
+        self._enviado: Dict[str, Any] = {}
+        # Cambios aún no enviados (la página no ha terminado de cargar)
+        self._pendiente: Dict[str, Any] = {}
+
+        # Datos completos de line/area/scatter y ventana ampliada actual
+        self._completo: Optional[Dict[str, Any]] = None
+        self._ventana: Optional[tuple] = None
+        # Ancho del webview con el que se redujeron los datos enviados
+        self._ancho_datos = 0
+
+        # Al redimensionar se reduce de nuevo cuando el ancho se estabiliza
+        self._timer_redimension = QTimer(self)
+        self._timer_redimension.setSingleShot(True)
+        self._timer_redimension.setInterval(ESPERA_REDIMENSION_MS)
+        self._timer_redimension.timeout.connect(self._on_redimensionado)
 
-            # Crear archivo temporal
-            fd, self.temp_file = tempfile.mkstemp(suffix='.html', text=True)
-            with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                f.write(html)
+        # Crear UI
+        self._create_ui()
 
-            # Cargar desde archivo
-            url = QUrl.fromLocalFile(self.temp_file)
-            self.webview.load(url)
+    def _create_ui(self):
+        """Crear interfaz"""
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Crear QWebEngineView con el perfil compartido de gráficos
+        self.webview = QWebEngineView(self)
+        self.webview.setPage(QWebEnginePage(perfil_graficos(), self.webview))
+
+        # Configurar settings
+        settings = self.webview.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.ErrorPageEnabled, False)
+
+        self.webview.loadFinished.connect(self._on_load_finished)
+        self.webview.page().renderProcessTerminated.connect(self._on_render_terminado)
 
-            print(f"✅ Gráfico D3.js v7 cargado: {self.temp_file}")
+        # Canal para que la página pida rangos ampliados
+        self._puente = PuenteGrafico(self)
+        self._puente.rango_solicitado.connect(self._on_rango_solicitado)
+        self._puente.restablecimiento_solicitado.connect(self._on_restablecer)
+        self._canal = QWebChannel(self)
+        self._canal.registerObject('puente', self._puente)
+        self.webview.page().setWebChannel(self._canal)
 
-        except Exception as e:
-            print(f"❌ Error cargando HTML: {e}")
-            import traceback
-            traceback.print_exc()
+        layout.addWidget(self.webview)
+
+    def set_chart(self, chart_type: str, title: str, datos: dict, subtitle: str = "", tema: str = 'dark', mode: str = 'summary'):
+        """
+        Establecer gráfico D3.js v7
+
+        Args:
+            chart_type: 'bar', 'horizontal_bar', 'donut', 'line', 'area', 'scatter'
+            title: Título del gráfico
+            datos: {'labels': [...], 'values': [...]} (scatter acepta 'x';
+                   line/area/scatter se reducen al ancho del gráfico)
+            subtitle: Subtítulo opcional
+            tema: 'dark' o 'light'
+            mode: 'summary' (vista dashboard) o 'detail' (vista expandida)
+        """
+
+        print(f"📊 Cargando gráfico D3.js v7 - {chart_type}: {title}")
+
+        # Guardar datos
+        self.chart_type = chart_type
+        self.chart_data = datos
+        self.tema = tema
+        self._completo = self._datos_completos(chart_type, datos)
+        self._ventana = None
+
+        self._enviar({
+            'type': chart_type,
+            'title': title,
+            'subtitle': subtitle,
+            'mode': mode,
+            'theme': tema,
+            **self._vista_datos(),
+        })
+
+    def set_theme(self, tema: str):
+        """Cambiar solo el tema (variables CSS, sin redibujar)"""
+        self.tema = tema
+        self._enviar({'theme': tema})
+
+    def redibujar(self):
+        """Volver a dibujar el gráfico actual con su animación de entrada"""
+        if self._pagina_lista and self._enviado:
+            self.webview.page().runJavaScript("SmartChart.redraw()")
 
     def clear(self):
         """Limpiar gráfico"""
-        self.webview.setHtml("")
-
-    def __del__(self):
-        """Limpiar al destruir"""
-        if self.temp_file and os.path.exists(self.temp_file):
-            try:
-                os.unlink(self.temp_file)
-            except:
-                pass
+        self._pendiente = {}
+        self._enviado = {}
+        self._completo = None
+        self._ventana = None
+        if self._pagina_lista:
+            self.webview.page().runJavaScript("SmartChart.clear()")
+
+    # ==================== ENVÍO A LA PÁGINA ====================
+
+    @staticmethod
+    def _preparar_datos(datos: dict) -> list:
+        """Datos en el formato de la página: [{label, value}]"""
+        labels = datos.get('labels', [])
+        values = datos.get('values', [])
+
+        return [
+            {"label": str(label), "value": float(value) if value is not None else 0.0}
+            for label, value in zip(labels, values)
+        ]
+
+    # ==================== REDUCCIÓN Y ZOOM ====================
+
+    @staticmethod
+    def _datos_completos(chart_type: str, datos: dict) -> Optional[Dict[str, Any]]:
+        """Arrays a resolución completa de line/area/scatter (None en el resto)"""
+        if chart_type not in TIPOS_REDUCIBLES:
+            return None
+
+        labels = datos.get('labels', [])
+        values = datos.get('values', [])
+        n = min(len(labels), len(values))
+        completo = {
+            'labels': labels[:n],
+            # None → 0, como en el resto de gráficos
+            'values': np.nan_to_num(valores_float(values[:n])),
+        }
+        if chart_type == 'scatter':
+            xs = datos.get('x')
+            completo['x'] = valores_float(xs[:n]) if xs else np.arange(n, dtype=float)
+        return completo
+
+    def _vista_datos(self) -> Dict[str, Any]:
+        """Claves 'data', 'zoom' y 'nota' para la página según la ventana actual"""
+        if self._completo is None:
+            return {'data': self._preparar_datos(self.chart_data), 'zoom': False, 'nota': ''}
+
+        self._ancho_datos = self.webview.width()
+        presupuesto = presupuesto_puntos(self._ancho_datos)
+        if self.chart_type == 'scatter':
+            return self._vista_dispersion(presupuesto)
+        return self._vista_serie(presupuesto)
+
+    def _vista_serie(self, presupuesto: int) -> Dict[str, Any]:
+        """Línea/área: LTTB sobre la ventana [i0, i1] (d.i = índice original)"""
+        labels = self._completo['labels']
+        valores = self._completo['values']
+        total = len(valores)
+
+        i0, i1 = 0, total - 1
+        if self._ventana is not None:
+            i0 = min(max(0, int(self._ventana[0])), total - 1)
+            i1 = max(i0, min(total - 1, int(self._ventana[1])))
+
+        indices = i0 + lttb_indices(valores[i0:i1 + 1], presupuesto)
+        data = [
+            {"label": str(labels[i]), "value": float(valores[i]), "i": int(i)}
+            for i in indices
+        ]
+        return {
+            'data': data,
+            'zoom': total > presupuesto or self._ventana is not None,
+            'nota': self._nota(len(data), max(0, i1 - i0 + 1), total),
+        }
+
+    def _vista_dispersion(self, presupuesto: int) -> Dict[str, Any]:
+        """Dispersión: puntos sueltos si caben, celdas hexbin si no"""
+        labels = self._completo['labels']
+        xs = self._completo['x']
+        ys = self._completo['values']
+        total = len(ys)
+
+        dentro = np.ones(total, dtype=bool)
+        if self._ventana is not None:
+            x0, x1, y0, y1 = self._ventana
+            dentro = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        seleccion = np.flatnonzero(dentro)
+
+        if len(seleccion) <= presupuesto:
+            data = [
+                {"label": str(labels[i]), "value": float(ys[i]), "x": float(xs[i])}
+                for i in seleccion
+            ]
+        else:
+            ancho = self._ancho_datos or ANCHO_PREDETERMINADO_PX
+            celdas = hexbin(xs[seleccion], ys[seleccion], ancho, ALTO_GRAFICO_PX,
+                            max_celdas=presupuesto)
+            data = [
+                {"label": f"{int(conteo):,} registros", "value": float(y), "x": float(x), "count": int(conteo)}
+                for x, y, conteo in zip(celdas['x'], celdas['y'], celdas['conteo'])
+            ]
+
+        return {
+            'data': data,
+            'zoom': total > presupuesto or self._ventana is not None,
+            'nota': self._nota(len(data), len(seleccion), total),
+        }
+
+    def _nota(self, mostrados: int, en_ventana: int, total: int) -> str:
+        """Texto bajo el gráfico cuando no se muestran todos los puntos"""
+        if self._ventana is None and mostrados >= total:
+            return ""
+        if self._ventana is None:
+            return f"Mostrando {mostrados:,} de {total:,} puntos • Selecciona una zona para ampliar"
+        return (f"Ampliado: {en_ventana:,} de {total:,} registros ({mostrados:,} dibujados) • "
+                f"Doble clic para restablecer")
+
+    def _on_rango_solicitado(self, x0: float, x1: float, y0: float, y1: float):
+        """La página seleccionó una zona: enviar esa ventana a más resolución"""
+        if self._completo is None:
+            return
+        self._ventana = (min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1))
+        self._enviar(self._vista_datos())
+
+    def _on_restablecer(self):
+        if self._completo is None or self._ventana is None:
+            return
+        self._ventana = None
+        self._enviar(self._vista_datos())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._completo is not None:
+            self._timer_redimension.start()
+
+    def _on_redimensionado(self):
+        """Nuevo ancho: reducir otra vez al presupuesto y redibujar sin animación"""
+        if self._completo is None or self.webview.width() == self._ancho_datos:
+            return
+
+        cambios = self._cambios(self._vista_datos())
+        if not cambios:
+            return
+
+        self._enviado.update(cambios)
+        if self._pagina_lista:
+            self.webview.page().runJavaScript(f"SmartChart.resize({json.dumps(cambios)})")
+        else:
+            self._pendiente.update(cambios)
+
+    def _cambios(self, estado: Dict[str, Any]) -> Dict[str, Any]:
+        """Claves de estado que difieren de lo ya enviado a la página"""
+        return {k: v for k, v in estado.items() if k not in self._enviado or self._enviado[k] != v}
+
+    def _enviar(self, estado: Dict[str, Any]):
+        """Envía a la página solo las claves que cambiaron"""
+        cambios = self._cambios(estado)
+        if not cambios:
+            return
+
+        self._enviado.update(cambios)
+        self._pendiente.update(cambios)
+
+        if self._pagina_lista:
+            self._vaciar_pendiente()
+        elif not self._carga_pedida:
+            # Primera vez: la página anfitriona se carga cuando el
+            # planificador tiene turno libre
+            self._pedir_carga()
+
+    def _pedir_carga(self):
+        """Encola la carga de la página anfitriona en el planificador"""
+        self._carga_pedida = True
+        get_planificador_cargas().encolar(self.webview, self._cargar_host)
+
+    def _vaciar_pendiente(self):
+        """Ejecuta en la página los cambios acumulados"""
+        cambios, self._pendiente = self._pendiente, {}
+        if not cambios:
+            return
+
+        if set(cambios) == {'theme'}:
+            script = f"SmartChart.setTheme({json.dumps(cambios['theme'])})"
+        else:
+            script = f"SmartChart.update({json.dumps(cambios)})"
+        self.webview.page().runJavaScript(script)
+
+    def _cargar_host(self):
+        """Carga la página anfitriona (una vez por widget)"""
+        html, base = _pagina_host()
+        self.webview.setHtml(html, base)
+
+    def _on_load_finished(self, ok: bool):
+        if not ok:
+            print(f"❌ Error cargando la página del gráfico {self.chart_type}")
+            # La página no quedó utilizable: todo el estado se reenvía en
+            # la próxima carga (reintento ahora o el siguiente _enviar)
+            self._pagina_lista = False
+            self._carga_pedida = False
+            self._pendiente = dict(self._enviado)
+            if self._enviado and self._reintentos < REINTENTOS_CARGA:
+                self._reintentos += 1
+                self._pedir_carga()
+            return
+        self._reintentos = 0
+        self._pagina_lista = True
+        self._vaciar_pendiente()
+
+    def _on_render_terminado(self, *args):
+        """El proceso de renderizado murió: recargar y reenviar todo el estado"""
+        self._pagina_lista = False
+        self._pendiente = dict(self._enviado)
+        self._pedir_carga()
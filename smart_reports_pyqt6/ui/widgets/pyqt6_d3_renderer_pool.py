@@ -0,0 +1,188 @@
+"""
+Pool de Renderizado D3 - QtWebEngine compartido por todas las gráficas
+
+OPTIMIZACIÓN: Pocos procesos Chromium y cargas encadenadas por loadFinished
+
+Por defecto Chromium levanta un proceso de renderizado por vista: seis
+tarjetas del dashboard suponían seis procesos (más de 1 GB de RSS). Además,
+las cargas se espaciaban con retardos fijos (500 ms entre tarjetas + 200 ms
+por gráfico).
+
+Alcance: cada D3ChartWidget sigue teniendo su propio QWebEngineView y su
+propia página (las tarjetas, el modo expandido y los diálogos se colocan
+como widgets Qt independientes). Lo que se comparte son los procesos de
+renderizado, el perfil y la caché; cada vista conserva su documento, su
+contexto JavaScript y su superficie de composición. El ahorro real con N
+tarjetas se mide con scripts/benchmark_rss_graficos.py (RSS y PSS de la
+aplicación y sus procesos QtWebEngine, con y sin estos flags).
+
+- configurar_motor_web(): --process-per-site y --renderer-process-limit
+  para que todas las páginas de gráficos (mismo origen) compartan un pool
+  pequeño de procesos de renderizado. Debe llamarse antes de QApplication.
+- perfil_graficos(): un único QWebEngineProfile para todas las vistas
+  (caché HTTP y de scripts compartida), con el esquema smartreports://
+  que sirve D3/NVD3/fuentes empaquetados (pyqt6_web_assets).
+- PlanificadorCargas: cola de cargas con un máximo de N simultáneas; la
+  siguiente página empieza en cuanto otra emite loadFinished (con un
+  tiempo máximo por si una carga nunca termina). Si un widget pide una
+  carga nueva mientras espera, solo se conserva la última.
+"""
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEngineProfile
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+
+from smart_reports_pyqt6.ui.widgets.pyqt6_web_assets import (
+    instalar_manejador_assets,
+    registrar_esquema_assets
+)
+
+# Procesos de renderizado compartidos por todas las gráficas
+PROCESOS_RENDER_MAX = 2
+
+# Páginas que se cargan a la vez (el resto espera su turno en la cola)
+CARGAS_SIMULTANEAS = 2
+
+# Tiempo máximo de una carga antes de ceder el turno a la siguiente
+TIMEOUT_CARGA_MS = 10000
+
+NOMBRE_PERFIL = 'smart_reports_graficos'
+
+
+def configurar_motor_web(procesos: int = PROCESOS_RENDER_MAX):
+    """
+    Flags de Chromium para compartir procesos de renderizado y registro
+    del esquema smartreports:// de los assets
+
+    Ambos se leen al arrancar QtWebEngine: llamar antes de crear
+    QApplication. Respeta los flags que ya vengan en
+    QTWEBENGINE_CHROMIUM_FLAGS.
+
+    Args:
+        procesos: Máximo de procesos de renderizado
+    """
+    flags = os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '').split()
+    existentes = {flag.split('=')[0] for flag in flags}
+
+    for flag in ('--process-per-site', f'--renderer-process-limit={procesos}'):
+        if flag.split('=')[0] not in existentes:
+            flags.append(flag)
+
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(flags)
+    registrar_esquema_assets()
+
+
+_perfil: Optional[QWebEngineProfile] = None
+
+
+def perfil_graficos() -> QWebEngineProfile:
+    """Perfil único de las páginas de gráficos (se crea la primera vez)"""
+    global _perfil
+    if _perfil is None:
+        # Hijo de la aplicación: vive más que cualquier página que lo use
+        _perfil = QWebEngineProfile(NOMBRE_PERFIL, QCoreApplication.instance())
+        _perfil.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        instalar_manejador_assets(_perfil)
+    return _perfil
+
+
+# ============================================================================
+# PLANIFICADOR DE CARGAS
+# ============================================================================
+
+class PlanificadorCargas(QObject):
+    """Cola de cargas de páginas dirigida por loadFinished"""
+
+    def __init__(self, simultaneas: int = CARGAS_SIMULTANEAS,
+                 timeout_ms: int = TIMEOUT_CARGA_MS, parent=None):
+        """
+        Args:
+            simultaneas: Cargas en curso a la vez
+            timeout_ms: Tiempo máximo de una carga
+        """
+        super().__init__(parent)
+        self.simultaneas = max(1, simultaneas)
+        self.timeout_ms = timeout_ms
+
+        # id(vista) → (vista, función que inicia la carga), en orden de llegada
+        self._pendientes: "OrderedDict[int, tuple]" = OrderedDict()
+        # id(vista) → turno de la carga en curso (para ignorar timeouts viejos)
+        self._en_curso: Dict[int, int] = {}
+        self._conectadas = set()
+        self._turno = 0
+
+    def encolar(self, vista: QWebEngineView, cargar: Callable[[], None]):
+        """
+        Pide una carga para la vista
+
+        Args:
+            vista: Vista que emitirá loadFinished
+            cargar: Inicia la carga (setHtml / load) cuando llega el turno
+        """
+        clave = id(vista)
+        if clave not in self._conectadas:
+            self._conectadas.add(clave)
+            vista.loadFinished.connect(lambda _ok, clave=clave: self._terminada(clave))
+            vista.destroyed.connect(lambda _obj=None, clave=clave: self._olvidar(clave))
+
+        # Última petición gana; conserva la posición en la cola
+        self._pendientes[clave] = (vista, cargar)
+        self._despachar()
+
+    def cancelar(self, vista: QWebEngineView):
+        """Descarta la carga pendiente de la vista (la que está en curso sigue)"""
+        self._pendientes.pop(id(vista), None)
+
+    @property
+    def pendientes(self) -> int:
+        return len(self._pendientes)
+
+    def _despachar(self):
+        """Inicia cargas mientras haya hueco"""
+        while len(self._en_curso) < self.simultaneas:
+            # Una vista que ya está cargando espera a terminar antes de recargar
+            clave = next((c for c in self._pendientes if c not in self._en_curso), None)
+            if clave is None:
+                return
+
+            vista, cargar = self._pendientes.pop(clave)
+            self._turno += 1
+            turno = self._turno
+            self._en_curso[clave] = turno
+            QTimer.singleShot(self.timeout_ms, lambda clave=clave, turno=turno: self._terminada(clave, turno))
+
+            try:
+                cargar()
+            except Exception as e:
+                print(f"❌ Error iniciando carga de gráfico: {e}")
+                self._en_curso.pop(clave, None)
+
+    def _terminada(self, clave: int, turno: Optional[int] = None):
+        """loadFinished (turno=None) o timeout de la carga"""
+        if clave not in self._en_curso:
+            return
+        if turno is not None and self._en_curso[clave] != turno:
+            return
+        del self._en_curso[clave]
+        self._despachar()
+
+    def _olvidar(self, clave: int):
+        """La vista se destruyó: sale de la cola y libera su turno"""
+        self._pendientes.pop(clave, None)
+        self._conectadas.discard(clave)
+        if self._en_curso.pop(clave, None) is not None:
+            self._despachar()
+
+
+_planificador: Optional[PlanificadorCargas] = None
+
+
+def get_planificador_cargas() -> PlanificadorCargas:
+    """Planificador global (uno por aplicación)"""
+    global _planificador
+    if _planificador is None:
+        _planificador = PlanificadorCargas(parent=QCoreApplication.instance())
+    return _planificador
@@ -0,0 +1,108 @@
+"""
+Esquema smartreports:// - Assets web servidos desde memoria
+
+ManejadorAssets responde smartreports://assets/<archivo> con los archivos
+de utils/visualization/vendor (D3, NVD3, Montserrat), leídos del disco una
+sola vez y compartidos por todas las vistas del perfil de gráficos. Las
+páginas no hacen ninguna petición de red.
+
+    registrar_esquema_assets()           # antes de crear QApplication
+    instalar_manejador_assets(perfil)    # al crear el perfil de las vistas
+"""
+from typing import Optional
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtWebEngineCore import (
+    QWebEngineProfile,
+    QWebEngineUrlRequestJob,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler
+)
+
+from smart_reports_pyqt6.utils.visualization.assets_web import (
+    ASSETS,
+    ESQUEMA,
+    HOST_ASSETS,
+    activar_esquema,
+    assets_faltantes,
+    leer_asset
+)
+
+_esquema_registrado = False
+
+
+def registrar_esquema_assets():
+    """
+    Declara el esquema smartreports:// en QtWebEngine
+
+    Debe llamarse antes de crear QApplication (requisito de Qt).
+    """
+    global _esquema_registrado
+    if _esquema_registrado:
+        return
+
+    esquema = QWebEngineUrlScheme(ESQUEMA.encode())
+    esquema.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Seguro y con CORS para que las páginas locales puedan usar sus
+    # scripts y fuentes (@font-face exige CORS)
+    esquema.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(esquema)
+    _esquema_registrado = True
+
+
+class ManejadorAssets(QWebEngineUrlSchemeHandler):
+    """Sirve los assets empaquetados desde la caché en memoria"""
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        url = job.requestUrl()
+        nombre = url.path().lstrip('/')
+        asset = ASSETS.get(nombre)
+
+        if url.host() != HOST_ASSETS or asset is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        contenido = leer_asset(nombre)
+        if contenido is None:
+            print(f"⚠️  Asset web no empaquetado: {nombre}")
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        # El buffer pertenece al job: Qt lo libera al terminar la petición
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(contenido))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(asset.mime.encode(), buffer)
+
+
+_manejador: Optional[ManejadorAssets] = None
+
+
+def instalar_manejador_assets(perfil: QWebEngineProfile) -> bool:
+    """
+    Instala el manejador smartreports:// en el perfil
+
+    Returns:
+        True si el esquema quedó activo (los templates usarán sus URLs)
+    """
+    global _manejador
+    if not _esquema_registrado:
+        # Sin registro previo a QApplication, Chromium no conoce el esquema
+        return False
+
+    if perfil.urlSchemeHandler(ESQUEMA.encode()) is None:
+        _manejador = ManejadorAssets(perfil)
+        perfil.installUrlSchemeHandler(ESQUEMA.encode(), _manejador)
+
+        # Sin los archivos en vendor/ los templates vuelven al CDN: que se note
+        faltantes = assets_faltantes()
+        if faltantes:
+            print(f"⚠️  Assets web sin empaquetar (se usará el CDN): {', '.join(faltantes)}")
+            print("   Ejecuta: python scripts/descargar_assets_web.py")
+
+    activar_esquema(True)
+    return True
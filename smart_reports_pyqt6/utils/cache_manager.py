@@ -1,5 +1,5 @@
 """
-Sistema de Caché Simple para Optimización de Rendimiento
+Sistema de Caché para Optimización de Rendimiento
 
 OPTIMIZACIÓN: Evita queries repetidas innecesarias
 
@@ -7,11 +7,79 @@ Casos de uso:
 - Datos de configuración (cambian raramente)
 - Listas de unidades de negocio
 - Estadísticas que se recalculan cada 5 minutos
+
+Con un DiskCache (utils/disk_cache.py) como segundo nivel, las lecturas
+van memoria → disco → función/BD, y los resultados sobreviven entre
+sesiones de la app.
 """
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Optional
-from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from datetime import date, datetime, timedelta
+import hashlib
+import itertools
+import logging
+import re
+import sys
 import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+# Marca interna para distinguir "no está en caché" de un valor None cacheado
+_FALTA = object()
+
+# Segundos que una foto expirada del disco se sirve desde memoria mientras
+# se refresca en segundo plano
+TTL_FOTO_SEGUNDOS = 60
+
+# Claves con identidades de instancia (token_instancia): solo valen en este
+# proceso, así que nunca van al nivel en disco
+MARCA_LOCAL = '<local:'
+SUFIJO_LOCAL = '#local'
+
+# id() → (weakref, token) de las instancias sin __cache_key__. El callback
+# del weakref borra la entrada al liberarse el objeto, antes de que su id()
+# pueda reutilizarse
+_tokens_instancia: Dict[int, Tuple[weakref.ref, str]] = {}
+_contador_tokens = itertools.count(1)
+_tokens_lock = threading.Lock()
+
+
+class _SinClave(TypeError):
+    """Argumento sin forma canónica: la llamada no se cachea"""
+
+
+def token_instancia(obj: Any) -> Optional[str]:
+    """
+    Identidad de una instancia para claves de caché, válida solo en este proceso
+
+    A diferencia de id(), un token no se reutiliza aunque el objeto se
+    libere: una instancia nueva nunca hereda las entradas de otra ya muerta.
+
+    Returns:
+        "<local:módulo.Clase#n>", o None si el objeto no admite weakref
+    """
+    clave = id(obj)
+    with _tokens_lock:
+        entrada = _tokens_instancia.get(clave)
+        if entrada is not None and entrada[0]() is obj:
+            return entrada[1]
+
+        def liberar(ref, clave=clave):
+            if _tokens_instancia.get(clave, (None,))[0] is ref:
+                _tokens_instancia.pop(clave, None)
+
+        try:
+            ref = weakref.ref(obj, liberar)
+        except TypeError:
+            return None
+
+        tipo = type(obj)
+        token = f"{MARCA_LOCAL}{tipo.__module__}.{tipo.__qualname__}#{next(_contador_tokens)}>"
+        _tokens_instancia[clave] = (ref, token)
+        return token
 
 
 class CacheManager:
@@ -19,8 +87,22 @@ class CacheManager:
     Gestor de caché en memoria con TTL (Time To Live)
 
     Características:
-    - Caché en memoria (dict)
-    - TTL configurable por entrada
+    - LRU acotado por número de entradas (max_entries) y por un presupuesto
+      aproximado de memoria (max_bytes)
+    - TTL configurable por entrada y barrido periódico de entradas
+      expiradas en un hilo de fondo
+    - Single-flight: si varios hilos piden la misma clave ausente, solo uno
+      ejecuta la función y los demás esperan su resultado
+    - Claves deterministas (iguales entre procesos y sesiones)
+    - Contadores de aciertos, fallos y desalojos
+    - Segundo nivel opcional en disco: una entrada expirada en disco se
+      devuelve al instante y se refresca en segundo plano
+    - Claves versionadas: con un proveedor de generaciones (ver
+      utils/generaciones_datos.py) la clave en memoria incluye la
+      generación de sus tablas de origen, y una importación del ETL la
+      invalida; en disco la foto va bajo la clave base junto con esas
+      generaciones. Un proveedor por origen de datos: cada BD tiene sus
+      propias generaciones
     - Thread-safe
     - Decorador @cached para funciones
 
@@ -33,11 +115,58 @@ class CacheManager:
             return cursor.fetchall()
     """
 
-    def __init__(self):
-        """Inicializar gestor de caché"""
-        self._cache = {}
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        sweep_interval_seconds: float = 60,
+        disk_cache=None
+    ):
+        """
+        Inicializar gestor de caché
+
+        Args:
+            max_entries: Máximo de entradas (0 = sin límite)
+            max_bytes: Presupuesto aproximado de memoria (0 = sin límite)
+            sweep_interval_seconds: Cada cuántos segundos se barren las
+                                    entradas expiradas (0 = sin barrido)
+            disk_cache: DiskCache opcional como segundo nivel
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_cache = disk_cache
+
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
         self._lock = threading.Lock()
 
+        # Single-flight: clave → [lock, hilos esperando]
+        self._locks_claves: Dict[str, list] = {}
+
+        # Claves que se están refrescando en segundo plano
+        self._refrescando = set()
+
+        # Proveedores de generaciones por origen de datos: tablas → {tabla: generación}
+        self._generation_providers: Dict[Any, Callable[[Iterable[str]], Optional[Dict[str, int]]]] = {}
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'singleflight_waits': 0,
+            'disk_hits': 0,
+            'background_refreshes': 0,
+        }
+
+        self._stop_sweeper = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval_seconds:
+            self.start_sweeper(sweep_interval_seconds)
+
+    # ==================== OPERACIONES BÁSICAS ====================
+
     def get(self, key: str) -> Optional[Any]:
         """
         Obtener valor del caché
@@ -48,57 +177,229 @@ class CacheManager:
         Returns:
             Valor cacheado o None si expiró/no existe
         """
-        with self._lock:
-            if key not in self._cache:
-                return None
-
-            entry = self._cache[key]
-
-            # Verificar si expiró
-            if entry['expires_at'] and datetime.now() > entry['expires_at']:
-                del self._cache[key]
-                return None
-
-            return entry['value']
+        value = self._lookup(key)
+        return None if value is _FALTA else value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
         """
-        Guardar valor en caché
+        Guardar valor en caché (memoria y, si está configurado, disco)
+
+        Si se supera max_entries o max_bytes se desalojan las entradas
+        usadas hace más tiempo.
 
         Args:
             key: Clave única
             value: Valor a cachear
             ttl_seconds: Tiempo de vida en segundos (None = infinito)
         """
+        self._guardar(key, key, value, ttl_seconds, {})
+
+    def _guardar(
+        self,
+        key: str,
+        memory_key: str,
+        value: Any,
+        ttl_seconds: Optional[float],
+        generaciones: Optional[Dict[str, int]]
+    ):
+        """Memoria bajo la clave versionada; disco bajo la clave base con sus generaciones"""
+        self._set_memory(memory_key, value, ttl_seconds)
+
+        if self.disk_cache is not None and not self.es_clave_local(key):
+            try:
+                self.disk_cache.set(key, value, ttl_seconds, generaciones)
+            except Exception as e:
+                logger.warning(f"⚠️  Error escribiendo caché en disco: {e}")
+
+    def _set_memory(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Guarda el valor solo en el nivel de memoria"""
+        size = self._estimate_size(value)
+        now = datetime.now()
+
         with self._lock:
+            # Un valor mayor que todo el presupuesto no se guarda
+            if self.max_bytes and size > self.max_bytes:
+                self._remove(key)
+                return
+
             expires_at = None
             if ttl_seconds:
-                expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+                expires_at = now + timedelta(seconds=ttl_seconds)
 
+            self._remove(key)
             self._cache[key] = {
                 'value': value,
                 'expires_at': expires_at,
-                'created_at': datetime.now()
+                'created_at': now,
+                'size': size
             }
+            self._bytes += size
+            self._stats['sets'] += 1
+
+            self._evict()
 
     def delete(self, key: str):
-        """Eliminar entrada del caché"""
+        """Eliminar entrada del caché (ambos niveles, todas sus generaciones)"""
+        prefijo = f"{key}@"
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            for clave in [k for k in self._cache if k == key or k.startswith(prefijo)]:
+                self._remove(clave)
+
+        if self.disk_cache is not None:
+            self.disk_cache.delete(key)
 
     def clear(self):
-        """Limpiar todo el caché"""
+        """Limpiar todo el caché (ambos niveles)"""
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
+
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+    def get_or_compute(
+        self,
+        key: str,
+        func: Callable[[], Any],
+        ttl_seconds: Optional[int] = None,
+        tables: Iterable[str] = (),
+        origen: Any = None
+    ) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula una sola vez (single-flight)
+
+        Si varios hilos llegan a la vez con la misma clave ausente, solo el
+        primero ejecuta func; los demás esperan y reciben el mismo valor.
+
+        Orden de lectura: memoria → disco → func. Nunca se consulta la BD
+        para saber las generaciones: el proveedor responde con lo último
+        que conoce. La foto del disco se compara con esas generaciones:
+        - Iguales y vigente: se usa
+        - Iguales y expirada: se devuelve y func se ejecuta en segundo plano
+        - Distintas: los datos cambiaron, se ejecuta func
+        - Aún desconocidas (arranque en frío, BD inaccesible): se devuelve
+          la foto y se revalida en segundo plano
+
+        Args:
+            key: Clave única (sin generaciones)
+            func: Función sin argumentos que calcula el valor
+            ttl_seconds: Tiempo de vida en segundos (None = infinito)
+            tables: Tablas de origen del valor (ver set_generation_provider)
+            origen: Origen de datos de esas tablas (el de su proveedor)
 
-    def cached(self, ttl_seconds: int = 300, key_prefix: str = ''):
+        Returns:
+            Valor cacheado o recién calculado
+        """
+        tables = self._normalizar_tablas(tables)
+        generaciones = self._generaciones(tables, origen=origen)
+        memory_key = self._clave_memoria(key, tables, generaciones)
+
+        value = self._lookup(memory_key)
+        if value is not _FALTA:
+            return value
+
+        lock_clave = self._acquire_key_lock(memory_key)
+        try:
+            # Otro hilo pudo haberlo calculado mientras esperábamos
+            value = self._peek(memory_key)
+            if value is not _FALTA:
+                return value
+
+            value = self._read_disk(key, memory_key, generaciones, func, ttl_seconds, tables, origen)
+            if value is not _FALTA:
+                return value
+
+            value = func()
+            self._guardar(key, memory_key, value, ttl_seconds, generaciones)
+            return value
+        finally:
+            self._release_key_lock(memory_key, lock_clave)
+
+    # ==================== NIVEL DE DISCO ====================
+
+    def _read_disk(
+        self,
+        key: str,
+        memory_key: str,
+        generaciones: Optional[Dict[str, int]],
+        func: Callable[[], Any],
+        ttl_seconds: Optional[int],
+        tables: Tuple[str, ...],
+        origen: Any = None
+    ) -> Any:
+        """Lee la foto de la clave base y la sube a memoria; _FALTA si no sirve"""
+        if self.disk_cache is None or self.es_clave_local(key):
+            return _FALTA
+
+        try:
+            entrada = self.disk_cache.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️  Error leyendo caché en disco: {e}")
+            return _FALTA
+
+        if entrada is None:
+            return _FALTA
+
+        value, restante, generaciones_foto = entrada
+        expirada = restante is not None and restante <= 0
+
+        if generaciones is not None and generaciones_foto != generaciones:
+            # Hubo una importación desde que se guardó la foto
+            return _FALTA
+
+        with self._lock:
+            self._stats['disk_hits'] += 1
+
+        if generaciones is None or expirada:
+            # Foto dudosa: se sirve ya y se revalida en segundo plano
+            self._set_memory(memory_key, value, TTL_FOTO_SEGUNDOS)
+            self._refresh_in_background(key, func, ttl_seconds, tables, origen)
+        else:
+            self._set_memory(memory_key, value, restante)
+
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        func: Callable[[], Any],
+        ttl_seconds: Optional[int],
+        tables: Tuple[str, ...] = (),
+        origen: Any = None
+    ):
+        """Recalcula la clave en un hilo de fondo (uno por clave a la vez)"""
+        with self._lock:
+            if key in self._refrescando:
+                return
+            self._refrescando.add(key)
+            self._stats['background_refreshes'] += 1
+
+        def refrescar():
+            try:
+                # Aquí sí se puede esperar al primer sondeo de generaciones
+                generaciones = self._generaciones(tables, esperar=True, origen=origen)
+                value = func()
+                self._guardar(key, self._clave_memoria(key, tables, generaciones),
+                              value, ttl_seconds, generaciones)
+            except Exception as e:
+                logger.warning(f"⚠️  No se pudo refrescar '{key}' en segundo plano: {e}")
+            finally:
+                with self._lock:
+                    self._refrescando.discard(key)
+
+        threading.Thread(target=refrescar, name="CacheManagerRefresh", daemon=True).start()
+
+    # ==================== DECORADOR ====================
+
+    def cached(self, ttl_seconds: int = 300, key_prefix: str = '', tables: Optional[Iterable[str]] = None):
         """
         Decorador para cachear resultados de funciones
 
         Args:
             ttl_seconds: Tiempo de vida del caché (default: 5 minutos)
             key_prefix: Prefijo para la clave de caché
+            tables: Tablas de origen; la clave incluye sus generaciones y se
+                    invalida cuando el ETL las modifica
 
         Uso:
             @cache_manager.cached(ttl_seconds=600)
@@ -106,41 +407,382 @@ class CacheManager:
                 # Query pesada
                 return results
 
+            get_statistics.invalidate_cache()          # Sin argumentos
+            get_report.invalidate_cache(2024, 'Q1')    # Con argumentos
+
+            @cache_manager.cached(ttl_seconds=6 * 3600, tables=['instituto_ProgresoModulo'])
+            def get_avance_global():
+                ...
+
         """
+        tables = tuple(tables or ())
+
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # Generar clave única basada en función y argumentos
-                cache_key = self._generate_cache_key(func, args, kwargs, key_prefix)
-
-                # Intentar obtener del caché
-                cached_value = self.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
-
-                # Ejecutar función y cachear resultado
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, ttl_seconds)
-
-                return result
+                # Generar clave determinista basada en función y argumentos
+                try:
+                    cache_key = self._generate_cache_key(func, args, kwargs, key_prefix)
+                except _SinClave:
+                    # Algún argumento no tiene identidad estable: sin caché
+                    return func(*args, **kwargs)
+
+                return self.get_or_compute(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    ttl_seconds,
+                    tables
+                )
 
             # Agregar método para invalidar caché
-            wrapper.invalidate_cache = lambda: self.delete(
-                self._generate_cache_key(func, (), {}, key_prefix)
-            )
+            def invalidate_cache(*args, **kwargs):
+                try:
+                    self.delete(self._generate_cache_key(func, args, kwargs, key_prefix))
+                except _SinClave:
+                    pass
+
+            wrapper.invalidate_cache = invalidate_cache
 
             return wrapper
 
         return decorator
 
+    # ==================== CLAVES ====================
+
+    @classmethod
+    def _generate_cache_key(cls, func: Callable, args: tuple, kwargs: dict, prefix: str = '') -> str:
+        """
+        Generar clave determinista para caché
+
+        Formato: "<prefijo>:<módulo>.<función>:<sha1 de los argumentos>".
+        A diferencia de hash(), el resultado es el mismo en cualquier
+        proceso, así que la clave sirve también fuera de la memoria. Si
+        algún argumento se identifica por token_instancia, la clave lleva
+        SUFIJO_LOCAL y se queda en memoria.
+
+        Raises:
+            _SinClave: Algún argumento no tiene forma canónica
+        """
+        func_name = f"{func.__module__}.{func.__qualname__}"
+        args_str = repr(cls._canonical((args, kwargs)))
+        digest = hashlib.sha1(args_str.encode('utf-8')).hexdigest()[:20]
+
+        return cls._marcar_local(f"{prefix}:{func_name}:{digest}", args_str)
+
     @staticmethod
-    def _generate_cache_key(func: Callable, args: tuple, kwargs: dict, prefix: str = '') -> str:
-        """Generar clave única para caché"""
-        func_name = f"{func.__module__}.{func.__name__}"
-        args_str = str(args) + str(sorted(kwargs.items()))
+    def _marcar_local(key: str, args_str: str) -> str:
+        """Agrega SUFIJO_LOCAL si la clave depende de identidades del proceso"""
+        return key + SUFIJO_LOCAL if MARCA_LOCAL in args_str else key
 
-        key = f"{prefix}:{func_name}:{hash(args_str)}"
-        return key
+    @staticmethod
+    def es_clave_local(key: str) -> bool:
+        """True si la clave solo vale en este proceso (no se lee ni escribe en disco)"""
+        return key.endswith(SUFIJO_LOCAL)
+
+    def set_generation_provider(self, provider: Optional[Callable[[Iterable[str]], Optional[Dict[str, int]]]],
+                                origen: Any = None):
+        """
+        Define el proveedor de generaciones de datos de un origen
+
+        Args:
+            provider: Función tablas → {tabla: generación}, o None si aún
+                      no las conoce (p. ej. una instancia de
+                      GeneracionesDatos). Debe responder sin bloquear; si
+                      además tiene esperar(), los refrescos en segundo plano
+                      la usan antes de calcular. None lo desactiva
+            origen: Origen de datos al que pertenecen las generaciones
+                    (p. ej. el __cache_key__() de su pool); None = el
+                    origen por defecto
+        """
+        with self._lock:
+            if provider is None:
+                self._generation_providers.pop(origen, None)
+            else:
+                self._generation_providers[origen] = provider
+
+    def generation_provider(self, origen: Any = None) -> Optional[Callable[[Iterable[str]], Optional[Dict[str, int]]]]:
+        """Proveedor de generaciones del origen (None si no tiene)"""
+        return self._generation_providers.get(origen)
+
+    @property
+    def has_generation_provider(self) -> bool:
+        """True si las claves del origen por defecto se versionan con generaciones"""
+        return None in self._generation_providers
+
+    def versioned_key(self, key: str, tables: Iterable[str], origen: Any = None) -> str:
+        """
+        Agrega a la clave la generación de sus tablas de origen
+
+        Sin proveedor, sin tablas o con generaciones aún desconocidas la
+        clave queda igual.
+
+        Args:
+            key: Clave base
+            tables: Tablas de origen del valor
+            origen: Origen de datos de esas tablas
+
+        Returns:
+            "<clave>@<tabla>=<generación>,..."
+        """
+        tables = self._normalizar_tablas(tables)
+        return self._clave_memoria(key, tables, self._generaciones(tables, origen=origen))
+
+    @staticmethod
+    def _normalizar_tablas(tables: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(sorted({t.lower() for t in tables}))
+
+    def _generaciones(self, tables: Tuple[str, ...], esperar: bool = False,
+                      origen: Any = None) -> Optional[Dict[str, int]]:
+        """
+        Generaciones de las tablas ({} si no se versionan, None si aún no
+        se conocen)
+
+        Args:
+            tables: Tablas normalizadas
+            esperar: Esperar al primer sondeo del proveedor (solo en hilos
+                     de fondo)
+            origen: Origen de datos (elige el proveedor)
+        """
+        provider = self._generation_providers.get(origen)
+        if provider is None or not tables:
+            return {}
+
+        try:
+            if esperar and hasattr(provider, 'esperar'):
+                provider.esperar()
+            generaciones = provider(tables)
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudieron leer generaciones de datos: {e}")
+            return None
+
+        if generaciones is None:
+            return None
+        return {t: generaciones.get(t, 0) for t in tables}
+
+    @staticmethod
+    def _clave_memoria(key: str, tables: Tuple[str, ...], generaciones: Optional[Dict[str, int]]) -> str:
+        """Clave del nivel de memoria: la base más las generaciones (si se conocen)"""
+        if not tables or not generaciones:
+            return key
+        return f"{key}@" + ",".join(f"{t}={generaciones[t]}" for t in tables)
+
+    @classmethod
+    def query_key(cls, query: str, params: Any = None, prefix: str = 'sql') -> str:
+        """
+        Clave determinista para el resultado de una consulta SQL
+
+        Los espacios del texto se normalizan, así que la misma consulta con
+        otra indentación comparte la entrada.
+
+        Args:
+            query: Texto SQL
+            params: Parámetros de la consulta
+            prefix: Prefijo de la clave
+
+        Returns:
+            "<prefijo>:<sha1 de consulta + parámetros>" (más SUFIJO_LOCAL
+            si los parámetros incluyen identidades del proceso)
+        """
+        texto = re.sub(r'\s+', ' ', query).strip()
+        args_str = repr((texto, cls._canonical(params)))
+        digest = hashlib.sha1(args_str.encode('utf-8')).hexdigest()[:20]
+        return cls._marcar_local(f"{prefix}:{digest}", args_str)
+
+    @classmethod
+    def _canonical(cls, value: Any) -> Any:
+        """
+        Forma canónica de un argumento para construir la clave
+
+        - dict y set se ordenan (su orden de iteración no es estable)
+        - Fechas se representan en ISO 8601
+        - Objetos que definen __cache_key__() (p. ej. un servicio con su
+          conexión) se representan por lo que devuelve
+        - El resto de objetos se representa por su token_instancia: dos
+          instancias nunca comparten entradas y la clave no sale de la
+          memoria. Sin weakref no hay token y la llamada no se cachea
+
+        Raises:
+            _SinClave: Objeto sin __cache_key__ que no admite weakref
+        """
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            return value
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._canonical(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((repr(cls._canonical(k)), cls._canonical(v)) for k, v in value.items()))
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted(repr(cls._canonical(v)) for v in value))
+        if hasattr(value, '__cache_key__'):
+            return cls._canonical(value.__cache_key__())
+
+        token = token_instancia(value)
+        if token is None:
+            raise _SinClave(f"Sin clave de caché para {type(value).__qualname__}")
+        return token
+
+    # ==================== MEMORIA ====================
+
+    @classmethod
+    def _estimate_size(cls, value: Any, _depth: int = 0) -> int:
+        """
+        Tamaño aproximado en bytes de un valor
+
+        Usa memory_usage(deep=True) para DataFrames/Series, nbytes para
+        arrays y recorre listas, tuplas, sets y dicts hasta 3 niveles.
+        """
+        memory_usage = getattr(value, 'memory_usage', None)
+        if callable(memory_usage):
+            try:
+                uso = memory_usage(deep=True)
+                return int(uso.sum()) if hasattr(uso, 'sum') else int(uso)
+            except TypeError:
+                pass
+
+        nbytes = getattr(value, 'nbytes', None)
+        if isinstance(nbytes, int):
+            return nbytes
+
+        size = sys.getsizeof(value)
+        if _depth >= 3:
+            return size
+
+        if isinstance(value, dict):
+            size += sum(
+                cls._estimate_size(k, _depth + 1) + cls._estimate_size(v, _depth + 1)
+                for k, v in value.items()
+            )
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(cls._estimate_size(v, _depth + 1) for v in value)
+
+        return size
+
+    def _evict(self):
+        """Desaloja entradas LRU hasta cumplir los límites (requiere _lock)"""
+        while self._cache and (
+            (self.max_entries and len(self._cache) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= entry['size']
+            self._stats['evictions'] += 1
+
+    def _remove(self, key: str):
+        """Elimina una entrada si existe (requiere _lock)"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry['size']
+
+    # ==================== LECTURA INTERNA ====================
+
+    def _lookup(self, key: str) -> Any:
+        """Lectura con contadores y orden LRU; _FALTA si no está o expiró"""
+        with self._lock:
+            entry = self._cache.get(key)
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return _FALTA
+
+            # Verificar si expiró
+            if entry['expires_at'] and datetime.now() > entry['expires_at']:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return _FALTA
+
+            self._cache.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry['value']
+
+    def _peek(self, key: str) -> Any:
+        """
+        Doble verificación de single-flight: si otro hilo ya calculó el
+        valor, el fallo contado en _lookup pasa a contarse como acierto
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or (entry['expires_at'] and datetime.now() > entry['expires_at']):
+                return _FALTA
+
+            self._cache.move_to_end(key)
+            self._stats['misses'] -= 1
+            self._stats['hits'] += 1
+            return entry['value']
+
+    # ==================== SINGLE-FLIGHT ====================
+
+    def _acquire_key_lock(self, key: str) -> threading.Lock:
+        """Toma el lock de la clave (lo crea si nadie lo está usando)"""
+        with self._lock:
+            registro = self._locks_claves.get(key)
+            if registro is None:
+                registro = self._locks_claves[key] = [threading.Lock(), 0]
+            elif registro[0].locked():
+                self._stats['singleflight_waits'] += 1
+            registro[1] += 1
+
+        registro[0].acquire()
+        return registro[0]
+
+    def _release_key_lock(self, key: str, lock_clave: threading.Lock):
+        """Suelta el lock de la clave y lo elimina si ya nadie lo espera"""
+        with self._lock:
+            registro = self._locks_claves[key]
+            registro[1] -= 1
+            if registro[1] == 0:
+                del self._locks_claves[key]
+        lock_clave.release()
+
+    # ==================== BARRIDO DE EXPIRADAS ====================
+
+    def start_sweeper(self, interval_seconds: float = 60):
+        """
+        Inicia el hilo de fondo que elimina entradas expiradas
+
+        Args:
+            interval_seconds: Segundos entre barridos
+        """
+        if self._sweeper and self._sweeper.is_alive():
+            return
+
+        self._stop_sweeper.clear()
+
+        def barrer():
+            while not self._stop_sweeper.wait(interval_seconds):
+                self.sweep_expired()
+
+        self._sweeper = threading.Thread(target=barrer, name="CacheManagerSweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        """Detiene el hilo de barrido"""
+        self._stop_sweeper.set()
+        if self._sweeper:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
+    def sweep_expired(self) -> int:
+        """
+        Elimina todas las entradas expiradas
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        now = datetime.now()
+        with self._lock:
+            expiradas = [
+                key for key, entry in self._cache.items()
+                if entry['expires_at'] and now > entry['expires_at']
+            ]
+            for key in expiradas:
+                self._remove(key)
+            self._stats['expirations'] += len(expiradas)
+
+        return len(expiradas)
+
+    # ==================== ESTADÍSTICAS ====================
 
     def get_stats(self) -> dict:
         """Obtener estadísticas del caché"""
@@ -156,23 +798,55 @@ class CacheManager:
                 else:
                     active += 1
 
+            consultas = self._stats['hits'] + self._stats['misses']
+
             return {
                 'total_entries': total_entries,
                 'active': active,
                 'expired': expired,
-                'memory_keys': list(self._cache.keys())
+                **self._stats,
+                'hit_rate': round(self._stats['hits'] / consultas, 3) if consultas else 0.0,
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'memory_keys': list(self._cache.keys()),
+                'disk': self.disk_cache.get_stats() if self.disk_cache is not None else None
             }
 
 
 # Instancia global del gestor de caché
 _global_cache_manager = None
+_global_cache_lock = threading.Lock()
 
 
 def get_cache_manager() -> CacheManager:
     """Obtener instancia global del gestor de caché (Singleton)"""
     global _global_cache_manager
     if _global_cache_manager is None:
-        _global_cache_manager = CacheManager()
+        with _global_cache_lock:
+            if _global_cache_manager is None:
+                from smart_reports_pyqt6.config.settings import CACHE_CONFIG
+
+                disk_cache = None
+                if CACHE_CONFIG.get("disk_enabled"):
+                    from smart_reports_pyqt6.utils.disk_cache import DiskCache
+                    try:
+                        disk_cache = DiskCache(
+                            CACHE_CONFIG["disk_path"],
+                            schema_version=CACHE_CONFIG["schema_version"],
+                            max_stale_seconds=CACHE_CONFIG["disk_max_stale_seconds"]
+                        )
+                        disk_cache.purge()
+                    except Exception as e:
+                        logger.warning(f"⚠️  Caché en disco deshabilitado: {e}")
+                        disk_cache = None
+
+                _global_cache_manager = CacheManager(
+                    max_entries=CACHE_CONFIG["max_entries"],
+                    max_bytes=CACHE_CONFIG["max_bytes"],
+                    sweep_interval_seconds=CACHE_CONFIG["sweep_interval_seconds"],
+                    disk_cache=disk_cache
+                )
     return _global_cache_manager
 
 
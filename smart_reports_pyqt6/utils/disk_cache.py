@@ -0,0 +1,234 @@
+"""
+Caché de Resultados en Disco (segundo nivel)
+
+OPTIMIZACIÓN: Arranques en frío sin ir a SQL Server
+
+El CacheManager en memoria se pierde al cerrar la app; este nivel guarda
+los resultados en un SQLite local para que la siguiente sesión pueda
+pintar el dashboard con la última foto de los datos mientras se refresca
+en segundo plano.
+
+- DataFrames se guardan como Parquet si pyarrow está instalado; el resto
+  (y DataFrames sin pyarrow) con pickle
+- Cada entrada lleva su TTL y la versión de esquema con la que se guardó;
+  al cambiar CACHE_CONFIG['schema_version'] las entradas viejas se ignoran
+- Las entradas expiradas se conservan como "foto" hasta max_stale_seconds
+- Cada entrada guarda además las generaciones de datos con que se calculó
+  (utils/generaciones_datos.py): la clave no depende de ellas, así que la
+  foto se encuentra aunque aún no se sepa la generación actual
+"""
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import io
+import json
+import pickle
+import sqlite3
+import threading
+import time
+
+# Parquet (opcional)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+class DiskCache:
+    """
+    Caché clave → resultado serializado sobre SQLite
+
+    Uso:
+        disco = DiskCache("data/cache_resultados.sqlite", schema_version="3")
+        disco.set("clave", df, ttl_seconds=3600, generaciones={"instituto_usuario": 7})
+        entrada = disco.get("clave")  # None o (valor, segundos_restantes, generaciones)
+    """
+
+    def __init__(self, path: str, schema_version: str = "1", max_stale_seconds: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: Ruta del archivo SQLite
+            schema_version: Versión del esquema de datos; entradas con otra
+                            versión no se devuelven
+            max_stale_seconds: Antigüedad máxima de una entrada expirada
+                               para seguir sirviéndola como foto
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.schema_version = str(schema_version)
+        self.max_stale_seconds = max_stale_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                clave TEXT PRIMARY KEY,
+                valor BLOB NOT NULL,
+                formato TEXT NOT NULL,
+                version TEXT NOT NULL,
+                creado REAL NOT NULL,
+                expira REAL,
+                generaciones TEXT
+            )
+        """)
+        # Archivos creados antes de guardar generaciones
+        columnas = {row[1] for row in self._conn.execute("PRAGMA table_info(resultados)")}
+        if 'generaciones' not in columnas:
+            self._conn.execute("ALTER TABLE resultados ADD COLUMN generaciones TEXT")
+        self._conn.commit()
+
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'writes': 0}
+
+    # ==================== LECTURA / ESCRITURA ====================
+
+    def get(self, key: str) -> Optional[Tuple[Any, Optional[float], Optional[Dict[str, int]]]]:
+        """
+        Leer una entrada
+
+        Args:
+            key: Clave única
+
+        Returns:
+            None si no hay entrada utilizable; si no, tupla (valor,
+            segundos_restantes, generaciones): restante None = no expira,
+            <= 0 = expirada pero aún sirve como foto; generaciones None =
+            se guardó sin conocerlas
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT valor, formato, version, creado, expira, generaciones FROM resultados WHERE clave = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None or row[2] != self.schema_version:
+            self._contar('misses')
+            return None
+
+        valor, formato, _, creado, expira, generaciones = row
+        ahora = time.time()
+        restante = None if expira is None else expira - ahora
+
+        if restante is not None and restante <= 0:
+            if ahora - creado > self.max_stale_seconds:
+                self._contar('misses')
+                return None
+            self._contar('stale_hits')
+        else:
+            self._contar('hits')
+
+        generaciones = json.loads(generaciones) if generaciones is not None else None
+        return self._deserializar(valor, formato), restante, generaciones
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        generaciones: Optional[Dict[str, int]] = None
+    ):
+        """
+        Guardar una entrada
+
+        Args:
+            key: Clave única
+            value: Valor (debe ser serializable)
+            ttl_seconds: Tiempo de vida en segundos (None = sin expiración)
+            generaciones: Generaciones de las tablas de origen con que se
+                          calculó el valor (None = desconocidas)
+        """
+        try:
+            valor, formato = self._serializar(value)
+        except Exception:
+            # Valores no serializables solo viven en memoria
+            return
+
+        ahora = time.time()
+        expira = ahora + ttl_seconds if ttl_seconds else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resultados (clave, valor, formato, version, creado, expira, generaciones) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(valor), formato, self.schema_version, ahora, expira,
+                 json.dumps(generaciones, sort_keys=True) if generaciones is not None else None)
+            )
+            self._conn.commit()
+            self._stats['writes'] += 1
+
+    def delete(self, key: str):
+        """Eliminar una entrada"""
+        with self._lock:
+            self._conn.execute("DELETE FROM resultados WHERE clave = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Eliminar todas las entradas"""
+        with self._lock:
+            self._conn.execute("DELETE FROM resultados")
+            self._conn.commit()
+
+    def purge(self) -> int:
+        """
+        Elimina entradas de otra versión de esquema o demasiado viejas
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        limite = time.time() - self.max_stale_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM resultados WHERE version <> ? OR (expira IS NOT NULL AND creado < ?)",
+                (self.schema_version, limite)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Cierra el archivo SQLite"""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> dict:
+        """Estadísticas del nivel de disco"""
+        with self._lock:
+            entradas, bytes_totales = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(valor)), 0) FROM resultados"
+            ).fetchone()
+            return {
+                **self._stats,
+                'entries': entradas,
+                'bytes': bytes_totales,
+                'schema_version': self.schema_version,
+                'path': str(self.path)
+            }
+
+    # ==================== SERIALIZACIÓN ====================
+
+    @staticmethod
+    def _serializar(value: Any) -> Tuple[bytes, str]:
+        """Serializa a Parquet (DataFrames con pyarrow) o pickle"""
+        if PARQUET_AVAILABLE and type(value).__name__ == 'DataFrame':
+            try:
+                buffer = io.BytesIO()
+                value.to_parquet(buffer, engine='pyarrow', index=True)
+                return buffer.getvalue(), 'parquet'
+            except Exception:
+                # Columnas con tipos mixtos u objetos: se guarda con pickle
+                pass
+
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 'pickle'
+
+    @staticmethod
+    def _deserializar(valor: bytes, formato: str) -> Any:
+        """Inverso de _serializar"""
+        if formato == 'parquet':
+            import pandas as pd
+            return pd.read_parquet(io.BytesIO(valor), engine='pyarrow')
+
+        return pickle.loads(valor)
+
+    def _contar(self, contador: str):
+        with self._lock:
+            self._stats[contador] += 1
@@ -0,0 +1,213 @@
+"""
+Generaciones de Datos para Invalidar la Caché
+
+OPTIMIZACIÓN: TTLs largos sin datos viejos
+
+Cada importación del ETL incrementa, en la misma transacción, un contador
+por tabla modificada (instituto_GeneracionDatos). La app incluye en cada
+clave de caché la generación de sus tablas de origen: mientras no haya una
+importación, las claves no cambian y la caché se reutiliza; en cuanto hay
+una, las claves cambian y la siguiente lectura va a la BD.
+
+Saber si algo cambió cuesta una sola consulta sobre una tabla de pocas
+filas, que se repite cada poll_seconds en un hilo de fondo: quien pide
+una generación nunca espera a la BD.
+
+Solo las tablas de TABLAS_CON_GENERACION tienen generación (las que
+modifica el ETL de SQL Server); una consulta que lee cualquier otra tabla
+no puede confiar en las generaciones y debe usar un TTL corto.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Tablas cuya generación incrementa el ETL (TABLAS_POR_ESTADISTICA en
+# etl_instituto_completo), en minúsculas
+TABLAS_CON_GENERACION = frozenset({
+    'instituto_usuario',
+    'instituto_progresomodulo',
+    'instituto_resultadoevaluacion',
+    'instituto_modulo',
+    'instituto_evaluacion',
+    'instituto_unidaddenegocio',
+    'instituto_departamento',
+    'instituto_resumenprogreso',
+})
+
+# Tablas después de FROM / JOIN (con o sin esquema y corchetes)
+_RE_TABLAS = re.compile(r'\b(?:FROM|JOIN)\s+((?:\[?\w+\]?\.)*\[?\w+\]?)', re.IGNORECASE)
+
+
+def tablas_en_consulta(query: str) -> List[str]:
+    """
+    Tablas de origen de una consulta SQL
+
+    Args:
+        query: Texto SQL
+
+    Returns:
+        Nombres de tabla (sin esquema ni corchetes, en minúsculas), ordenados
+    """
+    tablas = set()
+    for nombre in _RE_TABLAS.findall(query):
+        tabla = nombre.split('.')[-1].strip('[]').lower()
+        # Subconsultas "FROM (SELECT ...)" no capturan nombre
+        if tabla and tabla != 'select':
+            tablas.add(tabla)
+    return sorted(tablas)
+
+
+def tablas_versionadas(tablas: Iterable[str]) -> bool:
+    """True si todas las tablas (al menos una) tienen generación"""
+    tablas = [t.lower() for t in tablas]
+    return bool(tablas) and all(t in TABLAS_CON_GENERACION for t in tablas)
+
+
+class GeneracionesDatos:
+    """
+    Lector de instituto_GeneracionDatos con sondeo en segundo plano
+
+    Se usa como proveedor de generaciones del CacheManager:
+
+        generaciones = GeneracionesDatos(pool)
+        cache.set_generation_provider(generaciones)
+
+    El sondeo arranca con la primera petición. Hasta que termina el primer
+    sondeo con éxito las generaciones son desconocidas (None) y el
+    CacheManager sirve sus fotos de disco.
+
+    Los observadores registrados con agregar_observador() reciben el
+    conjunto de tablas que cambiaron, p. ej. para recargar un dashboard
+    (se llaman desde el hilo de sondeo).
+    """
+
+    QUERY = "SELECT Tabla, Generacion FROM instituto_GeneracionDatos"
+
+    def __init__(self, pool, poll_seconds: float = 15):
+        """
+        Args:
+            pool: ConnectionPool de la app
+            poll_seconds: Intervalo mínimo entre consultas a la BD
+        """
+        self.pool = pool
+        self.poll_seconds = poll_seconds
+
+        self._lock = threading.Lock()
+        self._generaciones: Optional[Dict[str, int]] = None
+        self._ultima_consulta = 0.0
+        self._observadores: List[Callable[[Set[str]], None]] = []
+
+        # Se activa tras el primer intento de sondeo (con o sin éxito)
+        self._primer_intento = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def __call__(self, tablas: Iterable[str]) -> Optional[Dict[str, int]]:
+        """
+        Última generación conocida de cada tabla (0 si nunca se ha
+        importado); no consulta la BD
+
+        Args:
+            tablas: Nombres de tabla
+
+        Returns:
+            Diccionario tabla (minúsculas) → generación, o None si aún no
+            hay un sondeo con éxito
+        """
+        self.iniciar()
+
+        with self._lock:
+            if self._generaciones is None:
+                return None
+            return {t.lower(): self._generaciones.get(t.lower(), 0) for t in tablas}
+
+    def esperar(self, timeout: Optional[float] = 30) -> bool:
+        """
+        Espera al primer intento de sondeo (solo desde hilos de fondo)
+
+        Returns:
+            True si las generaciones ya se conocen
+        """
+        self.iniciar()
+        self._primer_intento.wait(timeout)
+        with self._lock:
+            return self._generaciones is not None
+
+    # ==================== SONDEO ====================
+
+    def iniciar(self):
+        """Arranca el hilo de sondeo (si no está corriendo)"""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+
+        with self._lock:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._detener.clear()
+
+            def sondear():
+                while True:
+                    self.refrescar()
+                    self._primer_intento.set()
+                    if self._detener.wait(self.poll_seconds):
+                        break
+
+            self._hilo = threading.Thread(target=sondear, name="GeneracionesDatosPoll", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo de sondeo"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=1)
+            self._hilo = None
+
+    def refrescar(self) -> Set[str]:
+        """
+        Consulta las generaciones en la BD
+
+        Lo llama el hilo de sondeo. Si la consulta falla (tabla inexistente
+        en una BD anterior, BD caída) se conservan las últimas generaciones
+        conocidas.
+
+        Returns:
+            Tablas cuya generación cambió desde la última consulta
+        """
+        self._ultima_consulta = time.monotonic()
+
+        try:
+            with self.pool.cursor() as cursor:
+                cursor.execute(self.QUERY)
+                nuevas = {str(row[0]).lower(): int(row[1]) for row in cursor.fetchall()}
+        except Exception as e:
+            logger.debug(f"Generaciones no disponibles: {e}")
+            return set()
+
+        with self._lock:
+            cambiadas = {
+                tabla for tabla, generacion in nuevas.items()
+                if (self._generaciones or {}).get(tabla) != generacion
+            }
+            primera_vez = self._generaciones is None
+            self._generaciones = nuevas
+            observadores = list(self._observadores)
+
+        if cambiadas and not primera_vez:
+            logger.info(f"🔄 Datos actualizados en: {', '.join(sorted(cambiadas))}")
+            for observador in observadores:
+                try:
+                    observador(cambiadas)
+                except Exception as e:
+                    logger.warning(f"⚠️  Error en observador de generaciones: {e}")
+
+        return cambiadas if not primera_vez else set()
+
+    def agregar_observador(self, callback: Callable[[Set[str]], None]):
+        """Registra una función que recibe las tablas que cambiaron"""
+        with self._lock:
+            self._observadores.append(callback)
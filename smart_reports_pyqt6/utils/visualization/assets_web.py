@@ -0,0 +1,151 @@
+"""
+Assets Web Locales (D3, NVD3, Montserrat)
+
+OPTIMIZACIÓN: Gráficos sin ningún viaje a la red
+
+Los templates HTML cargaban D3, NVD3 y Google Fonts desde CDNs en cada
+gráfico; en las redes de terminal (lentas o sin salida a internet) los
+gráficos se quedaban en blanco. Los archivos viven ahora en el paquete
+(carpeta vendor/, ver scripts/descargar_assets_web.py) y los templates los
+piden con url_asset() / etiquetas_head():
+
+- Con QtWebEngine, el esquema smartreports://assets/<archivo> lo sirve
+  ManejadorAssets (ui/widgets/pyqt6_web_assets.py) desde memoria: cada
+  archivo se lee del disco una sola vez por proceso.
+- Sin el esquema (HTML exportado, navegador externo) se usa file:// al
+  archivo local.
+- Si el archivo no está en vendor/, se usa la URL del CDN de siempre.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import threading
+
+ESQUEMA = 'smartreports'
+HOST_ASSETS = 'assets'
+
+# Carpeta con los archivos de terceros empaquetados
+DIRECTORIO_VENDOR = Path(__file__).resolve().parent / 'vendor'
+
+
+@dataclass(frozen=True)
+class AssetWeb:
+    """Archivo JS/CSS/fuente servido a los templates"""
+    archivo: str
+    mime: str
+    url_cdn: str = ''   # Respaldo si el archivo no está empaquetado
+    requiere: Tuple[str, ...] = ()  # Otros assets que referencia (p. ej. fuentes)
+
+
+ASSETS: Dict[str, AssetWeb] = {
+    'd3.v7.min.js': AssetWeb(
+        'd3.v7.min.js', 'application/javascript',
+        'https://d3js.org/d3.v7.min.js'),
+    # NVD3 requiere D3 v3.x
+    'd3.v3.min.js': AssetWeb(
+        'd3.v3.min.js', 'application/javascript',
+        'https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.17/d3.min.js'),
+    'nv.d3.min.js': AssetWeb(
+        'nv.d3.min.js', 'application/javascript',
+        'https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.js'),
+    'nv.d3.min.css': AssetWeb(
+        'nv.d3.min.css', 'text/css',
+        'https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.css'),
+    'montserrat.css': AssetWeb(
+        'montserrat.css', 'text/css',
+        'https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600;700;800&display=swap',
+        requiere=tuple(f'montserrat-{peso}.woff2' for peso in (300, 400, 600, 700, 800))),
+    'montserrat-300.woff2': AssetWeb('montserrat-300.woff2', 'font/woff2'),
+    'montserrat-400.woff2': AssetWeb('montserrat-400.woff2', 'font/woff2'),
+    'montserrat-600.woff2': AssetWeb('montserrat-600.woff2', 'font/woff2'),
+    'montserrat-700.woff2': AssetWeb('montserrat-700.woff2', 'font/woff2'),
+    'montserrat-800.woff2': AssetWeb('montserrat-800.woff2', 'font/woff2'),
+}
+
+# Conjuntos que usa cada familia de templates
+ASSETS_D3 = ('d3.v7.min.js', 'montserrat.css')
+ASSETS_NVD3 = ('d3.v3.min.js', 'nv.d3.min.js', 'nv.d3.min.css', 'montserrat.css')
+
+# Lo activa el manejador Qt al instalarse en el perfil de las vistas
+_esquema_activo = False
+
+_contenidos: Dict[str, bytes] = {}
+_lock = threading.Lock()
+
+
+def activar_esquema(activo: bool = True):
+    """Indica que las páginas pueden pedir smartreports://assets/..."""
+    global _esquema_activo
+    _esquema_activo = activo
+
+
+def esquema_activo() -> bool:
+    return _esquema_activo
+
+
+def ruta_asset(nombre: str) -> Optional[Path]:
+    """Ruta local del asset o None si no está empaquetado (él o lo que requiere)"""
+    asset = ASSETS.get(nombre)
+    if asset is None:
+        return None
+    ruta = DIRECTORIO_VENDOR / asset.archivo
+    if not ruta.is_file():
+        return None
+    if any(ruta_asset(requerido) is None for requerido in asset.requiere):
+        return None
+    return ruta
+
+
+def url_asset(nombre: str) -> str:
+    """
+    URL con la que un template debe pedir el asset
+
+    smartreports:// si el esquema está activo, file:// si solo existe el
+    archivo local, y la URL del CDN si no está empaquetado.
+    """
+    asset = ASSETS[nombre]
+    ruta = ruta_asset(nombre)
+    if ruta is None:
+        return asset.url_cdn
+    if _esquema_activo:
+        return f"{ESQUEMA}://{HOST_ASSETS}/{asset.archivo}"
+    return ruta.as_uri()
+
+
+def etiquetas_head(*nombres: str) -> str:
+    """<script>/<link> de los assets indicados, para el <head> de un template"""
+    etiquetas = []
+    for nombre in nombres:
+        url = url_asset(nombre)
+        if ASSETS[nombre].mime == 'text/css':
+            etiquetas.append(f'<link rel="stylesheet" href="{url}">')
+        else:
+            etiquetas.append(f'<script src="{url}"></script>')
+    return "\n    ".join(etiquetas)
+
+
+def leer_asset(nombre: str) -> Optional[bytes]:
+    """
+    Contenido del asset (cacheado en memoria durante toda la ejecución)
+
+    Returns:
+        Bytes del archivo o None si no existe
+    """
+    contenido = _contenidos.get(nombre)
+    if contenido is not None:
+        return contenido
+
+    ruta = ruta_asset(nombre)
+    if ruta is None:
+        return None
+
+    with _lock:
+        contenido = _contenidos.get(nombre)
+        if contenido is None:
+            contenido = _contenidos[nombre] = ruta.read_bytes()
+    return contenido
+
+
+def assets_faltantes() -> list:
+    """Assets registrados que no están en vendor/"""
+    return [nombre for nombre in ASSETS if ruta_asset(nombre) is None]
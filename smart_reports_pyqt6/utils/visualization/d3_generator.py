@@ -5,7 +5,19 @@ Sistema escalable y profesional para generación de visualizaciones
 
 import json
 from typing import Dict, List, Any, Optional
-from smart_reports.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.utils.visualization.assets_web import ASSETS_D3, etiquetas_head
+from smart_reports_pyqt6.utils.visualization.reduccion_series import (
+    ANCHO_PREDETERMINADO_PX,
+    presupuesto_puntos,
+    reducir_series
+)
+from smart_reports_pyqt6.utils.visualization.templates_compilados import (
+    get_cache_templates,
+    hueco,
+    hueco_json,
+    parrafo_subtitulo
+)
 
 
 class MotorTemplatesD3:
@@ -51,11 +63,8 @@ class MotorTemplatesD3:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{titulo}</title>
 
-    <!-- D3.js v7 -->
-    <script src="https://d3js.org/d3.v7.min.js"></script>
-
-    <!-- Fuente Montserrat -->
-    <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600;700;800&display=swap" rel="stylesheet">
+    <!-- D3.js v7 y fuente Montserrat (empaquetados, ver assets_web) -->
+    {etiquetas_head(*ASSETS_D3)}
 
     <style>
         * {{
@@ -257,18 +266,26 @@ class MotorTemplatesD3:
         labels = datos.get('labels') or datos.get('categorias', [])
         values = datos.get('values') or datos.get('valores', [])
 
-        labels_json = json.dumps(labels)
-        values_json = json.dumps(values)
+        return get_cache_templates().renderizar(
+            ('d3.barras', tema), lambda: MotorTemplatesD3._template_barras(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            labels=labels, values=values
+        )
+
+    @staticmethod
+    def _template_barras(tema: str) -> str:
+        """Cascarón del gráfico de barras con huecos para título y datos"""
+
         colores_json = json.dumps(MotorTemplatesD3.PALETA_COLORES)
 
-        html = MotorTemplatesD3._generar_head(titulo, tema)
+        html = MotorTemplatesD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <div class="controls">
                 <button class="btn" onclick="sortAscending()">📈 Ordenar Ascendente</button>
@@ -283,8 +300,8 @@ class MotorTemplatesD3:
     <script>
         // Datos
         const rawData = {{
-            labels: {labels_json},
-            values: {values_json}
+            labels: {hueco_json('labels')},
+            values: {hueco_json('values')}
         }};
 
         const colors = {colores_json};
@@ -479,26 +496,34 @@ class MotorTemplatesD3:
         labels = datos.get('labels') or datos.get('categorias', [])
         values = datos.get('values') or datos.get('valores', [])
 
-        labels_json = json.dumps(labels)
-        values_json = json.dumps(values)
+        return get_cache_templates().renderizar(
+            ('d3.donut', tema), lambda: MotorTemplatesD3._template_donut(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            labels=labels, values=values
+        )
+
+    @staticmethod
+    def _template_donut(tema: str) -> str:
+        """Cascarón del gráfico donut con huecos para título y datos"""
+
         colores_json = json.dumps(MotorTemplatesD3.PALETA_COLORES)
 
-        html = MotorTemplatesD3._generar_head(titulo, tema)
+        html = MotorTemplatesD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
             <div id="chart-container"></div>
         </div>
     </div>
 
     <script>
         // Datos
-        const labels = {labels_json};
-        const values = {values_json};
+        const labels = {hueco_json('labels')};
+        const values = {hueco_json('values')};
         const colors = {colores_json};
 
         const data = labels.map((label, i) => ({{
@@ -638,35 +663,53 @@ class MotorTemplatesD3:
         titulo: str,
         datos: Dict[str, Any],
         subtitulo: str = "",
-        tema: str = 'dark'
+        tema: str = 'dark',
+        ancho_px: int = ANCHO_PREDETERMINADO_PX
     ) -> str:
-        """Generar gráfico de líneas con D3.js (múltiples series)"""
+        """
+        Generar gráfico de líneas con D3.js (múltiples series)
+
+        Args:
+            ancho_px: Ancho previsto del gráfico; las series con más puntos
+                      que píxeles se reducen con LTTB (ver reduccion_series)
+        """
 
         # Aceptar tanto 'labels'/'values' como 'categorias'/'valores'
         labels = datos.get('labels') or datos.get('categorias', [])
         values = datos.get('values') or datos.get('valores', [])
 
         # datos = {'labels': [...], 'series': [{'name': '...', 'values': [...]}, ...]}
-        labels_json = json.dumps(labels)
-        series_json = json.dumps(datos.get('series', [{'name': 'Serie 1', 'values': values}]))
+        series = datos.get('series', [{'name': 'Serie 1', 'values': values}])
+        labels, series = reducir_series(labels, series, presupuesto_puntos(ancho_px))
+
+        return get_cache_templates().renderizar(
+            ('d3.lineas', tema), lambda: MotorTemplatesD3._template_lineas(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            labels=labels, series=series
+        )
+
+    @staticmethod
+    def _template_lineas(tema: str) -> str:
+        """Cascarón del gráfico de líneas con huecos para título y datos"""
+
         colores_json = json.dumps(MotorTemplatesD3.PALETA_COLORES)
 
-        html = MotorTemplatesD3._generar_head(titulo, tema)
+        html = MotorTemplatesD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
             <div id="chart-container"></div>
         </div>
     </div>
 
     <script>
         // Datos
-        const labels = {labels_json};
-        const series = {series_json};
+        const labels = {hueco_json('labels')};
+        const series = {hueco_json('series')};
         const colors = {colores_json};
 
         // Configuración
@@ -799,11 +842,16 @@ class MotorTemplatesD3:
         titulo: str,
         datos: Dict[str, Any],
         subtitulo: str = "",
-        tema: str = 'dark'
+        tema: str = 'dark',
+        ancho_px: int = ANCHO_PREDETERMINADO_PX
     ) -> str:
         """
         Generar gráfico de área con D3.js
         Similar al gráfico de líneas pero con área rellenada
+
+        Args:
+            ancho_px: Ancho previsto del gráfico; las series con más puntos
+                      que píxeles se reducen con LTTB (ver reduccion_series)
         """
 
         # Aceptar tanto 'labels'/'values' como 'categorias'/'valores'
@@ -811,18 +859,29 @@ class MotorTemplatesD3:
         values = datos.get('values') or datos.get('valores', [])
 
         # Soporte para múltiples series
-        labels_json = json.dumps(labels)
-        series_json = json.dumps(datos.get('series', [{'name': 'Serie 1', 'values': values}]))
+        series = datos.get('series', [{'name': 'Serie 1', 'values': values}])
+        labels, series = reducir_series(labels, series, presupuesto_puntos(ancho_px))
+
+        return get_cache_templates().renderizar(
+            ('d3.area', tema), lambda: MotorTemplatesD3._template_area(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            labels=labels, series=series
+        )
+
+    @staticmethod
+    def _template_area(tema: str) -> str:
+        """Cascarón del gráfico de área con huecos para título y datos"""
+
         colores_json = json.dumps(MotorTemplatesD3.PALETA_COLORES)
 
-        html = MotorTemplatesD3._generar_head(titulo, tema)
+        html = MotorTemplatesD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <div class="controls">
                 <button class="btn" onclick="enableZoom()">🔍 Activar Zoom</button>
@@ -835,8 +894,8 @@ class MotorTemplatesD3:
 
     <script>
         // Datos
-        const labels = {labels_json};
-        const series = {series_json};
+        const labels = {hueco_json('labels')};
+        const series = {hueco_json('series')};
         const colors = {colores_json};
 
         // Configuración
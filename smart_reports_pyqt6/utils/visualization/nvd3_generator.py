@@ -5,7 +5,14 @@ NVD3 es una librería de componentes reutilizables construida sobre D3.js
 
 import json
 from typing import Dict, List, Any, Optional
-from smart_reports.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.utils.visualization.assets_web import ASSETS_NVD3, etiquetas_head
+from smart_reports_pyqt6.utils.visualization.templates_compilados import (
+    get_cache_templates,
+    hueco,
+    hueco_json,
+    parrafo_subtitulo
+)
 
 
 class MotorTemplatesNVD3:
@@ -49,15 +56,9 @@ class MotorTemplatesNVD3:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{titulo}</title>
 
-    <!-- D3.js v3 (NVD3 requiere D3 v3.x) -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.17/d3.min.js"></script>
-
-    <!-- NVD3.js -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.js"></script>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.css">
-
-    <!-- Fuente Montserrat -->
-    <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600;700;800&display=swap" rel="stylesheet">
+    <!-- D3.js v3 (NVD3 requiere D3 v3.x), NVD3.js y fuente Montserrat
+         (empaquetados, ver assets_web) -->
+    {etiquetas_head(*ASSETS_NVD3)}
 
     <style>
         * {{
@@ -226,22 +227,10 @@ class MotorTemplatesNVD3:
         if not labels or not values:
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico de barras")
             # Retornar HTML con mensaje de error
-            html = MotorTemplatesNVD3._generar_head(titulo, tema)
-            html += f"""
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-                <p>No se encontraron datos para mostrar en este gráfico.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3.sin_datos', tema), lambda: MotorTemplatesNVD3._template_sin_datos(tema),
+                titulo=titulo
+            )
 
         # VALIDACIÓN: Verificar que ambas listas tengan la misma longitud
         min_len = min(len(labels), len(values))
@@ -252,19 +241,29 @@ class MotorTemplatesNVD3:
 
         # NVD3 usa formato [{ x: label, y: value}, ...]
         chart_data = [{"x": str(labels[i]), "y": float(values[i])} for i in range(len(labels))]
-        chart_data_json = json.dumps([{"key": "Valores", "values": chart_data}])
-        colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
 
         print(f"✅ [DEBUG] Datos transformados correctamente: {len(chart_data)} puntos")
 
-        html = MotorTemplatesNVD3._generar_head(titulo, tema)
+        return get_cache_templates().renderizar(
+            ('nvd3.barras', tema), lambda: MotorTemplatesNVD3._template_barras(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            chart_data=[{"key": "Valores", "values": chart_data}]
+        )
+
+    @staticmethod
+    def _template_barras(tema: str) -> str:
+        """Cascarón del gráfico de barras con huecos para título y datos"""
+
+        colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
+
+        html = MotorTemplatesNVD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
         </div>
@@ -289,7 +288,7 @@ class MotorTemplatesNVD3:
                 .tickFormat(d3.format(',.0f'));
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             nv.utils.windowResize(chart.update);
@@ -323,22 +322,10 @@ class MotorTemplatesNVD3:
         # VALIDACIÓN: Verificar que haya datos
         if not labels or not values:
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico de dona")
-            html = MotorTemplatesNVD3._generar_head(titulo, tema)
-            html += f"""
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-                <p>No se encontraron datos para mostrar en este gráfico.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3.sin_datos', tema), lambda: MotorTemplatesNVD3._template_sin_datos(tema),
+                titulo=titulo
+            )
 
         # VALIDACIÓN: Verificar que ambas listas tengan la misma longitud
         min_len = min(len(labels), len(values))
@@ -349,19 +336,29 @@ class MotorTemplatesNVD3:
 
         # NVD3 pie chart formato
         chart_data = [{"label": str(labels[i]), "value": float(values[i])} for i in range(len(labels))]
-        chart_data_json = json.dumps(chart_data)
-        colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
 
         print(f"✅ [DEBUG] Datos transformados correctamente: {len(chart_data)} puntos")
 
-        html = MotorTemplatesNVD3._generar_head(titulo, tema)
+        return get_cache_templates().renderizar(
+            ('nvd3.donut', tema), lambda: MotorTemplatesNVD3._template_donut(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            chart_data=chart_data
+        )
+
+    @staticmethod
+    def _template_donut(tema: str) -> str:
+        """Cascarón del gráfico de dona con huecos para título y datos"""
+
+        colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
+
+        html = MotorTemplatesNVD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
         </div>
@@ -381,14 +378,14 @@ class MotorTemplatesNVD3:
                 .color({colors_json});
 
             chart.tooltip.contentGenerator(function(obj) {{
-                var total = d3.sum({chart_data_json}, function(d) {{ return d.value; }});
+                var total = d3.sum({hueco_json('chart_data')}, function(d) {{ return d.value; }});
                 var percent = ((obj.data.value / total) * 100).toFixed(1);
                 return '<h3>' + obj.data.label + '</h3>' +
                        '<p>' + obj.data.value.toLocaleString() + ' (' + percent + '%)</p>';
             }});
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             nv.utils.windowResize(chart.update);
@@ -423,22 +420,10 @@ class MotorTemplatesNVD3:
         # VALIDACIÓN: Verificar que haya datos
         if not labels or (not values and not series):
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico de líneas")
-            html = MotorTemplatesNVD3._generar_head(titulo, tema)
-            html += f"""
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-                <p>No se encontraron datos para mostrar en este gráfico.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3.sin_datos', tema), lambda: MotorTemplatesNVD3._template_sin_datos(tema),
+                titulo=titulo
+            )
 
         # Convertir a formato NVD3
         nvd3_data = []
@@ -453,25 +438,33 @@ class MotorTemplatesNVD3:
 
         print(f"✅ [DEBUG] Datos transformados correctamente: {len(nvd3_data)} series")
 
-        chart_data_json = json.dumps(nvd3_data)
-        labels_json = json.dumps(labels)
+        return get_cache_templates().renderizar(
+            ('nvd3.lineas', tema), lambda: MotorTemplatesNVD3._template_lineas(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            chart_data=nvd3_data, labels=labels
+        )
+
+    @staticmethod
+    def _template_lineas(tema: str) -> str:
+        """Cascarón del gráfico de líneas con huecos para título y datos"""
+
         colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
 
-        html = MotorTemplatesNVD3._generar_head(titulo, tema)
+        html = MotorTemplatesNVD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
         </div>
     </div>
 
     <script>
-        var labels = {labels_json};
+        var labels = {hueco_json('labels')};
 
         nv.addGraph(function() {{
             var chart = nv.models.lineChart()
@@ -490,7 +483,7 @@ class MotorTemplatesNVD3:
                 .tickFormat(d3.format(',.0f'));
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             nv.utils.windowResize(chart.update);
@@ -527,18 +520,26 @@ class MotorTemplatesNVD3:
                 "values": [{"x": i, "y": serie_values[i]} for i in range(len(serie_values))]
             })
 
-        chart_data_json = json.dumps(nvd3_data)
-        labels_json = json.dumps(labels)
+        return get_cache_templates().renderizar(
+            ('nvd3.area', tema), lambda: MotorTemplatesNVD3._template_area(tema),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            chart_data=nvd3_data, labels=labels
+        )
+
+    @staticmethod
+    def _template_area(tema: str) -> str:
+        """Cascarón del gráfico de área con huecos para título y datos"""
+
         colors_json = json.dumps(MotorTemplatesNVD3.PALETA_COLORES)
 
-        html = MotorTemplatesNVD3._generar_head(titulo, tema)
+        html = MotorTemplatesNVD3._generar_head(hueco('titulo'), tema)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <div class="controls">
                 <button class="btn" onclick="chart.style('stack');">📊 Apilado</button>
@@ -551,7 +552,7 @@ class MotorTemplatesNVD3:
     </div>
 
     <script>
-        var labels = {labels_json};
+        var labels = {hueco_json('labels')};
         var chart;
 
         nv.addGraph(function() {{
@@ -572,7 +573,7 @@ class MotorTemplatesNVD3:
                 .tickFormat(d3.format(',.0f'));
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             nv.utils.windowResize(chart.update);
@@ -585,3 +586,24 @@ class MotorTemplatesNVD3:
 """
 
         return html
+
+    @staticmethod
+    def _template_sin_datos(tema: str) -> str:
+        """Cascarón de la página sin datos ("No hay datos disponibles")"""
+
+        html = MotorTemplatesNVD3._generar_head(hueco('titulo'), tema)
+        html += f"""
+<body>
+    <div class="container">
+        <div class="chart-card">
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
+                <h2>⚠️ No hay datos disponibles</h2>
+                <p>No se encontraron datos para mostrar en este gráfico.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+        return html
@@ -10,7 +10,14 @@ Motor de Templates HTML/NVD3.js INTERACTIVO MEJORADO
 
 import json
 from typing import Dict, List, Any, Optional
-from smart_reports.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.config.themes import HUTCHISON_COLORS
+from smart_reports_pyqt6.utils.visualization.assets_web import ASSETS_NVD3, etiquetas_head
+from smart_reports_pyqt6.utils.visualization.templates_compilados import (
+    get_cache_templates,
+    hueco,
+    hueco_json,
+    parrafo_subtitulo
+)
 
 
 class MotorTemplatesNVD3Interactive:
@@ -31,14 +38,15 @@ class MotorTemplatesNVD3Interactive:
     ]
 
     @staticmethod
-    def _generar_head_interactivo(titulo: str, tema: str = 'dark', data_source: Dict = None, chart_height: int = 500) -> str:
+    def _generar_head_interactivo(titulo: str, tema: str = 'dark', chart_height: int = 500) -> str:
         """Generar <head> con estilos mejorados y data source embebido
 
         Args:
             titulo: Título del gráfico
             tema: 'dark' o 'light'
-            data_source: Info de origen de datos
             chart_height: Altura del gráfico en píxeles (default: 500)
+
+        El data source va en el hueco 'data_source' (ver _origen_datos).
         """
 
         # Colores según tema - HUTCHISON PORTS THEME
@@ -55,18 +63,6 @@ class MotorTemplatesNVD3Interactive:
             text_secondary = '#4a5c8a'  # Navy más claro
             hover_bg = '#f0f0f0'  # Hutchison hover light
 
-        # Data source por defecto
-        if not data_source:
-            from datetime import datetime
-            data_source = {
-                'database': 'MySQL - Instituto Hutchison Ports',
-                'table': 'Data Visualization',
-                'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'records_count': 0
-            }
-
-        data_source_json = json.dumps(data_source)
-
         return f"""
 <!DOCTYPE html>
 <html lang="es">
@@ -75,15 +71,9 @@ class MotorTemplatesNVD3Interactive:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{titulo}</title>
 
-    <!-- D3.js v3 (NVD3 requiere D3 v3.x) -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.17/d3.min.js"></script>
-
-    <!-- NVD3.js -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.js"></script>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.8.6/nv.d3.min.css">
-
-    <!-- Fuente Montserrat -->
-    <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600;700;800&display=swap" rel="stylesheet">
+    <!-- D3.js v3 (NVD3 requiere D3 v3.x), NVD3.js y fuente Montserrat
+         (empaquetados, ver assets_web) -->
+    {etiquetas_head(*ASSETS_NVD3)}
 
     <style>
         * {{
@@ -374,7 +364,7 @@ class MotorTemplatesNVD3Interactive:
 
     <script>
         // Data source global
-        window.DATA_SOURCE = {data_source_json};
+        window.DATA_SOURCE = {hueco_json('data_source')};
 
         // Función para mostrar data source modal
         function showDataSourceModal(elementData) {{
@@ -454,6 +444,41 @@ class MotorTemplatesNVD3Interactive:
 </head>
 """
 
+    @staticmethod
+    def _origen_datos(data_source: Optional[Dict]) -> Dict:
+        """Data source a embeber (por defecto, el de la BD del Instituto)"""
+        if data_source:
+            return data_source
+
+        from datetime import datetime
+        return {
+            'database': 'MySQL - Instituto Hutchison Ports',
+            'table': 'Data Visualization',
+            'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'records_count': 0
+        }
+
+    @staticmethod
+    def _template_sin_datos(tema: str, chart_height: int) -> str:
+        """Cascarón de la página sin datos ("No hay datos disponibles")"""
+
+        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(hueco('titulo'), tema, chart_height)
+        html += f"""
+<body>
+    <div class="container">
+        <div class="chart-card">
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
+                <h2>⚠️ No hay datos disponibles</h2>
+                <p>No se encontraron datos para mostrar en este gráfico.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+        return html
+
     @staticmethod
     def generar_grafico_barras_interactivo(
         titulo: str,
@@ -486,22 +511,11 @@ class MotorTemplatesNVD3Interactive:
         # VALIDACIÓN: Verificar que haya datos
         if not labels or not values:
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico de barras")
-            html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
-            html += f"""
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-                <p>No se encontraron datos para mostrar en este gráfico.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3i.sin_datos', tema, chart_height),
+                lambda: MotorTemplatesNVD3Interactive._template_sin_datos(tema, chart_height),
+                titulo=titulo, data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source)
+            )
 
         # VALIDACIÓN: Verificar que ambas listas tengan la misma longitud
         min_len = min(len(labels), len(values))
@@ -524,19 +538,33 @@ class MotorTemplatesNVD3Interactive:
 
         # NVD3 usa formato [{ x: label, y: value}, ...]
         chart_data = [{"x": str(labels[i]), "y": float(values[i])} for i in range(len(labels))]
-        chart_data_json = json.dumps([{"key": "Valores", "values": chart_data}])
-        colors_json = json.dumps(MotorTemplatesNVD3Interactive.PALETA_COLORES)
 
         print(f"✅ [DEBUG] Datos transformados correctamente: {len(chart_data)} puntos")
 
-        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
+        return get_cache_templates().renderizar(
+            ('nvd3i.barras', tema, chart_height),
+            lambda: MotorTemplatesNVD3Interactive._template_barras(tema, chart_height),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source),
+            chart_data=[{"key": "Valores", "values": chart_data}],
+            ranking=sorted([(v, l) for l, v in zip(labels, values)], reverse=True),
+            total=total, num_labels=len(labels), promedio=f"{avg_val:.0f}"
+        )
+
+    @staticmethod
+    def _template_barras(tema: str, chart_height: int) -> str:
+        """Cascarón del gráfico de barras con huecos para título, datos y estadísticas"""
+
+        colors_json = json.dumps(MotorTemplatesNVD3Interactive.PALETA_COLORES)
+
+        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(hueco('titulo'), tema, chart_height)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
 
@@ -558,8 +586,8 @@ class MotorTemplatesNVD3Interactive:
 
             // TOOLTIP MEJORADO con estadísticas
             chart.tooltip.contentGenerator(function(obj) {{
-                const percentage = (obj.data.y / {total}) * 100;
-                const ranking = {json.dumps(sorted([(v, l) for l, v in zip(labels, values)], reverse=True))};
+                const percentage = (obj.data.y / {hueco('total')}) * 100;
+                const ranking = {hueco_json('ranking')};
                 const position = ranking.findIndex(r => r[1] === obj.data.x) + 1;
 
                 return '<h3>📊 ' + obj.data.x + '</h3>' +
@@ -573,11 +601,11 @@ class MotorTemplatesNVD3Interactive:
                        '</div>' +
                        '<div class="tooltip-stat">' +
                        '  <span class="tooltip-label">Ranking:</span>' +
-                       '  <span class="tooltip-value">#' + position + ' de {len(labels)}</span>' +
+                       '  <span class="tooltip-value">#' + position + ' de {hueco('num_labels')}</span>' +
                        '</div>' +
                        '<div class="tooltip-stat">' +
                        '  <span class="tooltip-label">Promedio:</span>' +
-                       '  <span class="tooltip-value">' + {avg_val:.0f}.toLocaleString() + '</span>' +
+                       '  <span class="tooltip-value">' + {hueco('promedio')}.toLocaleString() + '</span>' +
                        '</div>' +
                        '<p style="margin-top: 10px; font-size: 11px; opacity: 0.8;">🖱️ Haz clic para ver origen de datos</p>';
             }});
@@ -586,7 +614,7 @@ class MotorTemplatesNVD3Interactive:
                 .tickFormat(d3.format(',.0f'));
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             // CLICK HANDLER - Mostrar data source
@@ -639,21 +667,11 @@ class MotorTemplatesNVD3Interactive:
 
         if not labels or not values:
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico donut")
-            html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
-            html += """
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">""" + titulo + """</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3i.sin_datos', tema, chart_height),
+                lambda: MotorTemplatesNVD3Interactive._template_sin_datos(tema, chart_height),
+                titulo=titulo, data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source)
+            )
 
         min_len = min(len(labels), len(values))
         if len(labels) != len(values):
@@ -668,17 +686,29 @@ class MotorTemplatesNVD3Interactive:
 
         # NVD3 pie chart formato
         chart_data = [{"label": str(labels[i]), "value": float(values[i])} for i in range(len(labels))]
-        chart_data_json = json.dumps(chart_data)
+
+        return get_cache_templates().renderizar(
+            ('nvd3i.donut', tema, chart_height),
+            lambda: MotorTemplatesNVD3Interactive._template_donut(tema, chart_height),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source),
+            chart_data=chart_data, total=total
+        )
+
+    @staticmethod
+    def _template_donut(tema: str, chart_height: int) -> str:
+        """Cascarón del gráfico donut con huecos para título, datos y estadísticas"""
+
         colors_json = json.dumps(MotorTemplatesNVD3Interactive.PALETA_COLORES)
 
-        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
+        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(hueco('titulo'), tema, chart_height)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
 
@@ -703,7 +733,7 @@ class MotorTemplatesNVD3Interactive:
 
             // TOOLTIP MEJORADO
             chart.tooltip.contentGenerator(function(obj) {{
-                const percentage = (obj.data.value / {total}) * 100;
+                const percentage = (obj.data.value / {hueco('total')}) * 100;
 
                 return '<h3>📊 ' + obj.data.label + '</h3>' +
                        '<div class="tooltip-stat">' +
@@ -716,13 +746,13 @@ class MotorTemplatesNVD3Interactive:
                        '</div>' +
                        '<div class="tooltip-stat">' +
                        '  <span class="tooltip-label">Total:</span>' +
-                       '  <span class="tooltip-value">' + {total}.toLocaleString() + '</span>' +
+                       '  <span class="tooltip-value">' + {hueco('total')}.toLocaleString() + '</span>' +
                        '</div>' +
                        '<p style="margin-top: 10px; font-size: 11px; opacity: 0.8;">🖱️ Haz clic para ver origen de datos</p>';
             }});
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             // CLICK HANDLER
@@ -772,21 +802,11 @@ class MotorTemplatesNVD3Interactive:
 
         if not labels or not values:
             print(f"⚠️ [WARNING] No hay datos para generar el gráfico de líneas")
-            html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
-            html += """
-<body>
-    <div class="container">
-        <div class="chart-card">
-            <h1 class="chart-title">""" + titulo + """</h1>
-            <div style="text-align: center; padding: 100px; color: #ff6b6b;">
-                <h2>⚠️ No hay datos disponibles</h2>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            return html
+            return get_cache_templates().renderizar(
+                ('nvd3i.sin_datos', tema, chart_height),
+                lambda: MotorTemplatesNVD3Interactive._template_sin_datos(tema, chart_height),
+                titulo=titulo, data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source)
+            )
 
         min_len = min(len(labels), len(values))
         if len(labels) != len(values):
@@ -804,17 +824,30 @@ class MotorTemplatesNVD3Interactive:
 
         # NVD3 line chart formato: [{key: "Series", values: [{x:0, y:val}, ...]}]
         chart_data = [{"x": i, "y": float(values[i]), "label": str(labels[i])} for i in range(len(labels))]
-        chart_data_json = json.dumps([{"key": "Tendencia", "values": chart_data}])
+
+        return get_cache_templates().renderizar(
+            ('nvd3i.lineas', tema, chart_height),
+            lambda: MotorTemplatesNVD3Interactive._template_lineas(tema, chart_height),
+            titulo=titulo, subtitulo=parrafo_subtitulo(subtitulo),
+            data_source=MotorTemplatesNVD3Interactive._origen_datos(data_source),
+            chart_data=[{"key": "Tendencia", "values": chart_data}], labels=labels,
+            total=total, promedio=f"{avg_val:.0f}", maximo=max_val
+        )
+
+    @staticmethod
+    def _template_lineas(tema: str, chart_height: int) -> str:
+        """Cascarón del gráfico de líneas con huecos para título, datos y estadísticas"""
+
         colors_json = json.dumps([HUTCHISON_COLORS['primary']])
 
-        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(titulo, tema, data_source, chart_height)
+        html = MotorTemplatesNVD3Interactive._generar_head_interactivo(hueco('titulo'), tema, chart_height)
 
         html += f"""
 <body>
     <div class="container">
         <div class="chart-card">
-            <h1 class="chart-title">{titulo}</h1>
-            {f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''}
+            <h1 class="chart-title">{hueco('titulo')}</h1>
+            {hueco('subtitulo')}
 
             <svg id="chart"></svg>
 
@@ -837,7 +870,7 @@ class MotorTemplatesNVD3Interactive:
             // TOOLTIP MEJORADO
             chart.tooltip.contentGenerator(function(obj) {{
                 const point = obj.point || obj.series[0];
-                const percentage = (point.y / {total}) * 100;
+                const percentage = (point.y / {hueco('total')}) * 100;
 
                 return '<h3>📈 ' + point.label + '</h3>' +
                        '<div class="tooltip-stat">' +
@@ -850,18 +883,18 @@ class MotorTemplatesNVD3Interactive:
                        '</div>' +
                        '<div class="tooltip-stat">' +
                        '  <span class="tooltip-label">Promedio:</span>' +
-                       '  <span class="tooltip-value">' + {avg_val:.0f}.toLocaleString() + '</span>' +
+                       '  <span class="tooltip-value">' + {hueco('promedio')}.toLocaleString() + '</span>' +
                        '</div>' +
                        '<div class="tooltip-stat">' +
                        '  <span class="tooltip-label">Máximo:</span>' +
-                       '  <span class="tooltip-value">' + {max_val}.toLocaleString() + '</span>' +
+                       '  <span class="tooltip-value">' + {hueco('maximo')}.toLocaleString() + '</span>' +
                        '</div>' +
                        '<p style="margin-top: 10px; font-size: 11px; opacity: 0.8;">🖱️ Haz clic para ver origen de datos</p>';
             }});
 
             chart.xAxis
                 .tickFormat(function(d) {{
-                    var labels = {json.dumps(labels)};
+                    var labels = {hueco_json('labels')};
                     return labels[d] || d;
                 }});
 
@@ -869,7 +902,7 @@ class MotorTemplatesNVD3Interactive:
                 .tickFormat(d3.format(',.0f'));
 
             d3.select('#chart')
-                .datum({chart_data_json})
+                .datum({hueco_json('chart_data')})
                 .call(chart);
 
             // CLICK HANDLER en puntos
@@ -0,0 +1,237 @@
+"""
+Reducción de Series Grandes para Gráficos
+
+OPTIMIZACIÓN: No más puntos que píxeles
+
+Las series diarias por usuario o las nubes de puntos de miles de empleados
+se incrustaban completas en la página: decenas de miles de nodos SVG y un
+webview que deja de responder. Antes de serializar, los datos se reducen a
+un presupuesto proporcional al ancho en píxeles del gráfico:
+
+- Líneas/área: Largest-Triangle-Three-Buckets (LTTB). Conserva picos y
+  valles (la forma visual de la serie), no solo promedios.
+- Dispersión: agregación hexagonal (hexbin); cada celda se dibuja como un
+  punto con su número de registros. El radio de celda se ajusta para que
+  no haya más celdas que el presupuesto.
+
+La resolución completa no se pierde: quien llama conserva los datos
+originales y vuelve a reducir solo la ventana ampliada (zoom), que con
+pocos puntos se envía sin reducir.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+# Puntos por píxel de ancho (LTTB no gana nada por encima de ~1)
+PUNTOS_POR_PIXEL = 1.0
+# Nunca reducir por debajo de esto (gráficos aún sin tamaño)
+PUNTOS_MINIMOS = 200
+# Radio mínimo de las celdas hexagonales, en píxeles
+RADIO_HEXBIN_PX = 6.0
+# Área de un hexágono de radio 1 (3·√3/2)
+AREA_HEXAGONO_UNIDAD = 3 * math.sqrt(3) / 2
+# Ancho supuesto cuando no se conoce (HTML exportado)
+ANCHO_PREDETERMINADO_PX = 1200
+
+
+def presupuesto_puntos(ancho_px: Optional[float], puntos_por_pixel: float = PUNTOS_POR_PIXEL) -> int:
+    """Máximo de puntos a dibujar para un gráfico de ancho_px píxeles"""
+    if not ancho_px or ancho_px <= 0:
+        ancho_px = ANCHO_PREDETERMINADO_PX
+    return max(PUNTOS_MINIMOS, int(ancho_px * puntos_por_pixel))
+
+
+def valores_float(valores: Sequence[Any]) -> np.ndarray:
+    """Array float con None → NaN (los datos de BD traen nulos y Decimal)"""
+    try:
+        return np.asarray(valores, dtype=float)
+    except TypeError:
+        return np.array([np.nan if v is None else float(v) for v in valores], dtype=float)
+
+
+# ============================================================================
+# LTTB (LÍNEAS / ÁREA)
+# ============================================================================
+
+def lttb_indices(y: Sequence[Any], umbral: int, x: Optional[Sequence[Any]] = None) -> np.ndarray:
+    """
+    Índices que conserva Largest-Triangle-Three-Buckets
+
+    Args:
+        y: Valores de la serie
+        umbral: Número de puntos a conservar (incluye primero y último)
+        x: Posiciones (None = equiespaciadas)
+
+    Returns:
+        Índices ordenados (todos si la serie ya cabe en el umbral)
+    """
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(y)
+    if umbral >= n or umbral < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # umbral - 2 cubetas entre el primer y el último punto
+    bordes = np.linspace(1, n - 1, umbral - 1).astype(np.int64)
+    inicios, fines = bordes[:-1], bordes[1:]
+
+    # Promedio de cada cubeta (el vértice "C" del triángulo de la anterior)
+    tamanos = fines - inicios
+    medias_x = np.add.reduceat(x[:n - 1], inicios) / tamanos
+    medias_y = np.add.reduceat(y[:n - 1], inicios) / tamanos
+    # Para la última cubeta, C es el último punto
+    medias_x = np.append(medias_x[1:], x[-1])
+    medias_y = np.append(medias_y[1:], y[-1])
+
+    indices = np.empty(umbral, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # A depende del punto elegido en la cubeta anterior: el bucle es por
+    # cubeta, el área de todos sus candidatos se calcula de una vez
+    a = 0
+    for k in range(umbral - 2):
+        inicio, fin = inicios[k], fines[k]
+        xa, ya = x[a], y[a]
+        areas = np.abs(
+            (xa - medias_x[k]) * (y[inicio:fin] - ya)
+            - (xa - x[inicio:fin]) * (medias_y[k] - ya)
+        )
+        a = inicio + int(np.argmax(areas))
+        indices[k + 1] = a
+
+    return indices
+
+
+def reducir_serie(
+    labels: Sequence[Any],
+    valores: Sequence[Any],
+    umbral: int
+) -> Tuple[List[Any], List[Any], np.ndarray]:
+    """
+    Serie reducida con LTTB
+
+    Returns:
+        (labels, valores, índices originales conservados)
+    """
+    indices = lttb_indices(valores_float(valores), umbral)
+    return [labels[i] for i in indices], [valores[i] for i in indices], indices
+
+
+def reducir_series(
+    labels: Sequence[Any],
+    series: List[Dict[str, Any]],
+    umbral: int
+) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """
+    Varias series con el mismo eje de labels ({'name', 'values'})
+
+    Se reduce cada serie con su parte del presupuesto y se conserva la
+    unión de índices, para que todas sigan alineadas con los labels.
+    """
+    n = len(labels)
+    if n <= umbral or any(len(serie.get('values', [])) != n for serie in series):
+        return list(labels), series
+
+    por_serie = max(3, umbral // max(1, len(series)))
+    indices = np.unique(np.concatenate([
+        lttb_indices(valores_float(serie['values']), por_serie) for serie in series
+    ]))
+
+    labels_red = [labels[i] for i in indices]
+    series_red = [
+        {**serie, 'values': [serie['values'][i] for i in indices]}
+        for serie in series
+    ]
+    return labels_red, series_red
+
+
+# ============================================================================
+# HEXBIN (DISPERSIÓN)
+# ============================================================================
+
+def radio_hexbin(ancho_px: float, alto_px: float, max_celdas: int,
+                 radio_minimo: float = RADIO_HEXBIN_PX) -> float:
+    """Radio con el que ancho_px x alto_px se cubre con unas max_celdas celdas"""
+    radio = math.sqrt(ancho_px * alto_px / (AREA_HEXAGONO_UNIDAD * max(1, max_celdas)))
+    return max(radio_minimo, radio)
+
+
+def hexbin(
+    x: Sequence[Any],
+    y: Sequence[Any],
+    ancho_px: float,
+    alto_px: float,
+    radio_px: float = RADIO_HEXBIN_PX,
+    max_celdas: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Agrega una nube de puntos en celdas hexagonales del tamaño de pantalla
+
+    Los puntos se proyectan a píxeles (ancho_px x alto_px); cada celda
+    devuelve el centroide de sus puntos en unidades de datos.
+
+    Args:
+        radio_px: Radio de celda (mínimo si se indica max_celdas)
+        max_celdas: Presupuesto de puntos: el radio crece hasta que las
+                    celdas ocupadas no lo superan
+
+    Returns:
+        {'x': media x, 'y': media y, 'conteo': puntos por celda}
+    """
+    x = valores_float(x)
+    y = valores_float(y)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[validos], y[validos]
+    if len(x) == 0:
+        return {'x': x, 'y': y, 'conteo': np.zeros(0, dtype=np.int64)}
+
+    def a_pixeles(valores: np.ndarray, largo: float) -> np.ndarray:
+        minimo, maximo = valores.min(), valores.max()
+        rango = (maximo - minimo) or 1.0
+        return (valores - minimo) / rango * largo
+
+    px = a_pixeles(x, ancho_px)
+    py = a_pixeles(y, alto_px)
+
+    if max_celdas is None:
+        inversa, conteo = _celdas_hexagonales(px, py, radio_px)
+    else:
+        max_celdas = max(1, max_celdas)
+        radio_px = max(radio_px, radio_hexbin(ancho_px, alto_px, max_celdas, radio_px))
+        inversa, conteo = _celdas_hexagonales(px, py, radio_px)
+        # Las celdas cortadas por los bordes pueden pasarse un poco del cálculo
+        while len(conteo) > max_celdas:
+            radio_px *= max(1.05, math.sqrt(len(conteo) / max_celdas))
+            inversa, conteo = _celdas_hexagonales(px, py, radio_px)
+
+    return {
+        'x': np.bincount(inversa, weights=x) / conteo,
+        'y': np.bincount(inversa, weights=y) / conteo,
+        'conteo': conteo,
+    }
+
+
+def _celdas_hexagonales(px: np.ndarray, py: np.ndarray,
+                        radio_px: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(celda de cada punto, puntos por celda) para hexágonos de radio_px"""
+    # Coordenadas axiales de hexágonos "pointy-top" y redondeo cúbico
+    q = (np.sqrt(3) / 3 * px - py / 3) / radio_px
+    r = (2 / 3 * py) / radio_px
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    corregir_q = (dq > dr) & (dq > ds)
+    corregir_r = ~corregir_q & (dr > ds)
+    rq = np.where(corregir_q, -rr - rs, rq)
+    rr = np.where(corregir_r, -rq - rs, rr)
+
+    # Una clave entera por celda: np.unique 1D es mucho más rápido que axis=0
+    rq = rq.astype(np.int64)
+    rr = rr.astype(np.int64)
+    rr -= rr.min()
+    clave = (rq - rq.min()) * (int(rr.max()) + 1) + rr
+    _, inversa, conteo = np.unique(clave, return_inverse=True, return_counts=True)
+    return inversa, conteo
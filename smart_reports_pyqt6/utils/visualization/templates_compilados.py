@@ -0,0 +1,198 @@
+"""
+Templates HTML Compilados para los Generadores de Gráficos
+
+OPTIMIZACIÓN: El HTML estático se genera una sola vez
+
+Los generadores (MotorTemplatesD3, MotorTemplatesNVD3,
+MotorTemplatesNVD3Interactive) construían en cada llamada un documento de
+miles de caracteres de CSS/JS con f-strings, aunque solo cambiaban los
+datos. Ahora cada tipo de gráfico declara su "cascarón" con huecos:
+
+    hueco('titulo')        # texto insertado tal cual
+    hueco_json('labels')   # valor serializado a JSON al renderizar
+
+El cascarón se construye y se parte en trozos literales una vez por
+(tipo de gráfico, tema, modo) y se guarda en CacheTemplates; generar un
+gráfico es solo serializar los datos (orjson si está instalado) y unir los
+trozos.
+
+    html = get_cache_templates().renderizar(
+        ('d3.barras', tema), lambda: Motor._template_barras(tema),
+        titulo=titulo, labels=labels, values=values
+    )
+"""
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import json
+import re
+import threading
+
+from smart_reports_pyqt6.utils.visualization.assets_web import esquema_activo
+
+# orjson es varias veces más rápido que json para listas grandes de datos
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# ============================================================================
+# SERIALIZACIÓN
+# ============================================================================
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que devuelve la BD y que JSON no conoce"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    # Escalares NumPy/pandas (int64, float64...)
+    if hasattr(valor, 'item'):
+        return valor.item()
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+if ORJSON_AVAILABLE:
+    _OPCIONES_ORJSON = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def a_json(valor: Any) -> str:
+        """Serializa un valor para insertarlo en un <script>"""
+        return orjson.dumps(valor, default=_por_defecto, option=_OPCIONES_ORJSON).decode('utf-8')
+else:
+    def a_json(valor: Any) -> str:
+        """Serializa un valor para insertarlo en un <script>"""
+        return json.dumps(valor, default=_por_defecto, ensure_ascii=False)
+
+
+# ============================================================================
+# HUECOS
+# ============================================================================
+
+# Marca que no puede aparecer en el CSS/JS de los templates
+_MARCA = '\x00'
+_PATRON_HUECO = re.compile(r'\x00([tj]):(\w+)\x00')
+
+
+def hueco(nombre: str) -> str:
+    """Hueco de texto: el valor se inserta tal cual (título, subtítulo...)"""
+    return f"{_MARCA}t:{nombre}{_MARCA}"
+
+
+def hueco_json(nombre: str) -> str:
+    """Hueco de datos: el valor se serializa a JSON al renderizar"""
+    return f"{_MARCA}j:{nombre}{_MARCA}"
+
+
+def parrafo_subtitulo(subtitulo: str) -> str:
+    """Fragmento <p> del subtítulo (vacío si no hay) para el hueco 'subtitulo'"""
+    return f'<p class="chart-subtitle">{subtitulo}</p>' if subtitulo else ''
+
+
+# ============================================================================
+# TEMPLATE COMPILADO
+# ============================================================================
+
+class TemplateCompilado:
+    """Cascarón HTML partido en trozos literales y huecos"""
+
+    __slots__ = ('literales', 'huecos')
+
+    def __init__(self, cascaron: str):
+        partes = _PATRON_HUECO.split(cascaron)
+        # partes = [literal, tipo, nombre, literal, tipo, nombre, ..., literal]
+        self.literales: List[str] = partes[0::3]
+        self.huecos: List[Tuple[bool, str]] = [
+            (tipo == 'j', nombre) for tipo, nombre in zip(partes[1::3], partes[2::3])
+        ]
+
+        sobrante = next((lit for lit in self.literales if _MARCA in lit), None)
+        if sobrante is not None:
+            raise ValueError("Template con una marca de hueco mal formada")
+
+    @property
+    def nombres(self) -> set:
+        return {nombre for _, nombre in self.huecos}
+
+    def renderizar(self, valores: Dict[str, Any]) -> str:
+        """Une los trozos literales con los valores de los huecos"""
+        partes = [self.literales[0]]
+        # Un mismo dato puede aparecer varias veces: se serializa una vez
+        serializados: Dict[str, str] = {}
+
+        for (es_json, nombre), literal in zip(self.huecos, self.literales[1:]):
+            if es_json:
+                texto = serializados.get(nombre)
+                if texto is None:
+                    texto = serializados[nombre] = a_json(valores[nombre])
+            else:
+                texto = str(valores[nombre])
+            partes.append(texto)
+            partes.append(literal)
+
+        return ''.join(partes)
+
+
+# ============================================================================
+# CACHÉ
+# ============================================================================
+
+class CacheTemplates:
+    """Templates compilados por (tipo de gráfico, tema, modo)"""
+
+    def __init__(self):
+        self._templates: Dict[Hashable, TemplateCompilado] = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.compilaciones = 0
+
+    def obtener(self, clave: Tuple, constructor: Callable[[], str]) -> TemplateCompilado:
+        """
+        Template compilado para la clave (lo construye la primera vez)
+
+        Args:
+            clave: (tipo, tema, modo...) - todo lo que cambia el cascarón
+            constructor: Devuelve el cascarón HTML con sus huecos
+        """
+        # Las URLs de D3/NVD3 del <head> dependen del esquema smartreports://
+        clave = (*clave, esquema_activo())
+
+        template = self._templates.get(clave)
+        if template is not None:
+            self.aciertos += 1
+            return template
+
+        with self._lock:
+            template = self._templates.get(clave)
+            if template is None:
+                template = self._templates[clave] = TemplateCompilado(constructor())
+                self.compilaciones += 1
+        return template
+
+    def renderizar(self, clave: Tuple, constructor: Callable[[], str], **valores) -> str:
+        """HTML final: template de la caché + valores de los huecos"""
+        return self.obtener(clave, constructor).renderizar(valores)
+
+    def limpiar(self):
+        """Descarta los templates (p. ej. tras cambiar los estilos)"""
+        with self._lock:
+            self._templates.clear()
+            self.aciertos = 0
+            self.compilaciones = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {
+            'templates': len(self._templates),
+            'compilaciones': self.compilaciones,
+            'aciertos': self.aciertos,
+            'orjson': ORJSON_AVAILABLE,
+        }
+
+
+_cache: Optional[CacheTemplates] = None
+
+
+def get_cache_templates() -> CacheTemplates:
+    """Obtener instancia singleton de la caché de templates"""
+    global _cache
+    if _cache is None:
+        _cache = CacheTemplates()
+    return _cache
@@ -0,0 +1,10 @@
+"""
+Configuración común de pytest
+
+Agrega la raíz del proyecto al path para importar smart_reports_pyqt6 y
+scripts/ (igual que hacen los scripts de la carpeta scripts/).
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,33 @@
+"""
+Pruebas de assets_web: URL local solo si el asset está completo
+"""
+import pytest
+
+from smart_reports_pyqt6.utils.visualization import assets_web
+
+
+@pytest.fixture
+def vendor(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets_web, 'DIRECTORIO_VENDOR', tmp_path)
+    monkeypatch.setattr(assets_web, '_esquema_activo', False)
+    return tmp_path
+
+
+def test_sin_archivo_usa_el_cdn(vendor):
+    assert assets_web.url_asset('d3.v7.min.js') == assets_web.ASSETS['d3.v7.min.js'].url_cdn
+
+
+def test_css_sin_sus_fuentes_usa_el_cdn(vendor):
+    (vendor / 'montserrat.css').write_text("@font-face {}")
+    (vendor / 'montserrat-400.woff2').write_bytes(b'x')
+
+    assert assets_web.url_asset('montserrat.css') == assets_web.ASSETS['montserrat.css'].url_cdn
+    assert 'montserrat.css' in assets_web.assets_faltantes()
+
+
+def test_css_con_todas_sus_fuentes_es_local(vendor):
+    (vendor / 'montserrat.css').write_text("@font-face {}")
+    for fuente in assets_web.ASSETS['montserrat.css'].requiere:
+        (vendor / fuente).write_bytes(b'x')
+
+    assert assets_web.url_asset('montserrat.css') == (vendor / 'montserrat.css').as_uri()
@@ -0,0 +1,127 @@
+"""
+Pruebas de BatchWriter (escritura en lotes del ETL)
+
+Se usa un cursor falso: no hace falta SQL Server, solo pyodbc instalado
+(BatchWriter captura pyodbc.Error).
+"""
+import pytest
+
+try:
+    import pyodbc
+except ImportError:  # sin pyodbc o sin el driver ODBC (libodbc) del sistema
+    pytest.skip("pyodbc no disponible", allow_module_level=True)
+
+from smart_reports_pyqt6.etl.etl_instituto_completo import BatchWriter, ETLConfig
+
+
+class CursorFalso:
+    """Registra lo ejecutado; executemany falla en los lotes indicados"""
+
+    def __init__(self, lotes_con_error=()):
+        self.fast_executemany = False
+        self.lotes_con_error = set(lotes_con_error)
+        self.ejecutadas = []
+        self.lotes = []
+
+    def execute(self, sql, *params):
+        self.ejecutadas.append(sql)
+
+    def executemany(self, sql, filas):
+        self.lotes.append(list(filas))
+        if len(self.lotes) in self.lotes_con_error:
+            raise pyodbc.Error("42000", "violación de restricción")
+
+
+class ConexionFalsa:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def _stats():
+    return {'errores': [], 'escrituras': []}
+
+
+def _writer(cursor, conexion, stats, **config):
+    return BatchWriter(conexion, cursor, ETLConfig(**config), stats)
+
+
+FILAS = [(i, f"U{i:03d}") for i in range(10)]
+
+
+def test_parte_las_filas_en_lotes_de_batch_size():
+    cursor, conexion, stats = CursorFalso(), ConexionFalsa(), _stats()
+    writer = _writer(cursor, conexion, stats, batch_size=4)
+
+    escritas = writer.escribir('prueba', "INSERT INTO t VALUES (?, ?)", FILAS)
+
+    assert escritas == 10
+    assert [len(lote) for lote in cursor.lotes] == [4, 4, 2]
+    assert [fila for lote in cursor.lotes for fila in lote] == FILAS
+    assert [e['lote'] for e in stats['escrituras']] == [1, 2, 3]
+    assert [e['filas'] for e in stats['escrituras']] == [4, 4, 2]
+
+
+def test_activa_fast_executemany_segun_config():
+    cursor = CursorFalso()
+    _writer(cursor, ConexionFalsa(), _stats(), fast_executemany=True)
+    assert cursor.fast_executemany is True
+
+    cursor = CursorFalso()
+    _writer(cursor, ConexionFalsa(), _stats(), fast_executemany=False)
+    assert cursor.fast_executemany is False
+
+
+def test_modo_transaction_no_hace_commit_por_lote():
+    cursor, conexion = CursorFalso(), ConexionFalsa()
+    _writer(cursor, conexion, _stats(), batch_size=3, commit_mode="transaction").escribir('prueba', "SQL", FILAS)
+
+    assert conexion.commits == 0
+    assert cursor.ejecutadas == []
+
+
+def test_modo_chunk_hace_commit_despues_de_cada_lote():
+    cursor, conexion = CursorFalso(), ConexionFalsa()
+    _writer(cursor, conexion, _stats(), batch_size=3, commit_mode="chunk").escribir('prueba', "SQL", FILAS)
+
+    assert conexion.commits == 4
+
+
+def test_modo_chunk_propaga_el_error_de_un_lote():
+    cursor, conexion = CursorFalso(lotes_con_error={2}), ConexionFalsa()
+    writer = _writer(cursor, conexion, _stats(), batch_size=3, commit_mode="chunk")
+
+    with pytest.raises(pyodbc.Error):
+        writer.escribir('prueba', "SQL", FILAS)
+
+    # El primer lote ya quedó confirmado; no se intentan más lotes
+    assert conexion.commits == 1
+    assert len(cursor.lotes) == 2
+
+
+def test_modo_savepoint_revierte_solo_el_lote_fallido():
+    cursor, conexion, stats = CursorFalso(lotes_con_error={2}), ConexionFalsa(), _stats()
+    writer = _writer(cursor, conexion, stats, batch_size=4, commit_mode="savepoint")
+
+    escritas = writer.escribir('prueba', "SQL", FILAS)
+
+    assert escritas == 6
+    assert len(cursor.lotes) == 3
+    assert cursor.ejecutadas == [
+        "SAVE TRANSACTION lote_1",
+        "SAVE TRANSACTION lote_2",
+        "ROLLBACK TRANSACTION lote_2",
+        "SAVE TRANSACTION lote_3",
+    ]
+    assert [e['lote'] for e in stats['escrituras']] == [1, 3]
+    assert len(stats['errores']) == 1
+    assert "lote 2/3" in stats['errores'][0]
+    assert conexion.commits == 0
+
+
+def test_sin_filas_no_ejecuta_nada():
+    cursor, conexion, stats = CursorFalso(), ConexionFalsa(), _stats()
+    assert _writer(cursor, conexion, stats).escribir('prueba', "SQL", []) == 0
+    assert cursor.lotes == [] and stats['escrituras'] == []
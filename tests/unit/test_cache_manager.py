@@ -0,0 +1,170 @@
+"""
+Pruebas de CacheManager: desalojo LRU, single-flight y claves de instancias
+"""
+import gc
+import threading
+import time
+
+from smart_reports_pyqt6.utils.cache_manager import CacheManager
+from smart_reports_pyqt6.utils.disk_cache import DiskCache
+
+
+def _cache(**kwargs):
+    # Sin hilo de barrido: las pruebas no dependen del reloj
+    return CacheManager(sweep_interval_seconds=0, **kwargs)
+
+
+def test_desaloja_la_entrada_usada_hace_mas_tiempo():
+    cache = _cache(max_entries=2, max_bytes=0)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    # Leer 'a' la vuelve la más reciente: el desalojado es 'b'
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_respeta_el_presupuesto_de_bytes():
+    valor = 'x' * 1000
+    tamano = CacheManager._estimate_size(valor)
+    cache = _cache(max_entries=0, max_bytes=tamano * 2)
+
+    for clave in ('a', 'b', 'c'):
+        cache.set(clave, valor)
+
+    stats = cache.get_stats()
+    assert stats['total_entries'] == 2
+    assert stats['bytes'] <= cache.max_bytes
+    assert cache.get('a') is None
+
+
+def test_no_guarda_valores_mayores_que_el_presupuesto():
+    cache = _cache(max_entries=0, max_bytes=100)
+    cache.set('grande', 'x' * 1000)
+
+    assert cache.get('grande') is None
+    assert cache.get_stats()['bytes'] == 0
+
+
+def test_reemplazar_una_clave_no_duplica_sus_bytes():
+    cache = _cache(max_entries=0, max_bytes=0)
+    cache.set('a', 'x' * 1000)
+    bytes_antes = cache.get_stats()['bytes']
+    cache.set('a', 'x' * 1000)
+
+    assert cache.get_stats()['bytes'] == bytes_antes
+
+
+def test_single_flight_ejecuta_la_funcion_una_sola_vez():
+    cache = _cache()
+    llamadas = []
+    empezo = threading.Event()
+    continuar = threading.Event()
+
+    def lenta():
+        llamadas.append(threading.current_thread().name)
+        empezo.set()
+        continuar.wait(5)
+        return 42
+
+    resultados = []
+    hilos = [
+        threading.Thread(target=lambda: resultados.append(cache.get_or_compute('clave', lenta)))
+        for _ in range(8)
+    ]
+    hilos[0].start()
+    assert empezo.wait(5)
+    for hilo in hilos[1:]:
+        hilo.start()
+
+    # Los demás hilos deben quedar esperando el lock de la clave
+    limite = time.monotonic() + 5
+    while cache.get_stats()['singleflight_waits'] < len(hilos) - 1 and time.monotonic() < limite:
+        time.sleep(0.01)
+    continuar.set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert len(llamadas) == 1
+    assert resultados == [42] * len(hilos)
+    stats = cache.get_stats()
+    assert stats['singleflight_waits'] == len(hilos) - 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == len(hilos) - 1
+
+
+def test_single_flight_libera_la_clave_si_la_funcion_falla():
+    cache = _cache()
+
+    def falla():
+        raise ValueError("sin conexión")
+
+    try:
+        cache.get_or_compute('clave', falla)
+    except ValueError:
+        pass
+
+    assert cache.get_or_compute('clave', lambda: 'ok') == 'ok'
+    assert cache._locks_claves == {}
+
+
+class _Objeto:
+    pass
+
+
+def test_instancia_nueva_no_hereda_la_clave_de_una_liberada():
+    claves = set()
+    for _ in range(200):
+        # Cada objeto se libera al terminar la vuelta: CPython suele
+        # reutilizar su dirección, pero nunca su token
+        claves.add(CacheManager.query_key('SELECT 1', _Objeto()))
+        gc.collect()
+
+    assert len(claves) == 200
+
+
+def test_la_misma_instancia_conserva_su_clave():
+    objeto = _Objeto()
+    assert CacheManager.query_key('SELECT 1', objeto) == CacheManager.query_key('SELECT 1', objeto)
+
+
+def test_claves_de_instancias_no_van_al_disco(tmp_path):
+    disco = DiskCache(str(tmp_path / 'cache.db'))
+    cache = _cache(disk_cache=disco)
+
+    @cache.cached(ttl_seconds=60)
+    def calcular(valor):
+        return valor
+
+    objeto = _Objeto()
+    assert calcular(objeto) is objeto
+    assert calcular(5) == 5
+
+    # Solo la clave determinista (argumento 5) llega al disco
+    stats = disco.get_stats()
+    assert stats['entries'] == stats['writes'] == 1
+    assert stats['misses'] == 1
+    assert calcular(objeto) is objeto
+    assert cache.get_stats()['hits'] == 1
+    disco.close()
+
+
+def test_argumento_sin_weakref_no_se_cachea():
+    cache = _cache()
+    llamadas = []
+
+    @cache.cached(ttl_seconds=60)
+    def calcular(valor):
+        llamadas.append(valor)
+        return len(llamadas)
+
+    # object() no admite weakref: no hay identidad estable para la clave
+    argumento = object()
+    assert calcular(argumento) == 1
+    assert calcular(argumento) == 2
+    assert cache.get_stats()['total_entries'] == 0
@@ -0,0 +1,96 @@
+"""
+Pruebas de ConsultaPaginada: predicados seek, límite por dialecto y
+recorrido completo por páginas
+"""
+import sqlite3
+
+import pytest
+
+from smart_reports_pyqt6.database.models.consultas_paginadas import (
+    ConsultaPaginada,
+    consulta_usuarios_por_unidad
+)
+
+BASE = "SELECT Nombre AS Nombre, IdUnidad AS IdUnidad, IdUsuario AS IdUsuario FROM usuarios"
+
+
+def _consulta(dialecto, claves=('IdUsuario',), **kwargs):
+    return ConsultaPaginada(base=BASE, claves=claves, encabezados=["Nombre"], dialecto=dialecto, **kwargs)
+
+
+# ==================== SQL DE CADA PÁGINA ====================
+
+def test_primera_pagina_sin_predicado_seek():
+    sql, params = _consulta('sqlserver', tamano_pagina=50).sql_pagina()
+
+    assert "WHERE" not in sql
+    assert sql.endswith("ORDER BY q.IdUsuario\nOFFSET 0 ROWS FETCH NEXT ? ROWS ONLY")
+    assert params == (50,)
+
+
+def test_clave_simple_continua_despues_de_la_ultima():
+    sql, params = _consulta('mysql', tamano_pagina=50).sql_pagina((120,))
+
+    assert "\nWHERE (q.IdUsuario > %s)\n" in sql
+    assert sql.endswith("ORDER BY q.IdUsuario\nLIMIT %s")
+    assert params == (120, 50)
+
+
+def test_clave_compuesta_expande_el_predicado_lexicografico():
+    consulta = _consulta('sqlserver', claves=('IdUnidad', 'IdUsuario'), params=('x',), tamano_pagina=10)
+    sql, params = consulta.sql_pagina((3, 77))
+
+    assert ("WHERE (q.IdUnidad > ?) OR (q.IdUnidad = ? AND q.IdUsuario > ?)") in sql
+    assert "ORDER BY q.IdUnidad, q.IdUsuario" in sql
+    # Parámetros de la base, luego los del seek en orden, luego el tamaño
+    assert params == ('x', 3, 3, 77, 10)
+
+
+def test_consulta_de_usuarios_usa_el_marcador_del_dialecto():
+    sql, params = consulta_usuarios_por_unidad('Operaciones', 'mysql').sql_pagina((5,))
+
+    assert "WHERE un.NombreUnidad = %s" in sql
+    assert "?" not in sql
+    assert params == ('Operaciones', 5, 200)
+
+
+# ==================== RECORRIDO COMPLETO ====================
+
+class ConsultaSqlite(ConsultaPaginada):
+    """LIMIT como MySQL pero con el marcador ? de sqlite3"""
+
+    @property
+    def placeholder(self) -> str:
+        return '?'
+
+
+@pytest.fixture
+def cursor():
+    conexion = sqlite3.connect(':memory:')
+    conexion.execute("CREATE TABLE usuarios (IdUsuario INTEGER, IdUnidad INTEGER, Nombre TEXT)")
+    # Claves repetidas en IdUnidad: el seek debe usar la clave completa
+    conexion.executemany(
+        "INSERT INTO usuarios VALUES (?, ?, ?)",
+        [(i, i % 4, f"Usuario {i}") for i in range(1, 48)]
+    )
+    yield conexion.cursor()
+    conexion.close()
+
+
+@pytest.mark.parametrize('claves', [('IdUsuario',), ('IdUnidad', 'IdUsuario')])
+def test_recorre_todas_las_filas_una_vez_y_en_orden(cursor, claves):
+    consulta = ConsultaSqlite(base=BASE, claves=claves, encabezados=["Nombre"],
+                              dialecto='mysql', tamano_pagina=5)
+
+    vistas, despues_de = [], None
+    while True:
+        filas = consulta.pagina(cursor, despues_de)
+        if not filas:
+            break
+        assert len(filas) <= 5
+        vistas.extend(filas)
+        despues_de = consulta.clave_de(filas[-1])
+
+    claves_vistas = [consulta.clave_de(fila) for fila in vistas]
+    assert len(vistas) == 47
+    assert claves_vistas == sorted(set(claves_vistas))
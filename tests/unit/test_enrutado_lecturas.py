@@ -0,0 +1,143 @@
+"""
+Pruebas de DatabaseConnection.execute(): qué sentencias son lecturas y a
+qué conexión va cada una (pool o compartida)
+"""
+import pytest
+
+from smart_reports_pyqt6.database.repositories.persistence.mysql.connection import (
+    ConnectionPool,
+    DatabaseConnection,
+    _es_lectura
+)
+
+
+class _Cursor:
+    def __init__(self, conexion):
+        self.conexion = conexion
+
+    def execute(self, query, params=None):
+        self.conexion.sentencias.append(query)
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class _Conexion:
+    """Conexión DB-API mínima que registra las sentencias recibidas"""
+
+    def __init__(self):
+        self.sentencias = []
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db():
+    """DatabaseConnection con conexión compartida y pool falsos"""
+    pool_conexiones = []
+
+    def abrir():
+        pool_conexiones.append(_Conexion())
+        return pool_conexiones[-1]
+
+    conexion = DatabaseConnection()
+    conexion.compartida = _Conexion()
+    conexion.del_pool = pool_conexiones
+    conexion._connection = conexion.compartida
+    conexion._cursor = conexion.compartida.cursor()
+    DatabaseConnection._pool = ConnectionPool(abrir, max_size=1, pre_ping=False)
+    yield conexion
+
+    conexion._connection = None
+    conexion._cursor = None
+    conexion._pendiente = False
+    DatabaseConnection._pool.close()
+    DatabaseConnection._pool = None
+
+
+def _en_pool(db):
+    return [s for c in db.del_pool for s in c.sentencias]
+
+
+# ==================== CLASIFICACIÓN ====================
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM t",
+    "  -- comentario\n/* otro */ select 1",
+    "WITH cte AS (SELECT Id FROM t) SELECT * FROM cte",
+    "WITH a (x) AS (SELECT 1), b AS (SELECT x FROM a) SELECT * FROM b",
+    "SELECT 'UPDATE t SET x = 1' AS texto, [Delete] FROM t",
+    "SELECT @update FROM t -- DELETE",
+])
+def test_lecturas(query):
+    assert _es_lectura(query)
+
+
+@pytest.mark.parametrize("query", [
+    "UPDATE t SET x = 1",
+    "WITH cte AS (SELECT Id FROM t) UPDATE t SET x = 1 FROM t JOIN cte ON cte.Id = t.Id",
+    "WITH cte AS (SELECT Id FROM t) DELETE FROM cte",
+    "with cte as (select 1 as Id) merge t using cte on t.Id = cte.Id when matched then delete;",
+    "SELECT * INTO #copia FROM t",
+    "SELECT * FROM t WITH (UPDLOCK) WHERE Id = 1 FOR UPDATE",
+    "SELECT 1; DROP TABLE t",
+    "",
+])
+def test_escrituras(query):
+    assert not _es_lectura(query)
+
+
+# ==================== ENRUTADO ====================
+
+def test_lectura_sin_escrituras_pendientes_va_al_pool(db):
+    db.execute("SELECT 1")
+
+    assert _en_pool(db) == ["SELECT 1"]
+    assert db.compartida.sentencias == []
+
+
+def test_lectura_tras_escritura_sin_confirmar_usa_la_conexion_compartida(db):
+    db.execute("UPDATE t SET x = 1")
+    db.execute("SELECT x FROM t")
+
+    # La lectura debe ver la escritura propia aún sin commit
+    assert db.compartida.sentencias == ["UPDATE t SET x = 1", "SELECT x FROM t"]
+    assert _en_pool(db) == []
+
+    db.commit()
+    db.execute_one("SELECT x FROM t")
+    assert _en_pool(db) == ["SELECT x FROM t"]
+
+
+def test_rollback_devuelve_las_lecturas_al_pool(db):
+    db.get_cursor().execute("DELETE FROM t")
+    db.execute("SELECT 1")
+    db.rollback()
+    db.execute("SELECT 2")
+
+    assert db.compartida.sentencias == ["DELETE FROM t", "SELECT 1"]
+    assert _en_pool(db) == ["SELECT 2"]
+
+
+def test_with_que_escribe_va_a_la_conexion_compartida(db):
+    query = "WITH cte AS (SELECT Id FROM t) DELETE FROM cte"
+    db.execute(query)
+
+    assert db.compartida.sentencias == [query]
+    assert _en_pool(db) == []
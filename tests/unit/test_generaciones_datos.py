@@ -0,0 +1,77 @@
+"""
+Pruebas de generaciones de datos: tablas versionadas y proveedores por
+origen en CacheManager
+"""
+import pytest
+
+from smart_reports_pyqt6.utils.cache_manager import CacheManager
+from smart_reports_pyqt6.utils.generaciones_datos import (
+    TABLAS_CON_GENERACION,
+    tablas_en_consulta,
+    tablas_versionadas
+)
+
+
+def test_tablas_en_consulta_sin_esquema_ni_corchetes():
+    query = """
+        SELECT * FROM [dbo].[instituto_Usuario] u
+        JOIN instituto_ProgresoModulo p ON p.IdUsuario = u.IdUsuario
+        LEFT JOIN (SELECT 1 AS x) s ON 1 = 1
+    """
+    assert tablas_en_consulta(query) == ['instituto_progresomodulo', 'instituto_usuario']
+
+
+def test_solo_se_versiona_si_todas_las_tablas_tienen_generacion():
+    assert tablas_versionadas(['instituto_ResumenProgreso', 'instituto_Usuario'])
+    assert not tablas_versionadas(['instituto_ResumenProgreso', 'instituto_asignaciones'])
+    assert not tablas_versionadas([])
+
+
+def test_coinciden_con_las_tablas_que_incrementa_el_etl():
+    try:
+        from smart_reports_pyqt6.etl.etl_instituto_completo import TABLAS_POR_ESTADISTICA
+    except ImportError:
+        pytest.skip("ETL no disponible (pyodbc)")
+
+    del_etl = {t.lower() for tablas in TABLAS_POR_ESTADISTICA.values() for t in tablas}
+    assert del_etl == TABLAS_CON_GENERACION
+
+
+class Proveedor:
+    def __init__(self, generacion):
+        self.generacion = generacion
+
+    def __call__(self, tablas):
+        return {t: self.generacion for t in tablas}
+
+
+def test_cada_origen_usa_su_proveedor():
+    cache = CacheManager(sweep_interval_seconds=0)
+    bd1, bd2 = Proveedor(1), Proveedor(7)
+    cache.set_generation_provider(bd1, 'bd1')
+    cache.set_generation_provider(bd2, 'bd2')
+
+    tablas = ['instituto_Usuario']
+    assert cache.versioned_key('k', tablas, 'bd1') == 'k@instituto_usuario=1'
+    assert cache.versioned_key('k', tablas, 'bd2') == 'k@instituto_usuario=7'
+    # Sin proveedor para el origen la clave no se versiona
+    assert cache.versioned_key('k', tablas) == 'k'
+    assert not cache.has_generation_provider
+
+
+def test_una_importacion_solo_invalida_su_origen():
+    cache = CacheManager(sweep_interval_seconds=0)
+    bd1, bd2 = Proveedor(1), Proveedor(1)
+    cache.set_generation_provider(bd1, 'bd1')
+    cache.set_generation_provider(bd2, 'bd2')
+    llamadas = []
+
+    def consultar(origen):
+        return cache.get_or_compute(f"q:{origen}", lambda: llamadas.append(origen) or origen,
+                                    3600, ['instituto_Usuario'], origen)
+
+    consultar('bd1'), consultar('bd2')
+    bd1.generacion = 2
+    consultar('bd1'), consultar('bd2')
+
+    assert llamadas == ['bd1', 'bd2', 'bd1']
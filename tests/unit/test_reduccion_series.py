@@ -0,0 +1,123 @@
+"""
+Pruebas de reduccion_series: invariantes de LTTB y hexbin
+"""
+import numpy as np
+import pytest
+
+from smart_reports_pyqt6.utils.visualization.reduccion_series import (
+    PUNTOS_MINIMOS,
+    RADIO_HEXBIN_PX,
+    hexbin,
+    lttb_indices,
+    presupuesto_puntos,
+    reducir_series
+)
+
+
+@pytest.fixture
+def serie():
+    rng = np.random.default_rng(7)
+    return np.cumsum(rng.normal(size=20000))
+
+
+# ==================== LTTB ====================
+
+@pytest.mark.parametrize('umbral', [3, 50, 800, 1999])
+def test_lttb_devuelve_umbral_indices_ordenados_con_extremos(serie, umbral):
+    indices = lttb_indices(serie, umbral)
+
+    assert len(indices) == umbral
+    assert indices[0] == 0 and indices[-1] == len(serie) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_conserva_picos_aislados():
+    valores = np.zeros(10000)
+    valores[3333] = 100.0
+    valores[6666] = -100.0
+
+    indices = lttb_indices(valores, 100)
+    assert 3333 in indices
+    assert 6666 in indices
+
+
+@pytest.mark.parametrize('umbral', [2, 10000, 20000])
+def test_lttb_no_reduce_si_ya_cabe_o_el_umbral_es_minimo(serie, umbral):
+    datos = serie[:10000]
+    assert np.array_equal(lttb_indices(datos, umbral), np.arange(len(datos)))
+
+
+def test_lttb_tolera_nulos():
+    valores = np.array([1.0, np.nan, 3.0, np.nan, 5.0] * 100)
+    indices = lttb_indices(valores, 20)
+    assert len(indices) == 20
+    assert indices[-1] == len(valores) - 1
+
+
+def test_reducir_series_mantiene_las_series_alineadas(serie):
+    labels = list(range(len(serie)))
+    series = [{'name': 'a', 'values': list(serie)}, {'name': 'b', 'values': list(-serie)}]
+
+    labels_red, series_red = reducir_series(labels, series, 400)
+
+    assert len(labels_red) <= 400
+    for original, reducida in zip(series, series_red):
+        assert len(reducida['values']) == len(labels_red)
+        assert reducida['values'] == [original['values'][i] for i in labels_red]
+
+
+def test_presupuesto_nunca_baja_del_minimo():
+    assert presupuesto_puntos(0) >= PUNTOS_MINIMOS
+    assert presupuesto_puntos(50) == PUNTOS_MINIMOS
+    assert presupuesto_puntos(800) == 800
+
+
+# ==================== HEXBIN ====================
+
+@pytest.fixture
+def nube():
+    rng = np.random.default_rng(11)
+    return rng.random(50000) * 1000, rng.random(50000) * 100
+
+
+def test_hexbin_conserva_todos_los_puntos(nube):
+    x, y = nube
+    celdas = hexbin(x, y, 800, 450)
+
+    assert celdas['conteo'].sum() == len(x)
+    assert len(celdas['x']) == len(celdas['y']) == len(celdas['conteo'])
+
+
+def test_hexbin_centroides_dentro_del_rango(nube):
+    x, y = nube
+    celdas = hexbin(x, y, 800, 450, max_celdas=800)
+
+    assert x.min() <= celdas['x'].min() and celdas['x'].max() <= x.max()
+    assert y.min() <= celdas['y'].min() and celdas['y'].max() <= y.max()
+
+
+@pytest.mark.parametrize('ancho, alto', [(800, 450), (300, 450), (1920, 450)])
+def test_hexbin_respeta_el_presupuesto(nube, ancho, alto):
+    x, y = nube
+    presupuesto = presupuesto_puntos(ancho)
+
+    celdas = hexbin(x, y, ancho, alto, max_celdas=presupuesto)
+
+    assert 0 < len(celdas['conteo']) <= presupuesto
+    assert celdas['conteo'].sum() == len(x)
+
+
+def test_hexbin_sin_presupuesto_usa_el_radio_fijo(nube):
+    x, y = nube
+    fijo = hexbin(x, y, 800, 450, radio_px=RADIO_HEXBIN_PX)
+
+    # 50k puntos uniformes en 800x450 llenan muchas más celdas que 800
+    assert len(fijo['conteo']) > 800
+
+
+def test_hexbin_ignora_nulos_y_acepta_vacios():
+    celdas = hexbin([1.0, None, 3.0], [np.nan, 2.0, 4.0], 800, 450, max_celdas=10)
+    assert celdas['conteo'].sum() == 1
+
+    vacio = hexbin([], [], 800, 450, max_celdas=10)
+    assert len(vacio['conteo']) == 0
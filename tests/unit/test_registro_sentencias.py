@@ -0,0 +1,131 @@
+"""
+Pruebas de RegistroSentencias: textos por dialecto, relleno de listas IN
+y tipos declarados con setinputsizes
+"""
+import pytest
+
+from smart_reports_pyqt6.database.repositories.persistence import registro_sentencias
+from smart_reports_pyqt6.database.repositories.persistence.registro_sentencias import (
+    DIALECTO_MYSQL,
+    DIALECTO_SQLSERVER,
+    RegistroSentencias
+)
+
+
+class CursorFalso:
+    """Registra execute/setinputsizes y devuelve una fila por ejecución"""
+
+    def __init__(self):
+        self.ejecuciones = []
+        self.tamanos = []
+        self.rowcount = -1
+
+    def setinputsizes(self, tamanos):
+        self.tamanos.append(tamanos)
+
+    def execute(self, sql, params=None):
+        self.ejecuciones.append((sql, params))
+
+    def fetchall(self):
+        return [len(self.ejecuciones)]
+
+
+@pytest.fixture
+def registro():
+    registro = RegistroSentencias(DIALECTO_SQLSERVER)
+    registro.registrar(
+        'prueba.por_userid',
+        sqlserver="SELECT IdUsuario FROM instituto_Usuario WHERE UserId IN ({placeholders}) AND Activo = ?",
+        mysql="SELECT IdUsuario FROM instituto_Usuario WHERE UserId IN ({placeholders}) AND Activo = %s",
+        tipos=('varchar:100', 'bit'),
+        lista_in=True,
+    )
+    return registro
+
+
+# ==================== TEXTOS ====================
+
+def test_expande_los_marcadores_segun_dialecto(registro):
+    assert "IN (?,?,?) AND" in registro.texto('prueba.por_userid', tam_lista=3)
+    assert "IN (%s,%s) AND" in registro.texto('prueba.por_userid', DIALECTO_MYSQL, tam_lista=2)
+
+
+def test_lista_in_exige_tam_lista(registro):
+    with pytest.raises(ValueError):
+        registro.texto('prueba.por_userid')
+
+
+def test_usa_la_variante_default_si_no_hay_propia():
+    registro = RegistroSentencias(DIALECTO_MYSQL)
+    registro.registrar('prueba.todos', "SELECT 1")
+    registro.registrar('prueba.solo_sqlserver', sqlserver="SELECT TOP 1 1")
+
+    assert registro.texto('prueba.todos') == "SELECT 1"
+    with pytest.raises(ValueError):
+        registro.texto('prueba.solo_sqlserver')
+
+
+def test_registrar_de_nuevo_solo_falla_con_otro_contenido(registro):
+    registro.registrar('prueba.simple', "SELECT 1")
+    registro.registrar('prueba.simple', "SELECT 1")
+
+    with pytest.raises(ValueError):
+        registro.registrar('prueba.simple', "SELECT 2")
+
+
+def test_lista_in_sin_marcador_es_un_error():
+    with pytest.raises(ValueError):
+        RegistroSentencias(DIALECTO_SQLSERVER).registrar('prueba.mal', "SELECT 1 WHERE a IN (?)", lista_in=True)
+
+
+# ==================== RELLENO DE BLOQUES ====================
+
+def test_rellena_una_lista_corta_hasta_el_tamano_de_bloque(registro):
+    cursor = CursorFalso()
+    filas = list(registro.consultar_en_bloques(cursor, 'prueba.por_userid', ['U1', 'U2'], 5, params=(1,)))
+
+    assert filas == [1]
+    sql, params = cursor.ejecuciones[0]
+    assert sql.count('?') == 6
+    assert params == ('U1', 'U2', 'U2', 'U2', 'U2', 1)
+
+
+def test_todos_los_bloques_comparten_texto(registro):
+    cursor = CursorFalso()
+    valores = [f"U{i}" for i in range(7)] + ['U0', 'U3']  # duplicados se eliminan
+
+    list(registro.consultar_en_bloques(cursor, 'prueba.por_userid', valores, 3, params=(1,)))
+
+    assert len(cursor.ejecuciones) == 3
+    assert len({sql for sql, _ in cursor.ejecuciones}) == 1
+    assert [params[:3] for _, params in cursor.ejecuciones] == [
+        ('U0', 'U1', 'U2'), ('U3', 'U4', 'U5'), ('U6', 'U6', 'U6')
+    ]
+    assert registro.metricas()['prueba.por_userid']['llamadas'] == 3
+
+
+def test_sin_valores_no_ejecuta(registro):
+    cursor = CursorFalso()
+    assert list(registro.consultar_en_bloques(cursor, 'prueba.por_userid', [], 5)) == []
+    assert cursor.ejecuciones == []
+
+
+# ==================== TIPOS ====================
+
+@pytest.mark.skipif(not registro_sentencias.PYODBC_AVAILABLE, reason="pyodbc no disponible")
+def test_declara_varchar_y_nvarchar_con_su_tipo_odbc(registro):
+    pyodbc = registro_sentencias.pyodbc
+    cursor = CursorFalso()
+    list(registro.consultar_en_bloques(cursor, 'prueba.por_userid', ['U1'], 3, params=(1,), dedicado=True))
+
+    assert cursor.tamanos == [
+        [(pyodbc.SQL_VARCHAR, 100, 0)] * 3 + [(pyodbc.SQL_BIT, 0, 0)]
+    ]
+    assert registro_sentencias._tamano_pyodbc('str:50') == (pyodbc.SQL_WVARCHAR, 50, 0)
+    assert registro_sentencias._tamano_pyodbc('varchar:255') == (pyodbc.SQL_VARCHAR, 255, 0)
+
+
+def test_sin_dedicado_no_declara_tipos(registro):
+    cursor = CursorFalso()
+    list(registro.consultar_en_bloques(cursor, 'prueba.por_userid', ['U1'], 3, params=(1,)))
+    assert cursor.tamanos == []